@@ -7,18 +7,20 @@ which would enable grinding attacks.
 Defense mechanism:
 1. Epoch salt binds commitment to (parent_hash, block_index)
 2. Cache tracks (commitment, epoch) tuples with TTL
-3. Persisted to disk for restart recovery
-4. Nonce sequence validation per address
+3. Persisted to disk for restart recovery (SQLite, append-per-admission)
+4. Nonce sequence validation per address, persisted alongside the cache
 """
 
 import hashlib
 import json
 import logging
 import os
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -27,26 +29,236 @@ Commitment = bytes  # 32-byte commitment hash
 Epoch = int  # Block index
 Address = bytes  # 32-byte address
 
+REPLAY_STORE_VERSION = 1
+
+
+class ReplayStore:
+    """
+    Durable replay-protection store backed by SQLite in WAL mode.
+
+    Each admission is a single-row insert committed on its own, so an add
+    costs the same at 10^3 or 10^6 entries and survives a crash once
+    add() returns. Entries are indexed by epoch, and a per-epoch summary
+    table (last admission time) makes TTL expiry a bulk delete of whole
+    epochs instead of a scan.
+
+    Also holds the per-address expected nonces for NonceTracker.
+    """
+
+    def __init__(self, path: Path, synchronous: str = "NORMAL") -> None:
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database path
+            synchronous: SQLite synchronous level (NORMAL is crash-safe in WAL mode;
+                FULL also survives power loss)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = self._open(synchronous)
+
+    def _open(self, synchronous: str) -> sqlite3.Connection:
+        """Open the database, setting aside a corrupt file rather than failing."""
+        try:
+            conn = self._connect(synchronous)
+            row = conn.execute("PRAGMA quick_check").fetchone()
+            if row and row[0] == "ok":
+                return conn
+            conn.close()
+            logger.error(f"Replay store failed integrity check: {row[0] if row else 'no result'}")
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Replay store unreadable: {e}")
+
+        corrupt_path = self.path.with_name(f"{self.path.name}.corrupt-{int(time.time())}")
+        for suffix in ("", "-wal", "-shm"):
+            candidate = Path(f"{self.path}{suffix}")
+            if candidate.exists():
+                candidate.replace(Path(f"{corrupt_path}{suffix}"))
+        logger.warning(f"Moved corrupt replay store to {corrupt_path}, starting empty")
+        return self._connect(synchronous)
+
+    def _connect(self, synchronous: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS replay_entries (
+                commitment TEXT NOT NULL,
+                epoch INTEGER NOT NULL,
+                added_at REAL NOT NULL,
+                PRIMARY KEY (commitment, epoch)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_replay_entries_epoch ON replay_entries(epoch);
+            CREATE TABLE IF NOT EXISTS replay_epochs (
+                epoch INTEGER PRIMARY KEY,
+                last_added REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_replay_epochs_last_added ON replay_epochs(last_added);
+            CREATE TABLE IF NOT EXISTS nonces (
+                address TEXT PRIMARY KEY,
+                next_nonce INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        conn.execute(f"PRAGMA user_version={REPLAY_STORE_VERSION}")
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM replay_entries").fetchone()[0])
+
+    def add(self, commitment_hex: str, epoch: Epoch, timestamp: float) -> None:
+        """Record a (commitment, epoch) admission."""
+        self.add_many([(commitment_hex, epoch, timestamp)])
+
+    def add_many(self, entries: Iterable[Tuple[str, Epoch, float]]) -> None:
+        """Record several admissions in one transaction."""
+        entries = list(entries)
+        if not entries:
+            return
+        latest: Dict[Epoch, float] = {}
+        for _, epoch, timestamp in entries:
+            latest[epoch] = max(timestamp, latest.get(epoch, timestamp))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO replay_entries (commitment, epoch, added_at) "
+                    "VALUES (?, ?, ?)",
+                    entries,
+                )
+                self._conn.executemany(
+                    "INSERT INTO replay_epochs (epoch, last_added) VALUES (?, ?) "
+                    "ON CONFLICT(epoch) DO UPDATE SET "
+                    "last_added = MAX(last_added, excluded.last_added)",
+                    latest.items(),
+                )
+
+    def get(self, commitment_hex: str, epoch: Epoch) -> Optional[float]:
+        """Get an entry's admission time, or None if absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT added_at FROM replay_entries WHERE commitment = ? AND epoch = ?",
+                (commitment_hex, epoch),
+            ).fetchone()
+        return float(row[0]) if row else None
+
+    def remove(self, commitment_hex: str, epoch: Epoch) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM replay_entries WHERE commitment = ? AND epoch = ?",
+                (commitment_hex, epoch),
+            )
+
+    def evict_epochs(self, epochs: List[Epoch]) -> int:
+        """
+        Drop every entry for the given epochs.
+
+        Returns:
+            Number of entries removed
+        """
+        if not epochs:
+            return 0
+        removed = 0
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for epoch in epochs:
+                    removed += self._conn.execute(
+                        "DELETE FROM replay_entries WHERE epoch = ?", (epoch,)
+                    ).rowcount
+                self._conn.executemany(
+                    "DELETE FROM replay_epochs WHERE epoch = ?", [(epoch,) for epoch in epochs]
+                )
+        return removed
+
+    def evict_before_epoch(self, epoch: Epoch) -> int:
+        """Drop every entry for epochs below `epoch`."""
+        with self._lock:
+            epochs = [
+                int(row[0])
+                for row in self._conn.execute(
+                    "SELECT epoch FROM replay_epochs WHERE epoch < ?", (epoch,)
+                )
+            ]
+        return self.evict_epochs(epochs)
+
+    def evict_expired(self, cutoff: float) -> int:
+        """Drop whole epochs whose latest admission is older than `cutoff`."""
+        with self._lock:
+            epochs = [
+                int(row[0])
+                for row in self._conn.execute(
+                    "SELECT epoch FROM replay_epochs WHERE last_added < ?", (cutoff,)
+                )
+            ]
+        return self.evict_epochs(epochs)
+
+    def epoch_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM replay_epochs").fetchone()[0])
+
+    def get_nonce(self, address_hex: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_nonce FROM nonces WHERE address = ?", (address_hex,)
+            ).fetchone()
+        return int(row[0]) if row else None
+
+    def set_nonce(self, address_hex: str, next_nonce: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO nonces (address, next_nonce) VALUES (?, ?)",
+                (address_hex, next_nonce),
+            )
+
 
 @dataclass
 class EpochReplayCache:
     """
     Cache for tracking (commitment, epoch) pairs to prevent replay attacks.
 
+    With a persist_path, entries live in a ReplayStore (SQLite) and are
+    durable as soon as add() returns; without one they are kept in memory.
+    A legacy JSON cache at a .json persist_path is imported into a .db
+    store next to it on first open.
+
     Attributes:
         ttl_seconds: Time-to-live for cache entries (default: 7 days)
-        cache: In-memory cache of (commitment_hex, epoch) -> timestamp
+        cache: In-memory cache of (commitment_hex, epoch) -> timestamp (memory mode only)
         persist_path: Optional path to persist cache to disk
     """
 
     ttl_seconds: int = 7 * 24 * 3600  # 7 days
     cache: Dict[Tuple[str, Epoch], float] = field(default_factory=dict)
     persist_path: Optional[Path] = None
+    store: Optional[ReplayStore] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        """Load persisted cache if available"""
-        if self.persist_path and self.persist_path.exists():
-            self._load_from_disk()
+        """Open the persistent store, importing a legacy JSON cache if present"""
+        if self.persist_path and self.store is None:
+            self.persist_path = Path(self.persist_path)
+            legacy_path: Optional[Path] = None
+            store_path = self.persist_path
+            if self.persist_path.suffix == ".json":
+                legacy_path = self.persist_path
+                store_path = self.persist_path.with_suffix(".db")
+
+            self.store = ReplayStore(store_path)
+
+            if legacy_path and legacy_path.exists():
+                self._load_from_disk(legacy_path)
+                self.store.add_many((c, e, t) for (c, e), t in self.cache.items())
+                self.cache.clear()
+                legacy_path.replace(legacy_path.with_suffix(".json.migrated"))
+                logger.info(f"Migrated JSON replay cache to {store_path}")
 
     def check_replay(self, commitment: Commitment, epoch: Epoch) -> bool:
         """
@@ -63,12 +275,17 @@ class EpochReplayCache:
         key = (commitment_hex, epoch)
 
         # Check if in cache
-        if key in self.cache:
-            entry_time = self.cache[key]
-
+        if self.store is not None:
+            entry_time = self.store.get(commitment_hex, epoch)
+        else:
+            entry_time = self.cache.get(key)
+        if entry_time is not None:
             # Check if expired
             if time.time() - entry_time > self.ttl_seconds:
-                del self.cache[key]
+                if self.store is not None:
+                    self.store.remove(commitment_hex, epoch)
+                else:
+                    del self.cache[key]
                 logger.debug(f"Expired cache entry: commitment={commitment_hex[:8]}..., epoch={epoch}")
                 return False  # Expired, not a replay
 
@@ -88,23 +305,33 @@ class EpochReplayCache:
             epoch: Block index
         """
         commitment_hex = commitment.hex()
-        key = (commitment_hex, epoch)
-        self.cache[key] = time.time()
+        now = time.time()
 
-        logger.debug(f"Added to replay cache: commitment={commitment_hex[:8]}..., epoch={epoch}")
+        # Persist if configured (single-row append)
+        if self.store is not None:
+            self.store.add(commitment_hex, epoch, now)
+        else:
+            self.cache[(commitment_hex, epoch)] = now
 
-        # Persist if configured
-        if self.persist_path:
-            self._persist_to_disk()
+        logger.debug(f"Added to replay cache: commitment={commitment_hex[:8]}..., epoch={epoch}")
 
     def cleanup_expired(self) -> int:
         """
         Remove expired entries from cache.
 
+        With a persistent store, expiry is per epoch: an epoch is dropped
+        once its most recent admission is older than the TTL.
+
         Returns:
             Number of entries removed
         """
         now = time.time()
+        if self.store is not None:
+            removed = self.store.evict_expired(now - self.ttl_seconds)
+            if removed:
+                logger.info(f"Cleaned up {removed} expired cache entries")
+            return removed
+
         expired_keys = [
             key for key, timestamp in self.cache.items() if now - timestamp > self.ttl_seconds
         ]
@@ -117,43 +344,28 @@ class EpochReplayCache:
 
         return len(expired_keys)
 
-    def _persist_to_disk(self) -> None:
-        """Persist cache to disk (JSON format)"""
-        if not self.persist_path:
-            return
-
-        # Ensure parent directory exists
-        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Convert to JSON-serializable format
-        data = {
-            "version": 1,
-            "ttl_seconds": self.ttl_seconds,
-            "entries": [
-                {
-                    "commitment": commitment_hex,
-                    "epoch": epoch,
-                    "timestamp": timestamp,
-                }
-                for (commitment_hex, epoch), timestamp in self.cache.items()
-            ],
-        }
+    def evict_before_epoch(self, epoch: Epoch) -> int:
+        """
+        Drop all entries for epochs below `epoch` (e.g. beyond the reorg horizon).
 
-        # Write atomically
-        temp_path = self.persist_path.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(data, f, indent=2)
+        Returns:
+            Number of entries removed
+        """
+        if self.store is not None:
+            return self.store.evict_before_epoch(epoch)
 
-        temp_path.replace(self.persist_path)
-        logger.debug(f"Persisted replay cache to {self.persist_path}")
+        stale_keys = [key for key in self.cache if key[1] < epoch]
+        for key in stale_keys:
+            del self.cache[key]
+        return len(stale_keys)
 
-    def _load_from_disk(self) -> None:
-        """Load cache from disk"""
-        if not self.persist_path or not self.persist_path.exists():
+    def _load_from_disk(self, path: Path) -> None:
+        """Load a legacy JSON cache file into memory"""
+        if not path.exists():
             return
 
         try:
-            with open(self.persist_path, "r") as f:
+            with open(path, "r") as f:
                 data = json.load(f)
 
             # Validate version
@@ -188,10 +400,15 @@ class EpochReplayCache:
 
     def stats(self) -> dict:
         """Get cache statistics"""
+        if self.store is not None:
+            total, epochs = len(self.store), self.store.epoch_count()
+        else:
+            total, epochs = len(self.cache), len({epoch for _, epoch in self.cache})
         return {
-            "total_entries": len(self.cache),
+            "total_entries": total,
+            "epochs": epochs,
             "ttl_seconds": self.ttl_seconds,
-            "persist_path": str(self.persist_path) if self.persist_path else None,
+            "persist_path": str(self.store.path) if self.store is not None else None,
         }
 
 
@@ -219,7 +436,7 @@ def get_replay_cache(
         # Default persist path
         if persist_path is None:
             data_dir = Path(os.getenv("COINJECTURE_DATA_DIR", "data"))
-            persist_path = data_dir / "cache" / "epoch_replay.json"
+            persist_path = data_dir / "cache" / "epoch_replay.db"
 
         _replay_cache = EpochReplayCache(
             ttl_seconds=ttl_seconds,
@@ -266,10 +483,19 @@ class NonceTracker:
     """
     Track nonce sequences per address to prevent replay attacks.
 
-    Nonces must be strictly increasing per address.
+    Nonces must be strictly increasing per address. With a store, expected
+    nonces are persisted on every increment and read through on a miss.
     """
 
     nonces: Dict[str, int] = field(default_factory=dict)  # address_hex -> expected_nonce
+    store: Optional[ReplayStore] = field(default=None, repr=False)
+
+    def _expected(self, address_hex: str) -> int:
+        expected = self.nonces.get(address_hex)
+        if expected is None:
+            expected = (self.store.get_nonce(address_hex) if self.store is not None else None) or 0
+            self.nonces[address_hex] = expected
+        return expected
 
     def validate_nonce(self, address: Address, nonce: int) -> bool:
         """
@@ -283,7 +509,7 @@ class NonceTracker:
             True if valid (expected nonce), False otherwise
         """
         address_hex = address.hex()
-        expected = self.nonces.get(address_hex, 0)
+        expected = self._expected(address_hex)
 
         if nonce != expected:
             logger.warning(
@@ -301,7 +527,10 @@ class NonceTracker:
             address: 32-byte address
         """
         address_hex = address.hex()
-        self.nonces[address_hex] = self.nonces.get(address_hex, 0) + 1
+        next_nonce = self._expected(address_hex) + 1
+        if self.store is not None:
+            self.store.set_nonce(address_hex, next_nonce)
+        self.nonces[address_hex] = next_nonce
 
     def get_nonce(self, address: Address) -> int:
         """
@@ -314,7 +543,7 @@ class NonceTracker:
             Expected nonce (0 if address never seen)
         """
         address_hex = address.hex()
-        return self.nonces.get(address_hex, 0)
+        return self._expected(address_hex)
 
 
 # Global nonce tracker
@@ -322,10 +551,10 @@ _nonce_tracker: Optional[NonceTracker] = None
 
 
 def get_nonce_tracker() -> NonceTracker:
-    """Get or create global nonce tracker"""
+    """Get or create global nonce tracker (persisted in the replay cache's store)"""
     global _nonce_tracker
     if _nonce_tracker is None:
-        _nonce_tracker = NonceTracker()
+        _nonce_tracker = NonceTracker(store=get_replay_cache().store)
     return _nonce_tracker
 
 
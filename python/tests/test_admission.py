@@ -0,0 +1,165 @@
+"""
+Tests for durable epoch replay protection and nonce tracking
+
+These tests verify the admission store:
+1. Detects replays across restarts
+2. Expires whole epochs by TTL and by height
+3. Recovers from crashes and corrupt files
+4. Migrates legacy JSON caches
+5. Keeps admission throughput flat as the cache grows (benchmark)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from coinjecture.consensus.admission import EpochReplayCache, NonceTracker
+
+
+def commitment(i: int) -> bytes:
+    return i.to_bytes(32, "big")
+
+
+class TestReplayDetection:
+    """Test replay detection in memory and on disk"""
+
+    def test_memory_mode(self):
+        """Without a persist path entries stay in memory"""
+        cache = EpochReplayCache()
+        assert not cache.check_replay(commitment(1), 5)
+        cache.add(commitment(1), 5)
+
+        assert cache.check_replay(commitment(1), 5)
+        assert not cache.check_replay(commitment(1), 6)
+        assert cache.store is None
+
+    def test_survives_restart(self, tmp_path):
+        """Entries and nonces persist across instances"""
+        path = tmp_path / "replay.db"
+        cache = EpochReplayCache(persist_path=path)
+        cache.add(commitment(1), 10)
+        tracker = NonceTracker(store=cache.store)
+        tracker.increment_nonce(b"\x01" * 32)
+        tracker.increment_nonce(b"\x01" * 32)
+        cache.store.close()
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert reopened.check_replay(commitment(1), 10)
+        assert NonceTracker(store=reopened.store).validate_nonce(b"\x01" * 32, 2)
+
+    def test_expired_entry_not_replay(self, tmp_path):
+        """Entries older than the TTL no longer count as replays"""
+        cache = EpochReplayCache(ttl_seconds=60, persist_path=tmp_path / "replay.db")
+        cache.store.add(commitment(1).hex(), 3, time.time() - 120)
+
+        assert not cache.check_replay(commitment(1), 3)
+        assert cache.store.get(commitment(1).hex(), 3) is None
+
+
+class TestEviction:
+    """Test bulk eviction by epoch"""
+
+    def test_ttl_evicts_whole_epochs(self, tmp_path):
+        """cleanup_expired drops epochs whose last admission is past the TTL"""
+        cache = EpochReplayCache(ttl_seconds=60, persist_path=tmp_path / "replay.db")
+        old = time.time() - 120
+        cache.store.add_many([(commitment(i).hex(), i % 3, old) for i in range(30)])
+        cache.add(commitment(100), 7)
+
+        assert cache.cleanup_expired() == 30
+        assert cache.stats()["total_entries"] == 1
+        assert cache.stats()["epochs"] == 1
+
+    def test_evict_before_epoch(self, tmp_path):
+        """evict_before_epoch drops all entries below a height"""
+        cache = EpochReplayCache(persist_path=tmp_path / "replay.db")
+        for epoch in range(10):
+            cache.add(commitment(epoch), epoch)
+
+        assert cache.evict_before_epoch(6) == 6
+        assert not cache.check_replay(commitment(5), 5)
+        assert cache.check_replay(commitment(6), 6)
+
+
+class TestRecovery:
+    """Test crash safety and legacy migration"""
+
+    def test_crash_after_add_is_durable(self, tmp_path):
+        """An add that returned is kept even if the process dies without closing"""
+        path = tmp_path / "replay.db"
+        script = (
+            "import os\n"
+            "from pathlib import Path\n"
+            "from coinjecture.consensus.admission import EpochReplayCache\n"
+            f"cache = EpochReplayCache(persist_path=Path({str(path)!r}))\n"
+            "for i in range(100):\n"
+            "    cache.add(i.to_bytes(32, 'big'), i)\n"
+            "os._exit(1)\n"
+        )
+        subprocess.run([sys.executable, "-c", script], env=dict(os.environ), check=False)
+
+        cache = EpochReplayCache(persist_path=path)
+        assert cache.stats()["total_entries"] == 100
+        assert cache.check_replay(commitment(99), 99)
+
+    def test_corrupt_store_set_aside(self, tmp_path):
+        """A corrupt database is moved aside and replaced with an empty one"""
+        path = tmp_path / "replay.db"
+        path.write_bytes(b"not a sqlite database" * 100)
+
+        cache = EpochReplayCache(persist_path=path)
+        cache.add(commitment(1), 1)
+
+        assert cache.check_replay(commitment(1), 1)
+        assert list(tmp_path.glob("replay.db.corrupt-*"))
+
+    def test_legacy_json_migrated(self, tmp_path):
+        """A JSON cache at the persist path is imported into the SQLite store"""
+        legacy = tmp_path / "epoch_replay.json"
+        legacy.write_text(json.dumps({
+            "version": 1,
+            "ttl_seconds": 3600,
+            "entries": [{"commitment": commitment(7).hex(), "epoch": 4, "timestamp": time.time()}],
+        }))
+
+        cache = EpochReplayCache(persist_path=legacy)
+
+        assert cache.check_replay(commitment(7), 4)
+        assert cache.store.path == tmp_path / "epoch_replay.db"
+        assert not legacy.exists()
+
+
+@pytest.mark.slow
+class TestAdmissionThroughput:
+    """Benchmark admissions/sec as the store grows"""
+
+    def test_admissions_per_second(self, tmp_path):
+        """Admission rate stays flat from 10^5 to 10^6 entries"""
+        cache = EpochReplayCache(persist_path=tmp_path / "replay.db")
+        rates = {}
+        loaded = 0
+
+        for size in (100_000, 1_000_000):
+            # Bulk-load to size, 100 commitments per epoch
+            while loaded < size:
+                batch = [
+                    (commitment(i).hex(), i // 100, time.time())
+                    for i in range(loaded, min(size, loaded + 50_000))
+                ]
+                cache.store.add_many(batch)
+                loaded += len(batch)
+
+            count = 2_000
+            start = time.perf_counter()
+            for i in range(size, size + count):
+                assert not cache.check_replay(commitment(i), i // 100)
+                cache.add(commitment(i), i // 100)
+            rates[size] = count / (time.perf_counter() - start)
+            loaded += count
+            print(f"{size:>9,} entries: {rates[size]:,.0f} admissions/sec")
+
+        assert rates[1_000_000] > rates[100_000] / 3
@@ -8,7 +8,7 @@ import json
 import sqlite3
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class IngestStore:
@@ -59,6 +59,7 @@ class IngestStore:
             cur.execute("CREATE INDEX IF NOT EXISTS idx_telemetry_ts ON telemetry(ts)")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_telemetry_miner ON telemetry(miner_address)")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_block_ts ON block_events(ts)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_block_ts_event ON block_events(ts, event_id)")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_block_index ON block_events(block_index)")
             conn.commit()
 
@@ -145,6 +146,30 @@ class IngestStore:
                 (limit,),
             )
             rows = cur.fetchall()
+        return self._block_rows(rows)
+
+    def blocks_since(self, ts: float, limit: int = 1000, after_event_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Block events with ts >= the given timestamp, ordered by (ts, event_id).
+
+        Pass the last event of a page as (ts, after_event_id) to get the next
+        one; events sharing that timestamp are split across pages by event_id
+        rather than returned again (uses idx_block_ts_event).
+        """
+        where, params = "ts >= ?", (ts,)
+        if after_event_id is not None:
+            where, params = "ts >= ? AND (ts > ? OR event_id > ?)", (ts, ts, after_event_id)
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT event_id, block_index, block_hash, cid, miner_address, capacity, work_score, ts FROM block_events "
+                f"WHERE {where} ORDER BY ts ASC, event_id ASC LIMIT ?",
+                params + (limit,),
+            )
+            rows = cur.fetchall()
+        return self._block_rows(rows)
+
+    def _block_rows(self, rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         for r in rows:
             out.append(
@@ -0,0 +1,170 @@
+"""
+Module: checkpoint
+Specification: docs/blockchain/consensus.md
+
+Signed local checkpoints for fast consensus service startup. A checkpoint
+snapshots the tip set, cumulative work, balances and the last processed
+event id; on boot the service restores the newest checkpoint that verifies
+and replays only the blocks after it.
+
+Checkpoints are local state, so they are signed with an HMAC-SHA256 key
+kept next to them rather than a network identity key.
+"""
+
+import os
+import json
+import hmac
+import glob
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_DIR = "data/checkpoints"
+DEFAULT_KEEP = 3
+KEY_FILE = "checkpoint.key"
+
+
+@dataclass
+class Checkpoint:
+    """Snapshot of consensus service state at a best-chain height."""
+    height: int
+    tip_hash: str
+    cumulative_work: float
+    tips: List[Dict[str, Any]] = field(default_factory=list)  # {"block", "height", "cumulative_work"}
+    balances: Dict[str, int] = field(default_factory=dict)  # Base units
+    last_event_id: Optional[str] = None
+    last_event_ts: float = 0.0
+    difficulty: Dict[str, Any] = field(default_factory=dict)  # DifficultyAdjuster state at the tip
+    created_at: float = field(default_factory=time.time)
+    version: int = CHECKPOINT_VERSION
+    signature: str = ""
+
+    def payload(self) -> bytes:
+        """Canonical signed bytes (everything but the signature)."""
+        data = asdict(self)
+        data.pop("signature")
+        return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def get_tip(self, block_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a tip entry by hash (the best tip if None)."""
+        block_hash = block_hash or self.tip_hash
+        for tip in self.tips:
+            if tip["block"].get("block_hash") == block_hash:
+                return tip
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Checkpoint':
+        return cls(
+            height=data["height"],
+            tip_hash=data["tip_hash"],
+            cumulative_work=data["cumulative_work"],
+            tips=data.get("tips", []),
+            balances=data.get("balances", {}),
+            last_event_id=data.get("last_event_id"),
+            last_event_ts=data.get("last_event_ts", 0.0),
+            difficulty=data.get("difficulty", {}),
+            created_at=data.get("created_at", 0.0),
+            version=data.get("version", CHECKPOINT_VERSION),
+            signature=data.get("signature", "")
+        )
+
+
+class CheckpointStore:
+    """
+    Directory of signed checkpoint files, newest kept by height.
+
+    Files are written atomically (temp file + rename) and older ones are
+    pruned down to `keep`. Tampered or corrupt files are skipped on load.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CHECKPOINT_DIR, key: Optional[bytes] = None,
+                 keep: int = DEFAULT_KEEP):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            directory: Checkpoint directory
+            key: HMAC key (loaded from or created in the directory if None)
+            keep: Number of checkpoint files to retain
+        """
+        self.directory = directory
+        self.keep = max(1, keep)
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(directory, exist_ok=True)
+        self.key = key or self._load_or_create_key()
+
+    def _load_or_create_key(self) -> bytes:
+        path = os.path.join(self.directory, KEY_FILE)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def sign(self, checkpoint: Checkpoint) -> Checkpoint:
+        checkpoint.signature = hmac.new(self.key, checkpoint.payload(), hashlib.sha256).hexdigest()
+        return checkpoint
+
+    def verify(self, checkpoint: Checkpoint) -> bool:
+        expected = hmac.new(self.key, checkpoint.payload(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, checkpoint.signature)
+
+    def _path(self, height: int) -> str:
+        return os.path.join(self.directory, f"checkpoint_{height:012d}.json")
+
+    def _list(self) -> List[str]:
+        """Checkpoint files, newest first."""
+        return sorted(glob.glob(os.path.join(self.directory, "checkpoint_*.json")), reverse=True)
+
+    def save(self, checkpoint: Checkpoint) -> bool:
+        """
+        Sign and write a checkpoint.
+
+        Returns:
+            True if written
+        """
+        try:
+            self.sign(checkpoint)
+            path = self._path(checkpoint.height)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(checkpoint.to_dict(), f)
+            os.replace(tmp_path, path)
+
+            for old in self._list()[self.keep:]:
+                os.remove(old)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to save checkpoint at height {checkpoint.height}: {e}")
+            return False
+
+    def load_latest(self) -> Optional[Checkpoint]:
+        """
+        Load the newest checkpoint with a valid signature.
+
+        Returns:
+            Checkpoint or None if there is none
+        """
+        for path in self._list():
+            try:
+                with open(path, "r") as f:
+                    checkpoint = Checkpoint.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.logger.warning(f"Skipping unreadable checkpoint {path}: {e}")
+                continue
+            if checkpoint.version != CHECKPOINT_VERSION or not self.verify(checkpoint):
+                self.logger.warning(f"Skipping checkpoint with bad signature or version: {path}")
+                continue
+            return checkpoint
+        return None
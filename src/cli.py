@@ -490,6 +490,8 @@ Examples:
             'wallet-list',
             help='List available wallets'
         )
+        list_parser.add_argument('--offset', type=int, default=0, help='Wallets to skip')
+        list_parser.add_argument('--limit', type=int, default=None, help='Maximum wallets to show')
         list_parser.set_defaults(func=self._handle_wallet_list)
         
         # Get balance - removed duplicate, using _add_wallet_balance_command instead
@@ -1392,7 +1394,7 @@ Examples:
         """Handle wallet creation."""
         try:
             try:
-                from .tokenomics.wallet import Wallet
+                from .tokenomics.wallet import WalletManager
             except ImportError:
                 from tokenomics.wallet import WalletManager
             manager = WalletManager()
@@ -1414,12 +1416,12 @@ Examples:
         """Handle wallet listing."""
         try:
             try:
-                from .tokenomics.wallet import Wallet
+                from .tokenomics.wallet import WalletManager
             except ImportError:
                 from tokenomics.wallet import WalletManager
             manager = WalletManager()
             
-            wallets = manager.list_wallets()
+            wallets = manager.list_wallets(offset=args.offset, limit=args.limit)
             if wallets:
                 print("📋 Available wallets:")
                 for wallet in wallets:
@@ -1438,14 +1440,15 @@ Examples:
     def _handle_transaction_send(self, args) -> int:
         """Handle transaction sending."""
         try:
-            from tokenomics.blockchain_state import BlockchainState, Transaction
-            state = BlockchainState()
+            from tokenomics.blockchain_state import BlockchainState, Transaction, DEFAULT_STATE_DB
+            from tokenomics.amount import to_units
+            state = BlockchainState(db_path=DEFAULT_STATE_DB)
             
             # Create transaction
             transaction = Transaction(
                 sender=args.sender,
                 recipient=args.recipient,
-                amount=args.amount,
+                amount=to_units(args.amount),
                 timestamp=time.time()
             )
             
@@ -1456,6 +1459,7 @@ Examples:
             
             # Add to pool
             if state.add_transaction(transaction):
+                state.save_state()
                 print(f"✅ Transaction submitted")
                 print(f"   ID: {transaction.transaction_id}")
                 print(f"   From: {args.sender}")
@@ -1472,14 +1476,15 @@ Examples:
     def _handle_transaction_history(self, args) -> int:
         """Handle transaction history retrieval."""
         try:
-            from tokenomics.blockchain_state import BlockchainState
-            state = BlockchainState()
+            from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+            from tokenomics.amount import format_amount
+            state = BlockchainState(db_path=DEFAULT_STATE_DB)
             
             transactions = state.get_transaction_history(args.address, args.limit)
             if transactions:
                 print(f"📜 Transaction history for {args.address}:")
                 for tx in transactions:
-                    print(f"   {tx.transaction_id[:8]}... | {tx.sender} -> {tx.recipient} | {tx.amount} | {time.ctime(tx.timestamp)}")
+                    print(f"   {tx.transaction_id[:8]}... | {tx.sender} -> {tx.recipient} | {format_amount(tx.amount)} | {time.ctime(tx.timestamp)}")
             else:
                 print(f"📜 No transactions found for {args.address}")
             return 0
@@ -1490,14 +1495,15 @@ Examples:
     def _handle_transaction_pending(self, args) -> int:
         """Handle pending transactions listing."""
         try:
-            from tokenomics.blockchain_state import BlockchainState
-            state = BlockchainState()
+            from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+            from tokenomics.amount import format_amount
+            state = BlockchainState(db_path=DEFAULT_STATE_DB)
             
             pending = state.get_pending_transactions(args.limit)
             if pending:
                 print(f"⏳ Pending transactions ({len(pending)}):")
                 for tx in pending:
-                    print(f"   {tx.transaction_id[:8]}... | {tx.sender} -> {tx.recipient} | {tx.amount} | {time.ctime(tx.timestamp)}")
+                    print(f"   {tx.transaction_id[:8]}... | {tx.sender} -> {tx.recipient} | {format_amount(tx.amount)} | {time.ctime(tx.timestamp)}")
             else:
                 print("⏳ No pending transactions")
             return 0
@@ -1508,15 +1514,16 @@ Examples:
     def _handle_transaction_get(self, args) -> int:
         """Handle transaction retrieval by ID."""
         try:
-            from tokenomics.blockchain_state import BlockchainState
-            state = BlockchainState()
+            from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+            from tokenomics.amount import format_amount
+            state = BlockchainState(db_path=DEFAULT_STATE_DB)
             
             transaction = state.get_transaction_by_id(args.tx_id)
             if transaction:
                 print(f"🔍 Transaction {args.tx_id}:")
                 print(f"   From: {transaction.sender}")
                 print(f"   To: {transaction.recipient}")
-                print(f"   Amount: {transaction.amount}")
+                print(f"   Amount: {format_amount(transaction.amount)}")
                 print(f"   Timestamp: {time.ctime(transaction.timestamp)}")
                 print(f"   Signature: {transaction.signature[:16]}..." if transaction.signature else "   Signature: None")
             else:
@@ -2251,23 +2258,25 @@ Examples:
         try:
             try:
                 from .tokenomics.wallet import Wallet
-                from .tokenomics.blockchain_state import BlockchainState
+                from .tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+                from .tokenomics.amount import format_amount, to_coins
             except ImportError:
                 from tokenomics.wallet import Wallet
-                from tokenomics.blockchain_state import BlockchainState
+                from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+                from tokenomics.amount import format_amount, to_coins
             
             # Load wallet from file
             wallet = Wallet.load_from_file(args.wallet)
             
             # Check local blockchain state first
             try:
-                blockchain_state = BlockchainState()
+                blockchain_state = BlockchainState(db_path=DEFAULT_STATE_DB)
                 blockchain_state.load_state()
                 local_balance = blockchain_state.get_balance(wallet.address)
                 
                 print(f"💰 Wallet Balance (Local Blockchain State):")
                 print(f"   Address: {wallet.address}")
-                print(f"   Balance: {local_balance:.6f} COIN")
+                print(f"   Balance: {format_amount(local_balance)} COIN")
                 
                 # Also try API for comparison (if available)
                 try:
@@ -2276,7 +2285,7 @@ Examples:
                         data = response.json()
                         api_balance = data.get('balance', 0)
                         print(f"   API Balance: {api_balance:.6f} COIN")
-                        if abs(local_balance - api_balance) > 0.000001:
+                        if abs(to_coins(local_balance) - api_balance) > 0.000001:
                             print(f"   ⚠️  Balance mismatch between local and API")
                     else:
                         print(f"   API: Not available (HTTP {response.status_code})")
@@ -2407,16 +2416,18 @@ Examples:
         try:
             try:
                 from .tokenomics.wallet import Wallet
-                from .tokenomics.blockchain_state import BlockchainState
+                from .tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+                from .tokenomics.amount import format_amount
             except ImportError:
                 from tokenomics.wallet import Wallet
-                from tokenomics.blockchain_state import BlockchainState
+                from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+                from tokenomics.amount import format_amount
             
             # Load wallet from file
             wallet = Wallet.load_from_file(args.wallet)
             
             # Load blockchain state
-            blockchain_state = BlockchainState()
+            blockchain_state = BlockchainState(db_path=DEFAULT_STATE_DB)
             blockchain_state.load_state()
             
             # Get current balance
@@ -2424,7 +2435,7 @@ Examples:
             
             print(f"💰 Mining Rewards Summary:")
             print(f"   Address: {wallet.address}")
-            print(f"   Current Balance: {balance:.6f} COIN")
+            print(f"   Current Balance: {format_amount(balance)} COIN")
             
             # Get transaction history for this address
             transactions = []
@@ -2439,7 +2450,7 @@ Examples:
             if transactions:
                 for i, tx in enumerate(transactions[:args.limit]):
                     timestamp_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(tx.timestamp))
-                    print(f"   {i+1}. {tx.amount:.6f} COIN - {timestamp_str}")
+                    print(f"   {i+1}. {format_amount(tx.amount)} COIN - {timestamp_str}")
                     print(f"      Transaction ID: {tx.transaction_id}")
                     if tx.sender == "NETWORK_MINING_REWARDS":
                         print(f"      Type: Mining Reward")
@@ -10,9 +10,10 @@ import time
 import hashlib
 import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set, Union, Callable, TYPE_CHECKING
 from enum import Enum
 from collections import deque
+from contextlib import contextmanager
 
 # Optional numpy import for equilibrium calculations
 try:
@@ -26,19 +27,26 @@ try:
     from .core.blockchain import Block, ProblemTier, ComputationalComplexity, calculate_computational_work_score
     from .pow import (
         ProblemRegistry, derive_epoch_salt, create_commitment, verify_commitment,
-        calculate_work_score, compute_solution_hash
+        calculate_work_score, compute_solution_hash, DifficultyAdjuster, check_block_body
     )
     from .storage import StorageManager, StorageConfig, NodeRole, PruningMode
     from .metrics_engine import MetricsEngine, get_metrics_engine, SATOSHI_CONSTANT
+    from .orphan_pool import OrphanPool, DEFAULT_MAX_ORPHANS, DEFAULT_MAX_ORPHAN_AGE
+    from .tokenomics.amount import to_coins
 except ImportError:
     # Fallback for direct execution
     from core.blockchain import Block, ProblemTier, ComputationalComplexity, calculate_computational_work_score
     from pow import (
         ProblemRegistry, derive_epoch_salt, create_commitment, verify_commitment,
-        calculate_work_score, compute_solution_hash
+        calculate_work_score, compute_solution_hash, DifficultyAdjuster, check_block_body
     )
     from storage import StorageManager, StorageConfig, NodeRole, PruningMode
     from metrics_engine import MetricsEngine, get_metrics_engine, SATOSHI_CONSTANT
+    from orphan_pool import OrphanPool, DEFAULT_MAX_ORPHANS, DEFAULT_MAX_ORPHAN_AGE
+    from tokenomics.amount import to_coins
+
+if TYPE_CHECKING:
+    from .validation_pipeline import PipelineResult
 
 
 # Constants
@@ -46,9 +54,29 @@ DEFAULT_CONFIRMATION_DEPTH = 20
 MAX_REORG_DEPTH = 100
 MAX_HEADERS_PER_SECOND = 100
 MAX_PROOF_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
+WRITE_BATCH_BLOCKS = 500
+WRITE_BATCH_MS = 250.0
 DEFAULT_NETWORK_ID = "coinjecture-testnet-v1"  # Keep original for genesis compatibility
 
 
+def _invert_lowest_one(n: int) -> int:
+    return n & (n - 1)
+
+
+def get_skip_height(height: int) -> int:
+    """
+    Height a node's skip pointer targets.
+    
+    Any height can be reached from any descendant in O(log n) jumps by
+    following skip pointers when they do not overshoot.
+    """
+    if height < 2:
+        return 0
+    if height & 1:
+        return _invert_lowest_one(_invert_lowest_one(height - 1)) + 1
+    return _invert_lowest_one(height)
+
+
 class ValidationError(Exception):
     """Base class for validation errors."""
     pass
@@ -77,11 +105,79 @@ class BlockNode:
     height: int
     receipt_time: float
     children: List[str] = field(default_factory=list)
+    skip_hash: Optional[str] = None  # Ancestor at get_skip_height(height)
+    difficulty_target: Optional[float] = None  # Adjuster target once connected to the main chain
+    
+    @property
+    def block_hash(self) -> str:
+        return self.block.block_hash
     
     def __hash__(self):
         return hash(self.block.block_hash)
 
 
+class BlockStub:
+    """
+    Lightweight stand-in for a finalized main-chain BlockNode.
+    
+    Keeps only what fork choice and linkage checks need; the full block is
+    loaded from storage on demand.
+    """
+    __slots__ = ("block_hash", "parent_hash", "height", "cumulative_work", "timestamp", "skip_hash",
+                 "difficulty_target")
+    
+    def __init__(self, block_hash: str, parent_hash: str, height: int, cumulative_work: float,
+                 timestamp: float, skip_hash: Optional[str] = None, difficulty_target: Optional[float] = None):
+        self.block_hash = block_hash
+        self.parent_hash = parent_hash
+        self.height = height
+        self.cumulative_work = cumulative_work
+        self.timestamp = timestamp
+        self.skip_hash = skip_hash
+        self.difficulty_target = difficulty_target
+    
+    @classmethod
+    def from_node(cls, node: BlockNode) -> 'BlockStub':
+        return cls(
+            node.block.block_hash, node.parent_hash, node.height,
+            node.cumulative_work, node.block.timestamp, node.skip_hash, node.difficulty_target
+        )
+    
+    def __hash__(self):
+        return hash(self.block_hash)
+
+
+@dataclass
+class ChainDelta:
+    """
+    Best-chain change emitted to chain listeners.
+    
+    A plain extension has no disconnected blocks; a reorg disconnects the
+    old branch tip-first back to the fork point, then connects the new one.
+    """
+    fork_hash: str
+    fork_height: int
+    disconnected: List[Block] = field(default_factory=list)  # Old tip first
+    connected: List[Block] = field(default_factory=list)     # Fork child first
+    
+    @property
+    def depth(self) -> int:
+        return len(self.disconnected)
+
+
+@dataclass
+class WriteBatch:
+    """Storage operations buffered by ConsensusEngine.batched_writes()."""
+    max_blocks: int
+    max_seconds: float
+    store_blocks: bool = False
+    operations: List[tuple] = field(default_factory=list)
+    blocks: int = 0  # Blocks connected since the last commit
+    started: float = field(default_factory=time.time)
+    commits: int = 0
+    failed_commits: int = 0
+
+
 @dataclass
 class ConsensusConfig:
     """Configuration for consensus engine."""
@@ -92,6 +188,12 @@ class ConsensusConfig:
     max_proof_size_bytes: int = MAX_PROOF_SIZE_BYTES
     genesis_timestamp: float = 1609459200.0  # 2021-01-01 00:00:00 UTC
     genesis_seed: str = "coinjecture_genesis_seed"
+    compaction_interval: int = 64  # Finalized blocks between block_tree compactions (0 disables)
+    max_orphans: int = DEFAULT_MAX_ORPHANS  # Blocks buffered while their parent is missing
+    orphan_max_age: float = DEFAULT_MAX_ORPHAN_AGE  # Seconds an orphan waits before eviction
+    write_batch_blocks: int = WRITE_BATCH_BLOCKS  # Blocks per storage commit in batched_writes()
+    write_batch_ms: float = WRITE_BATCH_MS  # Max milliseconds a batched write waits for its commit
+    light_mode: bool = False  # Header-only node: work comes from header claims, bodies fetched on demand
 
 
 @dataclass
@@ -199,8 +301,16 @@ class ConsensusEngine:
         # Initialize metrics engine for gas/reward calculation
         self.metrics_engine = metrics_engine or get_metrics_engine()
         
-        # Block tree for fork choice
-        self.block_tree: Dict[str, BlockNode] = {}
+        # Block tree for fork choice; finalized main-chain nodes become BlockStubs
+        self.block_tree: Dict[str, Union[BlockNode, BlockStub]] = {}
+        
+        # Callbacks receiving a ChainDelta whenever the best chain changes
+        self.chain_listeners: List[Callable[[ChainDelta], None]] = []
+        self.last_reorg: Optional[ChainDelta] = None
+        
+        # Full (non-stub) nodes by height, and the highest compacted height
+        self._resident_heights: Dict[int, Set[str]] = {}
+        self._compacted_height = -1
         
         # Current best tip
         self.best_tip: Optional[BlockNode] = None
@@ -211,6 +321,18 @@ class ConsensusEngine:
         # Header validation rate limiting
         self._header_timestamps: deque = deque(maxlen=100)
         
+        # Blocks that arrived before their parent, connected when it does
+        self.orphan_pool = OrphanPool(config.max_orphans, config.orphan_max_age)
+        
+        # Open write batch while connecting many blocks (None writes through)
+        self._write_batch: Optional[WriteBatch] = None
+        
+        # Difficulty state at the best tip, advanced incrementally by chain deltas
+        self.difficulty_adjuster = DifficultyAdjuster()
+        
+        # Metrics from the last staged validate_blocks() run
+        self.last_pipeline_metrics: Dict = {}
+        
         # Initialize genesis if not exists
         self._initialize_genesis()
     
@@ -487,11 +609,21 @@ class ConsensusEngine:
             block: Block to validate
             
         Returns:
-            True if valid
+            True if added to the block tree, False if buffered as an
+            orphan until its parent connects
             
         Raises:
             HeaderValidationError: If validation fails
         """
+        self.orphan_pool.metrics.blocks_received += 1
+        
+        # 0) Out-of-order arrival: buffer until the parent connects
+        if block.index > 0 and block.previous_hash not in self.block_tree:
+            if not self._validate_commitment_presence(block) or not self._validate_difficulty(block):
+                raise HeaderValidationError("Orphan header validation failed")
+            self.orphan_pool.add(block)
+            return False
+        
         # 1) Basic validation: parent linkage, timestamp
         if not self._validate_basic_header(block):
             raise HeaderValidationError("Basic header validation failed")
@@ -539,7 +671,7 @@ class ConsensusEngine:
             
             # Step 5: Calculate reward (AFTER validation)
             work_score = block_data.get('work_score', 0)
-            reward = self.metrics_engine.calculate_block_reward(
+            reward_units = self.metrics_engine.calculate_block_reward_units(
                 work_score, 
                 self.metrics_engine.network_state
             )
@@ -548,7 +680,8 @@ class ConsensusEngine:
             block_data['gas_used'] = gas_used
             block_data['gas_limit'] = 1000000
             block_data['gas_price'] = 0.000001
-            block_data['reward'] = reward
+            block_data['reward'] = to_coins(reward_units)
+            block_data['reward_units'] = reward_units
             
             # Apply Satoshi Constant for stability
             block_data['damping_ratio'] = SATOSHI_CONSTANT
@@ -601,7 +734,31 @@ class ConsensusEngine:
         Returns:
             True if valid
         """
-        # Check parent linkage
+        if not self._validate_parent_linkage(block):
+            return False
+        
+        # Rate limiting: max headers per second
+        current_time = time.time()
+        self._header_timestamps.append(current_time)
+        
+        if len(self._header_timestamps) >= self.config.max_headers_per_second:
+            time_window = current_time - self._header_timestamps[0]
+            if time_window < 1.0:
+                print(f"Rate limit exceeded: {len(self._header_timestamps)} headers in {time_window}s")
+                return False
+        
+        return True
+    
+    def _validate_parent_linkage(self, block: Block) -> bool:
+        """
+        Validate parent linkage, height and timestamp against the block tree.
+        
+        Args:
+            block: Block to validate
+            
+        Returns:
+            True if valid
+        """
         if block.index > 0:
             parent_node = self.block_tree.get(block.previous_hash)
             if not parent_node:
@@ -614,18 +771,9 @@ class ConsensusEngine:
                 return False
             
             # Check timestamp (median-time-past)
-            if block.timestamp <= parent_node.block.timestamp:
-                print(f"Invalid timestamp: {block.timestamp} <= {parent_node.block.timestamp}")
-                return False
-        
-        # Rate limiting: max headers per second
-        current_time = time.time()
-        self._header_timestamps.append(current_time)
-        
-        if len(self._header_timestamps) >= self.config.max_headers_per_second:
-            time_window = current_time - self._header_timestamps[0]
-            if time_window < 1.0:
-                print(f"Rate limit exceeded: {len(self._header_timestamps)} headers in {time_window}s")
+            parent_timestamp = self._node_timestamp(parent_node)
+            if block.timestamp <= parent_timestamp:
+                print(f"Invalid timestamp: {block.timestamp} <= {parent_timestamp}")
                 return False
         
         return True
@@ -729,23 +877,230 @@ class ConsensusEngine:
         
         # 4) Update indices and persistence
         if commitment:
-            problem_type = block.problem.get('type', 'subset_sum')
-            capacity = block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else 2
-            self.storage.store_commitment(commitment, block.block_hash, problem_type, capacity)
+            self._index_commitment(commitment, block)
         
         return True
     
-    def _add_block_to_tree(self, block: Block, receipt_time: float):
+    def validate_blocks(self, blocks: List, workers: Optional[int] = None) -> 'PipelineResult':
+        """
+        Validate a parent-first run of blocks through the staged pipeline.
+        
+        Stateless checks run in parallel worker processes; parent linkage
+        and work accumulation are applied in order. Intended for catch-up
+        sync, where validate_header's gossip rate limit does not apply.
+        
+        Args:
+            blocks: Blocks or ValidationJobs (with reveal data)
+            workers: Worker processes (None for CPU count, 0 runs inline)
+            
+        Returns:
+            PipelineResult with accepted and rejected block hashes
+        """
+        try:
+            from .validation_pipeline import ValidationPipeline
+        except ImportError:
+            from validation_pipeline import ValidationPipeline
+        
+        with ValidationPipeline(self, workers=workers) as pipeline:
+            result = pipeline.validate_blocks(blocks)
+            self.last_pipeline_metrics = pipeline.get_metrics()
+        return result
+    
+    def connect_blocks(self, blocks: List, workers: Optional[int] = None, store_blocks: bool = True) -> 'PipelineResult':
+        """
+        Validate and connect many blocks with batched storage commits.
+        
+        Initial-sync path: runs validate_blocks() inside batched_writes(), so
+        tree, work-index, tip, commitment and (optionally) header/body writes
+        reach storage in one transaction per batch instead of several per block.
+        
+        Args:
+            blocks: Parent-first Blocks or ValidationJobs
+            workers: Worker processes (None for CPU count, 0 runs inline)
+            store_blocks: Also persist each connected block's header and body
+            
+        Returns:
+            PipelineResult with accepted and rejected block hashes
+        """
+        with self.batched_writes(store_blocks=store_blocks):
+            return self.validate_blocks(blocks, workers=workers)
+    
+    def connect_headers(self, headers: List[Block]) -> int:
+        """
+        Light mode: link a parent-first run of headers into the block tree.
+        
+        Headers are checked for parent linkage, height, timestamp and
+        non-decreasing claimed work, then connected with batched header
+        writes. Headers whose parent is unknown go to the orphan pool.
+        Bodies are verified later, on demand, with verify_block_body().
+        
+        Args:
+            headers: Headers ordered by height
+            
+        Returns:
+            Number of headers connected (stops at the first invalid one)
+        """
+        if not self.config.light_mode:
+            print("connect_headers requires light_mode; use connect_blocks for full blocks")
+            return 0
+        
+        connected = 0
+        with self.batched_writes(store_blocks=True):
+            for header in headers:
+                if header.block_hash in self.block_tree:
+                    continue
+                parent = self.block_tree.get(header.previous_hash)
+                if parent is None and header.index > 0:
+                    self.orphan_pool.add(header)
+                    continue
+                if not self._validate_parent_linkage(header):
+                    break
+                if parent is not None and header.cumulative_work_score < parent.cumulative_work:
+                    print(f"Header work decreases at height {header.index}")
+                    break
+                connected += 1 + len(self._add_block_to_tree(header, receipt_time=time.time()))
+        return connected
+    
+    def verify_block_body(self, block: Block, header: Optional[Block] = None) -> bool:
+        """
+        Check a fetched block body against its known header.
+        
+        The block hash commits to the problem and solution, so a body that
+        rehashes to the header's hash, matches its linkage fields and
+        verifies is the body the header chain committed to.
+        
+        Args:
+            block: Fetched block
+            header: Known header (looked up in the tree or storage if None)
+            
+        Returns:
+            True if the body matches a known header and its solution verifies
+        """
+        try:
+            if header is None:
+                node = self.block_tree.get(block.block_hash)
+                header = node.block if isinstance(node, BlockNode) else self.storage.get_header(block.block_hash)
+            if header is None:
+                print(f"No header for body {block.block_hash[:16]}...")
+                return False
+            
+            reason = check_block_body(block, header, self.problem_registry)
+            if reason is not None:
+                print(f"{reason} for {header.block_hash[:16]}...")
+                return False
+            
+            return True
+        except Exception as e:
+            print(f"Error verifying block body: {e}")
+            return False
+    
+    @contextmanager
+    def batched_writes(
+        self,
+        max_blocks: Optional[int] = None,
+        max_ms: Optional[float] = None,
+        store_blocks: bool = False
+    ):
+        """
+        Buffer storage writes and commit them once per N blocks or T milliseconds.
+        
+        Each commit is a single storage transaction holding every write for
+        the blocks connected since the previous one, so after a crash storage
+        reflects a prefix of the connected chain with matching tips and work
+        index. Compaction is deferred to commit time so a stubbed block is
+        always written in the same transaction that makes it a stub. Pending
+        writes are committed when the context exits. Nested use joins the
+        outer batch.
+        
+        Args:
+            max_blocks: Blocks per commit (defaults to config.write_batch_blocks)
+            max_ms: Milliseconds before a commit (defaults to config.write_batch_ms)
+            store_blocks: Also persist each connected block's header and body
+            
+        Yields:
+            The open WriteBatch
+        """
+        if self._write_batch is not None:
+            yield self._write_batch
+            return
+        
+        self._write_batch = WriteBatch(
+            max_blocks=max(1, max_blocks or self.config.write_batch_blocks),
+            max_seconds=(self.config.write_batch_ms if max_ms is None else max_ms) / 1000.0,
+            store_blocks=store_blocks
+        )
+        try:
+            yield self._write_batch
+        finally:
+            self.flush_writes()
+            self._write_batch = None
+    
+    def flush_writes(self) -> bool:
+        """
+        Commit the open write batch (runs any deferred compaction first).
+        
+        Returns:
+            True if committed; on failure the operations are kept for the next attempt
+        """
+        batch = self._write_batch
+        if batch is None:
+            return True
+        
+        interval = self.config.compaction_interval
+        if interval and self._finalized_height() - self._compacted_height >= interval:
+            self.compact_block_tree()
+        
+        batch.blocks = 0
+        batch.started = time.time()
+        if not batch.operations:
+            return True
+        if self.storage.batch_write(batch.operations) is False:
+            batch.failed_commits += 1
+            print(f"⚠️  Batched commit failed, keeping {len(batch.operations)} writes for retry")
+            return False
+        batch.operations = []
+        batch.commits += 1
+        return True
+    
+    def _write(self, operations: List[tuple]) -> None:
+        """Send storage operations to the open batch, or straight to storage."""
+        if self._write_batch is not None:
+            self._write_batch.operations.extend(operations)
+        else:
+            self.storage.batch_write(operations)
+    
+    def _store_commitment(self, commitment: bytes, cid: str, problem_type, capacity: int) -> None:
+        """Store a commitment index entry, batched when a write batch is open."""
+        if self._write_batch is not None:
+            self._write_batch.operations.append(("commitment", (commitment, cid, problem_type, capacity)))
+        else:
+            self.storage.store_commitment(commitment, cid, problem_type, capacity)
+    
+    def _index_commitment(self, commitment: bytes, block: Block) -> None:
+        """Index a verified block's commitment under its hash."""
+        problem_type = block.problem.get('type', 'subset_sum')
+        capacity = block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else 2
+        self._store_commitment(commitment, block.block_hash, problem_type, capacity)
+    
+    def _add_block_to_tree(self, block: Block, receipt_time: float, connect_orphans: bool = True) -> List[str]:
         """
         Add block to fork choice tree.
         
         Args:
             block: Block to add
             receipt_time: Time block was received
+            connect_orphans: Also connect orphans waiting on this block
+            
+        Returns:
+            Hashes of orphans connected below this block
         """
         # Calculate cumulative work
         parent_node = self.block_tree.get(block.previous_hash)
-        if parent_node:
+        if self.config.light_mode:
+            # Headers carry no complexity; fork choice uses the claimed cumulative work
+            cumulative_work = float(block.cumulative_work_score)
+            height = parent_node.height + 1 if parent_node else block.index
+        elif parent_node:
             cumulative_work = parent_node.cumulative_work + calculate_work_score(block.complexity) if block.complexity else parent_node.cumulative_work
             height = parent_node.height + 1
         else:
@@ -753,28 +1108,168 @@ class ConsensusEngine:
             cumulative_work = calculate_work_score(block.complexity) if block.complexity else 0
             height = block.index
         
+        # Skip pointer for O(log n) ancestor lookup
+        skip_hash = None
+        if parent_node:
+            skip_node = self.get_ancestor(parent_node, get_skip_height(height))
+            skip_hash = skip_node.block_hash if skip_node else None
+        
         # Create block node
         node = BlockNode(
             block=block,
             parent_hash=block.previous_hash,
             cumulative_work=cumulative_work,
             height=height,
-            receipt_time=receipt_time
+            receipt_time=receipt_time,
+            skip_hash=skip_hash
         )
         
         # Add to tree
         self.block_tree[block.block_hash] = node
+        self._resident_heights.setdefault(height, set()).add(block.block_hash)
         
-        # Update parent's children
-        if parent_node:
+        # Update parent's children (stubs are finalized and track none)
+        if isinstance(parent_node, BlockNode):
             parent_node.children.append(block.block_hash)
         
-        # Update best tip if necessary
+        # Update best tip if necessary (main-chain work index is written by the delta)
         self._update_best_tip(node)
         
-        # Store work index
-        self.storage.store_work_index(height, int(cumulative_work), block.block_hash)
-        self.storage.store_tip(block.block_hash, int(cumulative_work))
+        batch = self._write_batch
+        if batch is None:
+            # Store tip
+            self.storage.store_tip(block.block_hash, int(cumulative_work))
+            
+            # Amortized compaction once enough new blocks are final
+            interval = self.config.compaction_interval
+            if interval and self._finalized_height() - self._compacted_height >= interval:
+                self.compact_block_tree()
+        else:
+            # Batched: tip (and header/body) ride along with this block's work-index rows
+            if batch.store_blocks:
+                batch.operations.append(("header", block))
+                if not self.config.light_mode:
+                    batch.operations.append(("block", block))
+            batch.operations.append(("tip", (block.block_hash, int(cumulative_work))))
+            batch.blocks += 1
+            if batch.blocks >= batch.max_blocks or time.time() - batch.started >= batch.max_seconds:
+                self.flush_writes()
+        
+        if connect_orphans and self.orphan_pool.has_children(block.block_hash):
+            return self._connect_orphans(block.block_hash)
+        return []
+    
+    def _connect_orphans(self, parent_hash: str) -> List[str]:
+        """
+        Connect every buffered descendant of a newly added block in one batch.
+        
+        Descendants come out parent-first, so each is linked against a tree
+        that already holds its parent; one that fails linkage (and hence its
+        own descendants) is dropped.
+        
+        Args:
+            parent_hash: Hash of the block that just connected
+            
+        Returns:
+            Hashes of the orphans that connected
+        """
+        connected = []
+        now = time.time()
+        for entry in self.orphan_pool.take_descendants(parent_hash):
+            block = entry.block
+            if block.block_hash in self.block_tree:
+                continue
+            if not self._validate_parent_linkage(block):
+                self.orphan_pool.metrics.dropped += 1
+                continue
+            self._add_block_to_tree(block, receipt_time=entry.received_at, connect_orphans=False)
+            if entry.commitment:
+                self._index_commitment(entry.commitment, block)
+            self.orphan_pool.record_resolved(entry, now)
+            connected.append(block.block_hash)
+        
+        if connected:
+            print(f"🔗 Connected {len(connected)} orphan block(s) below {parent_hash[:16]}...")
+        return connected
+    
+    def get_orphan_metrics(self) -> Dict:
+        """
+        Get orphan pool metrics.
+        
+        Returns:
+            Orphan rate, resolution latency and eviction counters
+        """
+        self.orphan_pool.evict_expired()
+        metrics = self.orphan_pool.metrics.to_dict()
+        metrics["pool_size"] = len(self.orphan_pool)
+        metrics["missing_parents"] = len(self.orphan_pool.missing_parents())
+        return metrics
+    
+    def _finalized_height(self) -> int:
+        """Highest height that is k-deep under the best tip (-1 if none)."""
+        if not self.best_tip:
+            return -1
+        return self.best_tip.height - self.config.confirmation_depth
+    
+    def _node_timestamp(self, node: Union[BlockNode, BlockStub]) -> float:
+        return node.timestamp if isinstance(node, BlockStub) else node.block.timestamp
+    
+    def _get_node_block(self, node: Union[BlockNode, BlockStub]) -> Optional[Block]:
+        """Get a node's block, loading compacted nodes from storage."""
+        if isinstance(node, BlockNode):
+            return node.block
+        return self.storage.get_block(node.block_hash) or self.storage.get_header(node.block_hash)
+    
+    def compact_block_tree(self) -> Dict[str, int]:
+        """
+        Compact finalized history in the block tree.
+        
+        Main-chain nodes at or below the finalized height are persisted and
+        replaced by BlockStubs; side-branch nodes at those heights can no
+        longer win fork choice and are evicted. Only heights above the last
+        compaction are visited, so each call costs O(newly finalized blocks).
+        
+        Returns:
+            Dict with stubbed/evicted counts
+        """
+        stats = {"stubbed": 0, "evicted": 0}
+        # Never compact the best tip itself
+        finalized = min(self._finalized_height(), self.best_tip.height - 1 if self.best_tip else -1)
+        if finalized <= self._compacted_height:
+            return stats
+        
+        # Main-chain hashes for the newly finalized heights
+        main_chain: Dict[int, str] = {}
+        node = self.best_tip
+        while isinstance(node, BlockNode) and node.height > self._compacted_height:
+            if node.height <= finalized:
+                main_chain[node.height] = node.block.block_hash
+            node = self.block_tree.get(node.parent_hash)
+        
+        to_persist = []
+        for height in range(self._compacted_height + 1, finalized + 1):
+            for block_hash in self._resident_heights.pop(height, ()):
+                node = self.block_tree.get(block_hash)
+                if not isinstance(node, BlockNode):
+                    continue
+                if main_chain.get(height) == block_hash:
+                    # Light nodes hold headers only; bodies are fetched on demand
+                    to_persist.append(("header" if self.config.light_mode else "block", node.block))
+                    self.block_tree[block_hash] = BlockStub.from_node(node)
+                    stats["stubbed"] += 1
+                else:
+                    del self.block_tree[block_hash]
+                    parent = self.block_tree.get(node.parent_hash)
+                    if isinstance(parent, BlockNode) and block_hash in parent.children:
+                        parent.children.remove(block_hash)
+                    stats["evicted"] += 1
+        
+        # Stubs are backed by storage
+        if to_persist:
+            self._write(to_persist)
+        
+        self._compacted_height = finalized
+        return stats
     
     def _update_best_tip(self, node: BlockNode):
         """
@@ -787,15 +1282,144 @@ class ConsensusEngine:
         """
         if not self.best_tip:
             self.best_tip = node
+            self._apply_chain_delta(ChainDelta(node.parent_hash, node.height - 1), [], [node])
+            return
+        
+        # Compare cumulative work, tie-breaker: earliest receipt time
+        better = (
+            node.cumulative_work > self.best_tip.cumulative_work or
+            (node.cumulative_work == self.best_tip.cumulative_work and
+             node.receipt_time < self.best_tip.receipt_time)
+        )
+        if not better:
             return
         
-        # Compare cumulative work
-        if node.cumulative_work > self.best_tip.cumulative_work:
+        if node.parent_hash == self.best_tip.block_hash:
+            fork = self.best_tip
             self.best_tip = node
-        elif node.cumulative_work == self.best_tip.cumulative_work:
-            # Tie-breaker: earliest receipt time
-            if node.receipt_time < self.best_tip.receipt_time:
-                self.best_tip = node
+            self._apply_chain_delta(ChainDelta(fork.block_hash, fork.height), [], [node])
+        else:
+            self.handle_reorg(node.block_hash)
+    
+    def add_chain_listener(self, listener: Callable[[ChainDelta], None]) -> None:
+        """Register a callback receiving a ChainDelta on every best-chain change."""
+        self.chain_listeners.append(listener)
+    
+    def get_ancestor(self, node: Union[BlockNode, BlockStub], height: int) -> Optional[Union[BlockNode, BlockStub]]:
+        """
+        Get a node's ancestor at a height in O(log n) via skip pointers.
+        
+        Args:
+            node: Descendant node
+            height: Ancestor height
+            
+        Returns:
+            Ancestor node, or None if out of range or not in the tree
+        """
+        if node is None or height < 0 or height > node.height:
+            return None
+        
+        walk = node
+        walk_height = node.height
+        while walk_height > height:
+            skip_height = get_skip_height(walk_height)
+            skip_height_prev = get_skip_height(walk_height - 1)
+            skip = self.block_tree.get(walk.skip_hash) if walk.skip_hash else None
+            if skip is not None and (
+                skip_height == height or
+                (skip_height > height and not (skip_height_prev < skip_height - 2 and skip_height_prev >= height))
+            ):
+                walk = skip
+                walk_height = skip_height
+            else:
+                walk = self.block_tree.get(walk.parent_hash)
+                if walk is None:
+                    return None
+                walk_height -= 1
+        return walk
+    
+    def find_fork_point(
+        self,
+        old_tip: Union[BlockNode, BlockStub],
+        new_tip: Union[BlockNode, BlockStub],
+        max_depth: Optional[int] = None
+    ) -> Optional[Union[BlockNode, BlockStub]]:
+        """
+        Find the lowest common ancestor of two tips.
+        
+        The taller tip is lifted to the other's height with get_ancestor,
+        then both walk back in lockstep, so the cost is O(log n + depth).
+        
+        Args:
+            old_tip: Current tip
+            new_tip: Candidate tip
+            max_depth: Give up once old_tip is this far above the search
+            
+        Returns:
+            Common ancestor node, or None if not found within max_depth
+        """
+        a = self.get_ancestor(old_tip, min(old_tip.height, new_tip.height))
+        b = self.get_ancestor(new_tip, min(old_tip.height, new_tip.height))
+        
+        while a is not None and b is not None and a.block_hash != b.block_hash:
+            if max_depth is not None and old_tip.height - a.height >= max_depth:
+                return None
+            a = self.block_tree.get(a.parent_hash)
+            b = self.block_tree.get(b.parent_hash)
+        
+        return a if a is not None and b is not None else None
+    
+    def _apply_chain_delta(
+        self,
+        delta: ChainDelta,
+        disconnected: List[BlockNode],
+        connected: List[BlockNode]
+    ) -> None:
+        """Write the main-chain work index for connected nodes and notify listeners."""
+        delta.disconnected = [node.block for node in disconnected]
+        delta.connected = [node.block for node in connected]
+        
+        self._advance_difficulty(delta, connected)
+        
+        self._write([
+            ("work_index", (node.height, int(node.cumulative_work), node.block_hash))
+            for node in connected
+        ])
+        
+        for listener in self.chain_listeners:
+            try:
+                listener(delta)
+            except Exception as e:
+                print(f"Chain listener error: {e}")
+    
+    def _advance_difficulty(self, delta: ChainDelta, connected: List[BlockNode]) -> None:
+        """
+        Move the difficulty adjuster to the new best tip.
+        
+        Extensions cost one O(log window) update per block; a reorg first
+        rewinds to the fork point's stored target and rebuilds the window
+        from its ancestors.
+        """
+        adjuster = self.difficulty_adjuster
+        if delta.disconnected:
+            fork = self.block_tree.get(delta.fork_hash)
+            scores = []
+            node = fork
+            while node is not None and len(scores) < adjuster.window_size:
+                parent = self.block_tree.get(node.parent_hash)
+                if parent is None:
+                    break
+                scores.append(node.cumulative_work - parent.cumulative_work)
+                node = parent
+            target = fork.difficulty_target if fork is not None and fork.difficulty_target is not None else adjuster.current_target
+            adjuster.reset(reversed(scores), target)
+        
+        for node in connected:
+            parent = self.block_tree.get(node.parent_hash)
+            if parent is not None:
+                block_time = node.block.timestamp - self._node_timestamp(parent)
+                adjuster.update(node.cumulative_work - parent.cumulative_work, block_time)
+            node.difficulty_target = adjuster.current_target
     
     def get_best_tip(self) -> Optional[Block]:
         """
@@ -805,7 +1429,64 @@ class ConsensusEngine:
             Best tip block or None
         """
         return self.best_tip.block if self.best_tip else None
-    
+
+    def get_tips(self) -> List[BlockNode]:
+        """
+        Get the resident chain tips (nodes without children).
+
+        Returns:
+            Tip nodes, best tip first
+        """
+        tips = [
+            node for node in self.block_tree.values()
+            if isinstance(node, BlockNode) and not node.children
+        ]
+        tips.sort(key=lambda n: (n is not self.best_tip, -n.cumulative_work))
+        return tips
+
+    def restore_tips(
+        self,
+        tips: List[Tuple[Block, int, float]],
+        best_hash: str,
+        difficulty: Optional[Dict] = None
+    ) -> bool:
+        """
+        Seed the block tree from a checkpoint's tip set.
+
+        Tips are inserted with their recorded height and cumulative work and
+        no ancestors; history below them is treated as compacted, and later
+        blocks link onto them as usual.
+
+        Args:
+            tips: (block, height, cumulative_work) for each tip
+            best_hash: Hash of the tip to make best
+            difficulty: DifficultyAdjuster.to_dict() state at the best tip
+
+        Returns:
+            True if the best tip was restored
+        """
+        if not any(block.block_hash == best_hash for block, _, _ in tips):
+            return False
+
+        for block, height, cumulative_work in tips:
+            node = BlockNode(
+                block=block,
+                parent_hash=block.previous_hash,
+                cumulative_work=cumulative_work,
+                height=height,
+                receipt_time=block.timestamp
+            )
+            self.block_tree[block.block_hash] = node
+            self._resident_heights.setdefault(height, set()).add(block.block_hash)
+            if block.block_hash == best_hash:
+                self.best_tip = node
+
+        if difficulty:
+            self.difficulty_adjuster.load_dict(difficulty)
+            self.best_tip.difficulty_target = self.difficulty_adjuster.current_target
+        self._compacted_height = max(self._compacted_height, min(height for _, height, _ in tips) - 1)
+        return True
+
     def get_chain_from_genesis(self, tip_hash: Optional[str] = None) -> List[Block]:
         """
         Get chain from genesis to tip.
@@ -827,7 +1508,7 @@ class ConsensusEngine:
         current_node = self.block_tree[tip_hash]
         
         while current_node:
-            chain.append(current_node.block)
+            chain.append(self._get_node_block(current_node))
             if current_node.parent_hash == "0" * 64:
                 break
             current_node = self.block_tree.get(current_node.parent_hash)
@@ -851,54 +1532,73 @@ class ConsensusEngine:
         
         block_node = self.block_tree[block_hash]
         depth = self.best_tip.height - block_node.height
+        if depth < self.config.confirmation_depth:
+            return False
         
-        return depth >= self.config.confirmation_depth
+        # Must be on the best chain, not a buried side branch
+        ancestor = self.get_ancestor(self.best_tip, block_node.height)
+        return ancestor is not None and ancestor.block_hash == block_hash
     
     def handle_reorg(self, new_tip_hash: str) -> Tuple[List[Block], List[Block]]:
         """
         Handle chain reorganization.
         
+        Walks both tips back only to their common ancestor, switches the
+        best tip, and emits the disconnect/connect ChainDelta to storage and
+        chain listeners.
+        
         Args:
             new_tip_hash: New tip block hash
             
         Returns:
-            Tuple of (removed_blocks, added_blocks)
+            Tuple of (removed_blocks, added_blocks), each in height order
         """
         if not self.best_tip or new_tip_hash not in self.block_tree:
             return ([], [])
         
+        old_tip = self.best_tip
         new_tip_node = self.block_tree[new_tip_hash]
+        if new_tip_node.block_hash == old_tip.block_hash:
+            return ([], [])
         
-        # Check reorg depth
-        old_chain = self.get_chain_from_genesis(self.best_tip.block.block_hash)
-        new_chain = self.get_chain_from_genesis(new_tip_hash)
-        
-        # Find common ancestor
-        common_height = min(len(old_chain), len(new_chain))
-        fork_point = 0
-        
-        for i in range(common_height):
-            if old_chain[i].block_hash == new_chain[i].block_hash:
-                fork_point = i
-            else:
-                break
+        # Find common ancestor, bounded by the reorg depth limit
+        fork_node = self.find_fork_point(old_tip, new_tip_node, max_depth=self.config.max_reorg_depth + 1)
+        if fork_node is None:
+            print(f"Reorg to {new_tip_hash[:16]}... exceeds maximum depth {self.config.max_reorg_depth} or has no common ancestor")
+            return ([], [])
         
-        # Check reorg depth limit
-        reorg_depth = len(old_chain) - fork_point - 1
+        reorg_depth = old_tip.height - fork_node.height
         if reorg_depth > self.config.max_reorg_depth:
             print(f"Reorg depth {reorg_depth} exceeds maximum {self.config.max_reorg_depth}")
             return ([], [])
         
-        # Get removed and added blocks
-        removed_blocks = old_chain[fork_point + 1:]
-        added_blocks = new_chain[fork_point + 1:]
+        # Collect both branches down to the fork point
+        disconnected: List[BlockNode] = []
+        node = old_tip
+        while node.block_hash != fork_node.block_hash:
+            if not isinstance(node, BlockNode):
+                print(f"Reorg would disconnect finalized block at height {node.height}")
+                return ([], [])
+            disconnected.append(node)
+            node = self.block_tree[node.parent_hash]
+        
+        connected: List[BlockNode] = []
+        node = new_tip_node
+        while node.block_hash != fork_node.block_hash:
+            connected.append(node)
+            node = self.block_tree[node.parent_hash]
+        connected.reverse()
         
         # Update best tip
         self.best_tip = new_tip_node
+        delta = ChainDelta(fork_node.block_hash, fork_node.height)
+        self._apply_chain_delta(delta, disconnected, connected)
+        self.last_reorg = delta
         
+        removed_blocks = list(reversed(delta.disconnected))
+        added_blocks = list(delta.connected)
         return (removed_blocks, added_blocks)
 
-
 if __name__ == "__main__":
     # Test ConsensusEngine
     print("Testing ConsensusEngine...")
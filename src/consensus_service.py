@@ -12,7 +12,7 @@ import logging
 import signal
 import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # Add src to path
 sys.path.append('src')
@@ -21,6 +21,8 @@ sys.path.append('src')
 from consensus import ConsensusEngine, ConsensusConfig
 from storage import StorageManager, StorageConfig, NodeRole, PruningMode
 from pow import ProblemRegistry
+from checkpoint import Checkpoint, CheckpointStore
+from event_ledger import ProcessedEventLedger
 from api.ingest_store import IngestStore
 from api.coupling_config import LAMBDA, CONSENSUS_WRITE_INTERVAL, CouplingState
 
@@ -46,10 +48,23 @@ class ConsensusService:
         self.running = False
         self.consensus_engine = None
         self.ingest_store = None
-        self.processed_events = set()
+        # Processed event ids (replaced by the on-disk ledger in initialize())
+        self.processed_events = ProcessedEventLedger(":memory:")
+        self.processed_events_path = "data/processed_events.db"
         self.coupling_state = CouplingState()
         self.blockchain_state_path = "data/blockchain_state.json"
         
+        # Signed local checkpoints for fast startup
+        self.checkpoint_dir = "data/checkpoints"
+        self.checkpoint_interval = 100  # Blocks between checkpoints
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        self.last_checkpoint_height = -1
+        self.last_event_id: Optional[str] = None
+        self.last_event_ts = 0.0
+        self.restored_event_id: Optional[str] = None  # Event position of the restored checkpoint
+        self.restored_event_ts = 0.0
+        self._checkpoint_prefix: List[Dict[str, Any]] = []  # Cached blocks below the restored checkpoint
+        
         # NEW: Initialize P2P discovery
         from p2p_discovery import P2PDiscoveryService, DiscoveryConfig
         
@@ -97,6 +112,11 @@ class ConsensusService:
             # Initialize ingest store (use API server's database)
             self.ingest_store = IngestStore("/home/coinjecture/COINjecture/data/faucet_ingest.db")
             
+            self.checkpoint_store = CheckpointStore(self.checkpoint_dir)
+            self.processed_events = ProcessedEventLedger(self.processed_events_path)
+            logger.info(f"Processed event ledger: {len(self.processed_events)} events, "
+                        f"resuming from ts {self.processed_events.resume_ts:.0f}")
+            
             # Bootstrap from existing blockchain state
             if not self.bootstrap_from_cache():
                 logger.warning("Bootstrap failed, starting fresh")
@@ -129,14 +149,20 @@ class ConsensusService:
                 blocks = blockchain_state.get('blocks', [])
                 logger.info(f"Found {len(blocks)} blocks in blockchain state")
                 
-                # Add each block to consensus engine
-                for block_data in blocks:
-                    block = self._convert_cache_block_to_block(block_data)
-                    if block:
-                        # Add to block tree without validation
-                        self.consensus_engine._add_block_to_tree(block, receipt_time=block.timestamp)
-                        logger.info(f"Bootstrapped block #{block.index}")
+                # Resume from the latest checkpoint and replay only the tail
+                start = self._restore_checkpoint(blocks)
+                
+                # Add each block to consensus engine, committing storage writes in batches
+                with self.consensus_engine.batched_writes():
+                    for block_data in blocks[start:]:
+                        block = self._convert_cache_block_to_block(block_data)
+                        if block:
+                            # Add to block tree without validation
+                            self.consensus_engine._add_block_to_tree(block, receipt_time=block.timestamp)
+                            logger.debug(f"Bootstrapped block #{block.index}")
                 
+                logger.info(f"Bootstrapped {len(blocks) - start} blocks"
+                            f"{f' after checkpoint #{self.last_checkpoint_height}' if start else ''}")
                 return True
             else:
                 logger.info("No blockchain state found, starting from genesis")
@@ -145,6 +171,111 @@ class ConsensusService:
             logger.error(f"Failed to bootstrap from cache: {e}")
             return False
     
+    def _restore_checkpoint(self, blocks: List[Dict[str, Any]]) -> int:
+        """
+        Restore engine and service state from the latest valid checkpoint.
+        
+        Args:
+            blocks: Cached blocks, genesis first
+            
+        Returns:
+            Index in blocks of the first block still to replay (0 for a full replay)
+        """
+        if not self.checkpoint_store:
+            return 0
+        
+        checkpoint = self.checkpoint_store.load_latest()
+        if not checkpoint:
+            return 0
+        
+        # The cache must still contain the checkpointed tip
+        position = None
+        for i in range(len(blocks) - 1, -1, -1):
+            if blocks[i].get('block_hash') == checkpoint.tip_hash:
+                position = i
+                break
+        if position is None:
+            logger.warning(f"Checkpoint tip #{checkpoint.height} not in cached chain, replaying in full")
+            return 0
+        
+        tips = []
+        for tip in checkpoint.tips:
+            block = self._convert_cache_block_to_block(tip['block'])
+            if block:
+                tips.append((block, tip['height'], tip['cumulative_work']))
+        if not self.consensus_engine.restore_tips(tips, checkpoint.tip_hash, checkpoint.difficulty):
+            logger.warning(f"Failed to restore checkpoint #{checkpoint.height}, replaying in full")
+            return 0
+        
+        self._checkpoint_prefix = blocks[:position]
+        self.last_checkpoint_height = checkpoint.height
+        self.last_event_id = self.restored_event_id = checkpoint.last_event_id
+        self.last_event_ts = self.restored_event_ts = checkpoint.last_event_ts
+        
+        if checkpoint.balances and not hasattr(self, 'blockchain_state'):
+            from tokenomics.blockchain_state import BlockchainState, DEFAULT_STATE_DB
+            self.blockchain_state = BlockchainState(db_path=DEFAULT_STATE_DB)
+            self.blockchain_state.load_state()
+            if not self.blockchain_state.balances:
+                with self.blockchain_state.atomic():
+                    for address, balance in checkpoint.balances.items():
+                        self.blockchain_state.update_balance(address, balance)
+        
+        logger.info(f"✅ Restored checkpoint #{checkpoint.height} ({checkpoint.tip_hash[:16]}...)")
+        return position + 1
+    
+    def create_checkpoint(self) -> Optional[Checkpoint]:
+        """
+        Write a signed checkpoint of the current tip set, balances and event position.
+        
+        Returns:
+            Saved checkpoint or None
+        """
+        try:
+            best = self.consensus_engine.best_tip if self.consensus_engine else None
+            if not self.checkpoint_store or not best:
+                return None
+            
+            balances = dict(self.blockchain_state.balances) if hasattr(self, 'blockchain_state') else {}
+            checkpoint = Checkpoint(
+                height=best.height,
+                tip_hash=best.block.block_hash,
+                cumulative_work=best.cumulative_work,
+                tips=[
+                    {
+                        "block": self._block_to_cache_dict(node.block),
+                        "height": node.height,
+                        "cumulative_work": node.cumulative_work
+                    }
+                    for node in self.consensus_engine.get_tips()
+                ],
+                balances=balances,
+                last_event_id=self.last_event_id,
+                last_event_ts=self.last_event_ts,
+                difficulty=self.consensus_engine.difficulty_adjuster.to_dict()
+            )
+            if not self.checkpoint_store.save(checkpoint):
+                return None
+            
+            self.last_checkpoint_height = checkpoint.height
+            logger.info(f"📌 Checkpoint written at #{checkpoint.height}")
+            return checkpoint
+        except Exception as e:
+            logger.error(f"❌ Failed to write checkpoint: {e}")
+            return None
+    
+    def _maybe_checkpoint(self):
+        """Checkpoint once the tip is checkpoint_interval blocks past the last one."""
+        best = self.consensus_engine.best_tip
+        if best and best.height - self.last_checkpoint_height >= self.checkpoint_interval:
+            self.create_checkpoint()
+    
+    def _mark_processed(self, event: Dict[str, Any]):
+        """Record an event as processed and advance the checkpoint event position."""
+        self.processed_events.add(event.get('event_id'), event.get('ts'))
+        self.last_event_id = event.get('event_id')
+        self.last_event_ts = max(self.last_event_ts, event.get('ts', 0))
+    
     def _convert_cache_block_to_block(self, block_data: Dict[str, Any]) -> Optional[Any]:
         """Convert cached block data to Block object."""
         try:
@@ -244,8 +375,8 @@ class ConsensusService:
             # This allows continuous processing while respecting λ-coupling for writes
             
             # Get current chain length
-            current_chain = self.consensus_engine.get_chain_from_genesis()
-            current_tip_index = current_chain[-1].index if current_chain else -1
+            current_tip = self.consensus_engine.get_best_tip()
+            current_tip_index = current_tip.index if current_tip else -1
             
             # Get latest block events
             block_events = self.ingest_store.latest_blocks(limit=50)
@@ -256,7 +387,7 @@ class ConsensusService:
                 event_block_index = event.get('block_index', 0)
                 
                 # Skip if already processed
-                if event_id in self.processed_events:
+                if self.processed_events.is_processed(event_id, event.get('ts')):
                     continue
                 
                 # Skip events for blocks that are already in the chain
@@ -278,7 +409,7 @@ class ConsensusService:
                     self.consensus_engine.storage.store_header(block)
                     
                     # Mark as processed
-                    self.processed_events.add(event_id)
+                    self._mark_processed(event)
                     processed_count += 1
                     
                     logger.info(f"✅ Processed block event: {event_id}")
@@ -321,9 +452,8 @@ class ConsensusService:
             peer_stats = self.p2p_discovery.get_peer_statistics()
             logger.info(f"🔍 Checking {peer_stats['total_discovered']} peers for submissions")
             
-            # Get ALL events (increase limit to catch all)
-            all_events = self.ingest_store.latest_blocks(limit=1000)
-            pending = [e for e in all_events if e.get('event_id') not in self.processed_events]
+            # Get events since the ledger's resume point
+            pending = self._fetch_pending_events(limit=1000)
             
             logger.info(f"📊 Found {len(pending)} pending submissions")
             
@@ -337,7 +467,7 @@ class ConsensusService:
                 
                 block = self._convert_event_to_block(event)
                 if not block or self._is_duplicate(block):
-                    self.processed_events.add(event.get('event_id'))
+                    self.processed_events.add(event.get('event_id'), event.get('ts'))
                     continue
                 
                 try:
@@ -345,7 +475,7 @@ class ConsensusService:
                     self.consensus_engine.storage.store_block(block)
                     self.consensus_engine.storage.store_header(block)
                     
-                    self.processed_events.add(event.get('event_id'))
+                    self._mark_processed(event)
                     processed += 1
                     
                     logger.info(f"✅ Processed block #{block.index}")
@@ -364,14 +494,47 @@ class ConsensusService:
             logger.error(f"❌ Error processing peer submissions: {e}")
             return False
     
+    def _fetch_pending_events(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Fetch unprocessed block events, oldest first.
+        
+        Reads forward from the ledger's resume point, so the cost follows
+        the number of new events rather than the ingest history.
+        
+        Args:
+            limit: Maximum events to return (also the page size)
+            
+        Returns:
+            Pending block events
+        """
+        since = self.processed_events.resume_ts
+        after_event_id = None
+        pending: List[Dict[str, Any]] = []
+        while len(pending) < limit:
+            # Keyset on (ts, event_id): pages never overlap, even within one timestamp
+            page = self.ingest_store.blocks_since(since, limit=limit, after_event_id=after_event_id)
+            for event in page:
+                event_id = event.get('event_id')
+                ts = event.get('ts', 0)
+                if self.processed_events.is_processed(event_id, ts):
+                    continue
+                # Events before the restored checkpoint were already processed
+                if ts < self.restored_event_ts or event_id == self.restored_event_id:
+                    continue
+                pending.append(event)
+            if len(page) < limit:
+                break
+            since, after_event_id = page[-1].get('ts', since), page[-1].get('event_id')
+        return pending[:limit]
+    
     def _convert_event_to_block(self, event: Dict[str, Any]) -> Optional[Any]:
         """Convert block event to Block object with η-damping for web mining events."""
         try:
             from core.blockchain import Block, ProblemTier, ComputationalComplexity, EnergyMetrics
             
             # η-damping: Use current chain tip + 1 instead of event's block_index
-            current_chain = self.consensus_engine.get_chain_from_genesis()
-            current_tip_index = current_chain[-1].index if current_chain else -1
+            current_tip = self.consensus_engine.get_best_tip()
+            current_tip_index = current_tip.index if current_tip else -1
             block_index = current_tip_index + 1
             
             # Extract event data with η-damping (graceful defaults)
@@ -438,7 +601,7 @@ class ConsensusService:
             )
             
             # η-damping: Use previous block hash from chain tip
-            previous_hash = current_chain[-1].block_hash if current_chain else "0" * 64
+            previous_hash = current_tip.block_hash if current_tip else "0" * 64
             
             # Create Block object with η-damped validation
             block = Block(
@@ -471,8 +634,10 @@ class ConsensusService:
             if not best_tip:
                 return
             
-            # Get chain from genesis
+            # Get chain from genesis (from the restored checkpoint, after a fast start)
             chain = self.consensus_engine.get_chain_from_genesis()
+            first_index = chain[0].index if chain else 0
+            prefix = [b for b in self._checkpoint_prefix if b.get('index', 0) < first_index]
             
             # Create blockchain state structure
             blockchain_state = {
@@ -487,19 +652,7 @@ class ConsensusService:
                     "offchain_cid": best_tip.offchain_cid,
                     "last_updated": time.time()
                 },
-                "blocks": [
-                    {
-                        "index": block.index,
-                        "timestamp": block.timestamp,
-                        "previous_hash": block.previous_hash,
-                        "merkle_root": block.merkle_root,
-                        "mining_capacity": block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
-                        "cumulative_work_score": block.cumulative_work_score,
-                        "block_hash": block.block_hash,
-                        "offchain_cid": block.offchain_cid
-                    }
-                    for block in chain
-                ],
+                "blocks": prefix + [self._block_to_cache_dict(block) for block in chain],
                 "last_updated": time.time(),
                 "consensus_version": "3.9.0-alpha.2",
                 "lambda_coupling": LAMBDA,
@@ -513,11 +666,27 @@ class ConsensusService:
             with open(self.blockchain_state_path, 'w') as f:
                 json.dump(blockchain_state, f, indent=2)
             
-            logger.info(f"📝 Blockchain state written: {len(chain)} blocks, tip: #{best_tip.index}")
+            logger.info(f"📝 Blockchain state written: {len(prefix) + len(chain)} blocks, tip: #{best_tip.index}")
+            
+            # Checkpoint only tips that are now in the cache
+            self._maybe_checkpoint()
             
         except Exception as e:
             logger.error(f"❌ Failed to write blockchain state: {e}")
     
+    def _block_to_cache_dict(self, block: Any) -> Dict[str, Any]:
+        """Convert a Block to the cached blockchain state format."""
+        return {
+            "index": block.index,
+            "timestamp": block.timestamp,
+            "previous_hash": block.previous_hash,
+            "merkle_root": block.merkle_root,
+            "mining_capacity": block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
+            "cumulative_work_score": block.cumulative_work_score,
+            "block_hash": block.block_hash,
+            "offchain_cid": block.offchain_cid
+        }
+    
     def _validate_event(self, event):
         """Validate event has required fields."""
         required = ['event_id', 'block_hash', 'miner_address', 'work_score', 'ts']
@@ -526,11 +695,9 @@ class ConsensusService:
     def _is_duplicate(self, block):
         """Check if block is duplicate."""
         try:
-            chain = self.consensus_engine.get_chain_from_genesis()
-            for existing in chain:
-                if existing.index == block.index:
-                    return True
-            return False
+            # The best chain holds exactly one block per index up to the tip
+            best_tip = self.consensus_engine.get_best_tip()
+            return best_tip is not None and 0 <= block.index <= best_tip.index
         except:
             return False
     
@@ -545,24 +712,25 @@ class ConsensusService:
                 return
             
             # Calculate rewards (same as API: 50 COIN base + 0.1 COIN per work score)
-            base_reward = 50.0
-            work_bonus = work_score * 0.1
+            from tokenomics.amount import to_units, format_amount
+            base_reward = to_units(50)
+            work_bonus = to_units(work_score * 0.1)
             total_reward = base_reward + work_bonus
             
             # Log reward distribution
             logger.info(f"💰 Distributing mining rewards to {miner_address}")
-            logger.info(f"   Base reward: {base_reward} COIN")
-            logger.info(f"   Work bonus: {work_bonus:.2f} COIN (work score: {work_score})")
-            logger.info(f"   Total reward: {total_reward:.2f} COIN")
+            logger.info(f"   Base reward: {format_amount(base_reward)} COIN")
+            logger.info(f"   Work bonus: {format_amount(work_bonus)} COIN (work score: {work_score})")
+            logger.info(f"   Total reward: {format_amount(total_reward)} COIN")
             
             # Implement actual token transfer to miner's wallet
             try:
                 # Import blockchain state management
-                from tokenomics.blockchain_state import BlockchainState, Transaction
+                from tokenomics.blockchain_state import BlockchainState, Transaction, DEFAULT_STATE_DB
                 
                 # Initialize blockchain state if not exists
                 if not hasattr(self, 'blockchain_state'):
-                    self.blockchain_state = BlockchainState()
+                    self.blockchain_state = BlockchainState(db_path=DEFAULT_STATE_DB)
                     self.blockchain_state.load_state()
                 
                 # Create mining reward transaction from network to miner
@@ -581,16 +749,16 @@ class ConsensusService:
                     # Save updated state
                     self.blockchain_state.save_state()
                     
-                    logger.info(f"✅ Mining reward transferred: {total_reward:.2f} COIN to {miner_address}")
+                    logger.info(f"✅ Mining reward transferred: {format_amount(total_reward)} COIN to {miner_address}")
                     logger.info(f"   Transaction ID: {mining_transaction.transaction_id}")
-                    logger.info(f"   New balance: {self.blockchain_state.get_balance(miner_address):.2f} COIN")
+                    logger.info(f"   New balance: {format_amount(self.blockchain_state.get_balance(miner_address))} COIN")
                 else:
                     logger.error(f"❌ Failed to add mining transaction for {miner_address}")
                     
             except Exception as e:
                 logger.error(f"❌ Failed to transfer mining rewards: {e}")
                 # Fallback to logging only
-                logger.info(f"🎉 Mining rewards calculated for {miner_address}: {total_reward:.2f} COIN")
+                logger.info(f"🎉 Mining rewards calculated for {miner_address}: {format_amount(total_reward)} COIN")
             
         except Exception as e:
             logger.error(f"❌ Failed to distribute mining rewards: {e}")
@@ -620,6 +788,7 @@ class ConsensusService:
                 logger.error(f"❌ Error: {e}")
                 time.sleep(5.0)
         
+        self.create_checkpoint()
         self.p2p_discovery.stop()
         self.running = False
         logger.info("✅ Consensus service stopped")
@@ -1191,25 +1191,50 @@ class InsufficientWorkError(Exception):
 class Transaction:
     """
     Enhanced Transaction class with cryptographic signatures and validation.
+    
+    The signing bytes and ID are computed once at construction; sender,
+    recipient, amount, timestamp and transaction_id cannot be reassigned
+    afterwards. signature and public_key are set by sign().
     """
     
-    def __init__(self, sender: str, recipient: str, amount: float, timestamp: float = None):
+    _IMMUTABLE_FIELDS = frozenset(("sender", "recipient", "amount", "timestamp", "transaction_id"))
+    
+    def __init__(self, sender: str, recipient: str, amount: float, timestamp: float = None,
+                 transaction_id: str = "", signature: str = "", public_key: str = ""):
         self.sender = sender
         self.recipient = recipient
         self.amount = amount
         self.timestamp = timestamp or time.time()
-        self.transaction_id = ""
-        self.signature = ""
-        self.public_key = ""
+        self.signature = signature
+        self.public_key = public_key
         
-        # Calculate transaction ID
-        self.transaction_id = self.calculate_transaction_id()
+        # Cache the signing bytes and calculate the transaction ID once
+        signing_bytes = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
+        self._digest = hashlib.sha256(signing_bytes).digest()
+        self.transaction_id = transaction_id or self._digest.hex()
+        self._signing_bytes = signing_bytes
+    
+    def __setattr__(self, name, value):
+        if name in self._IMMUTABLE_FIELDS and "_signing_bytes" in self.__dict__:
+            raise AttributeError(f"Transaction.{name} cannot be changed after construction")
+        object.__setattr__(self, name, value)
+    
+    @property
+    def signing_bytes(self) -> bytes:
+        """Canonical bytes covered by the signature and the ID."""
+        return self._signing_bytes
+    
+    @property
+    def signing_digest(self) -> bytes:
+        """SHA-256 of signing_bytes (the raw form of the computed ID)."""
+        return self._digest
+    
+    def _signing_data(self) -> bytes:
+        return self._signing_bytes
     
     def calculate_transaction_id(self) -> str:
         """Calculate unique transaction ID from transaction data."""
-        import hashlib
-        data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-        return hashlib.sha256(data).hexdigest()
+        return self._digest.hex()
     
     def sign(self, private_key_bytes: bytes) -> str:
         """
@@ -1236,8 +1261,7 @@ class Transaction:
             ).hex()
             
             # Sign transaction data
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature = private_key.sign(transaction_data)
+            signature = private_key.sign(self._signing_bytes)
             self.signature = signature.hex()
             
             return self.signature
@@ -1263,10 +1287,9 @@ class Transaction:
             public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
             
             # Verify signature
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
             signature_bytes = bytes.fromhex(self.signature)
             
-            public_key.verify(signature_bytes, transaction_data)
+            public_key.verify(signature_bytes, self._signing_bytes)
             return True
         except Exception:
             return False
@@ -1285,16 +1308,15 @@ class Transaction:
     @classmethod
     def from_dict(cls, data: dict):
         """Create transaction from dictionary."""
-        tx = cls(
+        return cls(
             sender=data['sender'],
             recipient=data['recipient'],
             amount=data['amount'],
-            timestamp=data.get('timestamp', time.time())
+            timestamp=data.get('timestamp', time.time()),
+            transaction_id=data.get('transaction_id', ''),
+            signature=data.get('signature', ''),
+            public_key=data.get('public_key', '')
         )
-        tx.transaction_id = data.get('transaction_id', tx.transaction_id)
-        tx.signature = data.get('signature', '')
-        tx.public_key = data.get('public_key', '')
-        return tx
 
     def __str__(self):
         return f"Transaction {self.transaction_id[:8]}...: {self.sender} -> {self.recipient} ({self.amount})"
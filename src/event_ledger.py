@@ -0,0 +1,185 @@
+"""
+Module: event_ledger
+
+Persistent ledger of processed ingest event ids for the consensus service.
+
+Ids are kept in an indexed SQLite table together with the event timestamp.
+A monotonic cursor (highest processed timestamp minus a reorder window)
+covers everything older: those events count as processed without a lookup
+and their rows are pruned, and only a bounded window of recent ids is held
+in memory. Restarts therefore resume from the cursor and cost O(new events),
+and memory stays constant however many events have been processed.
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+
+DEFAULT_RECENT_WINDOW = 10_000
+DEFAULT_REORDER_WINDOW = 24 * 3600.0  # Seconds an event may arrive late and still be checked exactly
+DEFAULT_RESUME_LOOKBACK = 300.0  # Seconds before the newest processed event that polling resumes from
+PRUNE_EVERY = 1_000  # Marks between prunes of rows behind the cursor
+
+
+class ProcessedEventLedger:
+    """
+    Set-like record of processed event ids backed by SQLite.
+
+    Supports `event_id in ledger`, `ledger.add(event_id, ts)` and `len(ledger)`
+    so it can stand in for the in-memory set it replaces.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/processed_events.db",
+        recent_window: int = DEFAULT_RECENT_WINDOW,
+        reorder_window: float = DEFAULT_REORDER_WINDOW
+    ):
+        """
+        Open (or create) the ledger.
+
+        Args:
+            db_path: SQLite database path (":memory:" for a non-persistent ledger)
+            recent_window: Recently processed ids kept in memory
+            reorder_window: How far behind the newest processed event an
+                event may be and still be checked individually
+        """
+        self.db_path = db_path
+        self.recent_window = max(1, recent_window)
+        self.reorder_window = reorder_window
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._since_prune = 0
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS processed_events (
+                event_id TEXT PRIMARY KEY,
+                ts REAL NOT NULL,
+                processed_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_processed_events_ts ON processed_events(ts);
+            CREATE TABLE IF NOT EXISTS ledger_meta (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+        self.high_water = self._get_meta("high_water", 0.0)
+        self._total = int(self._get_meta("total", 0))
+
+    def _get_meta(self, key: str, default: float) -> float:
+        row = self._conn.execute("SELECT value FROM ledger_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @property
+    def cursor(self) -> float:
+        """Events with a timestamp below the cursor are treated as processed."""
+        return self.high_water - self.reorder_window if self.high_water else 0.0
+
+    @property
+    def resume_ts(self) -> float:
+        """Timestamp to poll new events from (a little before the newest processed one)."""
+        return max(0.0, self.high_water - DEFAULT_RESUME_LOOKBACK) if self.high_water else 0.0
+
+    def __len__(self) -> int:
+        """Total events ever marked processed."""
+        return self._total
+
+    def __contains__(self, event_id: str) -> bool:
+        if event_id in self._recent:
+            return True
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed_events WHERE event_id = ?", (event_id,)
+            ).fetchone()
+        return row is not None
+
+    def is_processed(self, event_id: str, ts: Optional[float] = None) -> bool:
+        """
+        Check whether an event has been processed.
+
+        Args:
+            event_id: Event id
+            ts: Event timestamp (enables the cursor fast path)
+
+        Returns:
+            True if processed (or older than the cursor)
+        """
+        if ts is not None and ts < self.cursor:
+            return True
+        return event_id in self
+
+    def add(self, event_id: str, ts: Optional[float] = None) -> None:
+        """Mark one event processed."""
+        self.add_many([(event_id, time.time() if ts is None else ts)])
+
+    def add_many(self, events: Iterable[Tuple[str, float]]) -> None:
+        """Mark several (event_id, ts) pairs processed in one transaction."""
+        events = [(event_id, float(ts)) for event_id, ts in events if event_id]
+        if not events:
+            return
+
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed_events (event_id, ts, processed_at) VALUES (?, ?, ?)",
+                [(event_id, ts, now) for event_id, ts in events]
+            )
+            self._total += self._conn.total_changes - before
+            self.high_water = max(self.high_water, max(ts for _, ts in events))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ledger_meta (key, value) VALUES (?, ?)",
+                [("high_water", self.high_water), ("total", self._total)]
+            )
+            self._conn.commit()
+
+            for event_id, _ in events:
+                self._recent[event_id] = None
+                self._recent.move_to_end(event_id)
+            while len(self._recent) > self.recent_window:
+                self._recent.popitem(last=False)
+
+            self._since_prune += len(events)
+        if self._since_prune >= PRUNE_EVERY:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete rows already covered by the cursor.
+
+        Returns:
+            Number of rows removed
+        """
+        with self._lock:
+            self._since_prune = 0
+            removed = self._conn.execute(
+                "DELETE FROM processed_events WHERE ts < ?", (self.cursor,)
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            self.logger.debug(f"Pruned {removed} processed events behind cursor {self.cursor:.0f}")
+        return removed
+
+    def stored_count(self) -> int:
+        """Rows currently stored (events not yet behind the cursor)."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM processed_events").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,281 @@
+"""
+Module: header_sync
+Specification: docs/blockchain/network.md
+
+Header-first synchronization driver for COINjecture. Pulls header ranges
+with GET_HEADERS, validates the header chain (linkage, height, timestamp,
+cumulative work) and only then fetches block bodies for the accepted
+headers with GET_BLOCK_BY_HASH.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Callable, Tuple
+
+try:
+    from .core.blockchain import Block
+    from .network import NetworkProtocol
+    from .storage import StorageManager
+    from .peer_scoring import PURPOSE_SYNC
+    from .pow import ProblemRegistry, check_block_body
+except ImportError:
+    # Fallback for direct execution
+    from core.blockchain import Block
+    from network import NetworkProtocol
+    from storage import StorageManager
+    from peer_scoring import PURPOSE_SYNC
+    from pow import ProblemRegistry, check_block_body
+
+
+DEFAULT_SYNC_BATCH_SIZE = 500
+DEFAULT_BODY_BATCH_SIZE = 64
+
+
+@dataclass
+class HeaderSyncResult:
+    """Outcome of a header-first sync run."""
+    headers_synced: int = 0
+    blocks_fetched: int = 0
+    tip_height: int = -1
+    tip_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class HeaderSyncDriver:
+    """
+    Client-side header-first sync.
+
+    Headers are requested in batches and validated as a chain before any
+    body is fetched, so a peer serving a bad chain costs only header bytes.
+    """
+
+    def __init__(
+        self,
+        network: NetworkProtocol,
+        storage: StorageManager,
+        header_validator: Optional[Callable[[Block], bool]] = None,
+        batch_size: int = DEFAULT_SYNC_BATCH_SIZE,
+        body_batch_size: int = DEFAULT_BODY_BATCH_SIZE,
+        header_sink: Optional[Callable[[List[Block]], int]] = None,
+        body_verifier: Optional[Callable[[Block, Block], bool]] = None
+    ):
+        """
+        Initialize sync driver.
+
+        Args:
+            network: Network protocol used for RPC requests
+            storage: Storage manager receiving headers and bodies
+            header_validator: Optional extra per-header check (e.g. consensus)
+            batch_size: Heights requested per GET_HEADERS call
+            body_batch_size: Bodies requested per GET_BLOCK_BY_HASH call
+            header_sink: Receives each accepted header batch instead of storing
+                headers one at a time (e.g. ConsensusEngine.connect_headers);
+                returns how many it accepted
+            body_verifier: Checks a fetched body against its header (e.g.
+                ConsensusEngine.verify_block_body); defaults to rehashing
+                against the header and verifying the solution
+        """
+        self.network = network
+        self.storage = storage
+        self.header_validator = header_validator
+        self.batch_size = batch_size
+        self.body_batch_size = body_batch_size
+        self.header_sink = header_sink
+        self.body_verifier = body_verifier
+        self._problem_registry: Optional[ProblemRegistry] = None
+        self.logger = logging.getLogger(__name__)
+
+    def sync(
+        self,
+        peer_id: Optional[str] = None,
+        anchor: Optional[Block] = None,
+        target_height: Optional[int] = None,
+        fetch_bodies: bool = True
+    ) -> HeaderSyncResult:
+        """
+        Sync headers (then bodies) from a peer.
+
+        Args:
+            peer_id: Peer to sync from (None picks the best-scored sync peer)
+            anchor: Local tip header to extend (None syncs from genesis)
+            target_height: Stop after this height (None syncs until the peer runs out)
+            fetch_bodies: Fetch block bodies for accepted headers
+
+        Returns:
+            HeaderSyncResult
+        """
+        result = HeaderSyncResult()
+        if peer_id is None:
+            best = self.network.peer_scores.top_k(1, PURPOSE_SYNC)
+            if not best:
+                result.error = "No scored peers to sync from"
+                return result
+            peer_id = best[0]
+
+        if anchor is not None:
+            result.tip_height = anchor.index
+            result.tip_hash = anchor.block_hash
+
+        accepted: List[Block] = []
+        tip = anchor
+        next_height = anchor.index + 1 if anchor is not None else 0
+
+        while target_height is None or next_height <= target_height:
+            count = self.batch_size
+            if target_height is not None:
+                count = min(count, target_height - next_height + 1)
+
+            raw_headers = self.network.request_headers(peer_id, next_height, count)
+            if raw_headers is None:
+                result.error = f"GET_HEADERS from {peer_id} failed at height {next_height}"
+                break
+            if not raw_headers:
+                break
+
+            try:
+                headers = [self.storage._deserialize_header(raw) for raw in raw_headers]
+            except Exception as e:
+                result.error = f"Malformed header from {peer_id}: {e}"
+                break
+
+            chain = self.validate_header_chain(tip, headers)
+            if self.header_sink is not None:
+                chain = chain[:self.header_sink(chain)]
+            else:
+                for header in chain:
+                    self.storage.store_header(header)
+            accepted.extend(chain)
+
+            if not chain:
+                result.error = f"Header chain from {peer_id} does not extend height {next_height - 1}"
+                break
+
+            tip = chain[-1]
+            next_height = tip.index + 1
+            if len(chain) < len(headers) and chain[-1].index < headers[-1].index:
+                result.error = f"Invalid header from {peer_id} after height {tip.index}"
+                break
+
+        result.headers_synced = len(accepted)
+        if tip is not None:
+            result.tip_height = tip.index
+            result.tip_hash = tip.block_hash
+
+        if fetch_bodies and accepted:
+            result.blocks_fetched = self.fetch_bodies(peer_id, accepted)
+
+        self.logger.info(
+            f"Header sync from {peer_id}: {result.headers_synced} headers, "
+            f"{result.blocks_fetched} bodies, tip {result.tip_height}"
+        )
+        return result
+
+    def validate_header_chain(self, anchor: Optional[Block], headers: List[Block]) -> List[Block]:
+        """
+        Select the best linked branch of headers extending anchor.
+
+        Headers are ordered by height and may include several forks at one
+        height, in any order. Of the branches extending anchor, the one
+        reaching the greatest height is taken (the heaviest on ties), so a
+        dead side branch never shadows the chain the peer keeps extending.
+        The branch is then validated in order and cut at the first invalid
+        header.
+
+        Args:
+            anchor: Header to extend (None starts from the lowest height)
+            headers: Candidate headers ordered by height
+
+        Returns:
+            Accepted headers in chain order
+        """
+        children: Dict[str, List[Block]] = {}
+        for header in headers:
+            children.setdefault(header.previous_hash, []).append(header)
+
+        # Best (tip height, tip work) reachable from each header, children first
+        best: Dict[str, Tuple[Tuple[int, float], Optional[Block]]] = {}
+        for header in reversed(headers):
+            if not header.block_hash or header.block_hash in best:
+                continue
+            rank, step = (header.index, header.cumulative_work_score), None
+            for child in children.get(header.block_hash, []):
+                reach = best.get(child.block_hash)
+                if reach and child.index == header.index + 1 and self._links_to(header, child) and reach[0] > rank:
+                    rank, step = reach[0], child
+            best[header.block_hash] = (rank, step)
+
+        if anchor is None:
+            roots = [h for h in headers if h.index == headers[0].index] if headers else []
+        else:
+            roots = [h for h in children.get(anchor.block_hash, [])
+                     if h.index == anchor.index + 1 and self._links_to(anchor, h)]
+        roots = [h for h in roots if h.block_hash in best]
+        if not roots:
+            return []
+
+        accepted: List[Block] = []
+        header = max(roots, key=lambda h: best[h.block_hash][0])
+        while header is not None:
+            if self.header_validator and not self.header_validator(header):
+                break
+            accepted.append(header)
+            header = best[header.block_hash][1]
+        return accepted
+
+    def fetch_bodies(self, peer_id: str, headers: List[Block]) -> int:
+        """
+        Fetch and store bodies for validated headers.
+
+        Bodies are requested in batches and must rehash to their header's
+        hash, match its parent, height and merkle root, and carry a valid
+        solution. Fetching stops at the first missing or invalid body; an
+        invalid body counts as a failure against the peer.
+
+        Returns:
+            Number of bodies stored
+        """
+        fetched = 0
+        for i in range(0, len(headers), self.body_batch_size):
+            batch = headers[i:i + self.body_batch_size]
+            blocks = self.network.request_blocks(peer_id, [h.block_hash for h in batch])
+            if blocks is None:
+                self.logger.warning(f"Body request to {peer_id} failed")
+                return fetched
+
+            by_hash = {block.block_hash: block for block in blocks}
+            for header in batch:
+                block = by_hash.get(header.block_hash)
+                if block is None:
+                    self.logger.warning(f"Body for {header.block_hash[:16]}... unavailable from {peer_id}")
+                    return fetched
+
+                if not self._verify_body(block, header):
+                    self.logger.warning(f"Body for {header.block_hash[:16]}... from {peer_id} rejected")
+                    self.network.peer_scores.record_failure(peer_id)
+                    return fetched
+
+                if self.storage.store_block(block):
+                    fetched += 1
+        return fetched
+
+    def _verify_body(self, block: Block, header: Block) -> bool:
+        if self.body_verifier is not None:
+            return self.body_verifier(block, header)
+        if self._problem_registry is None:
+            self._problem_registry = ProblemRegistry()
+        try:
+            reason = check_block_body(block, header, self._problem_registry)
+        except Exception as e:
+            reason = str(e)
+        if reason is not None:
+            self.logger.debug(f"{reason} for {header.block_hash[:16]}...")
+            return False
+        return True
+
+    def _links_to(self, parent: Block, header: Block) -> bool:
+        """Check parent linkage, timestamp ordering and work monotonicity."""
+        return (
+            header.previous_hash == parent.block_hash and
+            header.timestamp > parent.timestamp and
+            header.cumulative_work_score >= parent.cumulative_work_score
+        )
@@ -10,6 +10,11 @@ import logging
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from .tokenomics.amount import Amount, to_units
+except ImportError:
+    from tokenomics.amount import Amount, to_units
+
 logger = logging.getLogger('coinjecture-metrics')
 
 # Satoshi Constant for Critical Complex Equilibrium
@@ -160,6 +165,15 @@ class MetricsEngine:
             logger.error(f"❌ Error calculating block reward: {e}")
             return 0.01
     
+    def calculate_block_reward_units(self, work_score: float, network_state: NetworkState) -> Amount:
+        """
+        Block reward in integer base units, for crediting to the ledger.
+        
+        The float reward is rounded once here; balances and issuance are then
+        summed exactly.
+        """
+        return to_units(self.calculate_block_reward(work_score, network_state))
+    
     def get_deflation_factor(self, cumulative_work: float) -> float:
         """
         Calculate deflation factor based on cumulative work:
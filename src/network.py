@@ -13,23 +13,27 @@ import struct
 import asyncio
 import logging
 from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Any, Union, Callable, Tuple, Set
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple, Set, Iterator, Iterable
 from enum import Enum
 import threading
-from collections import defaultdict, deque
+import itertools
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 
 # Import from existing modules
 try:
-    from .core.blockchain import Block, ProblemTier, ProblemType
+    from .core.blockchain import Block, ProblemTier, ProblemType, build_merkle_root
     from .consensus import ConsensusEngine
     from .storage import StorageManager
-    from .pow import ProblemRegistry
+    from .pow import ProblemRegistry, check_block_body
+    from .peer_scoring import PeerScoreTable, PURPOSE_GOSSIP
 except ImportError:
     # Fallback for direct execution
-    from core.blockchain import Block, ProblemTier, ProblemType
+    from core.blockchain import Block, ProblemTier, ProblemType, build_merkle_root
     from consensus import ConsensusEngine
     from storage import StorageManager
-    from pow import ProblemRegistry
+    from pow import ProblemRegistry, check_block_body
+    from peer_scoring import PeerScoreTable, PURPOSE_GOSSIP
 
 
 # Constants
@@ -38,6 +42,17 @@ DEFAULT_MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB
 DEFAULT_RATE_LIMIT_PER_SECOND = 100
 DEFAULT_COMPRESSION_THRESHOLD = 1024  # 1KB
 DEFAULT_PEER_TIMEOUT = 30.0  # seconds
+DEFAULT_MAX_CIDS_PER_FRAME = 512  # keeps announce frames well under max message size
+DEFAULT_SEND_QUEUE_SIZE = 64  # frames buffered per peer before backpressure kicks in
+DEFAULT_SEND_TIMEOUT = 5.0  # seconds
+DEFAULT_SEEN_CIDS_SIZE = 100_000  # announced CIDs remembered for deduplication
+DEFAULT_REQUEST_TIMEOUT = 10.0  # seconds
+MAX_HEADERS_PER_REQUEST = 2000
+MAX_BLOCKS_PER_REQUEST = 128
+DEFAULT_HEADER_CHUNK_BYTES = 64 * 1024  # 64KB per GET_HEADERS response chunk
+DEFAULT_RELAY_CACHE_SIZE = 64  # recent blocks kept to serve compact block fills
+DEFAULT_PROOF_CACHE_SIZE = 256  # recent problem/solution pairs keyed by solution hash
+SHORT_TX_ID_LENGTH = 12  # hex chars (6 bytes)
 
 
 class MessageType(Enum):
@@ -46,6 +61,8 @@ class MessageType(Enum):
     REVEAL = "reveal"
     REQUEST = "request"
     RESPONSE = "response"
+    ANNOUNCE = "announce"
+    COMPACT_BLOCK = "compact_block"
 
 
 class RequestKind(Enum):
@@ -53,6 +70,7 @@ class RequestKind(Enum):
     GET_HEADERS = "get_headers"
     GET_BLOCK_BY_HASH = "get_block_by_hash"
     GET_PROOF_BY_CID = "get_proof_by_cid"
+    GET_BLOCK_TXN = "get_block_txn"
 
 
 class CompressionCodec(Enum):
@@ -154,6 +172,8 @@ class ResponseMsg:
     error_message: Optional[str] = None
     request_id: Optional[str] = None
     timestamp: float = field(default_factory=time.time)
+    sequence: int = 0  # chunk index for streamed responses
+    final: bool = True  # False while more chunks follow
     
     def to_dict(self) -> Dict[str, Any]:
         result = {
@@ -168,6 +188,10 @@ class ResponseMsg:
             result["error_message"] = self.error_message
         if self.request_id:
             result["request_id"] = self.request_id
+        if self.sequence:
+            result["sequence"] = self.sequence
+        if not self.final:
+            result["final"] = False
             
         return result
     
@@ -182,10 +206,141 @@ class ResponseMsg:
             payload=payload,
             error_message=data.get("error_message"),
             request_id=data.get("request_id"),
+            timestamp=data.get("timestamp", time.time()),
+            sequence=data.get("sequence", 0),
+            final=data.get("final", True)
+        )
+
+
+@dataclass
+class AnnounceMsg:
+    """Batched proof CID announcement (one frame per broadcast flush)."""
+    cids: List[str]
+    peer_id: str
+    lambda_state: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": MessageType.ANNOUNCE.value,
+            "cids": self.cids,
+            "peer_id": self.peer_id,
+            "lambda_state": self.lambda_state,
+            "timestamp": self.timestamp
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AnnounceMsg':
+        return cls(
+            cids=list(data["cids"]),
+            peer_id=data["peer_id"],
+            lambda_state=data.get("lambda_state", 0.0),
             timestamp=data.get("timestamp", time.time())
         )
 
 
+@dataclass
+class CompactBlockMsg:
+    """Compact block announcement: header plus short ids instead of the body."""
+    header_bytes: bytes
+    short_tx_ids: List[str]
+    solution_hash: str
+    peer_id: str
+    timestamp: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": MessageType.COMPACT_BLOCK.value,
+            "header_bytes": self.header_bytes.hex(),
+            "short_tx_ids": self.short_tx_ids,
+            "solution_hash": self.solution_hash,
+            "peer_id": self.peer_id,
+            "timestamp": self.timestamp
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactBlockMsg':
+        return cls(
+            header_bytes=bytes.fromhex(data["header_bytes"]),
+            short_tx_ids=list(data["short_tx_ids"]),
+            solution_hash=data["solution_hash"],
+            peer_id=data["peer_id"],
+            timestamp=data.get("timestamp", time.time())
+        )
+
+
+MESSAGE_TYPES = {
+    HeaderMsg: MessageType.HEADER,
+    RevealMsg: MessageType.REVEAL,
+    RequestMsg: MessageType.REQUEST,
+    ResponseMsg: MessageType.RESPONSE,
+    AnnounceMsg: MessageType.ANNOUNCE,
+    CompactBlockMsg: MessageType.COMPACT_BLOCK
+}
+
+
+def short_tx_id(block_hash: str, transaction_id: str) -> str:
+    """Short transaction id, salted with the block hash to avoid precomputed collisions."""
+    return hashlib.sha256(f"{block_hash}:{transaction_id}".encode('utf-8')).hexdigest()[:SHORT_TX_ID_LENGTH]
+
+
+def proof_leaf(problem: Any, solution: Any) -> Dict[str, Any]:
+    """Problem/solution entry as committed in the block merkle root."""
+    return {'problem': problem, 'solution': solution}
+
+
+def solution_hash(problem: Any, solution: Any) -> str:
+    """Hash of the proof leaf, used to find the proof in a peer's local cache."""
+    return hashlib.sha256(json.dumps(proof_leaf(problem, solution), sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def tx_to_dict(tx: Any) -> Dict[str, Any]:
+    """Normalize a Transaction object or dict to its dict form."""
+    return tx.to_dict() if hasattr(tx, "to_dict") else dict(tx)
+
+
+def pack_payloads(items: List[bytes]) -> bytes:
+    """Pack encoded items (compact headers, block bodies) into one length-prefixed payload."""
+    return b"".join(struct.pack(">I", len(item)) + item for item in items)
+
+
+def unpack_payloads(payload: Optional[bytes]) -> List[bytes]:
+    """Split a pack_payloads() payload back into its items."""
+    items = []
+    if not payload:
+        return items
+    
+    offset = 0
+    while offset < len(payload):
+        (length,) = struct.unpack_from(">I", payload, offset)
+        offset += 4
+        if offset + length > len(payload):
+            raise ValueError("Truncated payload")
+        items.append(payload[offset:offset + length])
+        offset += length
+    return items
+
+
+def iter_payload_chunks(items: List[bytes], max_chunk_bytes: int = DEFAULT_HEADER_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Yield pack_payloads() payloads no larger than max_chunk_bytes.
+    
+    An item larger than the bound is sent in a chunk of its own.
+    """
+    chunk: List[bytes] = []
+    chunk_size = 0
+    for item in items:
+        size = len(item) + 4
+        if chunk and chunk_size + size > max_chunk_bytes:
+            yield pack_payloads(chunk)
+            chunk = []
+            chunk_size = 0
+        chunk.append(item)
+        chunk_size += size
+    if chunk:
+        yield pack_payloads(chunk)
+
+
 class MessageCompressor:
     """Handles message compression and decompression."""
     
@@ -285,6 +440,121 @@ class RateLimiter:
             return True
 
 
+class PeerSendQueue:
+    """
+    Bounded outbound frame queue for a single peer.
+
+    Frames stay queued until the transport accepts them, so a slow or
+    unreachable peer accumulates a backlog. Once the backlog reaches
+    max_frames, new frames for that peer are dropped (backpressure) instead
+    of stalling the flush for every other peer.
+    """
+
+    def __init__(self, max_frames: int = DEFAULT_SEND_QUEUE_SIZE):
+        self.max_frames = max_frames
+        self.frames: deque = deque()
+        self.lock = threading.Lock()
+        self.in_flight = False  # Head frame handed to an async transport
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def offer(self, frame: bytes) -> bool:
+        """
+        Enqueue a frame unless the queue is full.
+
+        Returns:
+            True if queued, False if dropped due to backpressure
+        """
+        with self.lock:
+            if len(self.frames) >= self.max_frames:
+                self.dropped += 1
+                return False
+            self.frames.append(frame)
+            return True
+
+    def peek(self) -> Optional[bytes]:
+        with self.lock:
+            return self.frames[0] if self.frames else None
+
+    def pop(self) -> None:
+        with self.lock:
+            if self.frames:
+                self.frames.popleft()
+                self.sent += 1
+
+    def claim(self) -> bool:
+        """Take the right to send the head frame; False if a send is already in flight."""
+        with self.lock:
+            if self.in_flight:
+                return False
+            self.in_flight = True
+            return True
+
+    def release(self) -> None:
+        with self.lock:
+            self.in_flight = False
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+class RecentSet:
+    """
+    Set of the most recently added keys, bounded to max_size.
+
+    Adding a key again refreshes it; the least recently added key is
+    forgotten once the set is full.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._keys: OrderedDict = OrderedDict()
+
+    def add(self, key) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+
+    def update(self, keys: Iterable) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class LocalTransport:
+    """
+    In-process stand-in for LibP2PHost.
+
+    Exposes the same send_message(peer_id, protocol, message) surface as
+    network/libp2p_host.LibP2PHost so NetworkProtocol can publish without a
+    libp2p stack. Nodes sharing a registry dict can reach each other.
+    """
+
+    def __init__(self, local_peer_id: str, registry: Optional[Dict[str, 'NetworkProtocol']] = None):
+        self.local_peer_id = local_peer_id
+        self.registry = registry if registry is not None else {}
+
+    def attach(self, network: 'NetworkProtocol') -> None:
+        """Register a NetworkProtocol instance as reachable under its peer_id."""
+        self.registry[network.peer_id] = network
+
+    def get_connected_peers(self) -> List[str]:
+        return [peer_id for peer_id in self.registry if peer_id != self.local_peer_id]
+
+    def send_message(self, peer_id: str, protocol: str, message: bytes) -> bool:
+        target = self.registry.get(peer_id)
+        if target is None:
+            return False
+        return target.handle_message(self.local_peer_id, protocol, message)
+
+
 class NetworkProtocol:
     """
     Network protocol implementation for COINjecture with equilibrium enforcement.
@@ -307,21 +577,28 @@ class NetworkProtocol:
         consensus: ConsensusEngine,
         storage: StorageManager,
         problem_registry: ProblemRegistry,
-        peer_id: str = "local_peer"
+        peer_id: str = "local_peer",
+        transport: Optional[Any] = None,
+        transport_loop: Optional[asyncio.AbstractEventLoop] = None
     ):
         """
         Initialize network protocol.
-        
+
         Args:
             consensus: Consensus engine
             storage: Storage manager
             problem_registry: Problem registry
             peer_id: Local peer identifier
+            transport: Object exposing send_message(peer_id, protocol, bytes),
+                e.g. LibP2PHost or LocalTransport. None disables publishing.
+            transport_loop: Event loop running an async transport
         """
         self.consensus = consensus
         self.storage = storage
         self.problem_registry = problem_registry
         self.peer_id = peer_id
+        self.transport = transport
+        self.transport_loop = transport_loop
         self.logger = logging.getLogger(__name__)
         
         # Message handling
@@ -341,14 +618,17 @@ class NetworkProtocol:
             MessageType.HEADER: self._handle_header_msg,
             MessageType.REVEAL: self._handle_reveal_msg,
             MessageType.REQUEST: self._handle_request_msg,
-            MessageType.RESPONSE: self._handle_response_msg
+            MessageType.RESPONSE: self._handle_response_msg,
+            MessageType.ANNOUNCE: self._handle_announce_msg,
+            MessageType.COMPACT_BLOCK: self._handle_compact_block_msg
         }
         
         # RPC handlers
         self.rpc_handlers: Dict[RequestKind, Callable] = {
             RequestKind.GET_HEADERS: self._handle_get_headers,
             RequestKind.GET_BLOCK_BY_HASH: self._handle_get_block_by_hash,
-            RequestKind.GET_PROOF_BY_CID: self._handle_get_proof_by_cid
+            RequestKind.GET_PROOF_BY_CID: self._handle_get_proof_by_cid,
+            RequestKind.GET_BLOCK_TXN: self._handle_get_block_txn
         }
         
         # Message deduplication
@@ -357,15 +637,58 @@ class NetworkProtocol:
         
         # Pending requests
         self.pending_requests: Dict[str, Dict] = {}
+        self._request_counter = itertools.count()
         
         # Equilibrium state
         self.peers: Dict[str, float] = {}  # peer_id -> last_seen timestamp
+        self.peer_scores = PeerScoreTable()
+        self.gossip_fanout: Optional[int] = None  # None publishes to every peer
         self.pending_broadcasts: Set[str] = set()  # CIDs to broadcast
+
+        # Gossip publish state
+        self.send_queues: Dict[str, PeerSendQueue] = {}
+        self.seen_cids = RecentSet(DEFAULT_SEEN_CIDS_SIZE)
+        self.announce_latencies: deque = deque(maxlen=1000)
+        self.on_proof_announced: Optional[Callable[[str, List[str]], None]] = None
+        # Compact block relay state
+        self.mempool: Optional[Any] = None  # e.g. BlockchainState (pending_transactions)
+        self.proof_cache: OrderedDict = OrderedDict()  # solution_hash -> proof leaf
+        self.relay_cache: OrderedDict = OrderedDict()  # block_hash -> Block
+        self.on_block_received: Optional[Callable[[str, Block], None]] = None
+        # Fills and fallbacks wait on peer replies, so they run off the message handler
+        self._relay_executor: Optional[ThreadPoolExecutor] = None
+        self._relay_lock = threading.Lock()
+        self._relay_pending: Set[str] = set()  # Announced blocks being rebuilt or fetched
+        self._relay_futures: Set[Any] = set()
+        self.relay_stats: Dict[str, int] = {
+            "compact_sent": 0,
+            "compact_bytes_sent": 0,
+            "compact_received": 0,
+            "reconstructed": 0,
+            "fill_requests": 0,
+            "fill_bytes_received": 0,
+            "txs_missing": 0,
+            "proofs_missing": 0,
+            "full_fallbacks": 0
+        }
         
+        self.gossip_stats: Dict[str, int] = {
+            "flushes": 0,
+            "frames_published": 0,
+            "frames_sent": 0,
+            "frames_dropped": 0,
+            "send_failures": 0,
+            "cids_published": 0,
+            "frames_received": 0,
+            "cids_received": 0
+        }
+
         # Equilibrium tracking
         self.lambda_state = self.LAMBDA  # Coupling state
         self.eta_state = self.ETA        # Damping state
-        self.last_broadcast = 0
+        # Start the λ-coupling clock at construction so the first announce
+        # is batched with the rest of its interval instead of sent alone
+        self.last_broadcast = time.time()
         self.last_listen = 0
         self.last_cleanup = 0
         
@@ -380,7 +703,7 @@ class NetworkProtocol:
         self.logger.info(f"👂 Listen interval: {self.LISTEN_INTERVAL:.2f}s")
         self.logger.info(f"🧹 Cleanup interval: {self.CLEANUP_INTERVAL:.2f}s")
     
-    def encode_message(self, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]) -> bytes:
+    def encode_message(self, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg, AnnounceMsg, CompactBlockMsg]) -> bytes:
         """
         Encode message with compression.
         
@@ -405,7 +728,7 @@ class NetworkProtocol:
         
         return json.dumps(envelope).encode('utf-8')
     
-    def decode_message(self, data: bytes) -> Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]:
+    def decode_message(self, data: bytes) -> Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg, AnnounceMsg, CompactBlockMsg]:
         """
         Decode message with decompression.
         
@@ -436,6 +759,10 @@ class NetworkProtocol:
             return RequestMsg.from_dict(message_dict)
         elif message_type == MessageType.RESPONSE:
             return ResponseMsg.from_dict(message_dict)
+        elif message_type == MessageType.ANNOUNCE:
+            return AnnounceMsg.from_dict(message_dict)
+        elif message_type == MessageType.COMPACT_BLOCK:
+            return CompactBlockMsg.from_dict(message_dict)
         else:
             raise ValueError(f"Unknown message type: {message_type}")
     
@@ -466,7 +793,7 @@ class NetworkProtocol:
             message = self.decode_message(data)
             
             # Route to appropriate handler
-            handler = self.message_handlers.get(type(message).__name__.replace('Msg', '').lower())
+            handler = self.message_handlers.get(MESSAGE_TYPES.get(type(message)))
             if handler:
                 return handler(peer_id, message)
             else:
@@ -494,6 +821,7 @@ class NetworkProtocol:
             
             # Store header
             self.storage.store_header(header)
+            self.peer_scores.update_height(peer_id, header.index)
             
             print(f"Processed header from {peer_id}: {header_hash[:16]}...")
             return True
@@ -530,56 +858,199 @@ class NetworkProtocol:
                 print(f"No handler for request kind: {message.kind}")
                 return False
             
-            # Process request
-            response = handler(message.params)
+            # Process request; handlers return bytes or an iterator of chunks
+            try:
+                result = handler(message.params)
+            except ValueError as e:
+                self._send_response(peer_id, ResponseMsg(
+                    status="not_found",
+                    error_message=str(e),
+                    request_id=message.request_id
+                ))
+                return False
+            
+            chunks = [result] if isinstance(result, (bytes, bytearray)) else list(result)
+            if not chunks:
+                chunks = [b""]
             
-            # Send response
-            response_msg = ResponseMsg(
-                status="success",
-                payload=response,
-                request_id=message.request_id
-            )
+            # Send response, streamed as one ResponseMsg per chunk
+            for sequence, chunk in enumerate(chunks):
+                response_msg = ResponseMsg(
+                    status="success",
+                    payload=bytes(chunk),
+                    request_id=message.request_id,
+                    sequence=sequence,
+                    final=sequence == len(chunks) - 1
+                )
+                if not self._send_response(peer_id, response_msg):
+                    return False
             
-            # In a real implementation, this would send via libp2p
-            print(f"Processed request {message.kind.value} from {peer_id}")
+            self.logger.debug(f"Processed request {message.kind.value} from {peer_id} ({len(chunks)} chunks)")
             return True
             
         except Exception as e:
             print(f"Error processing request from {peer_id}: {e}")
             return False
     
+    def _send_response(self, peer_id: str, response: ResponseMsg) -> bool:
+        """Send an RPC response to the requesting peer."""
+        if self.transport is None:
+            self.logger.debug(f"No transport, dropping response to {peer_id}")
+            return False
+        return self._transport_send(peer_id, self.topics["responses"], self.encode_message(response))
+    
     def _handle_response_msg(self, peer_id: str, message: ResponseMsg) -> bool:
         """Handle RPC response message."""
         try:
-            # Handle pending request
+            # Handle pending request; streamed chunks accumulate until final
             if message.request_id and message.request_id in self.pending_requests:
                 request_info = self.pending_requests[message.request_id]
-                request_info["response"] = message
-                request_info["completed"] = True
-                del self.pending_requests[message.request_id]
+                request_info.setdefault("responses", []).append(message)
+                if message.final or message.status != "success":
+                    request_info["response"] = message
+                    request_info["completed"] = True
+                    del self.pending_requests[message.request_id]
+                    event = request_info.get("event")
+                    if event:
+                        event.set()
             
-            print(f"Processed response from {peer_id}: {message.status}")
+            if message.final:
+                self.logger.debug(f"Processed response from {peer_id}: {message.status}")
             return True
             
         except Exception as e:
             print(f"Error processing response from {peer_id}: {e}")
             return False
     
-    def _handle_get_headers(self, params: Dict[str, Any]) -> bytes:
-        """Handle get_headers RPC request."""
-        start_height = params.get("start_height", 0)
-        count = params.get("count", 100)
+    def send_request(
+        self,
+        peer_id: str,
+        kind: RequestKind,
+        params: Dict[str, Any],
+        timeout: float = DEFAULT_REQUEST_TIMEOUT
+    ) -> Optional[List[ResponseMsg]]:
+        """
+        Send an RPC request and wait for the (possibly streamed) response.
+        
+        Args:
+            peer_id: Target peer ID
+            kind: Request kind
+            params: Request parameters
+            timeout: Seconds to wait for the final chunk
+            
+        Returns:
+            Response chunks in order, or None on failure/timeout
+        """
+        if self.transport is None:
+            return None
+        
+        request_id = f"{self.peer_id}-{next(self._request_counter)}"
+        request_info = {"completed": False, "responses": [], "event": threading.Event()}
+        self.pending_requests[request_id] = request_info
+        
+        request = RequestMsg(kind=kind, params=params, request_id=request_id)
+        started = time.time()
+        sent = self._transport_send(peer_id, self.topics["requests"], self.encode_message(request))
+        
+        if sent or request_info["completed"]:
+            request_info["event"].wait(timeout)
+        self.pending_requests.pop(request_id, None)
+        
+        if not request_info["completed"]:
+            self.logger.debug(f"Request {kind.value} to {peer_id} timed out")
+            self.peer_scores.record_failure(peer_id)
+            return None
+        
+        responses = sorted(request_info["responses"], key=lambda r: r.sequence)
+        self.peer_scores.record_success(
+            peer_id,
+            rtt=time.time() - started,
+            served_bytes=sum(len(r.payload or b"") for r in responses)
+        )
+        if any(r.status != "success" for r in responses):
+            return None
+        return responses
+    
+    def request_headers(self, peer_id: str, start_height: int, count: int) -> Optional[List[bytes]]:
+        """
+        Fetch compact header encodings for a height range from a peer.
+        
+        Returns:
+            Header bytes ordered by height, or None on failure
+        """
+        responses = self.send_request(
+            peer_id,
+            RequestKind.GET_HEADERS,
+            {"start_height": start_height, "count": count}
+        )
+        if responses is None:
+            return None
         
         headers = []
-        for height in range(start_height, start_height + count):
-            # Get header at height (simplified)
-            # In real implementation, would query storage by height
-            pass
+        for response in responses:
+            headers.extend(unpack_payloads(response.payload))
+        return headers
+    
+    def request_block(self, peer_id: str, block_hash: str) -> Optional[Block]:
+        """Fetch a full block body by hash from a peer."""
+        responses = self.send_request(peer_id, RequestKind.GET_BLOCK_BY_HASH, {"hash": block_hash})
+        if not responses or not responses[-1].payload:
+            return None
+        return self.storage._deserialize_block(responses[-1].payload)
+    
+    def request_blocks(self, peer_id: str, block_hashes: List[str]) -> Optional[List[Block]]:
+        """
+        Fetch several block bodies from a peer in one streamed request.
+        
+        Returns:
+            Blocks the peer had (possibly fewer than requested), or None on failure
+        """
+        responses = self.send_request(
+            peer_id,
+            RequestKind.GET_BLOCK_BY_HASH,
+            {"hashes": block_hashes[:MAX_BLOCKS_PER_REQUEST]}
+        )
+        if responses is None:
+            return None
+        
+        return [
+            self.storage._deserialize_block(body)
+            for response in responses
+            for body in unpack_payloads(response.payload)
+        ]
+    
+    def _handle_get_headers(self, params: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Handle get_headers RPC request.
+        
+        Range-queries the headers table by height and streams the stored
+        compact header encodings in chunks of at most max_chunk_bytes.
+        """
+        start_height = max(int(params.get("start_height", 0)), 0)
+        count = min(int(params.get("count", 100)), MAX_HEADERS_PER_REQUEST)
+        max_chunk_bytes = min(
+            int(params.get("max_chunk_bytes", DEFAULT_HEADER_CHUNK_BYTES)),
+            DEFAULT_HEADER_CHUNK_BYTES
+        )
         
-        return json.dumps(headers).encode('utf-8')
+        headers = self.storage.get_headers_range(start_height, count)
+        return iter_payload_chunks(headers, max_chunk_bytes)
     
-    def _handle_get_block_by_hash(self, params: Dict[str, Any]) -> bytes:
-        """Handle get_block_by_hash RPC request."""
+    def _handle_get_block_by_hash(self, params: Dict[str, Any]) -> Union[bytes, Iterator[bytes]]:
+        """
+        Handle get_block_by_hash RPC request.
+        
+        A "hashes" list fetches several bodies in one request; found blocks
+        are streamed as packed chunks and missing ones are skipped.
+        """
+        if "hashes" in params:
+            bodies = []
+            for block_hash in params["hashes"][:MAX_BLOCKS_PER_REQUEST]:
+                block = self.storage.get_block(block_hash)
+                if block:
+                    bodies.append(self.storage._serialize_block(block))
+            return iter_payload_chunks(bodies)
+        
         block_hash = params.get("hash")
         if not block_hash:
             raise ValueError("Missing block hash")
@@ -681,6 +1152,14 @@ class NetworkProtocol:
         
         self._running = True
         
+        # Restore peer scores from the last run
+        try:
+            loaded = self.peer_scores.load(self.storage)
+            if loaded:
+                self.logger.info(f"📈 Restored scores for {loaded} peers")
+        except Exception as e:
+            self.logger.debug(f"⚠️  Could not restore peer scores: {e}")
+        
         # Start broadcast loop (λ-coupling)
         self._broadcast_thread = threading.Thread(target=self._broadcast_loop, daemon=True)
         self._broadcast_thread.start()
@@ -698,8 +1177,20 @@ class NetworkProtocol:
     def stop_equilibrium_loops(self):
         """Stop equilibrium enforcement loops."""
         self._running = False
+        if self._relay_executor is not None:
+            self._relay_executor.shutdown(wait=False)
+            self._relay_executor = None
+        self._save_peer_scores()
         self.logger.info("🛑 Equilibrium loops stopped")
     
+    def _save_peer_scores(self) -> bool:
+        """Persist peer score snapshots to storage."""
+        try:
+            return bool(self.peer_scores.save(self.storage))
+        except Exception as e:
+            self.logger.debug(f"⚠️  Could not persist peer scores: {e}")
+            return False
+    
     def _broadcast_loop(self):
         """
         λ-coupling broadcast loop.
@@ -741,15 +1232,18 @@ class NetworkProtocol:
         current_time = time.time()
         
         try:
-            cid_count = len(self.pending_broadcasts)
+            # Snapshot rather than clear() so CIDs queued concurrently by
+            # announce_proof() are kept for the next flush
+            cids = list(self.pending_broadcasts)
+            cid_count = len(cids)
             self.logger.info(f"📡 Broadcasting {cid_count} CIDs (λ-coupling → equilibrium)")
             
-            # Broadcast all queued CIDs
-            for cid in list(self.pending_broadcasts):
-                self._gossip_cid(cid)
+            # Broadcast all queued CIDs as batched frames
+            self._gossip_cids(cids)
             
-            self.pending_broadcasts.clear()
+            self.pending_broadcasts.difference_update(cids)
             self.last_broadcast = current_time
+            self.gossip_stats["flushes"] += 1
             
             # Update coupling state towards target (1.45 → 0.7071)
             # Gradual decay: current * 0.98 + target * 0.02
@@ -763,33 +1257,501 @@ class NetworkProtocol:
             self.logger.error(f"❌ Error flushing broadcasts: {e}")
     
     def _gossip_cid(self, cid: str):
-        """Broadcast CID to all connected peers (synchronous version for threading)."""
+        """Broadcast a single CID to all connected peers."""
+        self._gossip_cids([cid])
+    
+    def _gossip_cids(self, cids: List[str]) -> int:
+        """
+        Publish CIDs to all connected peers on the commit-reveal topic.
+        
+        CIDs are packed into AnnounceMsg frames of up to
+        DEFAULT_MAX_CIDS_PER_FRAME each, so a normal flush costs one frame
+        per peer regardless of how many proofs were queued.
+        
+        Args:
+            cids: CIDs to announce
+            
+        Returns:
+            Number of frames published (per peer)
+        """
+        if not cids:
+            return 0
+        
         try:
-            message = {
-                'type': 'proof_announcement',
-                'cid': cid,
-                'timestamp': time.time(),
-                'lambda_state': self.lambda_state
-            }
-            
-            # In real implementation, this would use libp2p gossipsub
-            # For now, log the broadcast
-            self.logger.debug(f"🗣️  Gossiping CID: {cid[:16]}...")
-            
-            # Create reveal message and encode it
-            # This simulates the actual broadcast
+            frames = []
+            for i in range(0, len(cids), DEFAULT_MAX_CIDS_PER_FRAME):
+                message = AnnounceMsg(
+                    cids=cids[i:i + DEFAULT_MAX_CIDS_PER_FRAME],
+                    peer_id=self.peer_id,
+                    lambda_state=self.lambda_state
+                )
+                frames.append(self.encode_message(message))
+            
+            # Mark our own CIDs as seen so echoes are not re-reported
+            self.seen_cids.update(cids)
+            
+            peers = self._get_gossip_peers()
+            if not peers:
+                self.logger.debug(f"🗣️  No peers to gossip {len(cids)} CIDs to")
+                return 0
+            
+            for peer_id in peers:
+                queue = self.send_queues.get(peer_id)
+                if queue is None:
+                    queue = self.send_queues[peer_id] = PeerSendQueue()
+                for frame in frames:
+                    if not queue.offer(frame):
+                        self.gossip_stats["frames_dropped"] += 1
+                        self.logger.warning(f"⚠️  Send queue full for {peer_id}, dropping announce frame")
+            
+            for peer_id in peers:
+                self._drain_send_queue(peer_id)
+            
+            self.gossip_stats["frames_published"] += len(frames)
+            self.gossip_stats["cids_published"] += len(cids)
+            self.logger.debug(f"🗣️  Gossiped {len(cids)} CIDs in {len(frames)} frame(s) to {len(peers)} peers")
+            return len(frames)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error gossiping {len(cids)} CIDs: {e}")
+            return 0
+    
+    def _get_gossip_peers(self) -> List[str]:
+        """
+        Get peers to publish to: known peers plus transport connections.
+        
+        Peers are ordered best first by gossip score and cut to
+        gossip_fanout when set.
+        """
+        if self.transport is None:
+            return []
+        
+        peers = dict.fromkeys(self.peers)
+        if hasattr(self.transport, "get_connected_peers"):
+            peers.update(dict.fromkeys(self.transport.get_connected_peers()))
+        peers.pop(self.peer_id, None)
+        
+        ranked = self.peer_scores.rank(list(peers), PURPOSE_GOSSIP)
+        if self.gossip_fanout is not None:
+            ranked = ranked[:self.gossip_fanout]
+        return ranked
+    
+    def _drain_send_queue(self, peer_id: str):
+        """
+        Send queued frames to a peer in order.
+        
+        Stops at the first failure and leaves the frame queued, so an
+        unreachable peer builds up backlog until its queue applies
+        backpressure. With an async transport the head frame is scheduled
+        on its event loop and the drain resumes from the completion
+        callback, so a slow peer never holds up the flush for the others.
+        """
+        queue = self.send_queues.get(peer_id)
+        if queue is None or not queue.claim():
+            return
+        
+        topic = self.topics["commit_reveal"]
+        while True:
+            frame = queue.peek()
+            if frame is None:
+                queue.release()
+                return
             try:
-                # Try to create a RevealMsg if we have the commitment
-                # For now, just log that we're gossiping
-                print(f"📡 Gossiping CID: {cid[:16]}... to network")
+                result = self.transport.send_message(peer_id, topic, frame)
             except Exception as e:
-                self.logger.debug(f"⚠️  Gossip simulation: {e}")
+                self.logger.debug(f"⚠️  Send to {peer_id} failed: {e}")
+                result = False
+            if asyncio.iscoroutine(result):
+                future = self._schedule_send(result)
+                if future is not None:
+                    future.add_done_callback(lambda done: self._send_done(peer_id, queue, done))
+                    return  # The queue stays claimed until the send completes
+                result = self._run_send(peer_id, result)
+            if not self._record_send(peer_id, queue, bool(result)):
+                queue.release()
+                return
+    
+    def _send_done(self, peer_id: str, queue: PeerSendQueue, future) -> None:
+        """Completion callback for an async gossip send; continues the drain."""
+        try:
+            ok = not future.cancelled() and bool(future.result())
+        except Exception as e:
+            self.logger.debug(f"⚠️  Send to {peer_id} failed: {e}")
+            ok = False
+        sent = self._record_send(peer_id, queue, ok)
+        queue.release()  # Only after the head frame is popped, so it is never sent twice
+        if sent:
+            self._drain_send_queue(peer_id)
+    
+    def _record_send(self, peer_id: str, queue: PeerSendQueue, ok: bool) -> bool:
+        """Account for one head-of-queue send; the frame stays queued on failure."""
+        if not ok:
+            queue.failed += 1
+            self.gossip_stats["send_failures"] += 1
+            self.peer_scores.record_failure(peer_id)
+            return False
+        queue.pop()
+        self.gossip_stats["frames_sent"] += 1
+        return True
+    
+    def _schedule_send(self, coroutine):
+        """
+        Start an async send without waiting for it.
+        
+        Returns:
+            A future for the send, or None when no event loop is running
+            (the caller then runs it to completion)
+        """
+        coroutine = asyncio.wait_for(coroutine, DEFAULT_SEND_TIMEOUT)
+        if self.transport_loop is not None and self.transport_loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coroutine, self.transport_loop)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coroutine.close()
+            return None
+        return loop.create_task(coroutine)
+    
+    def _run_send(self, peer_id: str, coroutine) -> bool:
+        try:
+            return bool(asyncio.run(asyncio.wait_for(coroutine, DEFAULT_SEND_TIMEOUT)))
+        except Exception as e:
+            self.logger.debug(f"⚠️  Send to {peer_id} failed: {e}")
+            return False
+    
+    def _transport_send(self, peer_id: str, topic: str, frame: bytes) -> bool:
+        """
+        Send one frame through the transport, bridging async transports.
+        
+        Blocks until an async send completes, unless this thread is itself
+        running an event loop; the send is then scheduled on it and treated
+        as handed off.
+        """
+        try:
+            result = self.transport.send_message(peer_id, topic, frame)
+            if asyncio.iscoroutine(result):
+                if self.transport_loop is not None and self.transport_loop.is_running():
+                    try:
+                        running = asyncio.get_running_loop()
+                    except RuntimeError:
+                        running = None
+                    future = asyncio.run_coroutine_threadsafe(
+                        asyncio.wait_for(result, DEFAULT_SEND_TIMEOUT), self.transport_loop
+                    )
+                    if running is self.transport_loop:
+                        return True  # Waiting here would deadlock the loop
+                    result = future.result(timeout=DEFAULT_SEND_TIMEOUT)
+                else:
+                    future = self._schedule_send(result)
+                    if future is not None:
+                        return True
+                    result = self._run_send(peer_id, result)
+            return bool(result)
+        except Exception as e:
+            self.logger.debug(f"⚠️  Send to {peer_id} failed: {e}")
+            return False
+    
+    def _handle_announce_msg(self, peer_id: str, message: AnnounceMsg) -> bool:
+        """Handle batched proof CID announcement."""
+        try:
+            self.update_peer(peer_id)
+            self.gossip_stats["frames_received"] += 1
+            self.announce_latencies.append(max(0.0, time.time() - message.timestamp))
             
-            # TODO: Actual gossipsub publish
-            # Use libp2p host to publish to /coinj/commit-reveal/1.0.0 topic
+            # Deduplication
+            new_cids = [cid for cid in message.cids if cid not in self.seen_cids]
+            if not new_cids:
+                return True
+            self.seen_cids.update(new_cids)
+            self.gossip_stats["cids_received"] += len(new_cids)
+            
+            if self.on_proof_announced:
+                self.on_proof_announced(peer_id, new_cids)
+            
+            self.logger.debug(f"📥 Received {len(new_cids)} CIDs from {peer_id}")
+            return True
             
         except Exception as e:
-            self.logger.error(f"❌ Error gossiping CID {cid[:16]}...: {e}")
+            print(f"Error processing announcement from {peer_id}: {e}")
+            return False
+    
+    def get_gossip_stats(self) -> Dict[str, Any]:
+        """Get gossip publish/receive counters and announce latency."""
+        stats = dict(self.gossip_stats)
+        flushes = max(stats["flushes"], 1)
+        stats["messages_per_flush"] = stats["frames_sent"] / flushes
+        stats["avg_announce_latency"] = (
+            sum(self.announce_latencies) / len(self.announce_latencies)
+            if self.announce_latencies else 0.0
+        )
+        stats["queued_frames"] = sum(len(q) for q in self.send_queues.values())
+        return stats
+    
+    def cache_proof(self, problem: Any, solution: Any) -> str:
+        """
+        Remember a problem/solution pair so compact blocks can reuse it.
+        
+        Returns:
+            Solution hash the proof is cached under
+        """
+        proof_id = solution_hash(problem, solution)
+        self.proof_cache[proof_id] = proof_leaf(problem, solution)
+        self.proof_cache.move_to_end(proof_id)
+        while len(self.proof_cache) > DEFAULT_PROOF_CACHE_SIZE:
+            self.proof_cache.popitem(last=False)
+        return proof_id
+    
+    def _remember_block(self, block: Block):
+        """Keep a recent block available for serving compact block fills."""
+        self.relay_cache[block.block_hash] = block
+        self.relay_cache.move_to_end(block.block_hash)
+        while len(self.relay_cache) > DEFAULT_RELAY_CACHE_SIZE:
+            self.relay_cache.popitem(last=False)
+    
+    def _mempool_transactions(self) -> List[Any]:
+        """Get transactions currently known to the local mempool."""
+        if self.mempool is None:
+            return []
+        pending = getattr(self.mempool, "pending_transactions", self.mempool)
+        return list(pending.values()) if isinstance(pending, dict) else list(pending)
+    
+    def announce_compact_block(self, block: Block, exclude_peer: Optional[str] = None) -> int:
+        """
+        Announce a block as header + short tx ids + solution hash.
+        
+        Args:
+            block: Block to announce
+            exclude_peer: Peer not to send to (e.g. the one we got it from)
+            
+        Returns:
+            Number of peers the announcement was sent to
+        """
+        try:
+            self._remember_block(block)
+            proof_id = self.cache_proof(block.problem, block.solution)
+            self.seen_headers.add(block.block_hash)
+            
+            message = CompactBlockMsg(
+                header_bytes=self.storage._serialize_header(block),
+                short_tx_ids=[
+                    short_tx_id(block.block_hash, tx_to_dict(tx).get('transaction_id', ''))
+                    for tx in block.transactions
+                ],
+                solution_hash=proof_id,
+                peer_id=self.peer_id
+            )
+            frame = self.encode_message(message)
+            
+            sent = 0
+            for peer_id in self._get_gossip_peers():
+                if peer_id == exclude_peer:
+                    continue
+                if self._transport_send(peer_id, self.topics["headers"], frame):
+                    sent += 1
+                    self.relay_stats["compact_sent"] += 1
+                    self.relay_stats["compact_bytes_sent"] += len(frame)
+            
+            self.logger.debug(f"📦 Compact block {block.block_hash[:16]}... sent to {sent} peers ({len(frame)} bytes)")
+            return sent
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error announcing compact block: {e}")
+            return 0
+    
+    def _handle_compact_block_msg(self, peer_id: str, message: CompactBlockMsg) -> bool:
+        """
+        Handle compact block announcement.
+        
+        Rebuilds the body from the mempool and proof cache. If pieces are
+        missing or the rebuilt body does not match the header, the relay
+        worker requests them from the announcing peer (falling back to a
+        full block fetch), so the handler never waits on a reply.
+        
+        The block is stored and its hash marked seen only once it verifies
+        against the announced hash; a rejected announcement can be retried
+        from another peer.
+        """
+        block_hash = None
+        try:
+            header = self.storage._deserialize_header(message.header_bytes)
+            block_hash = header.block_hash
+            
+            # Deduplication
+            with self._relay_lock:
+                if block_hash in self.seen_headers or block_hash in self._relay_pending:
+                    return True
+                self._relay_pending.add(block_hash)
+            self.update_peer(peer_id)
+            self.relay_stats["compact_received"] += 1
+            
+            block = self._reconstruct_compact_block(peer_id, header, message, fetch=False)
+            if block is None:
+                future = self._get_relay_executor().submit(self._fetch_compact_block, peer_id, header, message)
+                with self._relay_lock:
+                    self._relay_futures.add(future)
+                future.add_done_callback(self._relay_done)
+                block_hash = None  # Released by the worker
+                return True
+            return self._accept_relayed_block(peer_id, header, block, reconstructed=True)
+            
+        except Exception as e:
+            print(f"Error processing compact block from {peer_id}: {e}")
+            return False
+        finally:
+            if block_hash is not None:
+                with self._relay_lock:
+                    self._relay_pending.discard(block_hash)
+    
+    def _get_relay_executor(self) -> ThreadPoolExecutor:
+        with self._relay_lock:
+            if self._relay_executor is None:
+                # One worker: relayed blocks reach on_block_received one at a time
+                self._relay_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compact-relay")
+            return self._relay_executor
+    
+    def _relay_done(self, future) -> None:
+        with self._relay_lock:
+            self._relay_futures.discard(future)
+    
+    def wait_for_relay(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for compact block fills and fallbacks in progress.
+        
+        Returns:
+            True if all of them finished within timeout
+        """
+        with self._relay_lock:
+            pending = list(self._relay_futures)
+        _, not_done = wait_futures(pending, timeout)
+        return not not_done
+    
+    def _fetch_compact_block(self, peer_id: str, header: Block, message: CompactBlockMsg) -> bool:
+        """Relay worker: fetch missing pieces (or the full block) and accept it."""
+        block_hash = header.block_hash
+        try:
+            block = self._reconstruct_compact_block(peer_id, header, message)
+            reconstructed = block is not None
+            if block is None:
+                self.relay_stats["full_fallbacks"] += 1
+                block = self.request_block(peer_id, block_hash)
+                if block is None:
+                    print(f"Could not obtain block {block_hash[:16]}... from {peer_id}")
+                    return False
+                self.relay_stats["fill_bytes_received"] += len(self.storage._serialize_block(block))
+            return self._accept_relayed_block(peer_id, header, block, reconstructed)
+        except Exception as e:
+            print(f"Error fetching compact block {block_hash[:16]}... from {peer_id}: {e}")
+            return False
+        finally:
+            with self._relay_lock:
+                self._relay_pending.discard(block_hash)
+    
+    def _accept_relayed_block(self, peer_id: str, header: Block, block: Block, reconstructed: bool) -> bool:
+        """Verify a relayed block against its announced header, then store and deliver it."""
+        reason = check_block_body(block, header, self.problem_registry)
+        if reason is not None:
+            print(f"{reason} for compact block {header.block_hash[:16]}... from {peer_id}")
+            self.peer_scores.record_failure(peer_id)
+            return False
+        
+        if reconstructed:
+            self.relay_stats["reconstructed"] += 1
+        with self._relay_lock:
+            self.seen_headers.add(header.block_hash)
+        self.peer_scores.update_height(peer_id, header.index)
+        self._remember_block(block)
+        self.cache_proof(block.problem, block.solution)
+        self.storage.store_header(block)
+        self.storage.store_block(block)
+        
+        if self.on_block_received:
+            self.on_block_received(peer_id, block)
+        return True
+    
+    def _reconstruct_compact_block(
+        self,
+        peer_id: str,
+        header: Block,
+        message: CompactBlockMsg,
+        fetch: bool = True
+    ) -> Optional[Block]:
+        """
+        Rebuild a block body from local pieces, fetching missing transactions/proof.
+        
+        Returns:
+            The header filled with its body, or None if pieces are missing
+            (and fetch is False or the request failed) or the body does not
+            match the merkle root
+        """
+        block_hash = header.block_hash
+        
+        mempool_index = {}
+        for tx in self._mempool_transactions():
+            tx_dict = tx_to_dict(tx)
+            mempool_index[short_tx_id(block_hash, tx_dict.get('transaction_id', ''))] = tx_dict
+        
+        transactions: List[Optional[Dict[str, Any]]] = [mempool_index.get(sid) for sid in message.short_tx_ids]
+        missing = [i for i, tx in enumerate(transactions) if tx is None]
+        proof = self.proof_cache.get(message.solution_hash)
+        
+        if missing or proof is None:
+            if not fetch:
+                return None
+            self.relay_stats["fill_requests"] += 1
+            self.relay_stats["txs_missing"] += len(missing)
+            if proof is None:
+                self.relay_stats["proofs_missing"] += 1
+            
+            responses = self.send_request(
+                peer_id,
+                RequestKind.GET_BLOCK_TXN,
+                {"hash": block_hash, "indexes": missing, "proof": proof is None}
+            )
+            if not responses or not responses[-1].payload:
+                return None
+            payload = responses[-1].payload
+            self.relay_stats["fill_bytes_received"] += len(payload)
+            
+            fill = json.loads(payload.decode('utf-8'))
+            for index, tx_dict in zip(missing, fill.get("transactions", [])):
+                transactions[index] = tx_dict
+            if proof is None:
+                proof = proof_leaf(fill.get("problem"), fill.get("solution"))
+        
+        if any(tx is None for tx in transactions):
+            return None
+        
+        # Body must hash to the header's merkle root
+        if build_merkle_root(transactions + [proof], "") != header.merkle_root:
+            self.logger.debug(f"Compact block {block_hash[:16]}... merkle mismatch")
+            return None
+        
+        header.transactions = transactions
+        header.problem = proof["problem"]
+        header.solution = proof["solution"]
+        return header
+    
+    def _handle_get_block_txn(self, params: Dict[str, Any]) -> bytes:
+        """Handle get_block_txn RPC request (compact block fill)."""
+        block_hash = params.get("hash")
+        if not block_hash:
+            raise ValueError("Missing block hash")
+        
+        block = self.relay_cache.get(block_hash) or self.storage.get_block(block_hash)
+        if not block:
+            raise ValueError("Block not found")
+        
+        fill: Dict[str, Any] = {
+            "transactions": [
+                tx_to_dict(block.transactions[i])
+                for i in params.get("indexes", [])
+                if 0 <= i < len(block.transactions)
+            ]
+        }
+        if params.get("proof"):
+            fill["problem"] = block.problem
+            fill["solution"] = block.solution
+        return json.dumps(fill).encode('utf-8')
     
     def _listen_loop(self):
         """
@@ -863,9 +1825,11 @@ class NetworkProtocol:
                     
                     for peer_id in stale_peers:
                         del self.peers[peer_id]
+                        self.send_queues.pop(peer_id, None)
                         self.logger.info(f"🧹 Removed stale peer: {peer_id}")
                     
                     self.last_cleanup = current_time
+                    self._save_peer_scores()
                     
                     # Log network health
                     self.logger.info(f"📊 Network: {len(self.peers)} active peers")
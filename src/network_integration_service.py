@@ -16,6 +16,11 @@ from datetime import datetime
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+try:
+    from src.peer_scoring import PeerScoreTable, PURPOSE_SYNC
+except ImportError:
+    from peer_scoring import PeerScoreTable, PURPOSE_SYNC
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
                     handlers=[logging.FileHandler('logs/network_integration.log'), logging.StreamHandler()])
 logger = logging.getLogger('network_integration')
@@ -34,6 +39,7 @@ GENESIS_BLOCK_HASH = 'd1700c2681b75c1d22ed08285994c202d310ff25cf40851365ca6fea22
 class NetworkIntegrationService:
     def __init__(self):
         self.connected_peers = set()
+        self.peer_scores = PeerScoreTable()
         self.current_block_index = 0
         self.running = True
         self.block_processor_thread = None
@@ -98,13 +104,19 @@ class NetworkIntegrationService:
             else:
                 url = f"http://{peer_address}/v1/data/block/{block_index}"
             
+            started = time.time()
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'success':
+                    self.peer_scores.record_success(
+                        peer_address, rtt=time.time() - started, served_bytes=len(response.content)
+                    )
+                    self.peer_scores.update_height(peer_address, block_index)
                     return data['data']
         except Exception as e:
             logger.warning(f"⚠️  Could not fetch block {block_index} from {peer_address}: {e}")
+        self.peer_scores.record_failure(peer_address)
         return None
     
     def ingest_block_to_api(self, block_data):
@@ -165,8 +177,8 @@ class NetworkIntegrationService:
                 next_block_index = current_index + 1
                 block_ingested = False
                 
-                # First, try to fetch from real peers
-                for peer in list(self.connected_peers):
+                # First, try to fetch from real peers, best sync score first
+                for peer in self.peer_scores.rank(list(self.connected_peers), PURPOSE_SYNC):
                     if not self.running:
                         break
                         
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from unified_consensus_service import UnifiedConsensusService
 from metrics_engine import SATOSHI_CONSTANT
+from peer_scoring import PeerScoreTable, PURPOSE_SYNC
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -45,6 +46,9 @@ class NetworkSyncService:
         # Discovered peers
         self.discovered_peers = []
         
+        # Peer scores (RTT, success rate, served bytes, advertised height)
+        self.peer_scores = PeerScoreTable()
+        
         logger.info("✅ Network sync service initialized")
     
     def discover_peers(self) -> List[str]:
@@ -70,6 +74,8 @@ class NetworkSyncService:
                 logger.warning(f"⚠️  Could not discover peers from {bootstrap_peer}: {e}")
         
         self.discovered_peers = list(all_peers)
+        for peer in self.discovered_peers:
+            self.peer_scores.add_peer(peer)
         logger.info(f"✅ Discovered {len(self.discovered_peers)} total peers")
         
         return self.discovered_peers
@@ -79,18 +85,41 @@ class NetworkSyncService:
         try:
             # Try to get block from peer
             block_url = f"http://{peer}/v1/data/block/{block_height}"
+            started = time.time()
             response = requests.get(block_url, timeout=10)
             
             if response.status_code == 200:
                 block_data = response.json()
                 if 'data' in block_data:
+                    self.peer_scores.record_success(
+                        peer, rtt=time.time() - started, served_bytes=len(response.content)
+                    )
                     return block_data['data']
             
         except Exception as e:
             logger.debug(f"Could not get block {block_height} from {peer}: {e}")
         
+        self.peer_scores.record_failure(peer)
         return None
     
+    def get_sync_peers(self, k: Optional[int] = None, min_height: int = -1) -> List[str]:
+        """
+        Get peers to sync from, best first.
+        
+        Args:
+            k: Maximum number of peers (None for all discovered peers)
+            min_height: Only return peers that advertised at least this height
+                (peers with no known height are still tried last)
+            
+        Returns:
+            Peer addresses ordered by sync score
+        """
+        k = len(self.discovered_peers) if k is None else k
+        return self.peer_scores.top_k(
+            k, PURPOSE_SYNC,
+            where=lambda p: p.last_height >= min_height or p.last_height < 0
+        )
+    
     def get_latest_block_height(self) -> int:
         """Get the latest block height from the network."""
         logger.info("📊 Getting latest block height from network...")
@@ -101,18 +130,22 @@ class NetworkSyncService:
             try:
                 # Try to get latest block info
                 metrics_url = f"http://{peer}/v1/metrics/dashboard"
+                started = time.time()
                 response = requests.get(metrics_url, timeout=10)
                 
                 if response.status_code == 200:
                     metrics_data = response.json()
                     if 'data' in metrics_data and 'blockchain' in metrics_data['data']:
                         peer_height = metrics_data['data']['blockchain'].get('latest_block', 0)
+                        self.peer_scores.record_success(peer, rtt=time.time() - started)
+                        self.peer_scores.update_height(peer, peer_height)
                         if peer_height > latest_height:
                             latest_height = peer_height
                             logger.info(f"📈 Found latest height {peer_height} from {peer}")
                 
             except Exception as e:
                 logger.debug(f"Could not get metrics from {peer}: {e}")
+                self.peer_scores.record_failure(peer)
         
         logger.info(f"✅ Latest network height: {latest_height}")
         return latest_height
@@ -140,7 +173,7 @@ class NetworkSyncService:
                 # Try to get block from multiple peers
                 block_data = None
                 
-                for peer in self.discovered_peers:
+                for peer in self.get_sync_peers(min_height=height):
                     block_data = self.get_block_from_peer(peer, height)
                     if block_data:
                         break
@@ -24,6 +24,9 @@ try:
     from .storage import StorageManager, StorageConfig, IPFSClient, PruningMode
     from .consensus import ConsensusEngine, ConsensusConfig
     from .network import NetworkProtocol
+    from .header_sync import HeaderSyncDriver, HeaderSyncResult
+    from .checkpoint import CheckpointStore
+    from .peer_scoring import PURPOSE_SYNC
     from .user_submissions.pool import ProblemPool
     from .user_submissions.submission import ProblemSubmission, SolutionRecord
     from .user_submissions.aggregation import AggregationStrategy
@@ -34,6 +37,9 @@ except ImportError:
     from storage import StorageManager, StorageConfig, IPFSClient, PruningMode
     from consensus import ConsensusEngine, ConsensusConfig
     from network import NetworkProtocol
+    from header_sync import HeaderSyncDriver, HeaderSyncResult
+    from checkpoint import CheckpointStore
+    from peer_scoring import PURPOSE_SYNC
     from user_submissions.pool import ProblemPool
     from user_submissions.submission import ProblemSubmission, SolutionRecord
     from user_submissions.aggregation import AggregationStrategy
@@ -74,6 +80,9 @@ class NodeConfig:
     # Data directory
     data_dir: str = "./data"
     
+    # Trusted checkpoint directory light nodes start from (defaults to <data_dir>/checkpoints)
+    checkpoint_dir: Optional[str] = None
+    
     # User submissions configuration
     enable_user_submissions: bool = True
     max_pending_submissions: int = 100
@@ -150,6 +159,10 @@ class Node:
                 "none": PruningMode.ARCHIVE
             }
             pruning_mode = pruning_mode_map.get(self.config.pruning_mode, PruningMode.FULL)
+            light = self.config.role == NodeRole.LIGHT
+            if light:
+                # Light nodes keep headers + commit_index only
+                pruning_mode = PruningMode.LIGHT
             
             storage_config = StorageConfig(
                 data_dir=self.config.data_dir,
@@ -166,7 +179,8 @@ class Node:
             # Initialize consensus engine
             self.logger.info("Creating consensus configuration...")
             consensus_config = ConsensusConfig(
-                genesis_seed="coinjecture-genesis-2025"
+                genesis_seed="coinjecture-genesis-2025",
+                light_mode=light
             )
             self.logger.info("Initializing consensus engine...")
             self.consensus = ConsensusEngine(
@@ -176,6 +190,10 @@ class Node:
             )
             self.logger.info("Consensus engine initialized")
             
+            # Light nodes start from the newest trusted local checkpoint
+            if light:
+                self._restore_light_checkpoint()
+            
             # Initialize network protocol
             # NetworkProtocol requires consensus, storage, and problem_registry
             # We'll initialize it after consensus is created
@@ -530,8 +548,111 @@ class Node:
     def _start_light_client(self) -> None:
         """Start light client services."""
         self.logger.info("Starting light client services...")
-        # Light clients subscribe to headers and validate commitments
-        # Implementation would include header subscription and validation
+        # Light clients sync headers only; bodies and bundles are fetched on demand
+        result = self.sync_light()
+        if result.error:
+            self.logger.warning(f"Light header sync incomplete: {result.error}")
+    
+    def _restore_light_checkpoint(self) -> bool:
+        """
+        Seed the header tree from the newest trusted local checkpoint.
+        
+        Returns:
+            bool: True if a checkpoint was restored
+        """
+        try:
+            directory = self.config.checkpoint_dir or os.path.join(self.config.data_dir, "checkpoints")
+            checkpoint = CheckpointStore(directory).load_latest()
+            if not checkpoint:
+                self.logger.info("No trusted checkpoint found, light sync starts from genesis")
+                return False
+            
+            # Checkpoint tips use the compact header encoding
+            tips = []
+            for tip in checkpoint.tips:
+                header = self.storage._deserialize_header(json.dumps(tip["block"]).encode())
+                self.storage.store_header(header)
+                tips.append((header, tip["height"], float(header.cumulative_work_score)))
+            
+            if not self.consensus.restore_tips(tips, checkpoint.tip_hash, checkpoint.difficulty):
+                self.logger.warning(f"Checkpoint #{checkpoint.height} has no usable best tip")
+                return False
+            
+            self.best_tip_hash = checkpoint.tip_hash
+            self.current_block_height = checkpoint.height
+            self.logger.info(f"Light node starting from checkpoint #{checkpoint.height}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to restore light checkpoint: {e}")
+            return False
+    
+    def sync_light(self, peer_id: Optional[str] = None) -> HeaderSyncResult:
+        """
+        Sync headers only, extending the current best tip.
+        
+        Args:
+            peer_id: Peer to sync from (None picks the best-scored sync peer)
+            
+        Returns:
+            HeaderSyncResult: Headers synced and the new tip
+        """
+        if not self.network or not self.consensus:
+            return HeaderSyncResult(error="Node not started")
+        
+        driver = HeaderSyncDriver(
+            self.network, self.storage,
+            header_sink=self.consensus.connect_headers,
+            body_verifier=self.consensus.verify_block_body
+        )
+        result = driver.sync(peer_id=peer_id, anchor=self.consensus.get_best_tip(), fetch_bodies=False)
+        
+        best_tip = self.consensus.get_best_tip()
+        if best_tip:
+            self.best_tip_hash = best_tip.block_hash
+            self.current_block_height = best_tip.index
+        return result
+    
+    def get_block(self, block_hash: str, peer_id: Optional[str] = None) -> Optional[Block]:
+        """
+        Get a full block, fetching and verifying its body on demand in light mode.
+        
+        Args:
+            block_hash: Block hash
+            peer_id: Peer to fetch from (None picks the best-scored sync peer)
+            
+        Returns:
+            Optional[Block]: Block if available locally or from the peer
+        """
+        block = self.storage.get_block(block_hash)
+        if block or self.config.role != NodeRole.LIGHT or not self.network:
+            return block
+        
+        if peer_id is None:
+            best = self.network.peer_scores.top_k(1, PURPOSE_SYNC)
+            if not best:
+                return None
+            peer_id = best[0]
+        
+        block = self.network.request_block(peer_id, block_hash)
+        if block is None or not self.consensus.verify_block_body(block):
+            return None
+        self.storage.store_block(block)
+        return block
+    
+    def get_proof_bundle(self, block_hash: str) -> Optional[bytes]:
+        """
+        Get a block's proof bundle via its header's CID (fetched from IPFS on demand).
+        
+        Args:
+            block_hash: Block hash
+            
+        Returns:
+            Optional[bytes]: Bundle bytes if available
+        """
+        header = self.storage.get_header(block_hash)
+        if not header or not header.offchain_cid:
+            return None
+        return self.storage.get_proof_bundle(header.offchain_cid)
     
     def _start_full_node(self) -> None:
         """Start full node services."""
@@ -0,0 +1,211 @@
+"""
+Module: orphan_pool
+Specification: docs/blockchain/consensus.md
+
+Bounded buffer for blocks that arrive before their parent. Orphans are
+indexed by the missing parent hash, so when that parent connects all of
+its waiting descendants can be taken out in one parent-first batch.
+Entries are evicted oldest-first by age and by pool size.
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Any
+
+try:
+    from .core.blockchain import Block
+except ImportError:
+    # Fallback for direct execution
+    from core.blockchain import Block
+
+
+DEFAULT_MAX_ORPHANS = 1000
+DEFAULT_MAX_ORPHAN_AGE = 600.0  # seconds
+
+
+@dataclass
+class OrphanEntry:
+    """A buffered block waiting for its parent."""
+    block: Block
+    received_at: float
+    peer_id: Optional[str] = None
+    commitment: Optional[bytes] = None  # Indexed when the block connects
+
+
+@dataclass
+class OrphanMetrics:
+    """Orphan rate and resolution latency counters."""
+    blocks_received: int = 0
+    orphans_received: int = 0
+    duplicates: int = 0
+    resolved: int = 0
+    dropped: int = 0  # Taken out with their parent but failed to connect
+    evicted_age: int = 0
+    evicted_size: int = 0
+    resolution_seconds_total: float = 0.0
+    resolution_seconds_max: float = 0.0
+
+    @property
+    def orphan_rate(self) -> float:
+        """Fraction of received blocks that arrived before their parent."""
+        return self.orphans_received / self.blocks_received if self.blocks_received else 0.0
+
+    @property
+    def avg_resolution_latency(self) -> float:
+        """Average seconds from buffering to connection."""
+        return self.resolution_seconds_total / self.resolved if self.resolved else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blocks_received": self.blocks_received,
+            "orphans_received": self.orphans_received,
+            "duplicates": self.duplicates,
+            "resolved": self.resolved,
+            "dropped": self.dropped,
+            "evicted_age": self.evicted_age,
+            "evicted_size": self.evicted_size,
+            "orphan_rate": self.orphan_rate,
+            "avg_resolution_latency": self.avg_resolution_latency,
+            "max_resolution_latency": self.resolution_seconds_max
+        }
+
+
+class OrphanPool:
+    """
+    Orphan blocks indexed by missing parent hash.
+
+    Insertion order doubles as age order, so eviction by age or size only
+    ever looks at the oldest entries.
+    """
+
+    def __init__(self, max_orphans: int = DEFAULT_MAX_ORPHANS, max_age: float = DEFAULT_MAX_ORPHAN_AGE):
+        """
+        Initialize orphan pool.
+
+        Args:
+            max_orphans: Maximum buffered blocks
+            max_age: Seconds an orphan may wait for its parent
+        """
+        self.max_orphans = max(1, max_orphans)
+        self.max_age = max_age
+        self.metrics = OrphanMetrics()
+        self._orphans: "OrderedDict[str, OrphanEntry]" = OrderedDict()
+        self._by_parent: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._orphans)
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self._orphans
+
+    def has_children(self, parent_hash: str) -> bool:
+        """Check whether any orphan is waiting on a parent."""
+        return parent_hash in self._by_parent
+
+    def add(self, block: Block, peer_id: Optional[str] = None, now: Optional[float] = None,
+            commitment: Optional[bytes] = None) -> bool:
+        """
+        Buffer a block whose parent is unknown.
+
+        Args:
+            block: Orphan block
+            peer_id: Peer that sent it
+            now: Current time (defaults to time.time())
+            commitment: Verified commitment to index once the block connects
+
+        Returns:
+            True if buffered, False if already present
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if block.block_hash in self._orphans:
+                self.metrics.duplicates += 1
+                return False
+
+            self._evict_expired(now)
+            while len(self._orphans) >= self.max_orphans:
+                self._remove(next(iter(self._orphans)))
+                self.metrics.evicted_size += 1
+
+            self._orphans[block.block_hash] = OrphanEntry(block, now, peer_id, commitment)
+            self._by_parent.setdefault(block.previous_hash, set()).add(block.block_hash)
+            self.metrics.orphans_received += 1
+            return True
+
+    def _remove(self, block_hash: str) -> Optional[OrphanEntry]:
+        entry = self._orphans.pop(block_hash, None)
+        if entry is None:
+            return None
+        siblings = self._by_parent.get(entry.block.previous_hash)
+        if siblings is not None:
+            siblings.discard(block_hash)
+            if not siblings:
+                del self._by_parent[entry.block.previous_hash]
+        return entry
+
+    def _evict_expired(self, now: float) -> int:
+        evicted = 0
+        while self._orphans:
+            oldest = next(iter(self._orphans.values()))
+            if now - oldest.received_at <= self.max_age:
+                break
+            self._remove(oldest.block.block_hash)
+            evicted += 1
+        self.metrics.evicted_age += evicted
+        return evicted
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Drop orphans older than max_age.
+
+        Returns:
+            Number of orphans evicted
+        """
+        with self._lock:
+            return self._evict_expired(time.time() if now is None else now)
+
+    def take_descendants(self, parent_hash: str) -> List[OrphanEntry]:
+        """
+        Remove and return every orphan descending from a parent.
+
+        Args:
+            parent_hash: Hash of the block that just connected
+
+        Returns:
+            Orphan entries in parent-first (breadth-first) order
+        """
+        with self._lock:
+            taken: List[OrphanEntry] = []
+            queue = deque([parent_hash])
+            while queue:
+                for child_hash in sorted(self._by_parent.get(queue.popleft(), ())):
+                    entry = self._remove(child_hash)
+                    if entry is not None:
+                        taken.append(entry)
+                        queue.append(child_hash)
+            return taken
+
+    def record_resolved(self, entry: OrphanEntry, now: Optional[float] = None) -> None:
+        """Record that a taken orphan connected."""
+        latency = (time.time() if now is None else now) - entry.received_at
+        self.metrics.resolved += 1
+        self.metrics.resolution_seconds_total += latency
+        self.metrics.resolution_seconds_max = max(self.metrics.resolution_seconds_max, latency)
+
+    def missing_parents(self) -> List[str]:
+        """
+        Parent hashes to request from peers (parents that are not orphans themselves).
+
+        Returns:
+            Missing parent hashes, oldest waiting first
+        """
+        with self._lock:
+            missing: List[str] = []
+            for entry in self._orphans.values():
+                parent_hash = entry.block.previous_hash
+                if parent_hash not in self._orphans and parent_hash not in missing:
+                    missing.append(parent_hash)
+            return missing
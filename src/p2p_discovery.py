@@ -8,13 +8,26 @@ for perfect network balance and peer discovery.
 import socket
 import json
 import time
+import struct
+import asyncio
+import itertools
 import threading
 import logging
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple, Callable, Any
 from dataclasses import dataclass
 from enum import Enum
 import math
 
+try:
+    from .peer_scoring import PeerScoreTable, PURPOSE_DISCOVERY
+except ImportError:
+    from peer_scoring import PeerScoreTable, PURPOSE_DISCOVERY
+
+
+# Framed protocol: 4-byte big-endian length prefix + JSON body
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 1024 * 1024  # 1MB
+
 
 class DiscoveryProtocol(Enum):
     """P2P discovery protocols."""
@@ -83,6 +96,19 @@ class DiscoveryConfig:
     max_peers: int = 20  # Appropriate for testnet with 3 active peers (16 total connections)
     peer_timeout: float = 141.4  # 10 * λ-coupling interval
     
+    # Connection pool
+    connect_timeout: float = 5.0
+    request_timeout: float = 5.0
+    keepalive_interval: float = 14.14  # Ping idle pooled connections every λ-interval
+    
+    # Serve peer lists to other nodes over the framed protocol
+    serve_peer_exchange: bool = False
+    listen_host: str = "0.0.0.0"
+    
+    # Peer exchange fan-out (None exchanges with every connected peer)
+    exchange_fanout: Optional[int] = None
+    shared_peers: int = 5  # Best-scored peers sent with each exchange request
+    
     def __post_init__(self):
         if self.bootstrap_nodes is None:
             self.bootstrap_nodes = [
@@ -93,6 +119,282 @@ class DiscoveryConfig:
             ]
 
 
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode a message as a length-prefixed JSON frame."""
+    body = json.dumps(message).encode()
+    if len(body) > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {len(body)} bytes")
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one length-prefixed JSON frame."""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {length} bytes")
+    return json.loads((await reader.readexactly(length)).decode())
+
+
+class FramedConnection:
+    """
+    Long-lived framed connection with multiplexed requests.
+    
+    Outbound requests carry a request_id and are matched to replies by a
+    single reader task, so many requests can be in flight at once. Inbound
+    requests (no matching request_id) are passed to the handler and the
+    reply is written back with the same request_id.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 handler: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None):
+        self.reader = reader
+        self.writer = writer
+        self.handler = handler
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.last_used = time.time()
+        self.closed = False
+        self._request_ids = itertools.count()
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+    
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Write one frame."""
+        frame = encode_frame(message)
+        async with self._write_lock:
+            self.writer.write(frame)
+            await self.writer.drain()
+        self.last_used = time.time()
+    
+    async def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a request and wait for its reply."""
+        if self.closed:
+            raise ConnectionError("Connection closed")
+        
+        request_id = str(next(self._request_ids))
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await self.send(dict(message, request_id=request_id))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+    
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                message = await read_frame(self.reader)
+                self.last_used = time.time()
+                
+                if message.get("reply"):
+                    future = self.pending.get(message.get("request_id"))
+                    if future and not future.done():
+                        future.set_result(message)
+                elif self.handler:
+                    asyncio.ensure_future(self._serve(message))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, OSError):
+            pass
+        finally:
+            await self.close()
+    
+    async def _serve(self, message: Dict[str, Any]) -> None:
+        try:
+            # Handlers are synchronous service code; keep them off the loop
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(None, self.handler, message)
+            if response is not None and not self.closed:
+                await self.send(dict(response, request_id=message.get("request_id"), reply=True))
+        except Exception:
+            await self.close()
+    
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed"))
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+        if self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+
+
+class ConnectionPool:
+    """
+    Pool of persistent framed connections keyed by (host, port).
+    
+    Runs its own asyncio loop on a background thread so the thread-based
+    discovery loops can use it synchronously; request_many() fans one
+    request out to many peers concurrently.
+    """
+    
+    def __init__(self, connect_timeout: float = 5.0, request_timeout: float = 5.0,
+                 keepalive_interval: float = 14.14):
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.keepalive_interval = keepalive_interval
+        self.logger = logging.getLogger('coinjecture-discovery')
+        
+        self.connections: Dict[Tuple[str, int], FramedConnection] = {}
+        self.last_rtt: Dict[Tuple[str, int], float] = {}  # Latest request round trip
+        self.stats = {"connects": 0, "requests": 0, "reused": 0, "failures": 0, "pings": 0, "evicted": 0}
+        
+        self._connect_locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+        self._server_connections: Set[FramedConnection] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start the pool's event loop thread (idempotent)."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._keepalive_loop(), self._loop)
+    
+    def _run(self, coro, timeout: Optional[float] = None):
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+    
+    async def _get_connection(self, host: str, port: int) -> FramedConnection:
+        key = (host, port)
+        conn = self.connections.get(key)
+        if conn and not conn.closed:
+            self.stats["reused"] += 1
+            return conn
+        
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            conn = self.connections.get(key)
+            if conn and not conn.closed:
+                self.stats["reused"] += 1
+                return conn
+            
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.connect_timeout)
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            conn = FramedConnection(reader, writer)
+            self.connections[key] = conn
+            self.stats["connects"] += 1
+            return conn
+    
+    async def _request(self, host: str, port: int, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            conn = await self._get_connection(host, port)
+            self.stats["requests"] += 1
+            started = time.time()
+            reply = await conn.request(message, self.request_timeout)
+            self.last_rtt[(host, port)] = time.time() - started
+            return reply
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.logger.debug(f"Request to {host}:{port} failed: {e}")
+            conn = self.connections.pop((host, port), None)
+            if conn:
+                await conn.close()
+            return None
+    
+    def request(self, host: str, port: int, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send a request over a pooled connection (None on failure)."""
+        return self._run(self._request(host, port, message))
+    
+    def request_many(self, targets: List[Tuple[str, int]], message: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+        """Send the same request to all targets concurrently; replies align with targets."""
+        if not targets:
+            return []
+        
+        async def fan_out():
+            return await asyncio.gather(*(self._request(host, port, message) for host, port in targets))
+        
+        return self._run(fan_out())
+    
+    def connect(self, host: str, port: int) -> bool:
+        """Open (or reuse) a pooled connection."""
+        async def open_connection():
+            try:
+                await self._get_connection(host, port)
+                return True
+            except Exception:
+                self.stats["failures"] += 1
+                return False
+        
+        return self._run(open_connection())
+    
+    def serve(self, host: str, port: int, handler: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> int:
+        """
+        Accept framed connections and answer requests with handler.
+        
+        Returns:
+            Bound port (useful when port is 0)
+        """
+        async def start_server():
+            async def on_connect(reader, writer):
+                conn = FramedConnection(reader, writer, handler)
+                self._server_connections.add(conn)
+            
+            server = await asyncio.start_server(on_connect, host, port)
+            self._servers.append(server)
+            return server.sockets[0].getsockname()[1]
+        
+        return self._run(start_server())
+    
+    async def _keepalive_loop(self) -> None:
+        """Ping idle connections and evict the ones that stopped answering."""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.time()
+            
+            for key, conn in list(self.connections.items()):
+                if conn.closed:
+                    self.connections.pop(key, None)
+                    self.stats["evicted"] += 1
+                    continue
+                if now - conn.last_used < self.keepalive_interval:
+                    continue
+                
+                self.stats["pings"] += 1
+                try:
+                    await conn.request({"type": "ping"}, self.request_timeout)
+                except Exception:
+                    await conn.close()
+                    self.connections.pop(key, None)
+                    self.stats["evicted"] += 1
+            
+            self._server_connections = {c for c in self._server_connections if not c.closed}
+    
+    def close(self) -> None:
+        """Close all connections and servers and stop the loop."""
+        if self._loop is None:
+            return
+        
+        async def shutdown():
+            for server in self._servers:
+                server.close()
+            for conn in list(self.connections.values()) + list(self._server_connections):
+                await conn.close()
+            self.connections.clear()
+            self._server_connections.clear()
+        
+        try:
+            self._run(shutdown(), timeout=5.0)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5.0)
+        with self._lock:
+            self._loop = None
+            self._thread = None
+
+
 class P2PDiscoveryService:
     """Simple P2P discovery service using Critical Complex Equilibrium Conjecture."""
     
@@ -112,6 +414,17 @@ class P2PDiscoveryService:
         self.lambda_coupling_state = 0.0  # Current coupling state
         self.eta_damping_state = 0.0      # Current damping state
         
+        # Persistent framed connections to bootstrap nodes and peers
+        self.connection_pool = ConnectionPool(
+            connect_timeout=config.connect_timeout,
+            request_timeout=config.request_timeout,
+            keepalive_interval=config.keepalive_interval
+        )
+        self.bound_port: Optional[int] = None
+        
+        # Latency/reliability scores, keyed like discovered_peers
+        self.peer_scores = PeerScoreTable()
+        
         self.logger.info(f"🌐 P2P Discovery Service initialized with λ = η = 1/√2 ≈ 0.7071")
         self.logger.info(f"📡 Bootstrap nodes: {len(self.config.bootstrap_nodes)}")
     
@@ -121,6 +434,13 @@ class P2PDiscoveryService:
             self.logger.info("🌐 Starting P2P discovery service with λ = η = 1/√2 ≈ 0.7071...")
             self.running = True
             
+            # Serve peer lists to other nodes
+            if self.config.serve_peer_exchange:
+                self.bound_port = self.connection_pool.serve(
+                    self.config.listen_host, self.config.listen_port, self._handle_discovery_request
+                )
+                self.logger.info(f"📡 Serving peer exchange on {self.config.listen_host}:{self.bound_port}")
+            
             # Start λ-coupling bootstrap discovery
             self._start_lambda_coupling_discovery()
             
@@ -147,6 +467,7 @@ class P2PDiscoveryService:
             if thread.is_alive():
                 thread.join(timeout=5.0)
         
+        self.connection_pool.close()
         self.logger.info("✅ P2P discovery service stopped")
     
     def get_peers(self) -> List[PeerInfo]:
@@ -226,115 +547,133 @@ class P2PDiscoveryService:
     
     def _discover_from_bootstrap_nodes(self) -> None:
         """Discover peers from bootstrap nodes using λ-coupling."""
+        targets = []
         for bootstrap_node in self.config.bootstrap_nodes:
             try:
-                host, port = bootstrap_node.split(':')
-                port = int(port)
-                
-                self.logger.info(f"🔍 λ-coupling query to bootstrap: {bootstrap_node}")
-                
-                # Connect to bootstrap node
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5.0)
+                host, port = bootstrap_node.rsplit(':', 1)
+                targets.append((bootstrap_node, host, int(port)))
+            except ValueError:
+                self.logger.error(f"❌ λ-coupling invalid bootstrap address: {bootstrap_node}")
+        
+        if not targets:
+            return
+        
+        # Send peer list request with λ-coupling to all bootstrap nodes at once
+        request = {
+            "type": "peer_list_request",
+            "lambda_coupling": self.lambda_coupling_state,
+            "timestamp": time.time(),
+            "requester_id": f"λ-coupling-{int(time.time())}"
+        }
+        
+        self.logger.info(f"🔍 λ-coupling query to {len(targets)} bootstrap nodes")
+        responses = self.connection_pool.request_many([(host, port) for _, host, port in targets], request)
+        
+        for (bootstrap_node, host, port), response in zip(targets, responses):
+            self._record_response(bootstrap_node, host, port, response)
+            if response is None:
+                self.logger.warning(f"❌ Bootstrap not reachable: {bootstrap_node}")
+                continue
+            
+            if response.get("type") == "peer_list_response":
+                peers = response.get("peers", [])
+                self.logger.info(f"📡 λ-coupling received {len(peers)} peers from {bootstrap_node}")
                 
-                try:
-                    sock.connect((host, port))
-                    
-                    # Send peer list request with λ-coupling
-                    request = {
-                        "type": "peer_list_request",
-                        "lambda_coupling": self.lambda_coupling_state,
-                        "timestamp": time.time(),
-                        "requester_id": f"λ-coupling-{int(time.time())}"
-                    }
-                    
-                    sock.send(json.dumps(request).encode())
-                    
-                    # Receive peer list response
-                    response_data = sock.recv(4096)
-                    if response_data:
-                        response = json.loads(response_data.decode())
-                        
-                        if response.get("type") == "peer_list_response":
-                            peers = response.get("peers", [])
-                            self.logger.info(f"📡 λ-coupling received {len(peers)} peers from {bootstrap_node}")
-                            
-                            # Add discovered peers with λ-coupling
-                            for peer_data in peers:
-                                self._add_discovered_peer(peer_data, DiscoveryProtocol.BOOTSTRAP)
-                    
-                    sock.close()
-                    
-                except socket.timeout:
-                    self.logger.warning(f"⏰ λ-coupling timeout: {bootstrap_node}")
-                except ConnectionRefusedError:
-                    self.logger.warning(f"❌ Bootstrap not reachable: {bootstrap_node}")
-                except Exception as e:
-                    self.logger.warning(f"⚠️  λ-coupling error with {bootstrap_node}: {e}")
-                finally:
-                    try:
-                        sock.close()
-                    except:
-                        pass
-                        
-            except Exception as e:
-                self.logger.error(f"❌ λ-coupling error processing {bootstrap_node}: {e}")
+                # Add discovered peers with λ-coupling
+                for peer_data in peers:
+                    self._add_discovered_peer(peer_data, DiscoveryProtocol.BOOTSTRAP)
     
     def _exchange_peers_with_connected(self) -> None:
-        """Exchange peer lists with connected peers using η-damping."""
-        connected_peers = self.get_connected_peers()
+        """Exchange peer lists with the best-scored connected peers concurrently using η-damping."""
+        connected_peers = self.get_best_peers(self.config.exchange_fanout, connected_only=True)
+        if not connected_peers:
+            return
         
-        for peer in connected_peers[:3]:  # Limit to 3 peers for η-damping efficiency
-            try:
-                # Connect to peer and request their peer list
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(3.0)
+        # Send η-damping peer exchange request
+        request = {
+            "type": "peer_exchange_request",
+            "eta_damping": self.eta_damping_state,
+            "our_peers": [p.to_dict() for p in self.get_best_peers(self.config.shared_peers)],
+            "timestamp": time.time()
+        }
+        
+        responses = self.connection_pool.request_many(
+            [(peer.address, peer.port) for peer in connected_peers], request
+        )
+        
+        for peer, response in zip(connected_peers, responses):
+            self._record_response(peer.peer_id, peer.address, peer.port, response)
+            if response is None:
+                self.logger.debug(f"η-damping exchange with {peer.address} failed")
+                peer.reputation = max(peer.reputation - 0.1, 0.0)
+                continue
+            
+            if response.get("type") == "peer_exchange_response":
+                their_peers = response.get("peers", [])
+                self.logger.info(f"📡 η-damping received {len(their_peers)} peers from {peer.address}")
                 
-                try:
-                    sock.connect((peer.address, peer.port))
-                    
-                    # Send η-damping peer exchange request
-                    request = {
-                        "type": "peer_exchange_request",
-                        "eta_damping": self.eta_damping_state,
-                        "our_peers": [p.to_dict() for p in self.get_peers()[:5]],  # Share our top 5 peers
-                        "timestamp": time.time()
-                    }
-                    
-                    sock.send(json.dumps(request).encode())
-                    
-                    # Receive their peer list
-                    response_data = sock.recv(4096)
-                    if response_data:
-                        response = json.loads(response_data.decode())
-                        
-                        if response.get("type") == "peer_exchange_response":
-                            their_peers = response.get("peers", [])
-                            self.logger.info(f"📡 η-damping received {len(their_peers)} peers from {peer.address}")
-                            
-                            # Add their peers with η-damping
-                            for peer_data in their_peers:
-                                self._add_discovered_peer(peer_data, DiscoveryProtocol.PEER_EXCHANGE)
-                    
-                    sock.close()
-                    
-                except Exception as e:
-                    self.logger.debug(f"η-damping exchange with {peer.address} failed: {e}")
-                finally:
-                    try:
-                        sock.close()
-                    except:
-                        pass
-                        
-            except Exception as e:
-                self.logger.error(f"Error in η-damping exchange with {peer.address}: {e}")
+                # Add their peers with η-damping
+                for peer_data in their_peers:
+                    self._add_discovered_peer(peer_data, DiscoveryProtocol.PEER_EXCHANGE)
+    
+    def get_best_peers(self, k: Optional[int] = None, connected_only: bool = False) -> List[PeerInfo]:
+        """
+        Get the k best discovered peers by discovery score.
+        
+        Args:
+            k: Number of peers (None for all)
+            connected_only: Only consider connected peers
+            
+        Returns:
+            PeerInfo list, best first
+        """
+        candidates = self.connected_peers if connected_only else self.discovered_peers
+        k = len(candidates) if k is None else k
+        ranked = self.peer_scores.top_k(k, PURPOSE_DISCOVERY, where=lambda p: p.peer_id in candidates)
+        return [self.discovered_peers[peer_id] for peer_id in ranked if peer_id in self.discovered_peers]
+    
+    def _record_response(self, peer_id: str, host: str, port: int, response: Optional[Dict[str, Any]]) -> None:
+        """Score a pooled request: RTT and reply size on success, failure otherwise."""
+        if response is None:
+            self.peer_scores.record_failure(peer_id)
+            return
+        self.peer_scores.record_success(
+            peer_id,
+            rtt=self.connection_pool.last_rtt.get((host, port)),
+            served_bytes=len(json.dumps(response))
+        )
+    
+    def _handle_discovery_request(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Answer framed discovery requests from other nodes."""
+        request_type = message.get("type")
+        
+        if request_type == "ping":
+            return {"type": "pong", "timestamp": time.time()}
+        
+        if request_type == "peer_list_request":
+            return {
+                "type": "peer_list_response",
+                "peers": [p.to_dict() for p in self.get_peers()],
+                "timestamp": time.time()
+            }
+        
+        if request_type == "peer_exchange_request":
+            for peer_data in message.get("our_peers", []):
+                self._add_discovered_peer(peer_data, DiscoveryProtocol.PEER_EXCHANGE)
+            return {
+                "type": "peer_exchange_response",
+                "peers": [p.to_dict() for p in self.get_peers()],
+                "timestamp": time.time()
+            }
+        
+        return None
     
     def _cleanup_old_peers(self) -> None:
         """Remove old and low-reputation peers for equilibrium."""
         current_time = time.time()
         peers_to_remove = []
         
-        for peer_id, peer in self.discovered_peers.items():
+        for peer_id, peer in list(self.discovered_peers.items()):
             # Remove old peers
             if current_time - peer.last_seen > self.config.peer_timeout:
                 peers_to_remove.append(peer_id)
@@ -349,6 +688,7 @@ class P2PDiscoveryService:
         for peer_id in peers_to_remove:
             del self.discovered_peers[peer_id]
             self.connected_peers.discard(peer_id)
+            self.peer_scores.remove(peer_id)
         
         if peers_to_remove:
             self.logger.info(f"🧹 Equilibrium cleanup: removed {len(peers_to_remove)} peers")
@@ -370,6 +710,7 @@ class P2PDiscoveryService:
             else:
                 # Add new peer
                 self.discovered_peers[peer_info.peer_id] = peer_info
+                self.peer_scores.add_peer(peer_info.peer_id)
                 self.logger.info(f"📡 New peer discovered: {peer_info.address}:{peer_info.port} via {protocol.value}")
             
             # Limit total peers for equilibrium
@@ -378,6 +719,7 @@ class P2PDiscoveryService:
                 oldest_peer = min(self.discovered_peers.values(), key=lambda p: p.last_seen)
                 del self.discovered_peers[oldest_peer.peer_id]
                 self.connected_peers.discard(oldest_peer.peer_id)
+                self.peer_scores.remove(oldest_peer.peer_id)
                 
         except Exception as e:
             self.logger.error(f"Error adding discovered peer: {e}")
@@ -389,25 +731,20 @@ class P2PDiscoveryService:
             if not peer:
                 return False
             
-            # Test connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3.0)
-            
-            try:
-                sock.connect((peer.address, peer.port))
-                sock.close()
-                
+            # Open a pooled connection that later exchanges reuse
+            if self.connection_pool.connect(peer.address, peer.port):
                 # Mark as connected with equilibrium
                 self.connected_peers.add(peer_id)
                 peer.reputation = min(peer.reputation + 0.2, 1.0)
+                self.peer_scores.record_success(peer_id)
                 
                 self.logger.info(f"✅ Connected to peer: {peer.address}:{peer.port}")
                 return True
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to connect to peer {peer.address}:{peer.port}: {e}")
-                peer.reputation = max(peer.reputation - 0.1, 0.0)
-                return False
+            
+            self.logger.warning(f"Failed to connect to peer {peer.address}:{peer.port}")
+            peer.reputation = max(peer.reputation - 0.1, 0.0)
+            self.peer_scores.record_failure(peer_id)
+            return False
                 
         except Exception as e:
             self.logger.error(f"Error connecting to peer {peer_id}: {e}")
@@ -422,7 +759,9 @@ class P2PDiscoveryService:
             "eta_damping_state": self.eta_damping_state,
             "equilibrium_ratio": self.lambda_coupling_state / max(self.eta_damping_state, 0.001),
             "average_reputation": sum(p.reputation for p in self.discovered_peers.values()) / max(len(self.discovered_peers), 1),
-            "discovery_threads": len(self.discovery_threads)
+            "discovery_threads": len(self.discovery_threads),
+            "pooled_connections": len(self.connection_pool.connections),
+            "connection_pool": dict(self.connection_pool.stats)
         }
 
 
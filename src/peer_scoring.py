@@ -0,0 +1,258 @@
+"""
+Module: peer_scoring
+Specification: docs/blockchain/network.md
+
+Latency- and reliability-scored peer table. Tracks RTT (EWMA), success
+rate, served bytes and last advertised height per peer, and keeps one
+max-heap per purpose so sync, discovery and gossip fan-out can ask for
+"top-k peers for X" in O(k log n).
+"""
+
+import heapq
+import threading
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Callable, Tuple, Any
+
+
+# EWMA weight for new RTT samples
+RTT_EWMA_ALPHA = 0.2
+# RTT at which the latency factor halves (seconds)
+RTT_REFERENCE = 0.25
+# Latency factor for peers with no RTT sample yet
+UNKNOWN_LATENCY_FACTOR = 0.5
+
+PURPOSE_SYNC = "sync"
+PURPOSE_GOSSIP = "gossip"
+PURPOSE_DISCOVERY = "discovery"
+
+
+@dataclass
+class PeerScore:
+    """Observed quality metrics for one peer."""
+    peer_id: str
+    rtt_ewma: Optional[float] = None  # seconds
+    successes: int = 0
+    failures: int = 0
+    served_bytes: int = 0
+    last_height: int = -1
+    last_seen: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """Laplace-smoothed success rate (0.5 for an unknown peer)."""
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def latency_factor(self) -> float:
+        """1.0 for instant replies, 0.5 at RTT_REFERENCE, tending to 0."""
+        if self.rtt_ewma is None:
+            return UNKNOWN_LATENCY_FACTOR
+        return 1.0 / (1.0 + self.rtt_ewma / RTT_REFERENCE)
+
+    @property
+    def quality(self) -> float:
+        """Combined reliability and latency score in (0, 1]."""
+        return self.success_rate * self.latency_factor
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PeerScore':
+        return cls(
+            peer_id=data["peer_id"],
+            rtt_ewma=data.get("rtt_ewma"),
+            successes=data.get("successes", 0),
+            failures=data.get("failures", 0),
+            served_bytes=data.get("served_bytes", 0),
+            last_height=data.get("last_height", -1),
+            last_seen=data.get("last_seen", 0.0)
+        )
+
+
+# Ranking key per purpose (higher is better)
+PURPOSE_KEYS: Dict[str, Callable[[PeerScore], Tuple]] = {
+    # Sync wants the tallest chain first, then the fastest reliable server
+    PURPOSE_SYNC: lambda p: (p.last_height, p.quality, p.served_bytes),
+    # Gossip wants low latency and reliable delivery
+    PURPOSE_GOSSIP: lambda p: (p.quality,),
+    # Discovery favours peers that answer, then those that have served us most
+    PURPOSE_DISCOVERY: lambda p: (p.success_rate, p.served_bytes),
+}
+
+
+def _negate(key: Tuple) -> Tuple:
+    return tuple(-value for value in key)
+
+
+class PeerScoreTable:
+    """
+    Peer scores with one lazily-invalidated max-heap per purpose.
+
+    Every update pushes a fresh heap entry tagged with the peer's version;
+    stale entries are discarded when they surface, and the heaps are
+    rebuilt when stale entries outnumber live ones.
+    """
+
+    def __init__(self):
+        self.scores: Dict[str, PeerScore] = {}
+        self._versions: Dict[str, int] = {}
+        self._heaps: Dict[str, List[Tuple]] = {purpose: [] for purpose in PURPOSE_KEYS}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, peer_id: str) -> bool:
+        return peer_id in self.scores
+
+    def get(self, peer_id: str) -> Optional[PeerScore]:
+        return self.scores.get(peer_id)
+
+    def _touch(self, peer_id: str) -> PeerScore:
+        score = self.scores.get(peer_id)
+        if score is None:
+            score = self.scores[peer_id] = PeerScore(peer_id=peer_id)
+        score.last_seen = time.time()
+        return score
+
+    def _reindex(self, score: PeerScore) -> None:
+        version = self._versions.get(score.peer_id, 0) + 1
+        self._versions[score.peer_id] = version
+        for purpose, key in PURPOSE_KEYS.items():
+            heap = self._heaps[purpose]
+            heapq.heappush(heap, (_negate(key(score)), score.peer_id, version))
+            if len(heap) > 4 * len(self.scores) + 64:
+                self._rebuild(purpose)
+
+    def _rebuild(self, purpose: str) -> None:
+        key = PURPOSE_KEYS[purpose]
+        heap = [
+            (_negate(key(score)), peer_id, self._versions[peer_id])
+            for peer_id, score in self.scores.items()
+        ]
+        heapq.heapify(heap)
+        self._heaps[purpose] = heap
+
+    def add_peer(self, peer_id: str) -> PeerScore:
+        """Register a peer (no-op if already known)."""
+        with self._lock:
+            if peer_id in self.scores:
+                return self.scores[peer_id]
+            score = self._touch(peer_id)
+            self._reindex(score)
+            return score
+
+    def record_success(self, peer_id: str, rtt: Optional[float] = None, served_bytes: int = 0) -> None:
+        """Record a successful exchange with optional RTT (seconds) and payload size."""
+        with self._lock:
+            score = self._touch(peer_id)
+            score.successes += 1
+            score.served_bytes += served_bytes
+            if rtt is not None:
+                if score.rtt_ewma is None:
+                    score.rtt_ewma = rtt
+                else:
+                    score.rtt_ewma = RTT_EWMA_ALPHA * rtt + (1 - RTT_EWMA_ALPHA) * score.rtt_ewma
+            self._reindex(score)
+
+    def record_failure(self, peer_id: str) -> None:
+        """Record a failed or timed-out exchange."""
+        with self._lock:
+            score = self._touch(peer_id)
+            score.failures += 1
+            self._reindex(score)
+
+    def update_height(self, peer_id: str, height: int) -> None:
+        """Record the latest height a peer advertised."""
+        with self._lock:
+            score = self._touch(peer_id)
+            if height <= score.last_height:
+                return
+            score.last_height = height
+            self._reindex(score)
+
+    def remove(self, peer_id: str) -> None:
+        """Forget a peer; its heap entries become stale."""
+        with self._lock:
+            self.scores.pop(peer_id, None)
+            # The version is kept so a re-added peer continues past its old
+            # heap entries instead of restarting at 1 and reviving them
+
+
+    def top_k(self, k: int, purpose: str = PURPOSE_GOSSIP,
+              where: Optional[Callable[[PeerScore], bool]] = None) -> List[str]:
+        """
+        Get the k best peers for a purpose.
+
+        Args:
+            k: Number of peers wanted
+            purpose: PURPOSE_SYNC, PURPOSE_GOSSIP or PURPOSE_DISCOVERY
+            where: Optional filter on PeerScore
+
+        Returns:
+            Peer IDs, best first
+        """
+        if purpose not in PURPOSE_KEYS:
+            raise ValueError(f"Unknown peer scoring purpose: {purpose}")
+
+        with self._lock:
+            heap = self._heaps[purpose]
+            result: List[str] = []
+            popped: List[Tuple] = []
+
+            while heap and len(result) < k:
+                entry = heapq.heappop(heap)
+                _, peer_id, version = entry
+                if peer_id not in self.scores or self._versions.get(peer_id) != version:
+                    continue  # Stale entry, drop it
+                popped.append(entry)
+                if where is None or where(self.scores[peer_id]):
+                    result.append(peer_id)
+
+            for entry in popped:
+                heapq.heappush(heap, entry)
+            return result
+
+    def rank(self, peer_ids: List[str], purpose: str = PURPOSE_GOSSIP) -> List[str]:
+        """Order an explicit peer list best first (unknown peers last, original order kept)."""
+        key = PURPOSE_KEYS[purpose]
+        with self._lock:
+            known = [p for p in peer_ids if p in self.scores]
+            unknown = [p for p in peer_ids if p not in self.scores]
+            known.sort(key=lambda p: key(self.scores[p]), reverse=True)
+        return known + unknown
+
+    def best_height(self) -> int:
+        """Highest height advertised by any peer (-1 if none)."""
+        best = self.top_k(1, PURPOSE_SYNC)
+        return self.scores[best[0]].last_height if best else -1
+
+    def save(self, storage) -> bool:
+        """Persist score snapshots to the storage peer_index table."""
+        with self._lock:
+            snapshots = [(s.peer_id, s.to_dict(), s.last_seen) for s in self.scores.values()]
+        return storage.store_peer_snapshots(snapshots)
+
+    def load(self, storage) -> int:
+        """
+        Load score snapshots from the storage peer_index table.
+
+        Returns:
+            Number of peers loaded
+        """
+        loaded = 0
+        for peer_id, meta in storage.get_peer_snapshots().items():
+            try:
+                score = PeerScore.from_dict(dict(meta, peer_id=peer_id))
+            except (KeyError, TypeError) as e:
+                self.logger.debug(f"Skipping malformed peer snapshot {peer_id}: {e}")
+                continue
+            with self._lock:
+                self.scores[peer_id] = score
+                self._reindex(score)
+            loaded += 1
+        return loaded
@@ -10,8 +10,10 @@ import hashlib
 import time
 import math
 import json
+import heapq
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
 from enum import Enum
 
 # Import from existing blockchain module
@@ -36,6 +38,7 @@ DEFAULT_TARGET_BLOCK_TIME = 30.0  # 30 seconds
 DIFFICULTY_ALPHA = 0.1  # EWMA smoothing factor
 MIN_TARGET = 100.0  # Minimum difficulty target
 MAX_TARGET = 1000000.0  # Maximum difficulty target
+DIFFICULTY_WINDOW = 100  # Recent blocks whose scores set the median
 
 
 def derive_epoch_salt(parent_hash: bytes, timestamp: int, epoch_duration: int = DEFAULT_EPOCH_DURATION) -> bytes:
@@ -305,6 +308,32 @@ class ProblemRegistry:
         return decode_problem_params(problem_bytes)
 
 
+def check_block_body(block, header, registry: ProblemRegistry) -> Optional[str]:
+    """
+    Check a fetched block body against the header the chain committed to.
+    
+    The block hash commits to the problem and solution, so a body that
+    rehashes to the header's hash, matches its linkage fields and verifies
+    is the body the header chain committed to.
+    
+    Args:
+        block: Fetched block
+        header: Known header for the same hash
+        registry: Problem registry used to verify the solution
+        
+    Returns:
+        None if the body is valid, otherwise the reason it was rejected
+    """
+    if (block.calculate_hash() != header.block_hash or
+            block.previous_hash != header.previous_hash or
+            block.index != header.index or
+            block.merkle_root != header.merkle_root):
+        return "Body does not match header"
+    if not registry.verify(block.problem, block.solution):
+        return "Body solution invalid"
+    return None
+
+
 def calculate_work_score(complexity: ComputationalComplexity) -> float:
     """
     Calculate work score from computational complexity.
@@ -320,12 +349,133 @@ def calculate_work_score(complexity: ComputationalComplexity) -> float:
     return calculate_computational_work_score(complexity)
 
 
+class SlidingWindowPercentile:
+    """
+    Percentile of the last `window` values, maintained incrementally.
+    
+    Two heaps split the window at the percentile's rank: a max-heap of the
+    lower part (whose top is the answer) and a min-heap of the rest. Values
+    leaving the window are deleted lazily when they surface at a heap top,
+    and the heaps are rebuilt once stale entries outnumber live ones, so
+    updates cost O(log n) amortized and queries O(1).
+    """
+    
+    def __init__(self, window: int = DIFFICULTY_WINDOW, percentile: float = 0.5):
+        """
+        Initialize sliding window.
+        
+        Args:
+            window: Number of most recent values kept
+            percentile: Rank as a fraction (0.5 gives sorted[n // 2])
+        """
+        self.window = max(1, window)
+        self.percentile = min(max(percentile, 0.0), 1.0)
+        self.values: deque = deque()  # (value, seq), oldest first
+        self._lower: List[tuple] = []  # (-value, -seq) max-heap
+        self._upper: List[tuple] = []  # (value, seq) min-heap
+        self._lower_size = 0
+        self._upper_size = 0
+        self._deleted: set = set()
+        self._seq = 0
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def _prune(self) -> None:
+        while self._lower and -self._lower[0][1] in self._deleted:
+            self._deleted.discard(-heapq.heappop(self._lower)[1])
+        while self._upper and self._upper[0][1] in self._deleted:
+            self._deleted.discard(heapq.heappop(self._upper)[1])
+    
+    def _in_lower(self, item: tuple) -> bool:
+        return bool(self._lower) and item <= (-self._lower[0][0], -self._lower[0][1])
+    
+    def _rebalance(self) -> None:
+        n = len(self.values)
+        target = min(n - 1, int(n * self.percentile)) + 1 if n else 0
+        while self._lower_size > target:
+            value, seq = heapq.heappop(self._lower)
+            heapq.heappush(self._upper, (-value, -seq))
+            self._lower_size -= 1
+            self._upper_size += 1
+            self._prune()
+        while self._lower_size < target:
+            value, seq = heapq.heappop(self._upper)
+            heapq.heappush(self._lower, (-value, -seq))
+            self._upper_size -= 1
+            self._lower_size += 1
+            self._prune()
+    
+    def _rebuild(self) -> None:
+        self._lower, self._upper, self._deleted = [], [(v, s) for v, s in self.values], set()
+        heapq.heapify(self._upper)
+        self._lower_size, self._upper_size = 0, len(self._upper)
+        self._rebalance()
+    
+    def add(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full."""
+        item = (value, self._seq)
+        self._seq += 1
+        self.values.append(item)
+        if self._in_lower(item):
+            heapq.heappush(self._lower, (-value, -item[1]))
+            self._lower_size += 1
+        else:
+            heapq.heappush(self._upper, item)
+            self._upper_size += 1
+        
+        if len(self.values) > self.window:
+            oldest = self.values.popleft()
+            if self._in_lower(oldest):
+                self._lower_size -= 1
+            else:
+                self._upper_size -= 1
+            self._deleted.add(oldest[1])
+            self._prune()
+        
+        self._rebalance()
+        if len(self._deleted) > len(self.values):
+            self._rebuild()
+    
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+    
+    def get(self) -> float:
+        """Current percentile (0.0 for an empty window)."""
+        return -self._lower[0][0] if self._lower_size else 0.0
+    
+    def to_list(self) -> List[float]:
+        """Window values, oldest first."""
+        return [value for value, _ in self.values]
+
+
+class _WindowView:
+    """Read-only list-like view of a window's values (oldest first)."""
+    
+    def __init__(self, window: SlidingWindowPercentile):
+        self._window = window
+    
+    def __len__(self) -> int:
+        return len(self._window)
+    
+    def __iter__(self):
+        return (value for value, _ in self._window.values)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._window.to_list()[index]
+        return self._window.values[index][0]
+
+
 @dataclass
 class DifficultyAdjuster:
     """
     Difficulty adjustment system using EWMA of observed scores.
     
-    Implements the difficulty mapping from pow.md specification.
+    Implements the difficulty mapping from pow.md specification. The median
+    of recent scores is kept in a SlidingWindowPercentile, so each update is
+    O(log window) instead of a full sort.
     """
     
     target_block_time: float = DEFAULT_TARGET_BLOCK_TIME
@@ -333,12 +483,14 @@ class DifficultyAdjuster:
     min_target: float = MIN_TARGET
     max_target: float = MAX_TARGET
     current_target: float = 1000.0  # Initial target
-    observed_scores: List[float] = None
+    observed_scores: List[float] = None  # Seed scores; afterwards the live window (oldest first)
+    window_size: int = DIFFICULTY_WINDOW
     
     def __post_init__(self):
-        """Initialize observed scores list."""
-        if self.observed_scores is None:
-            self.observed_scores = []
+        """Initialize the score window."""
+        self._median = SlidingWindowPercentile(self.window_size)
+        self._median.extend(self.observed_scores or [])
+        self.observed_scores = _WindowView(self._median)
     
     def update(self, observed_score: float, block_time: float) -> None:
         """
@@ -348,15 +500,8 @@ class DifficultyAdjuster:
             observed_score: Work score of the solved block
             block_time: Time taken to mine the block
         """
-        self.observed_scores.append(observed_score)
-        
-        # Keep only recent scores (last 100 blocks)
-        if len(self.observed_scores) > 100:
-            self.observed_scores = self.observed_scores[-100:]
-        
-        # Calculate median score
-        sorted_scores = sorted(self.observed_scores)
-        median_score = sorted_scores[len(sorted_scores) // 2]
+        self._median.add(observed_score)
+        median_score = self._median.get()
         
         # EWMA update: next_target = alpha * prev_target + (1-alpha) * median_score
         # Adjust based on block time ratio
@@ -368,6 +513,36 @@ class DifficultyAdjuster:
         # Clamp to bounds
         self.current_target = max(self.min_target, min(self.max_target, self.current_target))
     
+    def get_median_score(self) -> float:
+        """Median work score over the window."""
+        return self._median.get()
+    
+    def reset(self, scores: Iterable[float], current_target: float) -> None:
+        """
+        Replace the window and target (e.g. after a reorg).
+        
+        Args:
+            scores: Window scores, oldest first
+            current_target: Target after the newest score
+        """
+        self._median = SlidingWindowPercentile(self.window_size)
+        self._median.extend(scores)
+        self.observed_scores = _WindowView(self._median)
+        self.current_target = current_target
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize adjuster state for persistence alongside the chain tip."""
+        return {
+            "current_target": self.current_target,
+            "window_size": self.window_size,
+            "scores": self._median.to_list()
+        }
+    
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Restore state written by to_dict()."""
+        self.window_size = data.get("window_size", self.window_size)
+        self.reset(data.get("scores", []), data.get("current_target", self.current_target))
+    
     def get_current_target(self) -> float:
         """
         Get the current difficulty target.
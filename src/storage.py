@@ -432,6 +432,46 @@ class StorageManager:
             print(f"Error getting header: {e}")
             return None
     
+    def get_headers_range(self, start_height: int, count: int) -> List[bytes]:
+        """
+        Get serialized headers for a height range in one indexed query.
+        
+        Args:
+            start_height: First height (inclusive)
+            count: Number of heights to cover
+            
+        Returns:
+            Compact header bytes ordered by height (forks at the same
+            height are all returned)
+        """
+        if count <= 0:
+            return []
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT header_bytes FROM headers INDEXED BY idx_headers_height
+                    WHERE height >= ? AND height < ?
+                    ORDER BY height, timestamp
+                """, (start_height, start_height + count))
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error getting header range: {e}")
+            return []
+    
+    def get_header_height(self) -> int:
+        """Get the highest stored header height (-1 if none)."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT MAX(height) FROM headers")
+                result = cursor.fetchone()
+                return result[0] if result and result[0] is not None else -1
+        except Exception as e:
+            print(f"Error getting header height: {e}")
+            return -1
+    
     def store_block(self, block: Block) -> bool:
         """
         Store full block.
@@ -444,8 +484,9 @@ class StorageManager:
         """
         try:
             block_bytes = self._serialize_block(block)
-            block_hash = block.calculate_hash().encode()
-            header_hash = block.calculate_hash().encode()
+            # Key by the block's own hash so get_block() matches get_header()
+            block_hash = (block.block_hash if hasattr(block, 'block_hash') and block.block_hash else block.calculate_hash()).encode()
+            header_hash = block_hash
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -636,6 +677,47 @@ class StorageManager:
             print(f"Error getting commitment CID: {e}")
             return None
     
+    def store_peer_snapshots(self, snapshots: List[tuple]) -> bool:
+        """
+        Store peer metadata snapshots in one transaction.
+        
+        Args:
+            snapshots: List of (peer_id, meta dict, last_seen) tuples
+            
+        Returns:
+            True if successful
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO peer_index 
+                    (peer_id, meta, last_seen)
+                    VALUES (?, ?, ?)
+                """, [(peer_id, json.dumps(meta), int(last_seen)) for peer_id, meta, last_seen in snapshots])
+                conn.commit()
+            
+            return True
+        except Exception as e:
+            print(f"Error storing peer snapshots: {e}")
+            return False
+    
+    def get_peer_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all peer metadata snapshots.
+        
+        Returns:
+            Dict of peer_id -> meta dict
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT peer_id, meta FROM peer_index")
+                return {peer_id: json.loads(meta) for peer_id, meta in cursor.fetchall() if meta}
+        except Exception as e:
+            print(f"Error getting peer snapshots: {e}")
+            return {}
+    
     def store_proof_bundle(self, bundle_data: bytes) -> Optional[str]:
         """
         Store proof bundle in IPFS.
@@ -712,12 +794,21 @@ class StorageManager:
         except Exception as e:
             print(f"Error during pruning: {e}")
     
-    def batch_write(self, operations: List[tuple]):
+    def batch_write(self, operations: List[tuple]) -> bool:
         """
         Batch write operations for performance.
         
+        All operations are committed in a single transaction, so after a
+        crash either the whole batch is on disk or none of it is.
+        
         Args:
-            operations: List of (operation_type, data) tuples
+            operations: List of (operation_type, data) tuples, where
+                operation_type is "header" (block or (block, header_bytes)),
+                "block", "work_index" ((height, work, hash)), "tip"
+                ((hash, work)) or "commitment" ((commitment, cid, type, capacity))
+            
+        Returns:
+            True if committed
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -725,14 +816,23 @@ class StorageManager:
                 
                 for op_type, data in operations:
                     if op_type == "header":
-                        header, header_bytes = data
-                        header_hash = header.calculate_hash().encode()
+                        header, header_bytes = data if isinstance(data, tuple) else (data, self._serialize_header(data))
+                        header_hash = (header.block_hash or header.calculate_hash()).encode()
                         cursor.execute("""
                             INSERT OR REPLACE INTO headers 
                             (header_hash, header_bytes, height, timestamp)
                             VALUES (?, ?, ?, ?)
                         """, (header_hash, header_bytes, header.index, int(header.timestamp)))
                     
+                    elif op_type == "block":
+                        block = data
+                        block_hash = block.block_hash.encode()
+                        cursor.execute("""
+                            INSERT OR REPLACE INTO blocks 
+                            (block_hash, block_bytes, header_hash)
+                            VALUES (?, ?, ?)
+                        """, (block_hash, self._serialize_block(block), block_hash))
+                    
                     elif op_type == "work_index":
                         height, cumulative_work, block_hash = data
                         cursor.execute("""
@@ -740,11 +840,29 @@ class StorageManager:
                             (height, cumulative_work, block_hash)
                             VALUES (?, ?, ?)
                         """, (height, cumulative_work, block_hash.encode()))
+                    
+                    elif op_type == "tip":
+                        tip_hash, cumulative_work = data
+                        cursor.execute("""
+                            INSERT OR REPLACE INTO tips 
+                            (tip_hash, cumulative_work)
+                            VALUES (?, ?)
+                        """, (tip_hash.encode(), cumulative_work))
+                    
+                    elif op_type == "commitment":
+                        commitment, cid, problem_type, capacity = data
+                        cursor.execute("""
+                            INSERT OR REPLACE INTO commit_index 
+                            (commitment, cid, problem_type, capacity)
+                            VALUES (?, ?, ?, ?)
+                        """, (commitment, cid, problem_type, capacity))
                 
                 conn.commit()
-                
+            
+            return True
         except Exception as e:
             print(f"Error in batch write: {e}")
+            return False
     
     def sync(self):
         """Force sync to disk."""
@@ -825,6 +943,7 @@ class StorageManager:
             merkle_root=block_dict['merkle_root'],
             problem=block_dict['problem'],
             solution=block_dict['solution'],
+            complexity=None,  # Not part of the serialized body
             mining_capacity=ProblemTier(block_dict['mining_capacity']),
             cumulative_work_score=block_dict['cumulative_work_score'],
             block_hash=block_dict['block_hash'],
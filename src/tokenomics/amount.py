@@ -0,0 +1,65 @@
+"""
+Fixed-point coin amounts for COINjecture.
+
+Ledger amounts are integers of base units (COIN base units per coin). Integer
+addition is exact and associative, so replaying the same transfers in any
+order yields bit-identical balances on every node. Floats only appear at the
+edges: parsing user or legacy input, and display.
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Union
+
+
+# Integer number of base units
+Amount = int
+
+DECIMALS = 8
+COIN = 10 ** DECIMALS
+
+
+def to_units(coins: Union[int, float, str, Decimal]) -> Amount:
+    """
+    Convert a coin value to base units, rounding half-even at the last unit.
+
+    Floats are read through their shortest repr, so 0.1 becomes exactly
+    10_000_000 units on every platform.
+
+    Args:
+        coins: Amount in coins
+
+    Returns:
+        Amount in base units
+    """
+    if isinstance(coins, bool):
+        raise TypeError("amount cannot be a bool")
+    if isinstance(coins, int):
+        return coins * COIN
+    value = Decimal(str(coins)) if isinstance(coins, float) else Decimal(coins)
+    if not value.is_finite():
+        raise ValueError(f"amount must be finite: {coins!r}")
+    return int((value * COIN).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def to_coins(units: Amount) -> float:
+    """Convert base units to coins for display or float-based APIs."""
+    return units / COIN
+
+
+def format_amount(units: Amount) -> str:
+    """Exact decimal string for an amount, e.g. 150000000 -> '1.50000000'."""
+    sign = "-" if units < 0 else ""
+    whole, fraction = divmod(abs(units), COIN)
+    return f"{sign}{whole}.{fraction:0{DECIMALS}d}"
+
+
+def check_units(amount) -> Amount:
+    """
+    Ensure a ledger amount is an integer of base units.
+
+    Raises:
+        TypeError: If amount is not an int (floats must go through to_units)
+    """
+    if isinstance(amount, bool) or not isinstance(amount, int):
+        raise TypeError(f"amount must be integer base units, got {type(amount).__name__}; use to_units()")
+    return amount
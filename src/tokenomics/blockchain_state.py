@@ -5,35 +5,87 @@ Manages balances, transaction pool, and transaction history for the blockchain.
 """
 
 import time
+import json
+import bisect
 import hashlib
-from typing import Dict, List, Optional, Set
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
 from dataclasses import dataclass, field
 from collections import defaultdict
+from collections.abc import Mapping
+
+try:
+    from .amount import Amount, to_units, to_coins, format_amount, check_units, DECIMALS
+    from .signatures import get_signature_verifier
+    from .block_executor import get_block_executor
+except ImportError:
+    # Fallback for direct execution
+    from amount import Amount, to_units, to_coins, format_amount, check_units, DECIMALS
+    from signatures import get_signature_verifier
+    from block_executor import get_block_executor
+
+
+DEFAULT_STATE_DB = "data/blockchain_state.db"
+
+
+# Fields that determine the signing bytes and id; fixed once constructed
+_IMMUTABLE_FIELDS = frozenset(("sender", "recipient", "amount", "timestamp", "transaction_id"))
 
 
 @dataclass
 class Transaction:
     """
     Enhanced Transaction class with cryptographic signatures.
+    
+    amount is an integer of base units (see tokenomics.amount).
+    
+    The signing bytes and their SHA-256 are computed once in __post_init__;
+    the fields they cover (and transaction_id) cannot be reassigned
+    afterwards, so the cached values never go stale. signature and
+    public_key are set by sign().
     """
     sender: str
     recipient: str
-    amount: float
+    amount: Amount
     timestamp: float
     transaction_id: str = ""
     signature: str = ""
     public_key: str = ""
     
     def __post_init__(self):
-        """Calculate transaction ID after initialization."""
+        """Cache signing bytes and digest, and derive the ID if not given."""
+        check_units(self.amount)
+        # The amount is rendered in coins, as before fixed-point amounts,
+        # so ids and signatures of existing transactions stay valid
+        signing_bytes = f"{self.sender}{self.recipient}{to_coins(self.amount)}{self.timestamp}".encode()
+        digest = hashlib.sha256(signing_bytes).digest()
         if not self.transaction_id:
-            self.transaction_id = self.calculate_transaction_id()
+            self.transaction_id = digest.hex()
+        object.__setattr__(self, "_signing_bytes", signing_bytes)
+        object.__setattr__(self, "_digest", digest)
+    
+    def __setattr__(self, name, value):
+        if name in _IMMUTABLE_FIELDS and "_signing_bytes" in self.__dict__:
+            raise AttributeError(f"Transaction.{name} cannot be changed after construction")
+        object.__setattr__(self, name, value)
+    
+    @property
+    def signing_bytes(self) -> bytes:
+        """Canonical bytes covered by the signature and the ID."""
+        return self._signing_bytes
+    
+    @property
+    def signing_digest(self) -> bytes:
+        """SHA-256 of signing_bytes (the raw form of the computed ID)."""
+        return self._digest
+    
+    def _signing_data(self) -> bytes:
+        return self._signing_bytes
     
     def calculate_transaction_id(self) -> str:
         """Calculate unique transaction ID from transaction data."""
-        # Create hash of transaction data (excluding signature and public_key)
-        data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-        return hashlib.sha256(data).hexdigest()
+        # Hash of transaction data (excluding signature and public_key), computed at construction
+        return self._digest.hex()
     
     def sign(self, private_key_bytes: bytes) -> str:
         """
@@ -60,8 +112,7 @@ class Transaction:
             ).hex()
             
             # Sign transaction data
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature = private_key.sign(transaction_data)
+            signature = private_key.sign(self._signing_data())
             self.signature = signature.hex()
             
             return self.signature
@@ -73,26 +124,14 @@ class Transaction:
         """
         Verify transaction signature.
         
+        Goes through the shared SignatureVerifier, so a transaction already
+        verified (e.g. on mempool admission) is answered from its cache.
+        
         Returns:
             True if signature is valid
         """
         try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            from cryptography.hazmat.primitives import serialization
-            
-            if not self.signature or not self.public_key:
-                return False
-            
-            # Load public key
-            public_key_bytes = bytes.fromhex(self.public_key)
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
-            
-            # Verify signature
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature_bytes = bytes.fromhex(self.signature)
-            
-            public_key.verify(signature_bytes, transaction_data)
-            return True
+            return get_signature_verifier().verify_transaction(self)
         except Exception:
             return False
     
@@ -102,7 +141,8 @@ class Transaction:
             'transaction_id': self.transaction_id,
             'sender': self.sender,
             'recipient': self.recipient,
-            'amount': self.amount,
+            'amount': to_coins(self.amount),
+            'amount_units': self.amount,
             'timestamp': self.timestamp,
             'signature': self.signature,
             'public_key': self.public_key
@@ -111,10 +151,12 @@ class Transaction:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Transaction':
         """Create transaction from dictionary."""
+        # Dictionaries written before fixed-point amounts only carry coins
+        units = data['amount_units'] if 'amount_units' in data else to_units(data['amount'])
         tx = cls(
             sender=data['sender'],
             recipient=data['recipient'],
-            amount=data['amount'],
+            amount=units,
             timestamp=data['timestamp'],
             transaction_id=data.get('transaction_id', ''),
             signature=data.get('signature', ''),
@@ -123,50 +165,285 @@ class Transaction:
         return tx
     
     def __str__(self):
-        return f"Transaction {self.transaction_id[:8]}...: {self.sender} -> {self.recipient} ({self.amount})"
+        return f"Transaction {self.transaction_id[:8]}...: {self.sender} -> {self.recipient} ({format_amount(self.amount)})"
+
+
+class TransactionStore:
+    """
+    Processed transactions keyed by id, with per-address indexes.
+
+    Each transaction is stored once. The address indexes hold only ids, kept
+    in timestamp order so history queries read the newest entries directly.
+    """
+    
+    def __init__(self):
+        """Initialize empty store."""
+        self._transactions: Dict[str, Transaction] = {}
+        # Per address: parallel lists of timestamps and ids, oldest first
+        self._times: Dict[str, List[float]] = {}
+        self._ids: Dict[str, List[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._transactions)
+    
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._transactions
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._transactions.values())
+    
+    def _addresses(self, transaction: Transaction) -> List[str]:
+        if transaction.sender == transaction.recipient:
+            return [transaction.sender]
+        return [transaction.sender, transaction.recipient]
+    
+    def add(self, transaction: Transaction) -> bool:
+        """
+        Store a transaction and index it under sender and recipient.
+        
+        Args:
+            transaction: Transaction to store
+            
+        Returns:
+            True if stored, False if the id was already present
+        """
+        if transaction.transaction_id in self._transactions:
+            return False
+        self._transactions[transaction.transaction_id] = transaction
+        for address in self._addresses(transaction):
+            times = self._times.setdefault(address, [])
+            ids = self._ids.setdefault(address, [])
+            # Usually appends: transactions arrive roughly in time order
+            position = bisect.bisect_right(times, transaction.timestamp)
+            times.insert(position, transaction.timestamp)
+            ids.insert(position, transaction.transaction_id)
+        return True
+    
+    def remove(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        Remove a transaction and its index entries.
+        
+        Args:
+            transaction_id: Id of the transaction to remove
+            
+        Returns:
+            The removed transaction, or None if unknown
+        """
+        transaction = self._transactions.pop(transaction_id, None)
+        if transaction is None:
+            return None
+        for address in self._addresses(transaction):
+            times, ids = self._times[address], self._ids[address]
+            start = bisect.bisect_left(times, transaction.timestamp)
+            end = bisect.bisect_right(times, transaction.timestamp)
+            position = ids.index(transaction_id, start, end)
+            del times[position]
+            del ids[position]
+            if not ids:
+                del self._times[address]
+                del self._ids[address]
+        return transaction
+    
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by id."""
+        return self._transactions.get(transaction_id)
+    
+    def addresses(self) -> List[str]:
+        """Addresses with at least one transaction."""
+        return list(self._ids)
+    
+    def count(self, address: str) -> int:
+        """Number of transactions involving an address."""
+        return len(self._ids.get(address, ()))
+    
+    def history(self, address: str, limit: Optional[int] = None, newest_first: bool = True) -> List[Transaction]:
+        """
+        Get transactions involving an address in timestamp order.
+        
+        Args:
+            address: Wallet address
+            limit: Maximum number of transactions to return (None for all)
+            newest_first: Newest first if True, oldest first otherwise
+            
+        Returns:
+            List of transactions
+        """
+        ids = self._ids.get(address)
+        if not ids:
+            return []
+        if limit is None or limit >= len(ids):
+            selected = reversed(ids) if newest_first else ids
+        elif newest_first:
+            selected = reversed(ids[len(ids) - max(limit, 0):])
+        else:
+            selected = ids[:max(limit, 0)]
+        return [self._transactions[tx_id] for tx_id in selected]
+
+
+class TransactionHistoryView(Mapping):
+    """
+    Read-only address -> transactions mapping over a TransactionStore.
+    
+    Keeps the shape of the former transaction_history dict; lists are built
+    on access, oldest first. Unknown addresses map to an empty list.
+    """
+    
+    def __init__(self, store: TransactionStore):
+        self._store = store
+    
+    def __getitem__(self, address: str) -> List[Transaction]:
+        return self._store.history(address, newest_first=False)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.addresses())
+    
+    def __len__(self) -> int:
+        return len(self._store.addresses())
+    
+    def __contains__(self, address) -> bool:
+        return self._store.count(address) > 0
+    
+    def get(self, address: str, default=None) -> List[Transaction]:
+        if address in self:
+            return self[address]
+        return [] if default is None else default
 
 
 class BlockchainState:
     """
     Manages blockchain state including balances, transaction pool, and history.
+    
+    With a db_path, state is persisted incrementally to SQLite (see
+    state_store); otherwise it is held in memory and saved as JSON.
     """
     
-    def __init__(self):
-        """Initialize blockchain state."""
-        # Address balances
-        self.balances: Dict[str, float] = defaultdict(float)
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize blockchain state.
         
-        # Transaction pool (pending transactions)
-        self.pending_transactions: List[Transaction] = []
+        Args:
+            db_path: SQLite state database (None keeps state in memory)
+        """
+        try:
+            from .mempool import Mempool
+            from .state_store import StateStore, SQLiteTransactionStore, ProcessedIdSet
+        except ImportError:
+            # Fallback for direct execution
+            from mempool import Mempool
+            from state_store import StateStore, SQLiteTransactionStore, ProcessedIdSet
+        
+        self.store = StateStore(db_path) if db_path else None
+        self._undo: Optional[Dict[str, Optional[Amount]]] = None
         
-        # Transaction history by address
-        self.transaction_history: Dict[str, List[Transaction]] = defaultdict(list)
+        # Address balances (integer base units)
+        self.balances: Dict[str, Amount] = defaultdict(int)
+        if self.store is not None:
+            self.balances.update(self.store.load_balances())
         
+        # Transaction pool (pending transactions)
+        self.mempool = Mempool(balance_of=self.get_balance)
+        if self.store is not None:
+            for data in self.store.load_pending():
+                self.mempool.add(Transaction.from_dict(json.loads(data)))
+        
+        # Processed transactions by id, indexed by address
         # Set of processed transaction IDs to prevent double-spending
-        self.processed_transactions: Set[str] = set()
+        if self.store is not None:
+            self.transactions = SQLiteTransactionStore(self.store)
+            self.processed_transactions = ProcessedIdSet(self.store)
+        else:
+            self.transactions = TransactionStore()
+            self.processed_transactions: Set[str] = set()
         
         # Genesis block reward address (if any)
         self.genesis_address: Optional[str] = None
     
-    def update_balance(self, address: str, amount: float) -> bool:
+    @contextmanager
+    def atomic(self):
+        """
+        Apply the enclosed changes as one unit.
+        
+        With a state database, everything inside commits together; on error
+        the database rolls back and in-memory balances are restored. Nested
+        use joins the outer unit. Without a database this is a no-op.
+        """
+        if self.store is None or self._undo is not None:
+            yield
+            return
+        self._undo = {}
+        try:
+            with self.store.transaction():
+                yield
+        except BaseException:
+            for address, balance in self._undo.items():
+                if balance is None:
+                    self.balances.pop(address, None)
+                else:
+                    self.balances[address] = balance
+            raise
+        finally:
+            self._undo = None
+    
+    def _set_balance(self, address: str, balance: Amount):
+        if self._undo is not None and address not in self._undo:
+            self._undo[address] = self.balances.get(address)
+        self.balances[address] = balance
+        if self.store is not None:
+            self.store.set_balance(address, balance)
+    
+    @property
+    def pending_transactions(self) -> List[Transaction]:
+        """Pending transactions in arrival order."""
+        return list(self.mempool)
+    
+    @property
+    def transaction_history(self) -> TransactionHistoryView:
+        """Read-only view of processed transactions by address."""
+        return TransactionHistoryView(self.transactions)
+    
+    def record_transaction(self, transaction: Transaction) -> bool:
+        """
+        Add a transaction to history without touching balances.
+        
+        Args:
+            transaction: Transaction to record
+            
+        Returns:
+            True if recorded, False if already present
+        """
+        return self.transactions.add(transaction)
+    
+    def remove_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        Remove a transaction from history (e.g. when its block is disconnected).
+        
+        Args:
+            transaction_id: Id of the transaction to remove
+            
+        Returns:
+            The removed transaction, or None if unknown
+        """
+        return self.transactions.remove(transaction_id)
+    
+    def update_balance(self, address: str, amount: Amount) -> bool:
         """
         Update address balance.
         
         Args:
             address: Wallet address
-            amount: Amount to add (positive) or subtract (negative)
+            amount: Base units to add (positive) or subtract (negative)
             
         Returns:
             True if successful
         """
         try:
-            self.balances[address] += amount
+            self._set_balance(address, self.balances.get(address, 0) + check_units(amount))
             return True
         except Exception as e:
             print(f"Error updating balance: {e}")
             return False
     
-    def get_balance(self, address: str) -> float:
+    def get_balance(self, address: str) -> Amount:
         """
         Get current balance for address.
         
@@ -174,9 +451,9 @@ class BlockchainState:
             address: Wallet address
             
         Returns:
-            Current balance
+            Current balance in base units
         """
-        return self.balances.get(address, 0.0)
+        return self.balances.get(address, 0)
     
     def add_transaction(self, transaction: Transaction) -> bool:
         """
@@ -193,13 +470,8 @@ class BlockchainState:
             if not self.validate_transaction(transaction):
                 return False
             
-            # Check if already in pool
-            if any(tx.transaction_id == transaction.transaction_id for tx in self.pending_transactions):
-                return False
-            
-            # Add to pending pool
-            self.pending_transactions.append(transaction)
-            return True
+            # Add to pending pool (rejects duplicates and double-pending funds)
+            return self.mempool.add(transaction)
         except Exception as e:
             print(f"Error adding transaction: {e}")
             return False
@@ -258,34 +530,41 @@ class BlockchainState:
         Returns:
             List of pending transactions
         """
-        # Sort by timestamp (oldest first)
-        sorted_transactions = sorted(self.pending_transactions, key=lambda tx: tx.timestamp)
-        return sorted_transactions[:max_count]
+        # Highest priority first, oldest first among equals
+        return self.mempool.select(max_count)
     
-    def process_transactions(self, transactions: List[Transaction]) -> bool:
+    def verify_transactions(self, transactions: List[Transaction]) -> List[bool]:
         """
-        Process transactions and update balances.
+        Verify a block's signatures in one batch (coinbase counts as valid).
+        
+        Args:
+            transactions: Transactions of one block
+            
+        Returns:
+            Validity per transaction, in input order
+        """
+        return get_signature_verifier().verify_transactions(transactions)
+    
+    def process_transactions(self, transactions: List[Transaction], verify_signatures: bool = False) -> bool:
+        """
+        Process transactions (one block) and update balances atomically.
+        
+        Applied by the block executor (see block_executor): signatures are
+        checked in one batch and each touched balance is written once, with
+        the same result as applying the transactions one by one.
         
         Args:
             transactions: List of transactions to process
+            verify_signatures: Reject the block unless every signature verifies
             
         Returns:
             True if all processed successfully
         """
         try:
-            for transaction in transactions:
-                # Update balances
-                if transaction.sender != "COINBASE":
-                    self.update_balance(transaction.sender, -transaction.amount)
-                self.update_balance(transaction.recipient, transaction.amount)
-                
-                # Add to history
-                self.transaction_history[transaction.sender].append(transaction)
-                self.transaction_history[transaction.recipient].append(transaction)
-                
-                # Mark as processed
-                self.processed_transactions.add(transaction.transaction_id)
-            
+            result = get_block_executor().execute(self, transactions, verify_signatures)
+            if not result.success:
+                print("Error processing transactions: invalid signature in block")
+                return False
             return True
         except Exception as e:
             print(f"Error processing transactions: {e}")
@@ -298,27 +577,21 @@ class BlockchainState:
         Args:
             processed_transactions: Transactions that were included in a block
         """
-        processed_ids = {tx.transaction_id for tx in processed_transactions}
-        self.pending_transactions = [
-            tx for tx in self.pending_transactions 
-            if tx.transaction_id not in processed_ids
-        ]
+        self.mempool.remove_many(tx.transaction_id for tx in processed_transactions)
     
-    def get_transaction_history(self, address: str, limit: int = 100) -> List[Transaction]:
+    def get_transaction_history(self, address: str, limit: Optional[int] = 100) -> List[Transaction]:
         """
         Get transaction history for address.
         
         Args:
             address: Wallet address
-            limit: Maximum number of transactions to return
+            limit: Maximum number of transactions to return (None for all)
             
         Returns:
             List of transactions involving the address
         """
-        history = self.transaction_history.get(address, [])
-        # Sort by timestamp (newest first)
-        sorted_history = sorted(history, key=lambda tx: tx.timestamp, reverse=True)
-        return sorted_history[:limit]
+        # The address index is already in timestamp order
+        return self.transactions.history(address, limit)
     
     def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
         """
@@ -330,26 +603,18 @@ class BlockchainState:
         Returns:
             Transaction if found, None otherwise
         """
-        # Search in pending transactions
-        for tx in self.pending_transactions:
-            if tx.transaction_id == transaction_id:
-                return tx
-        
-        # Search in history
-        for address_history in self.transaction_history.values():
-            for tx in address_history:
-                if tx.transaction_id == transaction_id:
-                    return tx
-        
-        return None
+        pending = self.mempool.get(transaction_id)
+        if pending is not None:
+            return pending
+        return self.transactions.get(transaction_id)
     
-    def create_coinbase_transaction(self, recipient: str, amount: float, timestamp: float = None) -> Transaction:
+    def create_coinbase_transaction(self, recipient: str, amount: Amount, timestamp: float = None) -> Transaction:
         """
         Create coinbase transaction for block rewards.
         
         Args:
             recipient: Miner's address
-            amount: Reward amount
+            amount: Reward in base units
             timestamp: Transaction timestamp (defaults to current time)
             
         Returns:
@@ -365,8 +630,8 @@ class BlockchainState:
             timestamp=timestamp
         )
     
-    def get_total_supply(self) -> float:
-        """Get total coin supply."""
+    def get_total_supply(self) -> Amount:
+        """Get total coin supply in base units."""
         return sum(self.balances.values())
     
     def get_network_stats(self) -> Dict:
@@ -374,7 +639,7 @@ class BlockchainState:
         return {
             'total_addresses': len(self.balances),
             'total_supply': self.get_total_supply(),
-            'pending_transactions': len(self.pending_transactions),
+            'pending_transactions': len(self.mempool),
             'processed_transactions': len(self.processed_transactions),
             'top_balances': dict(sorted(self.balances.items(), key=lambda x: x[1], reverse=True)[:10])
         }
@@ -382,34 +647,55 @@ class BlockchainState:
     def to_dict(self) -> Dict:
         """Convert blockchain state to dictionary for serialization."""
         return {
+            'amount_decimals': DECIMALS,
             'balances': dict(self.balances),
             'pending_transactions': [tx.to_dict() for tx in self.pending_transactions],
-            'transaction_history': {
-                addr: [tx.to_dict() for tx in txs] 
-                for addr, txs in self.transaction_history.items()
-            },
+            'transactions': [tx.to_dict() for tx in self.transactions],
             'processed_transactions': list(self.processed_transactions)
         }
     
     def from_dict(self, data: Dict):
-        """Load blockchain state from dictionary."""
-        self.balances = defaultdict(float, data.get('balances', {}))
-        self.pending_transactions = [
-            Transaction.from_dict(tx_data) 
-            for tx_data in data.get('pending_transactions', [])
-        ]
-        self.transaction_history = defaultdict(list, {
-            addr: [Transaction.from_dict(tx_data) for tx_data in txs]
-            for addr, txs in data.get('transaction_history', {}).items()
-        })
-        self.processed_transactions = set(data.get('processed_transactions', []))
+        """Load blockchain state from dictionary (replacing any stored state)."""
+        if 'transactions' in data:
+            records = data['transactions']
+        else:
+            # Older files stored each transaction under both addresses
+            records = [tx_data for txs in data.get('transaction_history', {}).values() for tx_data in txs]
+        
+        with self.atomic():
+            if self.store is not None:
+                self.store.clear()
+            else:
+                self.transactions = TransactionStore()
+                self.processed_transactions = set()
+            self.balances = defaultdict(int)
+            # Files written before fixed-point amounts hold balances in coins
+            fixed_point = 'amount_decimals' in data
+            for address, balance in data.get('balances', {}).items():
+                self._set_balance(address, balance if fixed_point else to_units(balance))
+            for tx_data in records:
+                self.transactions.add(Transaction.from_dict(tx_data))
+            for tx_id in data.get('processed_transactions', []):
+                self.processed_transactions.add(tx_id)
+        
+        self.mempool.clear()
+        for tx_data in data.get('pending_transactions', []):
+            self.mempool.add(Transaction.from_dict(tx_data))
     
     def save_state(self, filepath: str = "data/blockchain_state.json") -> bool:
-        """Save blockchain state to file."""
+        """
+        Save blockchain state to file.
+        
+        With a state database, processed state is already on disk; only the
+        pending pool is written, and filepath is unused.
+        """
         try:
-            import json
             import os
             
+            if self.store is not None:
+                self.store.save_pending({tx.transaction_id: json.dumps(tx.to_dict()) for tx in self.mempool})
+                return True
+            
             # Ensure directory exists
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
@@ -425,14 +711,20 @@ class BlockchainState:
             return False
     
     def load_state(self, filepath: str = "data/blockchain_state.json") -> bool:
-        """Load blockchain state from file."""
+        """
+        Load blockchain state from file.
+        
+        With a state database, state is already loaded; a JSON file is only
+        imported when the database is still empty (one-time migration).
+        """
         try:
-            import json
             import os
             
             if not os.path.exists(filepath):
                 # File doesn't exist, start with empty state
                 return True
+            if self.store is not None and (self.balances or len(self.transactions)):
+                return True
             
             with open(filepath, 'r') as f:
                 data = json.load(f)
@@ -458,19 +750,19 @@ if __name__ == "__main__":
     test_address2 = "CJabcdef1234567890abcdef1234567890abcdef12"
     
     # Test balance operations
-    state.update_balance(test_address1, 100.0)
-    state.update_balance(test_address2, 50.0)
+    state.update_balance(test_address1, to_units(100))
+    state.update_balance(test_address2, to_units(50))
     
-    print(f"✅ Balance {test_address1}: {state.get_balance(test_address1)}")
-    print(f"✅ Balance {test_address2}: {state.get_balance(test_address2)}")
+    print(f"✅ Balance {test_address1}: {format_amount(state.get_balance(test_address1))}")
+    print(f"✅ Balance {test_address2}: {format_amount(state.get_balance(test_address2))}")
     
     # Test coinbase transaction
-    coinbase_tx = state.create_coinbase_transaction(test_address1, 10.0)
+    coinbase_tx = state.create_coinbase_transaction(test_address1, to_units(10))
     print(f"✅ Created coinbase transaction: {coinbase_tx}")
     
     # Test transaction processing
     state.process_transactions([coinbase_tx])
-    print(f"✅ Balance after coinbase: {state.get_balance(test_address1)}")
+    print(f"✅ Balance after coinbase: {format_amount(state.get_balance(test_address1))}")
     
     # Test network stats
     stats = state.get_network_stats()
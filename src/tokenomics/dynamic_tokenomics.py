@@ -16,10 +16,12 @@ Key Features:
 from __future__ import annotations
 import time
 import math
+import hashlib
+import bisect
 import random
 import statistics
 from dataclasses import dataclass, field
-from typing import Optional, Tuple
+from typing import Callable, Iterator, Optional, Tuple
 from collections import deque
 from enum import Enum
 
@@ -34,6 +36,11 @@ from core.blockchain import (
     solve_subset_sum, subset_sum_complexity, EnergyMetrics
 )
 
+try:
+    from .amount import Amount, to_units, to_coins, format_amount
+except ImportError:
+    from tokenomics.amount import Amount, to_units, to_coins, format_amount
+
 
 @dataclass
 class HardwareProfile:
@@ -58,13 +65,115 @@ class WorkScoreRecord:
     """Record of work done in a block"""
     block_number: int
     work_score: float
-    reward: float
+    reward: Amount  # Base units
     capacity: ProblemTier
     problem_size: int
     measured_solve_time: float
     measured_verify_time: float
     asymmetry_ratio: float
     timestamp: float
+    block_hash: str = ""
+    miner_address: Optional[str] = None
+    coinbase_id: Optional[str] = None  # Coinbase transaction crediting the reward
+
+
+# Rolling window sizes (blocks)
+NETWORK_WINDOW = 100
+CAPACITY_WINDOW = 50
+TIMING_WINDOW = 100
+
+# Recent records kept for reorgs; older history is summarized by the windows
+HISTORY_RETENTION = 1000
+
+
+class RollingWindow:
+    """
+    The last `size` values with a running sum and, optionally, a running median.
+    
+    Appends and pops cost O(1) for the sum (the sum is re-added exactly
+    once per `size` appends so float error cannot accumulate) and O(log n)
+    plus a short memmove for the sorted copy behind the median. Supports
+    appendleft so a window can refill from older history after a pop.
+    """
+    
+    def __init__(self, size: int, track_median: bool = False):
+        self.size = max(1, size)
+        self._values: deque = deque(maxlen=self.size)
+        self._sorted: Optional[list] = [] if track_median else None
+        self._sum = 0.0
+        self._updates = 0
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._values)
+    
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+    
+    def _insert(self, value: float):
+        self._sum += value
+        if self._sorted is not None:
+            bisect.insort(self._sorted, value)
+    
+    def _discard(self, value: float):
+        self._sum -= value
+        if self._sorted is not None:
+            del self._sorted[bisect.bisect_left(self._sorted, value)]
+    
+    def _tick(self):
+        self._updates += 1
+        if self._updates >= self.size:
+            self._sum = math.fsum(self._values)
+            self._updates = 0
+    
+    def append(self, value: float):
+        """Add the newest value, evicting the oldest once full."""
+        if len(self._values) == self.size:
+            self._discard(self._values[0])
+        self._values.append(value)
+        self._insert(value)
+        self._tick()
+    
+    def appendleft(self, value: float):
+        """Add a value older than every value in the window (ignored if full)."""
+        if len(self._values) < self.size:
+            self._values.appendleft(value)
+            self._insert(value)
+            self._tick()
+    
+    def pop(self) -> float:
+        """Remove and return the newest value."""
+        value = self._values.pop()
+        self._discard(value)
+        self._tick()
+        return value
+    
+    def clear(self):
+        self._values.clear()
+        if self._sorted is not None:
+            self._sorted.clear()
+        self._sum = 0.0
+        self._updates = 0
+    
+    @property
+    def total(self) -> float:
+        return self._sum if self._values else 0.0
+    
+    def mean(self) -> float:
+        """Mean of the window (0.0 when empty)."""
+        return self._sum / len(self._values) if self._values else 0.0
+    
+    def median(self) -> float:
+        """Median of the window, averaging the middle pair like statistics.median."""
+        if self._sorted is None:
+            raise ValueError("window does not track its median")
+        n = len(self._sorted)
+        if n == 0:
+            raise statistics.StatisticsError("no median for empty data")
+        mid = n // 2
+        return self._sorted[mid] if n % 2 else (self._sorted[mid - 1] + self._sorted[mid]) / 2
 
 
 @dataclass
@@ -77,6 +186,9 @@ class CapacityMetrics:
     avg_solve_time: float
     avg_asymmetry: float
     recent_records: deque
+    work_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
+    solve_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
+    asymmetry_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
 
 
 @dataclass
@@ -97,31 +209,47 @@ class DynamicWorkScoreTokenomics:
     # EVERYTHING ELSE IS DYNAMIC
     # ============================================
     
-    def __init__(self, blockchain_state=None):
-        # Track actual network behavior
-        self.work_score_history: list[WorkScoreRecord] = []
+    def __init__(self, blockchain_state=None, history_retention: int = HISTORY_RETENTION,
+                 miner_resolver: Optional[Callable[[Block], Optional[str]]] = None):
+        # Track actual network behavior (bounded; older blocks live on in the windows)
+        self.work_score_history: deque[WorkScoreRecord] = deque(maxlen=max(NETWORK_WINDOW, history_retention))
         self.capacity_performance: dict[ProblemTier, CapacityMetrics] = {}
+        self.blocks_recorded: int = 0
+        
+        # Network-wide rolling windows, updated in record_block()
+        self.recent_work_scores = RollingWindow(NETWORK_WINDOW)
+        self.recent_work_scores_half = RollingWindow(NETWORK_WINDOW // 2)
+        self.recent_work_rates = RollingWindow(NETWORK_WINDOW)  # work score per solve second
         
         # Dynamic supply emerges from network growth
         self.cumulative_work_score: float = 0.0
-        self.total_coins_issued: float = 0.0
+        self.total_coins_issued: Amount = 0  # Base units
         
         # Dynamic block time emerges from verification performance
-        self.recent_verification_times: deque = deque(maxlen=100)
-        self.recent_solve_times: deque = deque(maxlen=100)
+        self.recent_verification_times = RollingWindow(TIMING_WINDOW, track_median=True)
+        self.recent_solve_times = RollingWindow(TIMING_WINDOW)
         
         # Blockchain state for wallet integration
         self.blockchain_state = blockchain_state
+        # Maps a block connected by a chain delta to its miner's address
+        self.miner_resolver = miner_resolver
+        
+        # Bumped whenever recorded blocks change; versions the dynamics snapshot
+        self.version: int = 0
+        self._dynamics_snapshot: Optional[Tuple[int, dict, dict]] = None
         
     def calculate_block_reward(self,
                               block: Block,
-                              complexity: ComputationalComplexity) -> float:
+                              complexity: ComputationalComplexity) -> Amount:
         """
         Reward is purely a function of:
         1. This block's work score relative to recent network work
         2. The marginal contribution this work makes to cumulative progress
         
         NO static targets, NO arbitrary multipliers.
+        
+        Returns the reward in integer base units, so issuance and balances
+        add up exactly.
         """
         
         # 1. Get this block's work score (already calculated from complexity)
@@ -147,24 +275,27 @@ class DynamicWorkScoreTokenomics:
         # 5. Apply diversity bonus for underrepresented capacities
         diversity_bonus = self._calculate_diversity_bonus(block.mining_capacity)
         
-        # 6. Final reward
+        # 6. Final reward, rounded once to base units
         reward = base_reward * deflation_factor * diversity_bonus
         
-        return reward
+        return to_units(reward)
     
-    def _get_recent_average_work(self, window: int = 100) -> float:
+    def _get_recent_average_work(self, window: int = NETWORK_WINDOW) -> float:
         """
         Calculate average work score from recent blocks.
         This creates a moving baseline - no static target needed.
+        
+        The default window is read from a running sum in O(1).
         """
         
-        if len(self.work_score_history) < window:
-            window = len(self.work_score_history)
+        if window == NETWORK_WINDOW:
+            return self.recent_work_scores.mean() if len(self.recent_work_scores) else 1.0  # Genesis default
         
-        if window == 0:
+        window = min(window, len(self.work_score_history))
+        if window <= 0:
             return 1.0  # Genesis default
         
-        recent_scores = [record.work_score for record in self.work_score_history[-window:]]
+        recent_scores = [self.work_score_history[-i].work_score for i in range(1, window + 1)]
         return statistics.mean(recent_scores)
     
     def _calculate_deflation_factor(self) -> float:
@@ -199,14 +330,22 @@ class DynamicWorkScoreTokenomics:
         dominating the network.
         """
         
-        # Get current market dynamics
-        dynamics = self.get_capacity_market_dynamics()
+        # Get current market dynamics (memoized until the next recorded block)
+        _, dynamics, bonuses = self._get_dynamics_snapshot()
+        
+        if capacity in bonuses:
+            return bonuses[capacity]
         
         if capacity not in dynamics:
             # No data yet - no bonus
             return 1.0
         
-        market_share = dynamics[capacity]['market_share']
+        bonuses[capacity] = bonus = self._diversity_bonus_for_share(dynamics[capacity]['market_share'])
+        return bonus
+    
+    @staticmethod
+    def _diversity_bonus_for_share(market_share: float) -> float:
+        """Bonus multiplier for a capacity's market share"""
         
         # Apply bonus based on market share
         # Lower market share = higher bonus
@@ -221,12 +360,13 @@ class DynamicWorkScoreTokenomics:
         else:
             return 1.0  # No bonus/penalty for balanced representation
     
-    def record_block(self, block: Block, complexity: ComputationalComplexity, reward: float, miner_address: str = None):
+    def record_block(self, block: Block, complexity: ComputationalComplexity, reward: Amount, miner_address: str = None):
         """Record block metrics for dynamic adjustment and credit rewards to miner"""
         
         block_work_score = calculate_computational_work_score(complexity)
         
         # Update cumulative metrics
+        self.version += 1
         self.cumulative_work_score += block_work_score
         self.total_coins_issued += reward
         
@@ -240,10 +380,16 @@ class DynamicWorkScoreTokenomics:
             measured_solve_time=complexity.measured_solve_time,
             measured_verify_time=complexity.measured_verify_time,
             asymmetry_ratio=complexity.asymmetry_time,
-            timestamp=block.timestamp
+            timestamp=block.timestamp,
+            block_hash=block.block_hash,
+            miner_address=miner_address
         )
         
         self.work_score_history.append(record)
+        self.blocks_recorded += 1
+        self.recent_work_scores.append(record.work_score)
+        self.recent_work_scores_half.append(record.work_score)
+        self.recent_work_rates.append(self._work_rate(record))
         
         # Update capacity-specific metrics
         self._update_capacity_metrics(block.mining_capacity, record)
@@ -259,17 +405,105 @@ class DynamicWorkScoreTokenomics:
             
             # Create coinbase transaction
             from .blockchain_state import Transaction
+            # Keyed by block so equal rewards at equal timestamps stay distinct
+            coinbase_id = hashlib.sha256(f"COINBASE{block.block_hash}".encode()).hexdigest() if block.block_hash else ""
             coinbase_tx = Transaction(
                 sender="COINBASE",
                 recipient=miner_address,
                 amount=reward,
-                timestamp=block.timestamp
+                timestamp=block.timestamp,
+                transaction_id=coinbase_id
             )
             
             # Add to transaction history
-            self.blockchain_state.transaction_history[miner_address].append(coinbase_tx)
+            if self.blockchain_state.record_transaction(coinbase_tx):
+                record.coinbase_id = coinbase_tx.transaction_id
+            
+            print(f"💰 Credited {format_amount(reward)} coins to miner {miner_address}")
+    
+    def connect_block(self, block: Block, miner_address: str = None) -> Amount:
+        """Reward and record a block joining the best chain; returns the reward."""
+        reward = self.calculate_block_reward(block, block.complexity)
+        self.record_block(block, block.complexity, reward, miner_address)
+        return reward
+    
+    def disconnect_block(self, block: Block, settle_balance: bool = True) -> bool:
+        """
+        Undo record_block() for the current best-chain tip during a reorg.
+        
+        Only the most recently recorded block can be disconnected, back to
+        the retained history. Network windows refill from that history;
+        capacity and timing windows that already dropped older samples stay
+        short until new blocks refill them.
+        
+        Args:
+            block: Block being disconnected
+            settle_balance: Debit the miner's reward and drop its coinbase record
             
-            print(f"💰 Credited {reward:.6f} coins to miner {miner_address}")
+        Returns:
+            True if the block was the last record and has been undone
+        """
+        if not self.work_score_history:
+            return False
+        record = self.work_score_history[-1]
+        if record.block_number != block.index or (record.block_hash and record.block_hash != block.block_hash):
+            return False
+        
+        self.work_score_history.pop()
+        self.version += 1
+        self.blocks_recorded -= 1
+        self.cumulative_work_score -= record.work_score
+        self.total_coins_issued -= record.reward
+        
+        history = self.work_score_history
+        for window in (self.recent_work_scores, self.recent_work_scores_half, self.recent_work_rates):
+            window.pop()
+            if len(history) > len(window):
+                older = history[-len(window) - 1]
+                window.appendleft(self._work_rate(older) if window is self.recent_work_rates else older.work_score)
+        
+        metrics = self.capacity_performance.get(record.capacity)
+        if metrics:
+            metrics.blocks_mined -= 1
+            metrics.total_work_score -= record.work_score
+            if metrics.recent_records and metrics.recent_records[-1] is record:
+                metrics.recent_records.pop()
+                metrics.work_window.pop()
+                metrics.solve_window.pop()
+                metrics.asymmetry_window.pop()
+            if metrics.blocks_mined <= 0:
+                del self.capacity_performance[record.capacity]
+            elif metrics.recent_records:
+                self._recalculate_capacity_averages(metrics)
+        
+        if self.recent_verification_times:
+            self.recent_verification_times.pop()
+        if self.recent_solve_times:
+            self.recent_solve_times.pop()
+        
+        if settle_balance and self.blockchain_state and record.miner_address:
+            self.blockchain_state.update_balance(record.miner_address, -record.reward)
+            if record.coinbase_id:
+                self.blockchain_state.remove_transaction(record.coinbase_id)
+        
+        return True
+    
+    def apply_chain_delta(self, delta) -> None:
+        """
+        Apply a consensus ChainDelta: disconnect the old branch tip-first,
+        then connect the new branch. Usable as a ConsensusEngine chain listener.
+        
+        New-branch rewards are credited to the miner given by miner_resolver.
+        Without a resolver nobody can be credited, so old-branch miners are
+        not debited either and balances are left as they were.
+        """
+        resolver = self.miner_resolver
+        for block in delta.disconnected:
+            if not self.disconnect_block(block, settle_balance=resolver is not None):
+                print(f"⚠️  Tokenomics had no record for disconnected block {block.index}")
+        for block in delta.connected:
+            if block.complexity:
+                self.connect_block(block, resolver(block) if resolver else None)
     
     def _update_capacity_metrics(self, capacity: ProblemTier, record: WorkScoreRecord):
         """Track performance by capacity - no assumptions about relative difficulty"""
@@ -289,12 +523,21 @@ class DynamicWorkScoreTokenomics:
         metrics.blocks_mined += 1
         metrics.total_work_score += record.work_score
         metrics.recent_records.append(record)
-        
-        # Recalculate averages from recent data
-        recent = list(metrics.recent_records)
-        metrics.avg_work_score = statistics.mean(r.work_score for r in recent)
-        metrics.avg_solve_time = statistics.mean(r.measured_solve_time for r in recent)
-        metrics.avg_asymmetry = statistics.mean(r.asymmetry_ratio for r in recent)
+        metrics.work_window.append(record.work_score)
+        metrics.solve_window.append(record.measured_solve_time)
+        metrics.asymmetry_window.append(record.asymmetry_ratio)
+        self._recalculate_capacity_averages(metrics)
+    
+    def _recalculate_capacity_averages(self, metrics: CapacityMetrics):
+        """Refresh averages from the capacity's running sums"""
+        metrics.avg_work_score = metrics.work_window.mean()
+        metrics.avg_solve_time = metrics.solve_window.mean()
+        metrics.avg_asymmetry = metrics.asymmetry_window.mean()
+    
+    @staticmethod
+    def _work_rate(record: WorkScoreRecord) -> float:
+        """Work score per second of solve time"""
+        return record.work_score / max(0.001, record.measured_solve_time)
     
     def get_dynamic_block_time(self) -> float:
         """
@@ -308,8 +551,8 @@ class DynamicWorkScoreTokenomics:
             # Bootstrap: use theoretical minimum
             return 1.0  # 1 second default
         
-        # Median verification time (robust to outliers)
-        median_verify = statistics.median(self.recent_verification_times)
+        # Median verification time (robust to outliers), kept sorted as blocks arrive
+        median_verify = self.recent_verification_times.median()
         
         # Block time needs to be long enough for:
         # 1. Verification (median_verify)
@@ -331,15 +574,12 @@ class DynamicWorkScoreTokenomics:
         but rather maintaining healthy work score distribution.
         """
         
-        if len(self.work_score_history) < 100:
+        if len(self.recent_work_scores) < NETWORK_WINDOW:
             return 1.0  # No adjustment until enough data
         
         # Analyze work score distribution
-        recent_100 = self.work_score_history[-100:]
-        recent_50 = self.work_score_history[-50:]
-        
-        avg_work_recent = statistics.mean(r.work_score for r in recent_50)
-        avg_work_historical = statistics.mean(r.work_score for r in recent_100)
+        avg_work_recent = self.recent_work_scores_half.mean()
+        avg_work_historical = self.recent_work_scores.mean()
         
         # If recent work is much higher/lower than historical, adjust
         if avg_work_historical > 0:
@@ -361,14 +601,37 @@ class DynamicWorkScoreTokenomics:
         
         Instead of forcing ratios, observe what the market naturally produces.
         If one capacity is over/under-represented, miners will adjust.
+        
+        Returns a copy of the memoized snapshot for the current version.
+        """
+        
+        _, dynamics, _ = self._get_dynamics_snapshot()
+        return {capacity: dict(data) for capacity, data in dynamics.items()}
+    
+    def _get_dynamics_snapshot(self) -> Tuple[int, dict, dict]:
         """
+        (version, dynamics, diversity bonuses) for the recorded blocks.
         
-        total_blocks = len(self.work_score_history)
+        Rebuilt only after record_block() or disconnect_block() bump the
+        version; callers must not mutate the returned dicts.
+        """
+        snapshot = self._dynamics_snapshot
+        if snapshot is None or snapshot[0] != self.version:
+            snapshot = self._dynamics_snapshot = (self.version, self._compute_capacity_market_dynamics(), {})
+        return snapshot
+    
+    def _compute_capacity_market_dynamics(self) -> dict[ProblemTier, dict]:
+        """Build the per-capacity dynamics from the rolling windows"""
+        
+        total_blocks = self.blocks_recorded
         if total_blocks == 0:
             return {}
         
         dynamics = {}
         
+        # Network average, the same for every capacity
+        avg_work_per_second = self.recent_work_rates.mean()
+        
         for capacity, metrics in self.capacity_performance.items():
             # Market share
             market_share = metrics.blocks_mined / total_blocks
@@ -378,12 +641,6 @@ class DynamicWorkScoreTokenomics:
             work_per_second = metrics.avg_work_score / max(0.001, metrics.avg_solve_time)
             
             # Compare to network average
-            all_work_scores = [r.work_score for r in self.work_score_history[-100:]]
-            all_solve_times = [r.measured_solve_time for r in self.work_score_history[-100:]]
-            avg_work_per_second = statistics.mean(
-                w / max(0.001, t) for w, t in zip(all_work_scores, all_solve_times)
-            )
-            
             relative_profitability = work_per_second / avg_work_per_second if avg_work_per_second > 0 else 1.0
             
             dynamics[capacity] = {
@@ -421,10 +678,10 @@ class DynamicWorkScoreTokenomics:
         
         return {
             'cumulative_work_score': self.cumulative_work_score,
-            'total_coins_issued': self.total_coins_issued,
-            'coins_per_work_unit': self.total_coins_issued / max(1, self.cumulative_work_score),
+            'total_coins_issued': to_coins(self.total_coins_issued),
+            'coins_per_work_unit': to_coins(self.total_coins_issued) / max(1, self.cumulative_work_score),
             'current_deflation_factor': self._calculate_deflation_factor(),
-            'blocks_mined': len(self.work_score_history),
+            'blocks_mined': self.blocks_recorded,
             'dynamic_block_time': self.get_dynamic_block_time(),
             'difficulty_adjustment': self.get_difficulty_adjustment(),
             'capacity_dynamics': self.get_capacity_market_dynamics(),
@@ -435,14 +692,13 @@ class DynamicWorkScoreTokenomics:
     def _analyze_work_score_trend(self) -> dict:
         """Analyze how work scores are evolving"""
         
-        if len(self.work_score_history) < 100:
+        if len(self.recent_work_scores) < NETWORK_WINDOW:
             return {'status': 'INSUFFICIENT_DATA'}
         
-        recent_50 = [r.work_score for r in self.work_score_history[-50:]]
-        older_50 = [r.work_score for r in self.work_score_history[-100:-50]]
-        
-        recent_mean = statistics.mean(recent_50)
-        older_mean = statistics.mean(older_50)
+        # The older half is the full window minus the recent half
+        recent = self.recent_work_scores_half
+        recent_mean = recent.mean()
+        older_mean = (self.recent_work_scores.total - recent.total) / (NETWORK_WINDOW - len(recent))
         
         trend = (recent_mean - older_mean) / older_mean if older_mean > 0 else 0
         
@@ -477,19 +733,20 @@ class MarketDrivenMining:
         Miners use this to choose which tier to mine.
         """
         
-        # Get tier metrics from network
-        tier_metrics = self.tokenomics.tier_performance.get(tier)
+        # Get tier metrics from the network's memoized dynamics snapshot
+        _, dynamics, _ = self.tokenomics._get_dynamics_snapshot()
+        tier_metrics = dynamics.get(tier)
         
         if not tier_metrics:
             # No data yet - use theoretical estimates
             return self._estimate_theoretical_profitability(miner_hardware, tier)
         
         # Expected work score for this tier
-        expected_work = tier_metrics.avg_work_score
+        expected_work = tier_metrics['avg_work_score']
         
         # Expected solve time for this hardware/tier combo
         # This depends on hardware capabilities
-        expected_time = self._estimate_solve_time(miner_hardware, tier, tier_metrics.avg_solve_time)
+        expected_time = self._estimate_solve_time(miner_hardware, tier, tier_metrics['avg_solve_time'])
         
         # Expected reward
         recent_avg = self.tokenomics._get_recent_average_work()
@@ -0,0 +1,283 @@
+"""
+Transaction mempool for COINjecture.
+
+Pending transactions indexed by id, ordered by priority for block template
+selection. Each sender's pending spends are reserved against its balance so
+the same funds cannot be pending twice. Entries are evicted oldest-first by
+age and lowest-priority-first when the pool is full.
+"""
+
+import time
+import heapq
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
+
+try:
+    from .blockchain_state import Transaction
+except ImportError:
+    # Fallback for direct execution
+    from blockchain_state import Transaction
+
+
+DEFAULT_MAX_MEMPOOL_SIZE = 50_000
+DEFAULT_MAX_MEMPOOL_AGE = 3 * 3600.0  # seconds
+COINBASE_SENDER = "COINBASE"
+
+
+def default_priority(transaction: Transaction) -> float:
+    """Fee if the transaction carries one, otherwise 0 (oldest first)."""
+    return float(getattr(transaction, "fee", 0.0) or 0.0)
+
+
+@dataclass
+class MempoolEntry:
+    """A pending transaction and its ordering keys."""
+    transaction: Transaction
+    priority: float
+    added_at: float
+    sequence: int
+
+
+@dataclass
+class MempoolMetrics:
+    """Admission and eviction counters."""
+    added: int = 0
+    duplicates: int = 0
+    insufficient_funds: int = 0
+    rejected_full: int = 0
+    removed: int = 0
+    evicted_age: int = 0
+    evicted_size: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "added": self.added,
+            "duplicates": self.duplicates,
+            "insufficient_funds": self.insufficient_funds,
+            "rejected_full": self.rejected_full,
+            "removed": self.removed,
+            "evicted_age": self.evicted_age,
+            "evicted_size": self.evicted_size
+        }
+
+
+class Mempool:
+    """
+    Pending transactions with priority ordering and balance reservation.
+
+    A max-heap serves template selection and a min-heap serves size
+    eviction; both delete lazily and are rebuilt once stale entries
+    outnumber live ones. Insertion order doubles as age order.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_MEMPOOL_SIZE, max_age: float = DEFAULT_MAX_MEMPOOL_AGE,
+                 balance_of: Optional[Callable[[str], int]] = None,
+                 priority: Optional[Callable[[Transaction], float]] = None):
+        """
+        Initialize mempool.
+
+        Args:
+            max_size: Maximum pending transactions
+            max_age: Seconds a transaction may stay pending
+            balance_of: Sender balance lookup; None disables reservation
+            priority: Priority of a transaction, higher first (defaults to fee)
+        """
+        self.max_size = max(1, max_size)
+        self.max_age = max_age
+        self.balance_of = balance_of
+        self.priority = priority or default_priority
+        self.metrics = MempoolMetrics()
+        self._entries: "OrderedDict[str, MempoolEntry]" = OrderedDict()
+        self._best: List[Tuple[float, float, int, str]] = []
+        self._worst: List[Tuple[float, float, int, str]] = []
+        self._reserved: Dict[str, int] = {}
+        self._sequence = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._entries
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Pending transactions in arrival order."""
+        with self._lock:
+            return iter([entry.transaction for entry in self._entries.values()])
+
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a pending transaction by id."""
+        entry = self._entries.get(transaction_id)
+        return entry.transaction if entry else None
+
+    def reserved(self, sender: str) -> int:
+        """Base units a sender has committed to pending transactions."""
+        return self._reserved.get(sender, 0)
+
+    def available_balance(self, sender: str) -> float:
+        """Sender balance not yet reserved by pending transactions."""
+        balance = self.balance_of(sender) if self.balance_of else float("inf")
+        return balance - self.reserved(sender)
+
+    def add(self, transaction: Transaction, now: Optional[float] = None) -> bool:
+        """
+        Admit a transaction.
+
+        Args:
+            transaction: Validated transaction
+            now: Current time (defaults to time.time())
+
+        Returns:
+            True if admitted, False if duplicate, unfunded or outbid in a full pool
+        """
+        now = time.time() if now is None else now
+        tx_id = transaction.transaction_id
+        with self._lock:
+            if tx_id in self._entries:
+                self.metrics.duplicates += 1
+                return False
+
+            self._evict_expired(now)
+            sender = transaction.sender
+            if sender != COINBASE_SENDER and self.available_balance(sender) < transaction.amount:
+                self.metrics.insufficient_funds += 1
+                return False
+
+            priority = self.priority(transaction)
+            if len(self._entries) >= self.max_size:
+                worst = self._peek(self._worst)
+                # The newcomer is the newest, so it loses ties
+                if worst is None or priority <= worst.priority:
+                    self.metrics.rejected_full += 1
+                    return False
+                self._remove(worst.transaction.transaction_id)
+                self.metrics.evicted_size += 1
+
+            self._sequence += 1
+            entry = MempoolEntry(transaction, priority, now, self._sequence)
+            self._entries[tx_id] = entry
+            heapq.heappush(self._best, (-priority, transaction.timestamp, entry.sequence, tx_id))
+            heapq.heappush(self._worst, (priority, -transaction.timestamp, -entry.sequence, tx_id))
+            if sender != COINBASE_SENDER:
+                self._reserved[sender] = self._reserved.get(sender, 0) + transaction.amount
+            self.metrics.added += 1
+            return True
+
+    def _live(self, item: Tuple[float, float, int, str]) -> Optional[MempoolEntry]:
+        entry = self._entries.get(item[3])
+        return entry if entry is not None and entry.sequence == abs(item[2]) else None
+
+    def _peek(self, heap: List[Tuple[float, float, int, str]]) -> Optional[MempoolEntry]:
+        while heap:
+            entry = self._live(heap[0])
+            if entry is not None:
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def _remove(self, transaction_id: str) -> Optional[MempoolEntry]:
+        entry = self._entries.pop(transaction_id, None)
+        if entry is None:
+            return None
+        sender = entry.transaction.sender
+        if sender in self._reserved:
+            remaining = self._reserved[sender] - entry.transaction.amount
+            if remaining > 0:
+                self._reserved[sender] = remaining
+            else:
+                del self._reserved[sender]
+        if len(self._best) > 2 * len(self._entries) + 64:
+            self._rebuild()
+        return entry
+
+    def _rebuild(self):
+        self._best = [item for item in self._best if self._live(item)]
+        self._worst = [item for item in self._worst if self._live(item)]
+        heapq.heapify(self._best)
+        heapq.heapify(self._worst)
+
+    def remove(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        Remove a pending transaction and release its reservation.
+
+        Returns:
+            The removed transaction, or None if not pending
+        """
+        with self._lock:
+            entry = self._remove(transaction_id)
+            if entry is None:
+                return None
+            self.metrics.removed += 1
+            return entry.transaction
+
+    def remove_many(self, transaction_ids) -> int:
+        """
+        Remove transactions included in a block.
+
+        Returns:
+            Number of transactions removed
+        """
+        with self._lock:
+            return sum(1 for tx_id in transaction_ids if self.remove(tx_id) is not None)
+
+    def _evict_expired(self, now: float) -> int:
+        evicted = 0
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if now - oldest.added_at <= self.max_age:
+                break
+            self._remove(oldest.transaction.transaction_id)
+            evicted += 1
+        self.metrics.evicted_age += evicted
+        return evicted
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Drop transactions older than max_age.
+
+        Returns:
+            Number of transactions evicted
+        """
+        with self._lock:
+            return self._evict_expired(time.time() if now is None else now)
+
+    def select(self, max_count: int = 100) -> List[Transaction]:
+        """
+        Highest-priority transactions for a block template, in O(k log n).
+
+        Ties go to the older transaction. The pool is left unchanged.
+
+        Args:
+            max_count: Maximum number of transactions to return
+
+        Returns:
+            Transactions in selection order
+        """
+        with self._lock:
+            selected: List[Transaction] = []
+            popped: List[Tuple[float, float, int, str]] = []
+            while self._best and len(selected) < max_count:
+                item = heapq.heappop(self._best)
+                entry = self._live(item)
+                if entry is not None:
+                    selected.append(entry.transaction)
+                    popped.append(item)
+            for item in popped:
+                heapq.heappush(self._best, item)
+            return selected
+
+    def clear(self):
+        """Drop every pending transaction."""
+        with self._lock:
+            self._entries.clear()
+            self._best.clear()
+            self._worst.clear()
+            self._reserved.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and counters."""
+        stats = self.metrics.to_dict()
+        stats.update({"size": len(self._entries), "reserved_senders": len(self._reserved)})
+        return stats
@@ -0,0 +1,333 @@
+"""
+Ed25519 signature verification service for COINjecture.
+
+The verification backend (PyNaCl, cryptography, or the pure-Python ed25519
+module) is resolved once at import. SignatureVerifier checks single
+signatures or whole blocks, spreading large batches over a worker pool, and
+remembers recently verified (public key, message hash, signature) triples in
+a bounded LRU so transactions checked on mempool admission are not
+re-verified when their block connects.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_CACHE_SIZE = 100_000
+DEFAULT_CHUNK_SIZE = 256
+COINBASE_SENDER = "COINBASE"
+
+
+def _resolve_backend():
+    """Pick the first available Ed25519 implementation: (name, verify(pub, sig, msg) -> bool)."""
+    try:
+        import nacl.signing
+        import nacl.exceptions
+
+        def verify_nacl(public_key: bytes, signature: bytes, message: bytes) -> bool:
+            try:
+                nacl.signing.VerifyKey(public_key).verify(message, signature)
+                return True
+            except (nacl.exceptions.BadSignatureError, ValueError, TypeError):
+                return False
+
+        return "pynacl", verify_nacl
+    except ImportError:
+        pass
+
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        def verify_cryptography(public_key: bytes, signature: bytes, message: bytes) -> bool:
+            try:
+                ed25519.Ed25519PublicKey.from_public_bytes(public_key).verify(signature, message)
+                return True
+            except (InvalidSignature, ValueError, TypeError):
+                return False
+
+        return "cryptography", verify_cryptography
+    except ImportError:
+        pass
+
+    try:
+        import ed25519
+
+        def verify_pure(public_key: bytes, signature: bytes, message: bytes) -> bool:
+            try:
+                ed25519.VerifyingKey(public_key).verify(signature, message)
+                return True
+            except Exception:
+                return False
+
+        return "ed25519", verify_pure
+    except ImportError:
+        pass
+
+    def verify_unavailable(public_key: bytes, signature: bytes, message: bytes) -> bool:
+        return False
+
+    logging.getLogger(__name__).warning("No Ed25519 implementation available; all signatures will fail")
+    return "none", verify_unavailable
+
+
+BACKEND, _verify = _resolve_backend()
+
+
+def verify_raw(public_key: bytes, signature: bytes, message: bytes) -> bool:
+    """Verify one signature with the resolved backend (no caching)."""
+    return _verify(public_key, signature, message)
+
+
+def _verify_chunk(items: List[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+    """Worker entry point: verify (public_key, signature, message) triples."""
+    return [_verify(public_key, signature, message) for public_key, signature, message in items]
+
+
+def _decode(public_key_hex: str, signature_hex: str) -> Optional[Tuple[bytes, bytes]]:
+    if not public_key_hex or not signature_hex:
+        return None
+    try:
+        return bytes.fromhex(public_key_hex), bytes.fromhex(signature_hex)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass
+class VerifierMetrics:
+    """Cache and verification counters."""
+    cache_hits: int = 0
+    verified: int = 0
+    failed: int = 0
+    batches: int = 0
+    pooled_batches: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cache_hits": self.cache_hits,
+            "verified": self.verified,
+            "failed": self.failed,
+            "batches": self.batches,
+            "pooled_batches": self.pooled_batches
+        }
+
+
+class SignatureVerifier:
+    """
+    Cached, batched Ed25519 verification.
+
+    Only successful verifications are cached, keyed by the raw public key,
+    the SHA-256 of the message and the raw signature; a hit therefore
+    proves the exact same triple verified before.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize verifier.
+
+        Args:
+            cache_size: Verified triples remembered (0 disables the cache)
+            workers: Worker processes for verify_many (None for CPU count, 0 runs inline)
+            chunk_size: Signatures per worker task; smaller batches run inline
+        """
+        if workers is None:
+            # A single-CPU pool only adds pickling overhead
+            cpus = os.cpu_count() or 1
+            workers = cpus if cpus > 1 else 0
+        self.workers = workers
+        self.cache_size = max(0, cache_size)
+        self.chunk_size = max(1, chunk_size)
+        self.backend = BACKEND
+        self.metrics = VerifierMetrics()
+        self.logger = logging.getLogger(__name__)
+        self._cache: "OrderedDict[Tuple[bytes, bytes, bytes], None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'SignatureVerifier':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _key(public_key: bytes, signature: bytes, message: bytes,
+             message_hash: Optional[bytes] = None) -> Tuple[bytes, bytes, bytes]:
+        return public_key, message_hash or hashlib.sha256(message).digest(), signature
+
+    def _cached(self, key: Tuple[bytes, bytes, bytes]) -> bool:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.metrics.cache_hits += 1
+                return True
+            return False
+
+    def _remember(self, key: Tuple[bytes, bytes, bytes]) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = None
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def verify(self, public_key_hex: str, message: bytes, signature_hex: str,
+               message_hash: Optional[bytes] = None) -> bool:
+        """
+        Verify one signature, consulting the cache first.
+
+        Args:
+            public_key_hex: Public key as hex string
+            message: Signed bytes
+            signature_hex: Signature as hex string
+            message_hash: SHA-256 of message, if the caller already has it
+
+        Returns:
+            True if the signature is valid
+        """
+        decoded = _decode(public_key_hex, signature_hex)
+        if decoded is None:
+            self.metrics.failed += 1
+            return False
+        public_key, signature = decoded
+        key = self._key(public_key, signature, message, message_hash)
+        if self._cached(key):
+            return True
+        if _verify(public_key, signature, message):
+            self.metrics.verified += 1
+            self._remember(key)
+            return True
+        self.metrics.failed += 1
+        return False
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError) as e:
+                self.logger.warning(f"Process pool unavailable, verifying inline: {e}")
+                self.workers = 0
+        return self._executor
+
+    def _verify_uncached(self, items: List[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        executor = self._get_executor() if len(chunks) > 1 else None
+        if executor is not None:
+            try:
+                results = [ok for chunk in executor.map(_verify_chunk, chunks) for ok in chunk]
+                self.metrics.pooled_batches += 1
+                return results
+            except (BrokenProcessPool, RuntimeError) as e:
+                self.logger.warning(f"Process pool failed, verifying inline: {e}")
+                self._executor = None
+                self.workers = 0
+        return _verify_chunk(items)
+
+    def verify_many(self, items: Sequence[Tuple]) -> List[bool]:
+        """
+        Verify a batch of signatures, e.g. all of a block's transactions.
+
+        Cached triples are answered immediately; the rest are verified in
+        chunks across the worker pool when there is more than one chunk.
+
+        Args:
+            items: (public_key_hex, message, signature_hex[, message_hash]) per signature
+
+        Returns:
+            Validity per item, in input order
+        """
+        results: List[bool] = [False] * len(items)
+        pending: List[Tuple[int, Tuple[bytes, bytes, bytes], Tuple[bytes, bytes, bytes]]] = []
+        for index, item in enumerate(items):
+            public_key_hex, message, signature_hex = item[:3]
+            decoded = _decode(public_key_hex, signature_hex)
+            if decoded is None:
+                self.metrics.failed += 1
+                continue
+            public_key, signature = decoded
+            key = self._key(public_key, signature, message, item[3] if len(item) > 3 else None)
+            if self._cached(key):
+                results[index] = True
+            else:
+                pending.append((index, key, (public_key, signature, message)))
+
+        self.metrics.batches += 1
+        if pending:
+            verified = self._verify_uncached([raw for _, _, raw in pending])
+            for (index, key, _), ok in zip(pending, verified):
+                results[index] = ok
+                if ok:
+                    self.metrics.verified += 1
+                    self._remember(key)
+                else:
+                    self.metrics.failed += 1
+        return results
+
+    @staticmethod
+    def _transaction_item(transaction) -> Tuple:
+        # Transactions cache their signing bytes and digest; reuse both
+        return (transaction.public_key, transaction._signing_data(), transaction.signature,
+                getattr(transaction, "signing_digest", None))
+
+    def verify_transaction(self, transaction) -> bool:
+        """Verify a Transaction's signature over its signing data."""
+        return self.verify(*self._transaction_item(transaction))
+
+    def verify_transactions(self, transactions: Iterable) -> List[bool]:
+        """
+        Verify a block's transactions in one batch.
+
+        Coinbase transactions carry no signature and count as valid.
+
+        Returns:
+            Validity per transaction, in input order
+        """
+        transactions = list(transactions)
+        signed = [i for i, tx in enumerate(transactions) if tx.sender != COINBASE_SENDER]
+        results = [True] * len(transactions)
+        checked = self.verify_many([self._transaction_item(transactions[i]) for i in signed])
+        for i, ok in zip(signed, checked):
+            results[i] = ok
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backend, cache size and counters."""
+        stats = self.metrics.to_dict()
+        stats.update({"backend": self.backend, "cache_size": len(self._cache), "workers": self.workers})
+        return stats
+
+
+# Global verifier instance
+_signature_verifier = None
+
+
+def get_signature_verifier() -> SignatureVerifier:
+    """Get global signature verifier instance."""
+    global _signature_verifier
+    if _signature_verifier is None:
+        _signature_verifier = SignatureVerifier()
+    return _signature_verifier
@@ -0,0 +1,326 @@
+"""
+SQLite persistence for BlockchainState.
+
+Balances, processed transactions and processed ids live in indexed tables
+and are written incrementally: each block's transactions apply inside one
+SQLite transaction, so a crash leaves the state at a block boundary.
+Balances are loaded at startup; history and processed ids are queried on
+demand, so startup and per-block cost do not grow with chain age.
+"""
+
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from .blockchain_state import Transaction, DEFAULT_STATE_DB
+except ImportError:
+    # Fallback for direct execution
+    from blockchain_state import Transaction, DEFAULT_STATE_DB
+
+
+_TX_COLUMNS = "t.tx_id, t.sender, t.recipient, t.amount, t.timestamp, t.signature, t.public_key"
+
+
+def _row_to_transaction(row) -> Transaction:
+    return Transaction(
+        sender=row[1], recipient=row[2], amount=row[3], timestamp=row[4],
+        transaction_id=row[0], signature=row[5], public_key=row[6]
+    )
+
+
+class StateStore:
+    """
+    SQLite tables backing a BlockchainState.
+
+    Statements outside `transaction()` commit immediately; inside it they
+    commit together when the outermost block exits, or roll back on error.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_STATE_DB):
+        """
+        Open (or create) the state database.
+
+        Args:
+            db_path: SQLite database path (":memory:" for a non-persistent store)
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._depth = 0
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS balances (
+                address TEXT PRIMARY KEY,
+                balance INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS transactions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tx_id TEXT NOT NULL UNIQUE,
+                sender TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                amount INTEGER NOT NULL,
+                timestamp REAL NOT NULL,
+                signature TEXT NOT NULL DEFAULT '',
+                public_key TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS tx_by_address (
+                address TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (address, timestamp, seq)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS processed_ids (
+                tx_id TEXT PRIMARY KEY
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS pending_transactions (
+                tx_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS state_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self._counts = {key: self._get_meta(key) for key in ("transactions", "processed")}
+
+    def _get_meta(self, key: str) -> int:
+        row = self._conn.execute("SELECT value FROM state_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump(self, key: str, delta: int):
+        if delta:
+            self._counts[key] += delta
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state_meta (key, value) VALUES (?, ?)", (key, self._counts[key])
+            )
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one atomic commit (nested use joins the outer one)."""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    self._counts = {key: self._get_meta(key) for key in self._counts}
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._depth > 0
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # Balances
+
+    def load_balances(self) -> Dict[str, int]:
+        """All address balances."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT address, balance FROM balances"))
+
+    def set_balance(self, address: str, balance: int):
+        """Write one address balance."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO balances (address, balance) VALUES (?, ?)", (address, balance)
+            )
+
+    # Transactions
+
+    def add_transaction(self, transaction: Transaction) -> bool:
+        """
+        Store a transaction and index it under sender and recipient.
+
+        Returns:
+            True if stored, False if the id was already present
+        """
+        with self._lock, self.transaction():
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO transactions "
+                "(tx_id, sender, recipient, amount, timestamp, signature, public_key) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (transaction.transaction_id, transaction.sender, transaction.recipient, transaction.amount,
+                 transaction.timestamp, transaction.signature, transaction.public_key)
+            )
+            if cursor.rowcount == 0:
+                return False
+            addresses = {transaction.sender, transaction.recipient}
+            self._conn.executemany(
+                "INSERT INTO tx_by_address (address, timestamp, seq) VALUES (?, ?, ?)",
+                [(address, transaction.timestamp, cursor.lastrowid) for address in addresses]
+            )
+            self._bump("transactions", 1)
+            return True
+
+    def remove_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Remove a transaction and its index rows."""
+        with self._lock, self.transaction():
+            row = self._conn.execute(
+                f"SELECT {_TX_COLUMNS}, t.seq FROM transactions t WHERE t.tx_id = ?", (transaction_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("DELETE FROM tx_by_address WHERE seq = ? AND address IN (?, ?)",
+                               (row[7], row[1], row[2]))
+            self._conn.execute("DELETE FROM transactions WHERE seq = ?", (row[7],))
+            self._bump("transactions", -1)
+            return _row_to_transaction(row)
+
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by id."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_TX_COLUMNS} FROM transactions t WHERE t.tx_id = ?", (transaction_id,)
+            ).fetchone()
+        return _row_to_transaction(row) if row else None
+
+    def history(self, address: str, limit: Optional[int] = None, newest_first: bool = True) -> List[Transaction]:
+        """Transactions involving an address, read through the address index."""
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_TX_COLUMNS} FROM tx_by_address i JOIN transactions t ON t.seq = i.seq "
+                f"WHERE i.address = ? ORDER BY i.timestamp {order}, i.seq {order} LIMIT ?",
+                (address, -1 if limit is None else max(limit, 0))
+            ).fetchall()
+        return [_row_to_transaction(row) for row in rows]
+
+    def count(self, address: str) -> int:
+        """Number of transactions involving an address."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM tx_by_address WHERE address = ?", (address,)
+            ).fetchone()[0]
+
+    def addresses(self) -> List[str]:
+        """Addresses with at least one transaction."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT address FROM tx_by_address")]
+
+    def transaction_count(self) -> int:
+        return self._counts["transactions"]
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Every stored transaction, in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_TX_COLUMNS} FROM transactions t ORDER BY t.seq").fetchall()
+        return (_row_to_transaction(row) for row in rows)
+
+    # Processed ids
+
+    def add_processed(self, transaction_id: str) -> bool:
+        """Mark a transaction id processed."""
+        with self._lock, self.transaction():
+            cursor = self._conn.execute("INSERT OR IGNORE INTO processed_ids (tx_id) VALUES (?)", (transaction_id,))
+            self._bump("processed", cursor.rowcount)
+            return cursor.rowcount > 0
+
+    def is_processed(self, transaction_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM processed_ids WHERE tx_id = ?", (transaction_id,)
+            ).fetchone() is not None
+
+    def processed_count(self) -> int:
+        return self._counts["processed"]
+
+    def iter_processed(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT tx_id FROM processed_ids").fetchall()
+        return (row[0] for row in rows)
+
+    # Pending pool snapshot
+
+    def save_pending(self, records: Dict[str, str]):
+        """Replace the stored pending pool (tx_id -> JSON)."""
+        with self._lock, self.transaction():
+            self._conn.execute("DELETE FROM pending_transactions")
+            self._conn.executemany(
+                "INSERT INTO pending_transactions (tx_id, data) VALUES (?, ?)", list(records.items())
+            )
+
+    def load_pending(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT data FROM pending_transactions")]
+
+    def clear(self):
+        """Delete all state (used when importing a JSON snapshot)."""
+        with self._lock, self.transaction():
+            for table in ("balances", "transactions", "tx_by_address", "processed_ids",
+                          "pending_transactions", "state_meta"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._counts = {key: 0 for key in self._counts}
+
+
+class SQLiteTransactionStore:
+    """TransactionStore interface over a StateStore."""
+
+    def __init__(self, store: StateStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.transaction_count()
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return self._store.get_transaction(transaction_id) is not None
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return self._store.iter_transactions()
+
+    def add(self, transaction: Transaction) -> bool:
+        return self._store.add_transaction(transaction)
+
+    def remove(self, transaction_id: str) -> Optional[Transaction]:
+        return self._store.remove_transaction(transaction_id)
+
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        return self._store.get_transaction(transaction_id)
+
+    def addresses(self) -> List[str]:
+        return self._store.addresses()
+
+    def count(self, address: str) -> int:
+        return self._store.count(address)
+
+    def history(self, address: str, limit: Optional[int] = None, newest_first: bool = True) -> List[Transaction]:
+        return self._store.history(address, limit, newest_first)
+
+
+class ProcessedIdSet:
+    """Set-like view of processed transaction ids in a StateStore."""
+
+    def __init__(self, store: StateStore):
+        self._store = store
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return self._store.is_processed(transaction_id)
+
+    def __len__(self) -> int:
+        return self._store.processed_count()
+
+    def __iter__(self) -> Iterator[str]:
+        return self._store.iter_processed()
+
+    def add(self, transaction_id: str):
+        self._store.add_processed(transaction_id)
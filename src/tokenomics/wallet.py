@@ -7,14 +7,23 @@ transaction signing and address generation.
 
 import os
 import json
+import sqlite3
 import hashlib
-from typing import Optional, Dict, List
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 
+try:
+    from .signatures import get_signature_verifier
+except ImportError:
+    # Fallback for direct execution
+    from signatures import get_signature_verifier
+
 
 class Wallet:
     """
@@ -175,7 +184,10 @@ class Wallet:
     @staticmethod
     def _verify_tweetnacl_signature(public_key_hex: str, data: bytes, signature_hex: str) -> bool:
         """
-        Verify signature using multiple implementations as fallback.
+        Verify signature with the Ed25519 backend resolved at import.
+        
+        PyNaCl (browser tweetnacl compatible) is preferred, then cryptography,
+        then the pure-Python ed25519 module; see tokenomics.signatures.
         
         Args:
             public_key_hex: Public key as hex string
@@ -185,44 +197,7 @@ class Wallet:
         Returns:
             True if signature is valid
         """
-        # Try 1: PyNaCl (most compatible with browser crypto.subtle)
-        try:
-            import nacl.signing
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            verify_key = nacl.signing.VerifyKey(pub_bytes)
-            # PyNaCl expects signature + message concatenated format
-            signed_message = sig_bytes + data
-            verify_key.verify(signed_message)
-            print("✅ Signature verified with PyNaCl (browser-compatible)")
-            return True
-        except Exception as e:
-            print(f"PyNaCl verification failed: {e}")
-        
-        # Try 2: cryptography library (standard Python Ed25519)
-        try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(pub_bytes)
-            public_key.verify(sig_bytes, data)
-            print("✅ Signature verified with cryptography library")
-            return True
-        except Exception as e:
-            print(f"Cryptography library verification failed: {e}")
-        
-        # Try 3: Pure Python ed25519 library (fallback)
-        try:
-            import ed25519
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            vk = ed25519.VerifyingKey(pub_bytes)
-            vk.verify(sig_bytes, data)
-            return True
-        except Exception as e:
-            pass
-        
-        return False
+        return get_signature_verifier().verify(public_key_hex, data, signature_hex)
     
     def verify_signature(self, data: bytes, signature: bytes) -> bool:
         """
@@ -314,32 +289,170 @@ class Wallet:
         }
 
 
+WALLET_INDEX_FILE = "wallet_index.db"
+DEFAULT_WALLET_CACHE_SIZE = 1024
+
+
+class WalletIndex:
+    """
+    SQLite index of wallet files: address -> file, public key and file stamp.
+    
+    Lives next to the wallet files. reconcile() compares the directory
+    listing with stored (mtime, size) stamps and only parses files that are
+    new or changed, so reopening a large directory does no key work.
+    """
+    
+    def __init__(self, wallets_dir: Path):
+        self.wallets_dir = wallets_dir
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(wallets_dir / WALLET_INDEX_FILE), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS wallet_files (
+                filename TEXT PRIMARY KEY,
+                address TEXT NOT NULL,
+                public_key TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS wallet_files_address ON wallet_files (address);
+            """
+        )
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _read_entry(path: str) -> Optional[Tuple[str, str]]:
+        """(address, public_key) from a wallet file without building keys."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        public_key = data.get('public_key')
+        if not public_key:
+            # Older files without a public key: derive it once
+            wallet = Wallet.from_private_key_bytes(bytes.fromhex(data['private_key']))
+            return wallet.address, wallet.get_public_key_bytes().hex()
+        return data.get('address') or address_from_public_key(bytes.fromhex(public_key)), public_key
+    
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Bring the index in line with the wallet directory.
+        
+        Returns:
+            Counts of added/updated and removed files
+        """
+        with self._lock:
+            known = {row[0]: (row[1], row[2]) for row in
+                     self._conn.execute("SELECT filename, mtime_ns, size FROM wallet_files")}
+            changed, seen = [], set()
+            with os.scandir(self.wallets_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    stat = entry.stat()
+                    if known.get(entry.name) != (stat.st_mtime_ns, stat.st_size):
+                        changed.append((entry.name, entry.path, stat))
+            
+            rows = []
+            for name, path, stat in changed:
+                try:
+                    address, public_key = self._read_entry(path)
+                    rows.append((name, address, public_key, stat.st_mtime_ns, stat.st_size))
+                except Exception as e:
+                    print(f"Error loading wallet {path}: {e}")
+            removed = [(name,) for name in known if name not in seen]
+            
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO wallet_files VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.executemany("DELETE FROM wallet_files WHERE filename = ?", removed)
+            return {"updated": len(rows), "removed": len(removed)}
+    
+    def add(self, filename: str, address: str, public_key: str):
+        """Index a wallet file just written."""
+        stat = (self.wallets_dir / filename).stat()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO wallet_files VALUES (?, ?, ?, ?, ?)",
+                               (filename, address, public_key, stat.st_mtime_ns, stat.st_size))
+    
+    def find(self, address: str) -> Optional[str]:
+        """Wallet filename for an address."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename FROM wallet_files WHERE address = ? ORDER BY filename LIMIT 1", (address,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """(address, public_key) pairs ordered by filename."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT address, public_key FROM wallet_files ORDER BY filename LIMIT ? OFFSET ?",
+                (-1 if limit is None else max(limit, 0), max(offset, 0))
+            ).fetchall()
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM wallet_files").fetchone()[0]
+
+
 class WalletManager:
     """
     Manages multiple wallets and provides high-level operations.
+    
+    Wallet files are found through an on-disk address index; private keys
+    are only loaded when a wallet is first requested, and a bounded LRU
+    keeps recently used wallets in memory.
     """
     
-    def __init__(self, wallets_dir: str = "data/wallets"):
+    def __init__(self, wallets_dir: str = "data/wallets", cache_size: int = DEFAULT_WALLET_CACHE_SIZE):
         """
         Initialize wallet manager.
         
         Args:
             wallets_dir: Directory to store wallet files
+            cache_size: Loaded wallets kept in memory
         """
         self.wallets_dir = Path(wallets_dir)
         self.wallets_dir.mkdir(parents=True, exist_ok=True)
-        self._wallets: Dict[str, Wallet] = {}
+        self.cache_size = max(1, cache_size)
+        self._wallets: "OrderedDict[str, Wallet]" = OrderedDict()
+        self._index = WalletIndex(self.wallets_dir)
         self._load_existing_wallets()
     
     def _load_existing_wallets(self):
-        """Load existing wallets from disk."""
-        for wallet_file in self.wallets_dir.glob("*.json"):
-            try:
-                wallet = Wallet.load_from_file(str(wallet_file))
-                if wallet:
-                    self._wallets[wallet.address] = wallet
-            except Exception as e:
-                print(f"Error loading wallet {wallet_file}: {e}")
+        """Index wallet files on disk (keys are loaded on first use)."""
+        try:
+            self._index.reconcile()
+        except Exception as e:
+            print(f"Error indexing wallets in {self.wallets_dir}: {e}")
+    
+    def refresh(self) -> Dict[str, int]:
+        """Pick up wallet files added or removed by other processes."""
+        return self._index.reconcile()
+    
+    def close(self):
+        """Close the wallet index."""
+        self._index.close()
+    
+    def __len__(self) -> int:
+        return self._index.count()
+    
+    def _remember(self, wallet: Wallet):
+        self._wallets[wallet.address] = wallet
+        self._wallets.move_to_end(wallet.address)
+        while len(self._wallets) > self.cache_size:
+            self._wallets.popitem(last=False)
+    
+    def _save(self, name: str, wallet: Wallet) -> Optional[Wallet]:
+        filename = f"{name}.json"
+        if not wallet.save_to_file(str(self.wallets_dir / filename)):
+            return None
+        self._index.add(filename, wallet.address, wallet.get_public_key_bytes().hex())
+        self._remember(wallet)
+        return wallet
     
     def create_wallet(self, name: str) -> Optional[Wallet]:
         """
@@ -352,21 +465,14 @@ class WalletManager:
             New wallet instance or None if failed
         """
         try:
-            wallet = Wallet.generate_new()
-            filepath = self.wallets_dir / f"{name}.json"
-            
-            if wallet.save_to_file(str(filepath)):
-                self._wallets[wallet.address] = wallet
-                return wallet
-            else:
-                return None
+            return self._save(name, Wallet.generate_new())
         except Exception as e:
             print(f"Error creating wallet: {e}")
             return None
     
     def get_wallet(self, address: str) -> Optional[Wallet]:
         """
-        Get wallet by address.
+        Get wallet by address, loading its key from disk on first use.
         
         Args:
             address: Wallet address
@@ -374,24 +480,39 @@ class WalletManager:
         Returns:
             Wallet instance or None if not found
         """
-        return self._wallets.get(address)
+        wallet = self._wallets.get(address)
+        if wallet is not None:
+            self._wallets.move_to_end(address)
+            return wallet
+        filename = self._index.find(address)
+        if filename is None:
+            return None
+        wallet = Wallet.load_from_file(str(self.wallets_dir / filename))
+        if wallet is None or wallet.address != address:
+            return None
+        self._remember(wallet)
+        return wallet
     
-    def list_wallets(self) -> List[Dict]:
+    def list_wallets(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
         """
-        List all available wallets.
+        List available wallets, ordered by file name.
         
+        Args:
+            offset: Wallets to skip
+            limit: Maximum wallets to return (None for all)
+            
         Returns:
             List of wallet info dictionaries
         """
         return [
             {
-                'address': wallet.address,
-                'public_key': wallet.get_public_key_bytes().hex()
+                'address': address,
+                'public_key': public_key
             }
-            for wallet in self._wallets.values()
+            for address, public_key in self._index.page(offset, limit)
         ]
     
-    def get_balance(self, address: str, blockchain_state) -> float:
+    def get_balance(self, address: str, blockchain_state) -> int:
         """
         Get wallet balance from blockchain state.
         
@@ -400,7 +521,7 @@ class WalletManager:
             blockchain_state: BlockchainState instance
             
         Returns:
-            Current balance
+            Current balance in base units
         """
         return blockchain_state.get_balance(address)
     
@@ -417,14 +538,7 @@ class WalletManager:
         """
         try:
             private_key_bytes = bytes.fromhex(private_key_hex)
-            wallet = Wallet.from_private_key_bytes(private_key_bytes)
-            
-            filepath = self.wallets_dir / f"{name}.json"
-            if wallet.save_to_file(str(filepath)):
-                self._wallets[wallet.address] = wallet
-                return wallet
-            else:
-                return None
+            return self._save(name, Wallet.from_private_key_bytes(private_key_bytes))
         except Exception as e:
             print(f"Error importing wallet: {e}")
             return None
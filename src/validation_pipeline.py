@@ -0,0 +1,385 @@
+"""
+Module: validation_pipeline
+Specification: docs/blockchain/consensus.md
+
+Staged block validation for catch-up sync. Stateless checks (block hash,
+commitment presence and binding, difficulty, solution verify) run in a
+process pool in parallel batches; stateful checks (parent linkage, height,
+timestamp, work accumulation) are committed to the ConsensusEngine block
+tree strictly in submission order.
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Any, Iterable, Union
+
+try:
+    from .core.blockchain import Block
+    from .pow import (
+        ProblemRegistry, derive_epoch_salt, verify_commitment,
+        calculate_work_score, compute_solution_hash
+    )
+except ImportError:
+    # Fallback for direct execution
+    from core.blockchain import Block
+    from pow import (
+        ProblemRegistry, derive_epoch_salt, verify_commitment,
+        calculate_work_score, compute_solution_hash
+    )
+
+
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass
+class ValidationJob:
+    """A block to validate, with its reveal when one is available."""
+    block: Block
+    commitment: Optional[bytes] = None
+    miner_salt: Optional[bytes] = None
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one validate_blocks() run."""
+    accepted: List[str] = field(default_factory=list)
+    rejected: List[Tuple[str, str]] = field(default_factory=list)  # (block_hash, reason)
+    orphaned: List[str] = field(default_factory=list)  # Buffered until their parent connects
+    elapsed: float = 0.0
+
+
+@dataclass
+class PipelineMetrics:
+    """Cumulative pipeline throughput and queue-depth counters."""
+    blocks_in: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    orphaned: int = 0
+    stateless_seconds: float = 0.0  # CPU time spent in stateless checks (all workers)
+    stateful_seconds: float = 0.0   # Time spent committing in order
+    wall_seconds: float = 0.0
+    queue_depth_max: int = 0
+    queue_depth_total: int = 0
+    queue_samples: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Blocks per second over all runs."""
+        return self.blocks_in / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def avg_queue_depth(self) -> float:
+        """Average blocks waiting between the stateless and stateful stages."""
+        return self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blocks_in": self.blocks_in,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates,
+            "orphaned": self.orphaned,
+            "stateless_seconds": self.stateless_seconds,
+            "stateful_seconds": self.stateful_seconds,
+            "wall_seconds": self.wall_seconds,
+            "throughput": self.throughput,
+            "queue_depth_max": self.queue_depth_max,
+            "avg_queue_depth": self.avg_queue_depth
+        }
+
+
+# Per-process registry so workers do not receive it with every batch
+_WORKER_REGISTRY: Optional[ProblemRegistry] = None
+
+
+def _get_worker_registry() -> ProblemRegistry:
+    global _WORKER_REGISTRY
+    if _WORKER_REGISTRY is None:
+        _WORKER_REGISTRY = ProblemRegistry()
+    return _WORKER_REGISTRY
+
+
+def check_block_stateless(
+    block: Block,
+    registry: ProblemRegistry,
+    commitment: Optional[bytes] = None,
+    miner_salt: Optional[bytes] = None,
+    check_hash: bool = True
+) -> Optional[str]:
+    """
+    Run the checks that need nothing but the block itself.
+
+    Args:
+        block: Block to check
+        registry: Problem registry for solution verification
+        commitment: Reveal commitment (skips binding check if None)
+        miner_salt: Miner salt for the commitment
+        check_hash: Recompute and compare the block hash
+
+    Returns:
+        None if the block passes, otherwise the failure reason
+    """
+    try:
+        if check_hash and block.block_hash != block.calculate_hash():
+            return "Block hash mismatch"
+
+        # Commitment presence
+        if not block.problem or not block.solution:
+            return "Missing problem or solution"
+        if not block.merkle_root or len(block.merkle_root) != 64:
+            return "Invalid merkle root"
+
+        # Difficulty
+        if not block.complexity:
+            return "Missing complexity data"
+        if calculate_work_score(block.complexity) <= 0:
+            return "Invalid work score"
+
+        # Commitment binding (epoch salt depends only on the parent hash and timestamp)
+        if commitment is not None:
+            epoch_salt = derive_epoch_salt(
+                parent_hash=block.previous_hash.encode(),
+                timestamp=int(block.timestamp)
+            )
+            if not verify_commitment(
+                registry.encode_params(block.problem),
+                miner_salt,
+                epoch_salt,
+                compute_solution_hash(block.solution),
+                commitment
+            ):
+                return "Commitment verification failed"
+
+        # Fast verify
+        if not registry.verify(block.problem, block.solution):
+            return "Solution verification failed"
+
+        return None
+    except Exception as e:
+        return f"Stateless check error: {e}"
+
+
+def _check_batch(
+    batch: List[Tuple[Block, Optional[bytes], Optional[bytes]]],
+    check_hash: bool
+) -> Tuple[List[Optional[str]], float]:
+    """Worker entry point: check a batch, return per-block errors and CPU time."""
+    started = time.process_time()
+    registry = _get_worker_registry()
+    errors = [
+        check_block_stateless(block, registry, commitment, miner_salt, check_hash)
+        for block, commitment, miner_salt in batch
+    ]
+    return errors, time.process_time() - started
+
+
+class ValidationPipeline:
+    """
+    Two-stage validation pipeline in front of a ConsensusEngine.
+
+    Batches of blocks fan out to a process pool for stateless checks while
+    earlier batches are committed in order on the calling thread, so the
+    block tree sees exactly the sequence validate_header() would have.
+    """
+
+    def __init__(
+        self,
+        engine,
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_in_flight: Optional[int] = None,
+        check_hash: bool = True
+    ):
+        """
+        Initialize validation pipeline.
+
+        Args:
+            engine: ConsensusEngine receiving validated blocks
+            workers: Stateless worker processes (None for CPU count, 0 runs inline)
+            batch_size: Blocks per stateless batch
+            max_in_flight: Batches queued ahead of the stateful stage
+            check_hash: Recompute block hashes in the stateless stage
+        """
+        self.engine = engine
+        if workers is None:
+            # A single-CPU pool only adds pickling overhead
+            cpus = os.cpu_count() or 1
+            workers = cpus if cpus > 1 else 0
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max_in_flight or max(1, self.workers) * DEFAULT_IN_FLIGHT_PER_WORKER
+        self.check_hash = check_hash
+        self.metrics = PipelineMetrics()
+        self.logger = logging.getLogger(__name__)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._registry = ProblemRegistry()
+
+    def __enter__(self) -> 'ValidationPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError) as e:
+                self.logger.warning(f"Process pool unavailable, validating inline: {e}")
+                self.workers = 0
+        return self._executor
+
+    def _submit(self, batch: List[ValidationJob]) -> Future:
+        payload = [(job.block, job.commitment, job.miner_salt) for job in batch]
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(_check_batch, payload, self.check_hash)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self.logger.warning(f"Process pool failed, validating inline: {e}")
+                self._executor = None
+                self.workers = 0
+
+        future: Future = Future()
+        started = time.process_time()
+        future.set_result((
+            [check_block_stateless(b, self._registry, c, s, self.check_hash) for b, c, s in payload],
+            time.process_time() - started
+        ))
+        return future
+
+    def validate_blocks(self, jobs: Iterable[Union[Block, ValidationJob]]) -> PipelineResult:
+        """
+        Validate blocks and add the valid ones to the engine's block tree.
+
+        A block whose parent was rejected is rejected at the stateful stage;
+        one whose parent is simply unknown goes to the engine's orphan pool
+        and is connected (and reported as accepted) once its parent arrives.
+
+        Args:
+            jobs: Blocks or ValidationJobs (with reveal data)
+
+        Returns:
+            PipelineResult with accepted, rejected and orphaned block hashes
+        """
+        result = PipelineResult()
+        rejected: Set[str] = set()
+        started = time.time()
+        in_flight: deque = deque()  # (batch, future)
+        queued = 0
+        batch: List[ValidationJob] = []
+
+        def drain_one():
+            nonlocal queued
+            pending, future = in_flight.popleft()
+            self.metrics.queue_depth_max = max(self.metrics.queue_depth_max, queued)
+            self.metrics.queue_depth_total += queued
+            self.metrics.queue_samples += 1
+            try:
+                errors, cpu_seconds = future.result()
+            except BrokenProcessPool as e:
+                self.logger.warning(f"Worker died, re-checking batch inline: {e}")
+                self._executor = None
+                self.workers = 0
+                errors, cpu_seconds = _check_batch(
+                    [(j.block, j.commitment, j.miner_salt) for j in pending], self.check_hash
+                )
+            self.metrics.stateless_seconds += cpu_seconds
+            queued -= len(pending)
+            self._commit_batch(pending, errors, result, rejected)
+
+        for job in jobs:
+            if not isinstance(job, ValidationJob):
+                job = ValidationJob(block=job)
+            batch.append(job)
+            if len(batch) >= self.batch_size:
+                in_flight.append((batch, self._submit(batch)))
+                queued += len(batch)
+                batch = []
+                while len(in_flight) >= self.max_in_flight:
+                    drain_one()
+
+        if batch:
+            in_flight.append((batch, self._submit(batch)))
+            queued += len(batch)
+        while in_flight:
+            drain_one()
+
+        result.elapsed = time.time() - started
+        self.metrics.wall_seconds += result.elapsed
+        self.logger.info(
+            f"Validated {len(result.accepted) + len(result.rejected)} blocks in {result.elapsed:.2f}s: "
+            f"{len(result.accepted)} accepted, {len(result.rejected)} rejected"
+        )
+        return result
+
+    def _commit_batch(
+        self,
+        batch: List[ValidationJob],
+        errors: List[Optional[str]],
+        result: PipelineResult,
+        rejected: Set[str]
+    ) -> None:
+        """Stateful stage: link each block into the tree in order."""
+        started = time.time()
+        for job, error in zip(batch, errors):
+            block = job.block
+            self.metrics.blocks_in += 1
+
+            if block.block_hash in self.engine.block_tree:
+                self.metrics.duplicates += 1
+                result.accepted.append(block.block_hash)
+                continue
+            self.engine.orphan_pool.metrics.blocks_received += 1
+
+            orphan = block.index > 0 and block.previous_hash not in self.engine.block_tree
+            if error is None and orphan and block.previous_hash not in rejected:
+                # The commitment travels with the orphan and is indexed when it connects
+                if self.engine.orphan_pool.add(block, commitment=job.commitment):
+                    self.metrics.orphaned += 1
+                else:
+                    self.metrics.duplicates += 1  # Already buffered, still waiting on its parent
+                result.orphaned.append(block.block_hash)
+                continue
+
+            if error is None and not self.engine._validate_parent_linkage(block):
+                error = "Parent linkage validation failed"
+
+            if error is not None:
+                self.metrics.rejected += 1
+                result.rejected.append((block.block_hash, error))
+                rejected.add(block.block_hash)
+                continue
+
+            if job.commitment:
+                self.engine._index_commitment(job.commitment, block)
+            connected = self.engine._add_block_to_tree(block, receipt_time=time.time())
+
+            self.metrics.accepted += 1 + len(connected)
+            result.accepted.append(block.block_hash)
+            result.accepted.extend(connected)
+        self.metrics.stateful_seconds += time.time() - started
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get throughput and queue-depth metrics."""
+        metrics = self.metrics.to_dict()
+        metrics["workers"] = self.workers
+        metrics["batch_size"] = self.batch_size
+        metrics["max_in_flight"] = self.max_in_flight
+        return metrics
@@ -0,0 +1,123 @@
+"""
+Shared builders for consensus and tokenomics tests
+Synthetic blocks with solvable subset-sum proofs, engines and addresses
+"""
+
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from core.blockchain import Block, ProblemTier, ComputationalComplexity, EnergyMetrics
+from consensus import ConsensusEngine, ConsensusConfig
+from pow import ProblemRegistry
+
+
+def make_complexity(problem, solution_size=4):
+    return ComputationalComplexity(
+        time_solve_O="O(2^n)", time_solve_Omega="Omega(2^(n/2))", time_solve_Theta=None,
+        time_verify_O="O(n)", time_verify_Omega="Omega(n)", time_verify_Theta="Theta(n)",
+        space_solve_O="O(n * target)", space_solve_Omega="Omega(n)", space_solve_Theta=None,
+        space_verify_O="O(n)", space_verify_Omega="Omega(n)", space_verify_Theta="Theta(n)",
+        problem_class="NP-Complete",
+        problem_size=len(problem["numbers"]),
+        solution_size=solution_size,
+        epsilon_approximation=None,
+        asymmetry_time=100.0,
+        asymmetry_space=10.0,
+        measured_solve_time=0.01,
+        measured_verify_time=0.0001,
+        measured_solve_space=1024,
+        measured_verify_space=64,
+        energy_metrics=EnergyMetrics(
+            solve_energy_joules=1.0, verify_energy_joules=0.001,
+            solve_power_watts=100.0, verify_power_watts=1.0,
+            solve_time_seconds=0.01, verify_time_seconds=0.0001,
+            cpu_utilization=50.0, memory_utilization=10.0, gpu_utilization=0.0
+        ),
+        problem=problem,
+        solution_quality=1.0
+    )
+
+
+def make_block(parent, tag="main", numbers=32, solution_size=4):
+    """Equal-sized problems carry equal work; larger ones outweigh them."""
+    index = parent.index + 1 if parent else 0
+    values = list(range(index + 1, index + 1 + numbers))
+    solution = values[:solution_size]
+    problem = {"type": "subset_sum", "numbers": values, "target": sum(solution), "size": numbers}
+    block = Block(
+        index=index,
+        timestamp=1_700_000_000.0 + index * 14 + (0.5 if tag != "main" else 0),
+        previous_hash=parent.block_hash if parent else "0" * 64,
+        transactions=[],
+        merkle_root=f"{tag}-{index}".encode().hex().ljust(64, "0")[:64],
+        problem=problem,
+        solution=solution,
+        complexity=make_complexity(problem, solution_size),
+        mining_capacity=ProblemTier.TIER_2_DESKTOP,
+        cumulative_work_score=float(index),
+        block_hash=""
+    )
+    block.block_hash = block.calculate_hash()
+    return block
+
+
+def make_chain(parent, count, tag="main", **block_args):
+    """count linked blocks on top of parent (None starts from a genesis block)."""
+    blocks = []
+    for _ in range(count):
+        parent = make_block(parent, tag, **block_args)
+        blocks.append(parent)
+    return blocks
+
+
+class NullStorage:
+    """Storage that keeps nothing (Mock would retain every call's arguments)."""
+
+    def store_work_index(self, *args):
+        return True
+
+    def store_tip(self, *args):
+        return True
+
+    def batch_write(self, operations):
+        pass
+
+
+def make_engine(storage=None, genesis=None, registry=None, **config):
+    """Engine whose tree holds only genesis (a fresh make_block(None) by default)."""
+    with patch.object(ConsensusEngine, "_initialize_genesis"):
+        engine = ConsensusEngine(ConsensusConfig(**config), storage or Mock(), registry or ProblemRegistry())
+    genesis = genesis or make_block(None)
+    engine.genesis_block = genesis
+    engine._add_block_to_tree(genesis, receipt_time=genesis.timestamp)
+    engine.best_tip = engine.block_tree[genesis.block_hash]
+    return engine, genesis
+
+
+def extend(engine, parent, count, tag="main", numbers=32):
+    """Add count blocks on top of parent to the engine's tree."""
+    blocks = make_chain(parent, count, tag, numbers=numbers)
+    for block in blocks:
+        engine._add_block_to_tree(block, receipt_time=time.time())
+    return blocks
+
+
+def address(i):
+    return f"CJ{i:040x}"
+
+
+def legacy_verify(tx):
+    """Per-transaction verification without batching or caching."""
+    try:
+        public_key = ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(tx.public_key))
+        public_key.verify(bytes.fromhex(tx.signature), tx._signing_data())
+        return True
+    except Exception:
+        return False
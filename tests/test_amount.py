@@ -0,0 +1,166 @@
+"""
+Tests for integer fixed-point ledger amounts
+Includes an order-independence replay benchmark against float balances
+"""
+
+import pytest
+import json
+import random
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics.amount import COIN, to_units, to_coins, format_amount, check_units
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tests.helpers import address
+
+
+def make_transfers(count, addresses=50, seed=44):
+    """Funding coinbases followed by fractional transfers."""
+    rng = random.Random(seed)
+    transactions = [Transaction(sender="COINBASE", recipient=address(i), amount=to_units(1_000),
+                                timestamp=float(i), transaction_id=f"cb-{i}") for i in range(addresses)]
+    for i in range(count):
+        sender, recipient = rng.sample(range(addresses), 2)
+        coins = round(rng.uniform(0.00000001, 2.0), 8)
+        transactions.append(Transaction(
+            sender=address(sender), recipient=address(recipient), amount=to_units(coins),
+            timestamp=1_000.0 + i, transaction_id=f"tx-{i}"
+        ))
+    return transactions
+
+
+class TestAmountConversion:
+    """Test conversion, rounding and display of base units."""
+
+    @pytest.mark.unit
+    def test_to_units_is_exact(self):
+        assert COIN == 100_000_000
+        assert to_units(1) == COIN
+        assert to_units(0.1) == 10_000_000
+        assert to_units(0.1) + to_units(0.2) == to_units(0.3)
+        assert to_units("0.00000001") == 1
+        assert to_units(1.23456789) == 123_456_789
+
+        # Half-even at the last unit
+        assert to_units("0.000000005") == 0
+        assert to_units("0.000000015") == 2
+
+        with pytest.raises(TypeError):
+            to_units(True)
+        with pytest.raises(ValueError):
+            to_units(float("nan"))
+        with pytest.raises(TypeError):
+            check_units(1.5)
+
+    @pytest.mark.unit
+    def test_format_and_coins(self):
+        assert format_amount(150_000_000) == "1.50000000"
+        assert format_amount(1) == "0.00000001"
+        assert format_amount(-250_000_000) == "-2.50000000"
+        assert to_coins(to_units(12.5)) == 12.5
+
+        with pytest.raises(TypeError):
+            Transaction(sender=address(1), recipient=address(2), amount=1.5, timestamp=1.0)
+
+
+class TestFixedPointLedger:
+    """Test that balances are exact integers end to end."""
+
+    @pytest.mark.unit
+    def test_replay_order_does_not_change_balances(self):
+        transactions = make_transfers(5_000, addresses=10)
+        funding, transfers = transactions[:10], transactions[10:]
+        results = []
+        for seed in range(3):
+            shuffled = transfers[:]
+            random.Random(seed).shuffle(shuffled)
+            state = BlockchainState()
+            assert state.process_transactions(funding + shuffled)
+            results.append(dict(state.balances))
+
+        assert results[0] == results[1] == results[2]
+        assert all(isinstance(balance, int) for balance in results[0].values())
+        assert sum(results[0].values()) == to_units(10_000)
+
+    @pytest.mark.unit
+    def test_transaction_ids_and_legacy_files(self, tmp_path):
+        tx = Transaction(sender=address(1), recipient=address(2), amount=to_units(2.5), timestamp=1.0)
+        data = tx.to_dict()
+        assert data['amount'] == 2.5 and data['amount_units'] == 250_000_000
+        assert Transaction.from_dict(data).transaction_id == tx.transaction_id
+
+        # Coin-denominated records from before base units
+        legacy_tx = {k: v for k, v in data.items() if k != 'amount_units'}
+        assert Transaction.from_dict(legacy_tx).amount == 250_000_000
+
+        path = str(tmp_path / "state.json")
+        with open(path, "w") as f:
+            json.dump({"balances": {address(1): 0.1, address(2): 12.5}}, f)
+        state = BlockchainState()
+        assert state.load_state(path)
+        assert state.get_balance(address(1)) == 10_000_000
+        assert state.get_balance(address(2)) == 1_250_000_000
+
+        assert state.save_state(path)
+        restored = BlockchainState()
+        assert restored.load_state(path)
+        assert dict(restored.balances) == dict(state.balances)
+
+    @pytest.mark.unit
+    def test_block_reward_is_integer(self):
+        from metrics_engine import MetricsEngine, NetworkState
+
+        engine = MetricsEngine()
+        network_state = NetworkState(
+            cumulative_work=1000.0, network_avg_work=10.0, total_supply=0.0,
+            block_count=100, avg_block_time=60.0, network_growth_rate=0.0
+        )
+        units = engine.calculate_block_reward_units(25.0, network_state)
+        assert isinstance(units, int)
+        assert units == to_units(engine.calculate_block_reward(25.0, network_state))
+
+
+class TestAmountBenchmark:
+    """Benchmark exact replay against float accumulation."""
+
+    @pytest.mark.stress
+    def test_shuffled_replay_is_bit_identical(self):
+        print("\n🧮 Replaying 200,000 transfers in shuffled orders...")
+        transactions = make_transfers(200_000, addresses=100)
+        funding, transfers = transactions[:100], transactions[100:]
+
+        int_results, float_results, rates = [], [], []
+        for seed in range(3):
+            shuffled = transfers[:]
+            random.Random(seed).shuffle(shuffled)
+
+            state = BlockchainState()
+            start = time.perf_counter()
+            assert state.process_transactions(funding + shuffled)
+            rates.append(len(transactions) / (time.perf_counter() - start))
+            int_results.append(dict(state.balances))
+
+            # The previous float ledger, applied in the same order
+            balances = {}
+            for tx in funding + shuffled:
+                coins = to_coins(tx.amount)
+                if tx.sender != "COINBASE":
+                    balances[tx.sender] = balances.get(tx.sender, 0.0) - coins
+                balances[tx.recipient] = balances.get(tx.recipient, 0.0) + coins
+            float_results.append(balances)
+
+        exact = {addr: to_coins(units) for addr, units in int_results[0].items()}
+        float_error = max(abs(result[addr] - exact[addr]) for result in float_results for addr in exact)
+        float_orders = len({tuple(sorted(result.items())) for result in float_results})
+        print(f"   Integer ledger: {min(rates):,.0f} tx/sec, identical across orders: "
+              f"{int_results[0] == int_results[1] == int_results[2]}")
+        print(f"   Float ledger:   {float_orders} distinct results from 3 orders, "
+              f"max error {float_error:.3e} coins")
+
+        assert int_results[0] == int_results[1] == int_results[2]
+        assert sum(int_results[0].values()) == to_units(100_000)
+        print("✅ Fixed-point replay benchmark passed")
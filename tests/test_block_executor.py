@@ -0,0 +1,188 @@
+"""
+Tests for batched block execution
+Includes an equivalence and timing benchmark with 10,000-transfer blocks
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics import signatures
+from tokenomics.signatures import SignatureVerifier
+from tokenomics.block_executor import BlockExecutor, net_deltas
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tokenomics.wallet import Wallet
+from tokenomics.amount import to_units
+from tests.helpers import address, legacy_verify
+
+
+def make_block(count, addresses=200, seed=50, coinbases=5):
+    """Unsigned coinbases and transfers, including self-transfers."""
+    rng = random.Random(seed)
+    transactions = [Transaction(sender="COINBASE", recipient=address(rng.randrange(addresses)),
+                                amount=to_units(50), timestamp=float(i), transaction_id=f"cb-{seed}-{i}")
+                    for i in range(coinbases)]
+    for i in range(count):
+        sender = rng.randrange(addresses)
+        recipient = sender if i % 97 == 0 else rng.randrange(addresses)
+        transactions.append(Transaction(
+            sender=address(sender), recipient=address(recipient), amount=rng.randint(1, 10**9),
+            timestamp=1_000.0 + i, transaction_id=f"tx-{seed}-{i}"
+        ))
+    return transactions
+
+
+def signed_block(wallets, count, seed=50):
+    """Signed transfers between random wallet pairs."""
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(count):
+        sender, recipient = rng.sample(wallets, 2)
+        tx = Transaction(sender=sender.address, recipient=recipient.address, amount=to_units(1),
+                         timestamp=1_700_000_000.0 + i)
+        tx.sign(sender.get_private_key_bytes())
+        transactions.append(tx)
+    return transactions
+
+
+class LegacyBlockchainState(BlockchainState):
+    """The previous sequential apply, checking each signature before its update."""
+
+    def process_transactions(self, transactions, verify_signatures=False):
+        try:
+            with self.atomic():
+                for transaction in transactions:
+                    if verify_signatures and transaction.sender != "COINBASE" and not legacy_verify(transaction):
+                        raise ValueError("invalid signature in block")
+                    if transaction.sender != "COINBASE":
+                        self._set_balance(transaction.sender,
+                                          self.get_balance(transaction.sender) - transaction.amount)
+                    self._set_balance(transaction.recipient,
+                                      self.get_balance(transaction.recipient) + transaction.amount)
+                    self.transactions.add(transaction)
+                    self.processed_transactions.add(transaction.transaction_id)
+            return True
+        except Exception as e:
+            print(f"Error processing transactions: {e}")
+            return False
+
+
+def snapshot(state):
+    """Balances in insertion order, history in store order and processed ids."""
+    return (list(state.balances.items()),
+            [tx.transaction_id for tx in state.transactions],
+            set(state.processed_transactions))
+
+
+def fund(state, wallets):
+    for wallet in wallets:
+        state.update_balance(wallet.address, to_units(1_000))
+
+
+class TestNetDeltas:
+    """Test per-address net balance changes."""
+
+    @pytest.mark.unit
+    def test_first_touch_order_and_self_transfers(self):
+        a, b, c = (address(i) for i in range(3))
+        transactions = [
+            Transaction(sender="COINBASE", recipient=b, amount=50, timestamp=1.0),
+            Transaction(sender=a, recipient=c, amount=7, timestamp=2.0),
+            Transaction(sender=c, recipient=c, amount=3, timestamp=3.0),
+            Transaction(sender=b, recipient=a, amount=5, timestamp=4.0),
+        ]
+        deltas = net_deltas(transactions)
+        assert list(deltas.items()) == [(b, 45), (a, -2), (c, 7)]
+        assert net_deltas([]) == {}
+
+
+class TestBlockExecutor:
+    """Test that executed blocks match sequential application."""
+
+    @pytest.mark.unit
+    def test_matches_sequential_application(self):
+        for seed in range(3):
+            funding = make_block(0, seed=seed, coinbases=20)
+            block = make_block(3_000, seed=seed)
+            legacy, state = LegacyBlockchainState(), BlockchainState()
+            for target in (legacy, state):
+                assert target.process_transactions(funding)
+                assert target.process_transactions(block)
+            assert snapshot(state) == snapshot(legacy)
+
+    @pytest.mark.unit
+    def test_empty_block_and_invalid_signatures(self):
+        wallets = [Wallet() for _ in range(4)]
+        block = signed_block(wallets, 8)
+        block[5].signature = block[2].signature
+        state = BlockchainState()
+        fund(state, wallets)
+        before = snapshot(state)
+
+        with patch.object(signatures, "_signature_verifier", SignatureVerifier(workers=0)):
+            executor = BlockExecutor()
+            result = executor.execute(state, block, verify_signatures=True)
+            assert not result.success and result.invalid == [5]
+            assert snapshot(state) == before
+
+            assert executor.execute(state, [], verify_signatures=True).success
+            result = executor.execute(state, block[:5], verify_signatures=True)
+        assert result.success and result.addresses == 4
+        assert len(state.transactions) == 5
+
+    @pytest.mark.unit
+    def test_sqlite_state_matches_sequential(self, tmp_path):
+        block = make_block(500, addresses=50)
+        legacy = LegacyBlockchainState(db_path=str(tmp_path / "legacy.db"))
+        state = BlockchainState(db_path=str(tmp_path / "state.db"))
+        for target in (legacy, state):
+            assert target.process_transactions(block)
+        assert snapshot(state) == snapshot(legacy)
+        assert dict(state.store.load_balances()) == dict(legacy.store.load_balances())
+
+
+class TestBlockExecutorBenchmark:
+    """Time 10k-transfer blocks against sequential, interleaved application."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_equivalence_and_timing(self, tmp_path):
+        print("\n🧱 Benchmarking block execution with 10,000 signed transfers...")
+        wallets = [Wallet() for _ in range(500)]
+        block = signed_block(wallets, 10_000)
+        executor = BlockExecutor()
+        runs = iter(range(100))
+
+        def run(cls, db, verify):
+            state = cls(db_path=str(tmp_path / f"state-{next(runs)}.db") if db else None)
+            fund(state, wallets)
+            start = time.perf_counter()
+            if cls is LegacyBlockchainState:
+                assert state.process_transactions(block, verify_signatures=verify)
+            else:
+                assert executor.execute(state, block, verify_signatures=verify).success
+            return state, time.perf_counter() - start
+
+        for label, db in (("in-memory", False), ("sqlite", True)):
+            # Apply phase alone, best of five
+            legacy_apply = min(run(LegacyBlockchainState, db, False)[1] for _ in range(5))
+            executor_apply = min(run(BlockchainState, db, False)[1] for _ in range(5))
+
+            # Full blocks with signature checks and a cold verifier cache
+            legacy, legacy_s = run(LegacyBlockchainState, db, True)
+            with SignatureVerifier() as verifier, patch.object(signatures, "_signature_verifier", verifier):
+                state, executor_s = run(BlockchainState, db, True)
+            assert snapshot(state) == snapshot(legacy)
+
+            print(f"   {label:>9} apply: sequential {legacy_apply * 1000:6.0f} ms | executor "
+                  f"{executor_apply * 1000:6.0f} ms | {legacy_apply / executor_apply:.2f}x")
+            print(f"   {label:>9} full:  sequential {legacy_s:6.2f} s  | executor "
+                  f"{executor_s:6.2f} s  | {legacy_s / executor_s:.2f}x")
+        print(f"   {verifier.workers} verify workers, {os.cpu_count()} CPUs")
+        print("✅ Block execution benchmark passed")
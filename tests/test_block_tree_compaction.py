@@ -0,0 +1,114 @@
+"""
+Tests for finality-based compaction of ConsensusEngine.block_tree
+Includes a long-chain resident memory benchmark
+"""
+
+import pytest
+import gc
+import tracemalloc
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from consensus import BlockNode, BlockStub
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from tests.helpers import make_block, make_engine, extend, NullStorage
+
+
+class TestCompaction:
+    """Test stubbing of finalized main-chain nodes and side-branch eviction."""
+
+    @pytest.mark.unit
+    def test_finalized_main_chain_stubbed(self):
+        engine, genesis = make_engine(confirmation_depth=20, compaction_interval=10)
+        chain = extend(engine, genesis, 200)
+
+        resident = [n for n in engine.block_tree.values() if isinstance(n, BlockNode)]
+        stubs = [n for n in engine.block_tree.values() if isinstance(n, BlockStub)]
+
+        assert len(engine.block_tree) == 201
+        assert len(resident) <= 20 + 10
+        assert len(stubs) == 201 - len(resident)
+        assert engine.best_tip.block.block_hash == chain[-1].block_hash
+        assert engine.is_finalized(chain[100].block_hash)
+        assert engine.storage.batch_write.called
+
+    @pytest.mark.unit
+    def test_finalized_side_branch_evicted(self):
+        engine, genesis = make_engine(confirmation_depth=20, compaction_interval=0)
+        main = extend(engine, genesis, 10)
+        side = extend(engine, main[4], 3, tag="side")
+        main += extend(engine, main[-1], 40)
+
+        stats = engine.compact_block_tree()
+
+        assert stats["evicted"] == 3
+        assert all(block.block_hash not in engine.block_tree for block in side)
+        assert engine.block_tree[main[4].block_hash].height == 5
+        assert stats["stubbed"] == len(main) + 1 - 20
+
+    @pytest.mark.unit
+    def test_unfinalized_fork_kept(self):
+        engine, genesis = make_engine(confirmation_depth=20, compaction_interval=0)
+        main = extend(engine, genesis, 100)
+        side = extend(engine, main[90], 2, tag="side")
+
+        engine.compact_block_tree()
+
+        assert all(isinstance(engine.block_tree[b.block_hash], BlockNode) for b in side)
+
+    @pytest.mark.unit
+    def test_stubs_backed_by_storage(self, tmp_path):
+        storage = StorageManager(StorageConfig(
+            data_dir=str(tmp_path / "compaction"),
+            role=NodeRole.FULL,
+            pruning_mode=PruningMode.FULL
+        ))
+        engine, genesis = make_engine(storage, confirmation_depth=5, compaction_interval=5)
+        chain = extend(engine, genesis, 30)
+
+        assert isinstance(engine.block_tree[chain[3].block_hash], BlockStub)
+        history = engine.get_chain_from_genesis()
+        assert [b.block_hash for b in history] == [genesis.block_hash] + [b.block_hash for b in chain]
+
+        # A new block can still link to its (resident) parent after compaction
+        child = make_block(chain[-1])
+        assert engine._validate_parent_linkage(child)
+
+
+class TestCompactionMemory:
+    """Benchmark resident memory on a long chain."""
+
+    @staticmethod
+    def measure(length, compaction_interval):
+        gc.collect()
+        tracemalloc.start()
+        engine, genesis = make_engine(
+            NullStorage(), confirmation_depth=20, compaction_interval=compaction_interval
+        )
+        extend(engine, genesis, length)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current, engine
+
+    @pytest.mark.stress
+    def test_resident_memory_tracks_window(self):
+        print("\n🧠 Benchmarking block_tree memory on long chains...")
+        full_short, _ = self.measure(1000, 0)
+        full_long, _ = self.measure(3000, 0)
+        compact_short, _ = self.measure(1000, 64)
+        compact_long, engine = self.measure(3000, 64)
+
+        full_per_block = (full_long - full_short) / 2000
+        compact_per_block = (compact_long - compact_short) / 2000
+        resident = sum(isinstance(n, BlockNode) for n in engine.block_tree.values())
+
+        print(f"   Uncompacted: {full_per_block:,.0f} bytes/block")
+        print(f"   Compacted:   {compact_per_block:,.0f} bytes/block (stub), {resident} resident nodes")
+
+        assert resident <= 20 + 64
+        assert compact_per_block < full_per_block / 5
+
+        print("✅ Compaction memory benchmark passed")
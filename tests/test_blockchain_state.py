@@ -0,0 +1,179 @@
+"""
+Tests for the indexed transaction store in BlockchainState
+Includes a lookup and history benchmark at a million transactions
+"""
+
+import pytest
+import json
+import random
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics.blockchain_state import BlockchainState, Transaction, TransactionStore
+from tokenomics.amount import to_units
+from tests.helpers import address
+
+
+def make_transactions(count, addresses=100, seed=41):
+    """Transfers between a fixed set of addresses, mostly in time order."""
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(count):
+        sender, recipient = rng.sample(range(addresses), 2)
+        transactions.append(Transaction(
+            sender=address(sender), recipient=address(recipient), amount=to_units(1 + i % 7),
+            timestamp=1_700_000_000.0 + i + rng.uniform(-5, 5),  # Slightly out of order
+            transaction_id=f"{i:064x}"
+        ))
+    return transactions
+
+
+class LegacyHistory:
+    """The previous per-address lists, used as a reference."""
+
+    def __init__(self):
+        self.pending_transactions = []
+        self.transaction_history = {}
+
+    def add(self, tx):
+        self.transaction_history.setdefault(tx.sender, []).append(tx)
+        self.transaction_history.setdefault(tx.recipient, []).append(tx)
+
+    def get_transaction_history(self, address, limit=100):
+        history = self.transaction_history.get(address, [])
+        return sorted(history, key=lambda tx: tx.timestamp, reverse=True)[:limit]
+
+    def get_transaction_by_id(self, transaction_id):
+        for tx in self.pending_transactions:
+            if tx.transaction_id == transaction_id:
+                return tx
+        for address_history in self.transaction_history.values():
+            for tx in address_history:
+                if tx.transaction_id == transaction_id:
+                    return tx
+        return None
+
+
+class TestTransactionStore:
+    """Test id lookup and ordered address indexes."""
+
+    @pytest.mark.unit
+    def test_history_matches_sorted_scan(self):
+        transactions = make_transactions(2_000, addresses=10)
+        state, legacy = BlockchainState(), LegacyHistory()
+        state.process_transactions(transactions)
+        for tx in transactions:
+            legacy.add(tx)
+
+        for i in range(10):
+            for limit in (0, 1, 100, 10_000):
+                expected = legacy.get_transaction_history(address(i), limit)
+                assert [tx.timestamp for tx in state.get_transaction_history(address(i), limit)] == \
+                    [tx.timestamp for tx in expected]
+        assert state.get_transaction_history(address(99)) == []
+
+        for tx in random.Random(1).sample(transactions, 50):
+            assert state.get_transaction_by_id(tx.transaction_id) is tx
+        assert state.get_transaction_by_id("missing") is None
+
+    @pytest.mark.unit
+    def test_each_transaction_stored_once(self):
+        store = TransactionStore()
+        tx = make_transactions(1)[0]
+        assert store.add(tx)
+        assert not store.add(tx)
+
+        assert len(store) == 1
+        assert store.count(tx.sender) == store.count(tx.recipient) == 1
+        assert store.history(tx.sender)[0] is store.history(tx.recipient)[0]
+
+        assert store.remove(tx.transaction_id) is tx
+        assert store.addresses() == []
+        assert store.remove(tx.transaction_id) is None
+
+    @pytest.mark.unit
+    def test_pending_lookup_and_history_view(self):
+        state = BlockchainState()
+        coinbase = state.create_coinbase_transaction(address(1), to_units(10), timestamp=100.0)
+        assert state.add_transaction(coinbase)
+        assert not state.add_transaction(coinbase)
+        assert state.get_transaction_by_id(coinbase.transaction_id) is coinbase
+
+        state.process_transactions([coinbase])
+        state.clear_pending_transactions([coinbase])
+        assert state.pending_transactions == []
+        assert state.get_transaction_by_id(coinbase.transaction_id) is coinbase
+
+        # The former dict-of-lists shape still reads the same
+        assert state.transaction_history[address(1)] == [coinbase]
+        assert state.transaction_history.get(address(2), []) == []
+        assert set(state.transaction_history) == {"COINBASE", address(1)}
+
+    @pytest.mark.unit
+    def test_state_round_trip_and_legacy_files(self, tmp_path):
+        transactions = make_transactions(50, addresses=5)
+        state = BlockchainState()
+        state.process_transactions(transactions)
+        path = str(tmp_path / "state.json")
+        assert state.save_state(path)
+
+        restored = BlockchainState()
+        assert restored.load_state(path)
+        assert len(restored.transactions) == 50
+        assert [tx.transaction_id for tx in restored.get_transaction_history(address(0))] == \
+            [tx.transaction_id for tx in state.get_transaction_history(address(0))]
+
+        # Older files listed each transaction under both addresses
+        legacy = {"transaction_history": {}}
+        for tx in transactions:
+            for addr in (tx.sender, tx.recipient):
+                legacy["transaction_history"].setdefault(addr, []).append(tx.to_dict())
+        with open(path, "w") as f:
+            json.dump(legacy, f)
+        assert restored.load_state(path)
+        assert len(restored.transactions) == 50
+
+
+class TestTransactionStoreBenchmark:
+    """Benchmark lookups against the previous structure."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_million_transactions(self):
+        print("\n🗂️  Benchmarking transaction lookups at 1,000,000 transactions...")
+        transactions = make_transactions(1_000_000, addresses=1_000)
+        state, legacy = BlockchainState(), LegacyHistory()
+
+        start = time.perf_counter()
+        state.process_transactions(transactions)
+        print(f"   Indexed insert: {len(transactions) / (time.perf_counter() - start):,.0f} tx/sec")
+        for tx in transactions:
+            legacy.add(tx)
+
+        rng = random.Random(7)
+        lookups = [tx.transaction_id for tx in rng.sample(transactions, 20)]
+        addresses = [address(i) for i in rng.sample(range(1_000), 20)]
+
+        def timed(fn, args):
+            start = time.perf_counter()
+            results = [fn(arg) for arg in args]
+            return (time.perf_counter() - start) / len(args), results
+
+        new_lookup, found = timed(state.get_transaction_by_id, lookups)
+        old_lookup, expected = timed(legacy.get_transaction_by_id, lookups)
+        assert found == expected
+
+        new_history, found = timed(state.get_transaction_history, addresses)
+        old_history, expected = timed(legacy.get_transaction_history, addresses)
+        assert [[tx.timestamp for tx in txs] for txs in found] == [[tx.timestamp for tx in txs] for txs in expected]
+
+        print(f"   get_transaction_by_id:   indexed {new_lookup * 1e6:8.1f} µs, scan {old_lookup * 1e6:10.1f} µs")
+        print(f"   get_transaction_history: indexed {new_history * 1e6:8.1f} µs, sort {old_history * 1e6:10.1f} µs")
+
+        assert new_lookup * 100 < old_lookup
+        assert new_history * 10 < old_history
+        print("✅ Transaction store benchmark passed")
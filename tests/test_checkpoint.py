@@ -0,0 +1,210 @@
+"""
+Tests for signed checkpoints and fast ConsensusService startup
+Includes a startup-time benchmark at several chain heights
+"""
+
+import pytest
+import hashlib
+import importlib
+import json
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checkpoint import Checkpoint, CheckpointStore
+from consensus import ConsensusEngine, ConsensusConfig
+from pow import ProblemRegistry
+
+
+def make_cache_blocks(count, start=0, previous_hash="0" * 64):
+    """Cached blockchain state entries, as written by the consensus service."""
+    blocks = []
+    for index in range(start, start + count):
+        block_hash = hashlib.sha256(f"block-{index}".encode()).hexdigest()
+        blocks.append({
+            "index": index,
+            "timestamp": 1_700_000_000.0 + index * 14,
+            "previous_hash": previous_hash,
+            "merkle_root": "0" * 64,
+            "mining_capacity": "TIER_1_MOBILE",
+            "cumulative_work_score": float(index + 1),
+            "block_hash": block_hash,
+            "offchain_cid": ""
+        })
+        previous_hash = block_hash
+    return blocks
+
+
+def write_cache(path, blocks):
+    with open(path, "w") as f:
+        json.dump({"blocks": blocks}, f)
+
+
+@pytest.fixture
+def service_factory(tmp_path, monkeypatch):
+    """Build ConsensusServices sharing a cache file and checkpoint directory."""
+    monkeypatch.chdir(tmp_path)  # The service module logs to ./logs
+    consensus_service = importlib.import_module("consensus_service")
+    cache_path = str(tmp_path / "blockchain_state.json")
+
+    def make(checkpoints=True):
+        with patch.object(ConsensusEngine, "_initialize_genesis"):
+            engine = ConsensusEngine(ConsensusConfig(confirmation_depth=6), Mock(), ProblemRegistry())
+        with patch("p2p_discovery.DiscoveryConfig"), patch("p2p_discovery.P2PDiscoveryService"):
+            service = consensus_service.ConsensusService()
+        service.consensus_engine = engine
+        service.blockchain_state_path = cache_path
+        if checkpoints:
+            service.checkpoint_store = CheckpointStore(str(tmp_path / "checkpoints"))
+        return service
+
+    return make, cache_path
+
+
+class TestCheckpointStore:
+    """Test signing, verification and retention."""
+
+    @pytest.mark.unit
+    def test_round_trip_and_retention(self, tmp_path):
+        store = CheckpointStore(str(tmp_path), keep=2)
+        for height in (10, 20, 30):
+            assert store.save(Checkpoint(height=height, tip_hash=f"{height:064x}", cumulative_work=height * 1.5,
+                                         balances={"miner": 500_000_000}, last_event_id=f"evt-{height}"))
+
+        latest = store.load_latest()
+        assert latest.height == 30
+        assert latest.balances == {"miner": 500_000_000}
+        assert latest.last_event_id == "evt-30"
+        assert len(store._list()) == 2
+
+        # Same key file is reused across instances
+        assert CheckpointStore(str(tmp_path)).load_latest().height == 30
+
+    @pytest.mark.unit
+    def test_tampered_checkpoint_skipped(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save(Checkpoint(height=1, tip_hash="a" * 64, cumulative_work=1.0))
+        store.save(Checkpoint(height=2, tip_hash="b" * 64, cumulative_work=2.0))
+
+        path = store._path(2)
+        with open(path) as f:
+            data = json.load(f)
+        data["cumulative_work"] = 1e9
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+        assert store.load_latest().height == 1
+        assert CheckpointStore(str(tmp_path), key=b"other").load_latest() is None
+
+
+class TestFastStartup:
+    """Test that bootstrap resumes from a checkpoint and replays only the tail."""
+
+    @pytest.mark.unit
+    def test_resume_matches_full_replay(self, service_factory):
+        make, cache_path = service_factory
+        blocks = make_cache_blocks(200)
+        write_cache(cache_path, blocks)
+
+        first = make()
+        assert first.bootstrap_from_cache()
+        first.last_event_id, first.last_event_ts = "evt-199", 5000.0
+        assert first.create_checkpoint().height == 199
+
+        # Chain grows after the checkpoint
+        blocks += make_cache_blocks(10, start=200, previous_hash=blocks[-1]["block_hash"])
+        write_cache(cache_path, blocks)
+
+        resumed = make()
+        with patch.object(resumed, "_convert_cache_block_to_block",
+                          wraps=resumed._convert_cache_block_to_block) as convert:
+            assert resumed.bootstrap_from_cache()
+        full = make(checkpoints=False)
+        assert full.bootstrap_from_cache()
+
+        assert convert.call_count == 1 + 10  # Checkpoint tip + tail
+        assert resumed.consensus_engine.best_tip.block.block_hash == blocks[-1]["block_hash"]
+        assert resumed.consensus_engine.best_tip.height == full.consensus_engine.best_tip.height
+        assert resumed.consensus_engine.best_tip.cumulative_work == pytest.approx(
+            full.consensus_engine.best_tip.cumulative_work
+        )
+        assert resumed.last_event_id == "evt-199"
+        assert resumed.last_event_ts == 5000.0
+
+        # The cached chain is written back in full
+        resumed._write_blockchain_state()
+        with open(cache_path) as f:
+            written = json.load(f)["blocks"]
+        assert [b["block_hash"] for b in written] == [b["block_hash"] for b in blocks]
+
+    @pytest.mark.unit
+    def test_stale_checkpoint_falls_back_to_full_replay(self, service_factory):
+        make, cache_path = service_factory
+        write_cache(cache_path, make_cache_blocks(50))
+        first = make()
+        first.bootstrap_from_cache()
+        first.create_checkpoint()
+
+        # Cache replaced by an unrelated chain
+        other = make_cache_blocks(30, previous_hash="f" * 64)
+        write_cache(cache_path, other)
+
+        service = make()
+        assert service.bootstrap_from_cache()
+        assert service.last_checkpoint_height == -1
+        assert service.consensus_engine.best_tip.block.block_hash == other[-1]["block_hash"]
+
+    @pytest.mark.unit
+    def test_checkpointed_events_skipped(self, service_factory):
+        make, _ = service_factory
+        service = make()
+        service.restored_event_id, service.restored_event_ts = "evt-2", 2.0
+        service.p2p_discovery.get_peer_statistics.return_value = {"total_discovered": 0}
+        service.ingest_store = Mock()
+        service.ingest_store.blocks_since.return_value = [
+            {"event_id": f"evt-{i}", "ts": float(i)} for i in range(4)
+        ]
+
+        with patch.object(service, "_validate_event", return_value=False) as validate:
+            service.process_all_peer_submissions()
+
+        assert [c.args[0]["event_id"] for c in validate.call_args_list] == ["evt-3"]
+
+
+class TestStartupBenchmark:
+    """Benchmark bootstrap time with and without a checkpoint."""
+
+    @pytest.mark.stress
+    def test_startup_time_by_height(self, service_factory):
+        print("\n📌 Benchmarking startup time at several chain heights...")
+        make, cache_path = service_factory
+        tail = 20
+
+        for height in (1_000, 5_000, 20_000):
+            blocks = make_cache_blocks(height)
+            write_cache(cache_path, blocks[:-tail])
+            seed = make()
+            seed.bootstrap_from_cache()
+            seed.create_checkpoint()
+            write_cache(cache_path, blocks)
+
+            full = make(checkpoints=False)
+            start = time.perf_counter()
+            full.bootstrap_from_cache()
+            full_elapsed = time.perf_counter() - start
+
+            resumed = make()
+            start = time.perf_counter()
+            resumed.bootstrap_from_cache()
+            resumed_elapsed = time.perf_counter() - start
+
+            assert resumed.consensus_engine.best_tip.block.block_hash == blocks[-1]["block_hash"]
+            print(f"   height {height:>6,}: full replay {full_elapsed * 1000:8.1f} ms, "
+                  f"checkpoint + {tail} blocks {resumed_elapsed * 1000:7.1f} ms")
+            assert resumed_elapsed < full_elapsed
+
+        print("✅ Startup benchmark passed")
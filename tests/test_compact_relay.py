@@ -0,0 +1,239 @@
+"""
+Tests for compact block relay
+Multi-node local simulation comparing compact vs full block bytes
+"""
+
+import pytest
+import hashlib
+import sys
+import os
+from dataclasses import replace
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier, build_merkle_root
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from network import (
+    NetworkProtocol, LocalTransport, CompactBlockMsg, proof_leaf
+)
+
+
+def make_tx(i):
+    tx_id = hashlib.sha256(f"tx-{i}".encode()).hexdigest()
+    return {
+        "transaction_id": tx_id,
+        "sender": "BEANS" + "a" * 40,
+        "recipient": "BEANS" + "b" * 40,
+        "amount": 1.5 + i,
+        "timestamp": 1_700_000_000.0 + i,
+        "signature": "ab" * 64,
+        "public_key": "cd" * 32
+    }
+
+
+def make_block(transactions, index=1, previous_hash="0" * 64):
+    problem = {"type": "subset_sum", "numbers": list(range(1, 200)), "target": 5000, "size": 199}
+    solution = list(range(1, 60))
+    block = Block(
+        index=index,
+        timestamp=1_700_000_000.0 + index * 14,
+        previous_hash=previous_hash,
+        transactions=transactions,
+        merkle_root=build_merkle_root(transactions + [proof_leaf(problem, solution)], ""),
+        problem=problem,
+        solution=solution,
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_2_DESKTOP,
+        cumulative_work_score=100.0,
+        block_hash=""
+    )
+    block.block_hash = block.calculate_hash()
+    return block
+
+
+def build_network(tmp_path, node_count):
+    registry = {}
+    nodes = []
+    for i in range(node_count):
+        peer_id = f"node-{i}"
+        storage = StorageManager(StorageConfig(
+            data_dir=str(tmp_path / peer_id),
+            role=NodeRole.FULL,
+            pruning_mode=PruningMode.FULL
+        ))
+        transport = LocalTransport(peer_id, registry)
+        net = NetworkProtocol(Mock(), storage, Mock(), peer_id=peer_id, transport=transport)
+        transport.attach(net)
+        nodes.append(net)
+    return nodes
+
+
+class TestCompactBlockRelay:
+    """Test reconstruction from mempool and proof cache."""
+
+    @pytest.mark.unit
+    def test_message_roundtrip(self):
+        net = NetworkProtocol(Mock(), Mock(), Mock())
+        message = CompactBlockMsg(b"hdr", ["abc123"], "ff" * 32, "p1")
+
+        decoded = net.decode_message(net.encode_message(message))
+
+        assert isinstance(decoded, CompactBlockMsg)
+        assert decoded.short_tx_ids == ["abc123"]
+        assert decoded.header_bytes == b"hdr"
+
+    @pytest.mark.simulation
+    def test_full_reconstruction_without_fill(self, tmp_path):
+        miner, peer = build_network(tmp_path, 2)
+        transactions = [make_tx(i) for i in range(20)]
+        block = make_block(transactions)
+        peer.mempool = list(transactions)
+        peer.cache_proof(block.problem, block.solution)
+
+        received = []
+        peer.on_block_received = lambda p, b: received.append(b)
+        miner.announce_compact_block(block)
+
+        assert len(received) == 1
+        assert received[0].merkle_root == block.merkle_root
+        assert received[0].transactions == transactions
+        assert peer.relay_stats["fill_requests"] == 0
+        assert peer.storage.get_block(block.block_hash) is not None
+
+    @pytest.mark.simulation
+    def test_missing_pieces_requested(self, tmp_path):
+        miner, peer = build_network(tmp_path, 2)
+        transactions = [make_tx(i) for i in range(20)]
+        block = make_block(transactions)
+        peer.mempool = transactions[:15]
+
+        received = []
+        peer.on_block_received = lambda p, b: received.append(b)
+        miner.announce_compact_block(block)
+        assert peer.wait_for_relay(timeout=10)
+
+        assert len(received) == 1
+        assert received[0].solution == block.solution
+        assert peer.relay_stats["fill_requests"] == 1
+        assert peer.relay_stats["txs_missing"] == 5
+        assert peer.relay_stats["proofs_missing"] == 1
+        assert peer.relay_stats["full_fallbacks"] == 0
+
+    @pytest.mark.simulation
+    def test_merkle_mismatch_falls_back_to_full_block(self, tmp_path):
+        miner, peer = build_network(tmp_path, 2)
+        transactions = [make_tx(i) for i in range(5)]
+        block = make_block(transactions)
+        miner.storage.store_block(block)
+
+        # Peer's mempool holds a tampered copy with the same id
+        tampered = dict(transactions[0], amount=999.0)
+        peer.mempool = [tampered] + transactions[1:]
+        peer.cache_proof(block.problem, block.solution)
+
+        received = []
+        peer.on_block_received = lambda p, b: received.append(b)
+        miner.announce_compact_block(block)
+        assert peer.wait_for_relay(timeout=10)
+
+        assert peer.relay_stats["full_fallbacks"] == 1
+        assert received[0].transactions[0]["amount"] == transactions[0]["amount"]
+
+    @pytest.mark.simulation
+    def test_tampered_header_rejected(self, tmp_path):
+        miner, peer = build_network(tmp_path, 2)
+        transactions = [make_tx(i) for i in range(5)]
+        block = make_block(transactions)
+        peer.mempool = list(transactions)
+        peer.cache_proof(block.problem, block.solution)
+
+        received = []
+        peer.on_block_received = lambda p, b: received.append(b)
+
+        # Same announced hash, but the header no longer hashes to it
+        forged = replace(block, transactions=[], timestamp=block.timestamp + 1)
+        message = CompactBlockMsg(
+            peer.storage._serialize_header(forged),
+            [tx["transaction_id"] for tx in transactions],
+            proof_leaf(block.problem, block.solution),
+            miner.peer_id
+        )
+
+        assert not peer._handle_compact_block_msg(miner.peer_id, message)
+        assert received == []
+        assert block.block_hash not in peer.seen_headers
+        assert peer.storage.get_block(block.block_hash) is None
+
+        # The honest announcement of the same hash is still accepted
+        miner.announce_compact_block(block)
+        assert peer.wait_for_relay(timeout=10)
+        assert len(received) == 1
+        assert peer.storage.get_block(block.block_hash) is not None
+
+    @pytest.mark.simulation
+    def test_mismatched_fallback_block_rejected(self, tmp_path):
+        miner, peer = build_network(tmp_path, 2)
+        transactions = [make_tx(i) for i in range(5)]
+        block = make_block(transactions)
+
+        # Miner serves a different body under the announced hash
+        miner.storage.store_block(replace(block, timestamp=block.timestamp + 1))
+        tampered = dict(transactions[0], amount=999.0)
+        peer.mempool = [tampered] + transactions[1:]
+        peer.cache_proof(block.problem, block.solution)
+
+        received = []
+        peer.on_block_received = lambda p, b: received.append(b)
+        miner.announce_compact_block(block)
+        assert peer.wait_for_relay(timeout=10)
+
+        assert peer.relay_stats["full_fallbacks"] == 1
+        assert received == []
+        assert block.block_hash not in peer.seen_headers
+        assert peer.storage.get_block(block.block_hash) is None
+
+
+class TestCompactRelaySimulation:
+    """Report bytes per block propagated across a local network."""
+
+    @pytest.mark.simulation
+    def test_bytes_per_block(self, tmp_path):
+        print("\n📦 Simulating compact block relay (6 nodes, 10 blocks x 200 txs)...")
+
+        nodes = build_network(tmp_path, 6)
+        miner, peers = nodes[0], nodes[1:]
+
+        full_bytes = 0
+        previous_hash = "0" * 64
+        for height in range(1, 11):
+            transactions = [make_tx(height * 1000 + i) for i in range(200)]
+            block = make_block(transactions, index=height, previous_hash=previous_hash)
+            previous_hash = block.block_hash
+
+            # Peers saw ~95% of transactions and most saw the proof reveal
+            for n, peer in enumerate(peers):
+                peer.mempool = [tx for i, tx in enumerate(transactions) if (i + n) % 20]
+                if n % 2 == 0:
+                    peer.cache_proof(block.problem, block.solution)
+
+            full_bytes += len(miner.storage._serialize_block(block)) * len(peers)
+            miner.announce_compact_block(block)
+            for peer in peers:
+                assert peer.wait_for_relay(timeout=10)
+
+        compact_bytes = miner.relay_stats["compact_bytes_sent"] + sum(
+            peer.relay_stats["fill_bytes_received"] for peer in peers
+        )
+        deliveries = 10 * len(peers)
+
+        print(f"   Full relay:    {full_bytes / deliveries:,.0f} bytes/block/peer")
+        print(f"   Compact relay: {compact_bytes / deliveries:,.0f} bytes/block/peer")
+        print(f"   Savings: {(1 - compact_bytes / full_bytes) * 100:.1f}%")
+
+        assert all(peer.relay_stats["reconstructed"] == 10 for peer in peers)
+        assert all(peer.relay_stats["full_fallbacks"] == 0 for peer in peers)
+        assert compact_bytes < full_bytes / 2
+
+        print("✅ Compact relay simulation passed")
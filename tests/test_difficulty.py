@@ -0,0 +1,228 @@
+"""
+Tests for incremental difficulty adjustment
+Includes a benchmark over a million adjuster updates
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier, ComputationalComplexity, EnergyMetrics
+from consensus import ConsensusEngine, ConsensusConfig
+from checkpoint import Checkpoint, CheckpointStore
+from pow import ProblemRegistry, DifficultyAdjuster, SlidingWindowPercentile
+
+
+def make_complexity(problem):
+    return ComputationalComplexity(
+        time_solve_O="O(2^n)", time_solve_Omega="Omega(2^(n/2))", time_solve_Theta=None,
+        time_verify_O="O(n)", time_verify_Omega="Omega(n)", time_verify_Theta="Theta(n)",
+        space_solve_O="O(n * target)", space_solve_Omega="Omega(n)", space_solve_Theta=None,
+        space_verify_O="O(n)", space_verify_Omega="Omega(n)", space_verify_Theta="Theta(n)",
+        problem_class="NP-Complete",
+        problem_size=len(problem["numbers"]),
+        solution_size=4,
+        epsilon_approximation=None,
+        asymmetry_time=100.0,
+        asymmetry_space=10.0,
+        measured_solve_time=0.01,
+        measured_verify_time=0.0001,
+        measured_solve_space=1024,
+        measured_verify_space=64,
+        energy_metrics=EnergyMetrics(
+            solve_energy_joules=1.0, verify_energy_joules=0.001,
+            solve_power_watts=100.0, verify_power_watts=1.0,
+            solve_time_seconds=0.01, verify_time_seconds=0.0001,
+            cpu_utilization=50.0, memory_utilization=10.0, gpu_utilization=0.0
+        ),
+        problem=problem,
+        solution_quality=1.0
+    )
+
+
+def make_block(parent, tag="main", numbers=32):
+    index = parent.index + 1 if parent else 0
+    values = list(range(index + 1, index + 1 + numbers))
+    problem = {"type": "subset_sum", "numbers": values, "target": sum(values[:4]), "size": numbers}
+    block = Block(
+        index=index,
+        timestamp=1_700_000_000.0 + index * (14 if tag == "main" else 40),
+        previous_hash=parent.block_hash if parent else "0" * 64,
+        transactions=[],
+        merkle_root=f"{tag}-{index}".encode().hex().ljust(64, "0")[:64],
+        problem=problem,
+        solution=values[:4],
+        complexity=make_complexity(problem),
+        mining_capacity=ProblemTier.TIER_2_DESKTOP,
+        cumulative_work_score=float(index),
+        block_hash=""
+    )
+    block.block_hash = block.calculate_hash()
+    return block
+
+
+def make_engine():
+    with patch.object(ConsensusEngine, "_initialize_genesis"):
+        engine = ConsensusEngine(ConsensusConfig(compaction_interval=0), Mock(), ProblemRegistry())
+    genesis = make_block(None)
+    engine._add_block_to_tree(genesis, receipt_time=genesis.timestamp)
+    return engine, genesis
+
+
+def extend(engine, parent, count, tag="main", numbers=32):
+    blocks = []
+    for _ in range(count):
+        parent = make_block(parent, tag, numbers)
+        engine._add_block_to_tree(parent, receipt_time=time.time())
+        blocks.append(parent)
+    return blocks
+
+
+class SortingAdjuster:
+    """The previous full-sort implementation, used as a reference."""
+
+    def __init__(self):
+        self.adjuster = DifficultyAdjuster()
+        self.scores = []
+
+    def update(self, score, block_time):
+        self.scores = (self.scores + [score])[-100:]
+        median = sorted(self.scores)[len(self.scores) // 2]
+        a = self.adjuster
+        a.current_target = a.alpha * a.current_target + (1 - a.alpha) * median * (a.target_block_time / max(block_time, 0.1))
+        a.current_target = max(a.min_target, min(a.max_target, a.current_target))
+
+
+class TestSlidingWindow:
+    """Test incremental percentiles against sorting."""
+
+    @pytest.mark.unit
+    def test_matches_sorted_window(self):
+        rng = random.Random(39)
+        for window in (1, 7, 100):
+            for percentile in (0.0, 0.25, 0.5, 0.9, 1.0):
+                tracker, recent = SlidingWindowPercentile(window, percentile), []
+                for _ in range(2_000):
+                    value = rng.choice([rng.random(), float(rng.randint(0, 3))])  # Plenty of duplicates
+                    tracker.add(value)
+                    recent = (recent + [value])[-window:]
+                    ordered = sorted(recent)
+                    assert tracker.get() == ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+                # Lazy deletions stay bounded
+                assert len(tracker._lower) + len(tracker._upper) <= 2 * window + 1
+
+    @pytest.mark.unit
+    def test_adjuster_matches_full_sort(self):
+        rng = random.Random(7)
+        adjuster, reference = DifficultyAdjuster(), SortingAdjuster()
+        for _ in range(5_000):
+            score, block_time = rng.uniform(100, 5_000), rng.uniform(5, 60)
+            adjuster.update(score, block_time)
+            reference.update(score, block_time)
+            assert adjuster.current_target == pytest.approx(reference.adjuster.current_target)
+
+        assert list(adjuster.observed_scores) == reference.scores
+        assert adjuster.observed_scores[-1] == reference.scores[-1]
+
+    @pytest.mark.unit
+    def test_state_round_trip(self):
+        adjuster = DifficultyAdjuster(observed_scores=[500.0, 700.0])
+        for i in range(150):
+            adjuster.update(1_000.0 + i, 30.0)
+
+        restored = DifficultyAdjuster()
+        restored.load_dict(adjuster.to_dict())
+        adjuster.update(2_000.0, 20.0)
+        restored.update(2_000.0, 20.0)
+
+        assert restored.current_target == adjuster.current_target
+        assert restored.get_median_score() == adjuster.get_median_score()
+        assert len(restored.observed_scores) == 100
+
+
+class TestEngineDifficulty:
+    """Test that the engine's adjuster follows the best chain."""
+
+    @pytest.mark.unit
+    def test_reorg_rewinds_to_fork(self):
+        engine, genesis = make_engine()
+        main = extend(engine, genesis, 150)
+        extend(engine, main[119], 40, tag="fork", numbers=40)  # Heavier fork overtakes at depth 30
+
+        fresh, _ = make_engine()
+        winning = engine.get_chain_from_genesis()
+        for block in winning[1:]:
+            fresh._add_block_to_tree(block, receipt_time=time.time())
+
+        assert engine.last_reorg.depth == 30
+        assert engine.difficulty_adjuster.to_dict() == pytest.approx(fresh.difficulty_adjuster.to_dict())
+        assert engine.best_tip.difficulty_target == engine.difficulty_adjuster.current_target
+        assert engine.block_tree[main[119].block_hash].difficulty_target == pytest.approx(
+            fresh.block_tree[main[119].block_hash].difficulty_target
+        )
+
+    @pytest.mark.unit
+    def test_state_restored_with_checkpoint_tip(self, tmp_path):
+        engine, genesis = make_engine()
+        tip = extend(engine, genesis, 120)[-1]
+        store = CheckpointStore(str(tmp_path))
+        store.save(Checkpoint(height=120, tip_hash=tip.block_hash, cumulative_work=engine.best_tip.cumulative_work,
+                              difficulty=engine.difficulty_adjuster.to_dict()))
+
+        checkpoint = store.load_latest()
+        restored, _ = make_engine()
+        assert restored.restore_tips([(tip, 120, engine.best_tip.cumulative_work)], tip.block_hash,
+                                     checkpoint.difficulty)
+
+        child = make_block(tip)
+        engine._add_block_to_tree(child, receipt_time=time.time())
+        restored._add_block_to_tree(child, receipt_time=time.time())
+        assert restored.difficulty_adjuster.current_target == engine.difficulty_adjuster.current_target
+
+    @pytest.mark.unit
+    def test_difficulty_is_signed(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        checkpoint = store.sign(Checkpoint(height=1, tip_hash="a" * 64, cumulative_work=1.0,
+                                           difficulty={"current_target": 2.0}))
+        assert store.verify(checkpoint)
+
+        checkpoint.difficulty["current_target"] = 1.0
+        assert not store.verify(checkpoint)
+
+
+class TestDifficultyBenchmark:
+    """Benchmark adjuster updates."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_million_updates(self):
+        print("\n🎯 Benchmarking a million difficulty updates...")
+        rng = random.Random(1)
+        samples = [(rng.uniform(100, 5_000), rng.uniform(5, 60)) for _ in range(1_000_000)]
+
+        for window in (100, 10_000):
+            adjuster = DifficultyAdjuster(window_size=window)
+            start = time.perf_counter()
+            for score, block_time in samples:
+                adjuster.update(score, block_time)
+            incremental = len(samples) / (time.perf_counter() - start)
+
+            # Full sort per update, as before (sampled: it is far slower)
+            scores, count = [], 20_000
+            start = time.perf_counter()
+            for score, _ in samples[:count]:
+                scores = (scores + [score])[-window:]
+                sorted(scores)[len(scores) // 2]
+            sorting = count / (time.perf_counter() - start)
+
+            print(f"   window {window:>6,}: incremental {incremental:10,.0f} updates/sec, "
+                  f"full sort {sorting:10,.0f} updates/sec")
+            assert incremental > sorting
+
+        print("✅ Difficulty benchmark passed")
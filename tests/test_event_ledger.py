@@ -0,0 +1,181 @@
+"""
+Tests for the persistent processed-event ledger
+Includes a restart simulation over a million historical events
+"""
+
+import pytest
+import importlib
+import time
+import tracemalloc
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from event_ledger import ProcessedEventLedger
+from api.ingest_store import IngestStore
+
+
+def insert_events(store, start, count):
+    """Bulk-insert block events with ts == index."""
+    rows = [
+        (f"evt-{i}", i, f"{i:064x}", f"cid-{i}", "miner", "desktop", 10.0, float(i), "sig", float(i))
+        for i in range(start, start + count)
+    ]
+    with store._connect() as conn:
+        conn.executemany(
+            "INSERT INTO block_events(event_id, block_index, block_hash, cid, miner_address, capacity, "
+            "work_score, ts, sig, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    """Build a ConsensusService over a real ingest store and ledger."""
+    monkeypatch.chdir(tmp_path)  # The service module logs to ./logs
+    consensus_service = importlib.import_module("consensus_service")
+
+    def make(ingest_store, ledger):
+        with patch("p2p_discovery.DiscoveryConfig"), patch("p2p_discovery.P2PDiscoveryService"):
+            service = consensus_service.ConsensusService()
+        service.p2p_discovery.get_peer_statistics.return_value = {"total_discovered": 0}
+        service.consensus_engine = Mock()
+        service.ingest_store = ingest_store
+        service.processed_events = ledger
+        return service
+
+    return make
+
+
+class TestLedger:
+    """Test membership, persistence and bounded memory."""
+
+    @pytest.mark.unit
+    def test_set_interface_and_restart(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        ledger = ProcessedEventLedger(path)
+        ledger.add("a", 100.0)
+        ledger.add_many([("b", 101.0), ("c", 102.0), ("a", 100.0)])
+
+        assert "a" in ledger and "z" not in ledger
+        assert len(ledger) == 3
+        ledger.close()
+
+        reopened = ProcessedEventLedger(path)
+        assert "b" in reopened
+        assert len(reopened) == 3
+        assert reopened.high_water == 102.0
+
+    @pytest.mark.unit
+    def test_cursor_covers_and_prunes_old_events(self, tmp_path):
+        ledger = ProcessedEventLedger(str(tmp_path / "ledger.db"), recent_window=10, reorder_window=100.0)
+        ledger.add_many([(f"e{i}", float(i)) for i in range(1000)])
+
+        assert ledger.cursor == 899.0
+        assert ledger.is_processed("never-seen", ts=500.0)
+        assert not ledger.is_processed("never-seen", ts=950.0)
+        assert ledger.is_processed("e950", ts=950.0)
+
+        # Rows behind the cursor were pruned automatically
+        assert ledger.stored_count() == 101
+        assert ledger.prune() == 0
+        assert len(ledger._recent) == 10
+        assert len(ledger) == 1000
+
+
+class TestServiceIntegration:
+    """Test the consensus service reads forward from the ledger."""
+
+    @pytest.mark.unit
+    def test_only_new_events_pending(self, tmp_path, make_service):
+        store = IngestStore(str(tmp_path / "ingest.db"))
+        insert_events(store, 0, 50)
+        ledger = ProcessedEventLedger(str(tmp_path / "ledger.db"))
+        ledger.add_many([(f"evt-{i}", float(i)) for i in range(40)])
+
+        service = make_service(store, ledger)
+        pending = service._fetch_pending_events(limit=4)
+
+        assert [e["event_id"] for e in pending] == ["evt-40", "evt-41", "evt-42", "evt-43"]
+
+    @pytest.mark.unit
+    def test_pages_within_one_timestamp(self, tmp_path, make_service):
+        """Test: a full page sharing resume_ts does not stall the fetch."""
+        store = IngestStore(str(tmp_path / "ingest.db"))
+        insert_events(store, 0, 3)
+        with store._connect() as conn:
+            conn.execute("UPDATE block_events SET ts = 5.0")
+        insert_events(store, 10, 2)
+        ledger = ProcessedEventLedger(str(tmp_path / "ledger.db"))
+        ledger.add("evt-0", 5.0)
+
+        first = store.blocks_since(5.0, limit=2)
+        second = store.blocks_since(5.0, limit=2, after_event_id=first[-1]["event_id"])
+        assert [e["event_id"] for e in first + second] == ["evt-0", "evt-1", "evt-2", "evt-10"]
+
+        service = make_service(store, ledger)
+        pending = service._fetch_pending_events(limit=2)
+        assert [e["event_id"] for e in pending] == ["evt-1", "evt-2"]
+
+        ledger.add_many([("evt-1", 5.0), ("evt-2", 5.0)])
+        pending = service._fetch_pending_events(limit=2)
+        assert [e["event_id"] for e in pending] == ["evt-10", "evt-11"]
+
+    @pytest.mark.unit
+    def test_processed_events_survive_restart(self, tmp_path, make_service):
+        store = IngestStore(str(tmp_path / "ingest.db"))
+        insert_events(store, 0, 5)
+        path = str(tmp_path / "ledger.db")
+
+        service = make_service(store, ProcessedEventLedger(path))
+        with patch.object(service, "_validate_event", return_value=True), \
+             patch.object(service, "_convert_event_to_block", return_value=None):
+            service.process_all_peer_submissions()
+        service.processed_events.close()
+
+        restarted = make_service(store, ProcessedEventLedger(path))
+        assert restarted._fetch_pending_events() == []
+
+
+class TestRestartAtScale:
+    """Simulate a restart with a million historical events."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_restart_with_million_events(self, tmp_path, make_service):
+        print("\n📒 Simulating a restart over 1,000,000 processed events...")
+        history, new = 1_000_000, 100
+        store = IngestStore(str(tmp_path / "ingest.db"))
+        path = str(tmp_path / "ledger.db")
+
+        ledger = ProcessedEventLedger(path)
+        for start in range(0, history, 50_000):
+            insert_events(store, start, 50_000)
+            ledger.add_many([(f"evt-{i}", float(i)) for i in range(start, start + 50_000)])
+            assert len(ledger._recent) <= ledger.recent_window
+        ledger.close()
+        insert_events(store, history, new)
+
+        # Restart
+        tracemalloc.start()
+        start = time.perf_counter()
+        service = make_service(store, ProcessedEventLedger(path))
+        with patch.object(service, "_validate_event", return_value=False) as validate:
+            service.process_all_peer_submissions()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"   Restart + first poll: {elapsed * 1000:.1f} ms, peak {peak / 1024:.0f} KiB")
+        print(f"   Ledger rows kept: {service.processed_events.stored_count():,} of {len(service.processed_events):,}")
+
+        assert validate.call_count == new
+        assert len(service.processed_events) == history
+        assert service.processed_events.stored_count() < history // 5
+        assert elapsed < 2.0
+        assert peak < 16 * 1024 * 1024
+
+        print("✅ Restart simulation passed")
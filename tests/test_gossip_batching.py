@@ -0,0 +1,275 @@
+"""
+Tests for batched CID gossip publishing
+Multi-node in-process network using the LocalTransport stand-in
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+import sys
+import os
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from network import (
+    NetworkProtocol, LocalTransport, AnnounceMsg, PeerSendQueue, RecentSet,
+    DEFAULT_MAX_CIDS_PER_FRAME
+)
+
+
+def build_mesh(node_count):
+    """Create fully connected in-process nodes sharing one transport registry."""
+    registry = {}
+    nodes = []
+    for i in range(node_count):
+        peer_id = f"node-{i}"
+        transport = LocalTransport(peer_id, registry)
+        net = NetworkProtocol(Mock(), Mock(), Mock(), peer_id=peer_id, transport=transport)
+        transport.attach(net)
+        nodes.append(net)
+    return nodes
+
+
+class TestAnnounceFrame:
+    """Test the batched announcement frame."""
+
+    @pytest.mark.unit
+    def test_announce_roundtrip(self):
+        net = NetworkProtocol(Mock(), Mock(), Mock())
+        message = AnnounceMsg(cids=["QmA", "QmB"], peer_id="p1", lambda_state=0.7)
+
+        decoded = net.decode_message(net.encode_message(message))
+
+        assert isinstance(decoded, AnnounceMsg)
+        assert decoded.cids == ["QmA", "QmB"]
+        assert decoded.peer_id == "p1"
+
+    @pytest.mark.unit
+    def test_send_queue_backpressure(self):
+        queue = PeerSendQueue(max_frames=2)
+
+        assert queue.offer(b"a")
+        assert queue.offer(b"b")
+        assert not queue.offer(b"c"), "Full queue should reject new frames"
+        assert queue.dropped == 1
+
+        queue.pop()
+        assert queue.sent == 1
+        assert queue.peek() == b"b"
+
+
+class TestBatchedGossip:
+    """Test publishing through the transport."""
+
+    @pytest.mark.simulation
+    def test_one_frame_per_flush(self):
+        """Test: 50 CIDs flushed across a 10-node mesh cost one frame per peer."""
+        print("\n📡 Testing batched gossip (10 nodes, 50 CIDs)...")
+
+        nodes = build_mesh(10)
+        received = {net.peer_id: [] for net in nodes}
+        for net in nodes:
+            net.on_proof_announced = lambda peer, cids, sink=received[net.peer_id]: sink.extend(cids)
+
+        sender = nodes[0]
+        cids = [f"QmBatch{i}" for i in range(50)]
+        sender.pending_broadcasts.update(cids)
+        sender._flush_pending_broadcasts()
+
+        stats = sender.get_gossip_stats()
+        print(f"   Messages per flush: {stats['messages_per_flush']:.1f}")
+
+        assert not sender.pending_broadcasts
+        assert stats["frames_published"] == 1
+        assert stats["frames_sent"] == len(nodes) - 1
+        for net in nodes[1:]:
+            assert sorted(received[net.peer_id]) == sorted(cids)
+            assert net.gossip_stats["frames_received"] == 1
+            assert sender.peer_id in net.peers
+
+        print("✅ Batched gossip test passed")
+
+    @pytest.mark.simulation
+    def test_large_flush_is_chunked(self):
+        nodes = build_mesh(2)
+        cids = [f"QmChunk{i}" for i in range(DEFAULT_MAX_CIDS_PER_FRAME + 1)]
+
+        frames = nodes[0]._gossip_cids(cids)
+
+        assert frames == 2
+        assert nodes[1].gossip_stats["cids_received"] == len(cids)
+
+    @pytest.mark.simulation
+    def test_duplicate_announcements_ignored(self):
+        nodes = build_mesh(3)
+        nodes[0]._gossip_cids(["QmDup"])
+        nodes[1]._gossip_cids(["QmDup"])
+
+        assert nodes[2].gossip_stats["frames_received"] == 2
+        assert nodes[2].gossip_stats["cids_received"] == 1
+
+    @pytest.mark.simulation
+    def test_unreachable_peer_backpressure(self):
+        """Test: frames for a failing peer queue up, then drop without blocking others."""
+        nodes = build_mesh(2)
+        sender = nodes[0]
+        sender.update_peer("ghost-peer")
+
+        for i in range(70):
+            sender._gossip_cids([f"QmGhost{i}"])
+
+        ghost_queue = sender.send_queues["ghost-peer"]
+        assert len(ghost_queue) == ghost_queue.max_frames
+        assert ghost_queue.dropped == 70 - ghost_queue.max_frames
+        assert len(sender.send_queues["node-1"]) == 0
+        assert nodes[1].gossip_stats["cids_received"] == 70
+
+    @pytest.mark.simulation
+    def test_async_transport(self):
+        """Test: coroutine send_message (LibP2PHost interface) is awaited."""
+        delivered = []
+
+        class AsyncTransport:
+            def get_connected_peers(self):
+                return ["remote"]
+
+            async def send_message(self, peer_id, protocol, message):
+                delivered.append((peer_id, protocol, message))
+                return True
+
+        net = NetworkProtocol(Mock(), Mock(), Mock(), transport=AsyncTransport())
+        net._gossip_cids(["QmAsync"])
+
+        assert len(delivered) == 1
+        assert delivered[0][1] == net.topics["commit_reveal"]
+        assert isinstance(net.decode_message(delivered[0][2]), AnnounceMsg)
+
+    @pytest.mark.simulation
+    def test_slow_peer_does_not_stall_flush(self):
+        """Test: sends on a running transport loop are not awaited by the flush."""
+        release = threading.Event()
+        delivered = []
+
+        class AsyncTransport:
+            def get_connected_peers(self):
+                return ["slow", "fast"]
+
+            async def send_message(self, peer_id, protocol, message):
+                if peer_id == "slow":
+                    await asyncio.get_running_loop().run_in_executor(None, release.wait)
+                delivered.append(peer_id)
+                return True
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            net = NetworkProtocol(Mock(), Mock(), Mock(), transport=AsyncTransport(), transport_loop=loop)
+            start = time.time()
+            net._gossip_cids(["QmSlow1"])
+            net._gossip_cids(["QmSlow2"])
+            elapsed = time.time() - start
+
+            # Delivery is recorded before the completion callback pops the frame
+            deadline = time.time() + 5
+            while len(net.send_queues["fast"]) and time.time() < deadline:
+                time.sleep(0.01)
+            assert elapsed < 1.0
+            assert delivered.count("fast") == 2
+            assert len(net.send_queues["slow"]) == 2, "Second frame waits behind the in-flight one"
+
+            release.set()
+            while net.gossip_stats["frames_sent"] < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            assert delivered.count("slow") == 2
+            assert len(net.send_queues["slow"]) == 0
+            assert net.gossip_stats["frames_sent"] == 4
+        finally:
+            release.set()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+    @pytest.mark.simulation
+    def test_gossip_from_running_loop(self):
+        """Test: gossiping from inside an event loop schedules sends on that loop."""
+        delivered = []
+
+        class AsyncTransport:
+            def get_connected_peers(self):
+                return ["remote"]
+
+            async def send_message(self, peer_id, protocol, message):
+                delivered.append(peer_id)
+                return True
+
+        net = NetworkProtocol(Mock(), Mock(), Mock(), transport=AsyncTransport())
+
+        async def main():
+            net._gossip_cids(["QmInLoop"])
+            assert delivered == []
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        assert delivered == ["remote"]
+        assert net.gossip_stats["send_failures"] == 0
+        assert net.gossip_stats["frames_sent"] == 1
+
+
+class TestSeenCids:
+    """Test the bounded announcement dedup set."""
+
+    @pytest.mark.unit
+    def test_recent_set_evicts_oldest(self):
+        seen = RecentSet(3)
+        seen.update(["a", "b", "c"])
+        seen.add("a")
+        seen.add("d")
+
+        assert "b" not in seen
+        assert all(cid in seen for cid in ("a", "c", "d"))
+        assert len(seen) == 3
+
+    @pytest.mark.simulation
+    def test_seen_cids_bounded(self):
+        nodes = build_mesh(2)
+        nodes[1].seen_cids = RecentSet(10)
+        nodes[0]._gossip_cids([f"QmSeen{i}" for i in range(25)])
+
+        assert len(nodes[1].seen_cids) == 10
+        assert "QmSeen24" in nodes[1].seen_cids
+        assert "QmSeen0" not in nodes[1].seen_cids
+
+
+class TestGossipLatency:
+    """Measure announce → receive latency across the mesh."""
+
+    @pytest.mark.stress
+    def test_announce_to_receive_latency(self):
+        print("\n⏱️  Measuring announce→receive latency (20 nodes, 20 flushes)...")
+
+        nodes = build_mesh(20)
+        sender = nodes[0]
+
+        start = time.time()
+        for flush in range(20):
+            sender.pending_broadcasts.update(f"QmLat{flush}-{i}" for i in range(25))
+            sender._flush_pending_broadcasts()
+        elapsed = time.time() - start
+
+        stats = sender.get_gossip_stats()
+        latencies = [lat for net in nodes[1:] for lat in net.announce_latencies]
+        avg_latency_ms = sum(latencies) / len(latencies) * 1000
+
+        print(f"   Messages per flush: {stats['messages_per_flush']:.1f}")
+        print(f"   Avg announce→receive latency: {avg_latency_ms:.3f} ms")
+        print(f"   Total time: {elapsed:.3f}s")
+
+        assert stats["messages_per_flush"] == len(nodes) - 1
+        assert all(net.gossip_stats["cids_received"] == 500 for net in nodes[1:])
+        assert avg_latency_ms < 1000
+
+        print("✅ Latency test passed")
@@ -0,0 +1,254 @@
+"""
+Tests for GET_HEADERS range queries and header-first sync
+"""
+
+import pytest
+import copy
+import time
+import sys
+import os
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from network import (
+    NetworkProtocol, LocalTransport, RequestKind,
+    pack_payloads, unpack_payloads, iter_payload_chunks
+)
+from header_sync import HeaderSyncDriver
+
+
+def make_chain(length, start_time=1_700_000_000.0, prefix="main"):
+    """Build a linked chain of blocks."""
+    blocks = []
+    previous_hash = "0" * 64
+    for height in range(length):
+        values = list(range(height + 1, height + 11))
+        block = Block(
+            index=height,
+            timestamp=start_time + height * 14,
+            previous_hash=previous_hash,
+            transactions=[],
+            merkle_root=f"{prefix}-merkle-{height}",
+            problem={"type": "subset_sum", "numbers": values, "target": sum(values[:2]), "size": 10},
+            solution=values[:2],
+            complexity=None,
+            mining_capacity=ProblemTier.TIER_1_MOBILE,
+            cumulative_work_score=float(height * 10),
+            block_hash=""
+        )
+        block.block_hash = block.calculate_hash()
+        previous_hash = block.block_hash
+        blocks.append(block)
+    return blocks
+
+
+def make_storage(tmp_path, name):
+    config = StorageConfig(
+        data_dir=str(tmp_path / name),
+        role=NodeRole.FULL,
+        pruning_mode=PruningMode.FULL
+    )
+    return StorageManager(config)
+
+
+def make_pair(tmp_path):
+    """Create a serving node and a syncing client joined by LocalTransport."""
+    registry = {}
+    nodes = []
+    for name in ("server", "client"):
+        storage = make_storage(tmp_path, name)
+        transport = LocalTransport(name, registry)
+        net = NetworkProtocol(Mock(), storage, Mock(), peer_id=name, transport=transport)
+        transport.attach(net)
+        nodes.append(net)
+    return nodes
+
+
+class TestHeaderRange:
+    """Test the indexed range query and chunked encoding."""
+
+    @pytest.mark.unit
+    def test_range_query_ordered(self, tmp_path):
+        storage = make_storage(tmp_path, "range")
+        chain = make_chain(50)
+        for block in reversed(chain):
+            storage.store_header(block)
+
+        headers = [storage._deserialize_header(h) for h in storage.get_headers_range(10, 20)]
+
+        assert [h.index for h in headers] == list(range(10, 30))
+        assert storage.get_header_height() == 49
+        assert storage.get_headers_range(100, 10) == []
+
+    @pytest.mark.unit
+    def test_range_query_uses_height_index(self, tmp_path):
+        import sqlite3
+        storage = make_storage(tmp_path, "plan")
+        with sqlite3.connect(storage.db_path) as conn:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN SELECT header_bytes FROM headers INDEXED BY idx_headers_height
+                WHERE height >= ? AND height < ? ORDER BY height, timestamp
+            """, (0, 10)).fetchall()
+        assert any("idx_headers_height" in str(row) for row in plan)
+
+    @pytest.mark.unit
+    def test_chunks_are_size_bounded(self):
+        headers = [bytes([i % 256]) * 300 for i in range(100)]
+
+        chunks = list(iter_payload_chunks(headers, max_chunk_bytes=4096))
+
+        assert all(len(chunk) <= 4096 for chunk in chunks)
+        assert len(chunks) > 1
+        assert [h for chunk in chunks for h in unpack_payloads(chunk)] == headers
+        assert unpack_payloads(pack_payloads([])) == []
+
+
+class TestGetHeadersRPC:
+    """Test GET_HEADERS request/response streaming."""
+
+    @pytest.mark.simulation
+    def test_streamed_response(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        chain = make_chain(600)
+        for block in chain:
+            server.storage.store_header(block)
+
+        responses = client.send_request(
+            "server", RequestKind.GET_HEADERS,
+            {"start_height": 0, "count": 600, "max_chunk_bytes": 16 * 1024}
+        )
+
+        assert responses is not None
+        assert len(responses) > 1, "Large ranges should stream in several chunks"
+        assert responses[-1].final and not any(r.final for r in responses[:-1])
+        headers = [h for r in responses for h in unpack_payloads(r.payload)]
+        assert len(headers) == 600
+
+    @pytest.mark.simulation
+    def test_missing_block_returns_none(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        assert client.request_block("server", "deadbeef") is None
+
+
+class TestHeaderFirstSync:
+    """Test the client-side header-first sync driver."""
+
+    @pytest.mark.simulation
+    def test_sync_headers_then_bodies(self, tmp_path):
+        print("\n🔗 Testing header-first sync (120 blocks)...")
+        server, client = make_pair(tmp_path)
+        chain = make_chain(120)
+        for block in chain:
+            server.storage.store_header(block)
+            server.storage.store_block(block)
+
+        driver = HeaderSyncDriver(client, client.storage, batch_size=50)
+        start = time.time()
+        result = driver.sync("server")
+        elapsed = time.time() - start
+
+        print(f"   Headers: {result.headers_synced}, bodies: {result.blocks_fetched} in {elapsed:.3f}s")
+        assert result.error is None
+        assert result.headers_synced == 120
+        assert result.blocks_fetched == 120
+        assert result.tip_hash == chain[-1].block_hash
+        assert client.storage.get_block(chain[60].block_hash).merkle_root == chain[60].merkle_root
+
+    @pytest.mark.simulation
+    def test_sync_extends_anchor_and_skips_forks(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        chain = make_chain(30)
+        fork = make_chain(30, prefix="fork")
+        for block in chain + fork[10:]:
+            server.storage.store_header(block)
+
+        driver = HeaderSyncDriver(client, client.storage, batch_size=8)
+        result = driver.sync("server", anchor=chain[9], fetch_bodies=False)
+
+        assert result.error is None
+        assert result.headers_synced == 20
+        assert result.tip_hash == chain[-1].block_hash
+
+    @pytest.mark.simulation
+    def test_dead_fork_served_first_is_skipped(self, tmp_path):
+        """Test: a side branch with earlier timestamps does not stall the sync."""
+        server, client = make_pair(tmp_path)
+        chain = make_chain(30)
+        side, previous = [], chain[9]
+        for block in chain[10:13]:
+            header = copy.copy(block)
+            header.merkle_root = f"side-merkle-{block.index}"
+            header.timestamp = block.timestamp - 1
+            header.previous_hash = previous.block_hash
+            header.block_hash = header.calculate_hash()
+            side.append(header)
+            previous = header
+        for block in chain + side:
+            server.storage.store_header(block)
+
+        driver = HeaderSyncDriver(client, client.storage, batch_size=8)
+        result = driver.sync("server", anchor=chain[9], fetch_bodies=False)
+
+        assert result.error is None
+        assert result.headers_synced == 20
+        assert result.tip_hash == chain[-1].block_hash
+        assert client.storage.get_header(side[0].block_hash) is None
+
+    @pytest.mark.simulation
+    def test_bodies_not_fetched_past_invalid_header(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        chain = make_chain(40)
+        chain[25].previous_hash = "bad" * 16
+        for block in chain:
+            server.storage.store_header(block)
+            server.storage.store_block(block)
+
+        driver = HeaderSyncDriver(client, client.storage, batch_size=100)
+        result = driver.sync("server")
+
+        assert result.error is not None
+        assert result.headers_synced == 25
+        assert result.blocks_fetched == 25
+        assert client.storage.get_header(chain[30].block_hash) is None
+
+    @pytest.mark.simulation
+    def test_body_with_swapped_solution_rejected(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        chain = make_chain(20)
+        for block in chain:
+            server.storage.store_header(block)
+            server.storage.store_block(block)
+
+        # A valid problem and solution from elsewhere, served under block 12's header
+        forged = copy.copy(chain[12])
+        forged.problem, forged.solution = chain[3].problem, chain[3].solution
+        server.storage.store_block(forged)
+
+        failures = client.peer_scores.get("server").failures if "server" in client.peer_scores else 0
+        driver = HeaderSyncDriver(client, client.storage, batch_size=100, body_batch_size=8)
+        result = driver.sync("server")
+
+        assert result.headers_synced == 20
+        assert result.blocks_fetched == 12
+        assert client.storage.get_block(chain[12].block_hash) is None
+        assert client.peer_scores.get("server").failures == failures + 1
+
+    @pytest.mark.unit
+    def test_custom_body_verifier(self, tmp_path):
+        server, client = make_pair(tmp_path)
+        chain = make_chain(10)
+        for block in chain:
+            server.storage.store_header(block)
+            server.storage.store_block(block)
+
+        checked = []
+        driver = HeaderSyncDriver(client, client.storage,
+                                  body_verifier=lambda block, header: checked.append(header.index) or header.index < 4)
+        result = driver.sync("server")
+
+        assert checked == [0, 1, 2, 3, 4]
+        assert result.blocks_fetched == 4
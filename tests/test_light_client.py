@@ -0,0 +1,194 @@
+"""
+Tests for header-only light-client mode
+Includes a sync time and footprint benchmark against full mode
+"""
+
+import pytest
+import json
+import sqlite3
+import time
+import tracemalloc
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from consensus import ConsensusEngine, ConsensusConfig
+from checkpoint import Checkpoint, CheckpointStore
+from header_sync import HeaderSyncDriver
+from network import NetworkProtocol, LocalTransport
+from node import Node, NodeConfig, NodeRole as LightRole
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from pow import ProblemRegistry
+from tests import helpers
+
+
+def make_chain(count):
+    """Genesis followed by count valid blocks."""
+    return helpers.make_chain(None, count + 1, numbers=8)
+
+
+def make_storage(path, role=NodeRole.FULL):
+    return StorageManager(StorageConfig(data_dir=str(path), role=role, pruning_mode=PruningMode.FULL))
+
+
+def make_engine(storage, light_mode):
+    with patch.object(ConsensusEngine, "_initialize_genesis"):
+        return ConsensusEngine(ConsensusConfig(light_mode=light_mode), storage, ProblemRegistry())
+
+
+def make_server(tmp_path, chain, registry):
+    """Serving full node holding every header and body."""
+    storage = make_storage(tmp_path / "server")
+    storage.batch_write([op for block in chain for op in (("header", block), ("block", block))])
+    transport = LocalTransport("server", registry)
+    server = NetworkProtocol(Mock(), storage, Mock(), peer_id="server", transport=transport)
+    transport.attach(server)
+    return server
+
+
+def make_client(storage, name, registry):
+    transport = LocalTransport(name, registry)
+    client = NetworkProtocol(Mock(), storage, Mock(), peer_id=name, transport=transport)
+    transport.attach(client)
+    return client
+
+
+def header_of(block):
+    """Compact header, as a light node receives it."""
+    return StorageManager._deserialize_header(None, StorageManager._serialize_header(None, block))
+
+
+def write_checkpoint(directory, block, height):
+    header_dict = json.loads(StorageManager._serialize_header(None, block))
+    CheckpointStore(str(directory)).save(Checkpoint(
+        height=height, tip_hash=block.block_hash, cumulative_work=block.cumulative_work_score,
+        tips=[{"block": header_dict, "height": height, "cumulative_work": block.cumulative_work_score}]
+    ))
+
+
+def db_bytes(storage):
+    return sum(os.path.getsize(storage.db_path + suffix)
+               for suffix in ("", "-wal") if os.path.exists(storage.db_path + suffix))
+
+
+class TestLightEngine:
+    """Test header-only fork choice and on-demand body checks."""
+
+    @pytest.mark.unit
+    def test_connect_headers_keeps_headers_only(self, tmp_path):
+        chain = make_chain(100)
+        engine = make_engine(make_storage(tmp_path), light_mode=True)
+
+        assert engine.connect_headers([header_of(b) for b in chain]) == 101
+
+        assert engine.best_tip.block.block_hash == chain[-1].block_hash
+        assert engine.best_tip.cumulative_work == chain[-1].cumulative_work_score
+        assert engine.best_tip.block.problem == {}
+        with sqlite3.connect(engine.storage.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM headers").fetchone()[0] == 101
+            assert conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0] == 0
+        # Compacted stubs load back from the headers table
+        assert engine._compacted_height > 0
+        assert [b.block_hash for b in engine.get_chain_from_genesis()] == [b.block_hash for b in chain]
+
+    @pytest.mark.unit
+    def test_connect_headers_rejects_decreasing_work(self, tmp_path):
+        chain = make_chain(10)
+        headers = [header_of(b) for b in chain]
+        headers[6].cumulative_work_score = 0.5
+        engine = make_engine(make_storage(tmp_path), light_mode=True)
+
+        assert engine.connect_headers(headers) == 6
+        assert make_engine(make_storage(tmp_path / "full"), light_mode=False).connect_headers(headers) == 0
+
+    @pytest.mark.unit
+    def test_verify_block_body(self, tmp_path):
+        chain = make_chain(3)
+        engine = make_engine(make_storage(tmp_path), light_mode=True)
+        engine.connect_headers([header_of(b) for b in chain])
+
+        body = engine.storage._deserialize_block(engine.storage._serialize_block(chain[2]))
+        assert engine.verify_block_body(body)
+
+        body.solution = [1, 2, 3, 4]
+        assert not engine.verify_block_body(body)
+        assert not engine.verify_block_body(make_chain(4)[4])  # Unknown header
+
+
+class TestLightNode:
+    """Test a light Node starting from a trusted checkpoint."""
+
+    @pytest.mark.integration
+    def test_checkpoint_start_and_lazy_bodies(self, tmp_path):
+        chain = make_chain(200)
+        registry = {}
+        make_server(tmp_path, chain, registry)
+        write_checkpoint(tmp_path / "trusted", chain[50], 50)
+
+        config = NodeConfig(role=LightRole.LIGHT, data_dir=str(tmp_path / "light"),
+                            checkpoint_dir=str(tmp_path / "trusted"), enable_user_submissions=False)
+        node = Node(config)
+        with patch.object(ConsensusEngine, "_initialize_genesis"):
+            assert node.init()
+        assert node.consensus.config.light_mode
+        assert node.current_block_height == 50
+
+        node.network = make_client(node.storage, "light", registry)
+        result = node.sync_light("server")
+
+        assert result.error is None
+        assert result.headers_synced == 150
+        assert node.best_tip_hash == chain[-1].block_hash
+        assert node.storage.get_block(chain[120].block_hash) is None
+
+        block = node.get_block(chain[120].block_hash, peer_id="server")
+        assert block.solution == chain[120].solution
+        assert node.storage.get_block(chain[120].block_hash) is not None
+        assert node.get_block(chain[30].block_hash, peer_id="server") is None  # Below the checkpoint: no header
+
+
+class TestLightBenchmark:
+    """Benchmark sync time and footprint against a full node."""
+
+    @pytest.mark.stress
+    def test_light_vs_full_sync(self, tmp_path):
+        print("\n🪶 Benchmarking light vs full sync (2,000 blocks)...")
+        chain = make_chain(2_000)
+        registry = {}
+        make_server(tmp_path, chain, registry)
+        stats = {}
+
+        for mode in ("full", "light"):
+            storage = make_storage(tmp_path / mode)
+            client = make_client(storage, mode, registry)
+            engine = make_engine(storage, light_mode=(mode == "light"))
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            if mode == "light":
+                driver = HeaderSyncDriver(client, storage, header_sink=engine.connect_headers)
+                result = driver.sync("server", fetch_bodies=False)
+            else:
+                # Header-first download of headers and bodies, then full validation.
+                # The compact body encoding omits complexity, so the validated
+                # blocks are the originals.
+                driver = HeaderSyncDriver(client, storage)
+                result = driver.sync("server", fetch_bodies=True)
+                engine._add_block_to_tree(chain[0], receipt_time=chain[0].timestamp)
+                engine.connect_blocks(chain[1:], workers=0, store_blocks=False)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            assert result.error is None
+            assert engine.best_tip.block.block_hash == chain[-1].block_hash
+            stats[mode] = (elapsed, db_bytes(storage), peak)
+            print(f"   {mode:>5}: {elapsed:6.2f}s, disk {stats[mode][1] / 1024:7.0f} KiB, "
+                  f"peak RAM {peak / 1024:7.0f} KiB")
+
+        assert stats["light"][0] < stats["full"][0]
+        assert stats["light"][1] < stats["full"][1] / 2
+        print("✅ Light sync benchmark passed")
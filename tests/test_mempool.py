@@ -0,0 +1,184 @@
+"""
+Tests for the priority-ordered mempool
+Includes an insert and template-selection benchmark at 100k transactions
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tokenomics.mempool import Mempool
+from tokenomics.amount import to_units
+from tests.helpers import address
+
+
+def make_tx(i, sender=1, amount=1, fee=None, timestamp=None):
+    tx = Transaction(
+        sender=address(sender), recipient=address(sender + 1), amount=to_units(amount),
+        timestamp=1_700_000_000.0 + i if timestamp is None else timestamp,
+        transaction_id=f"{i:064x}"
+    )
+    if fee is not None:
+        tx.fee = fee
+    return tx
+
+
+class LegacyPool:
+    """The previous pending list, used as a reference."""
+
+    def __init__(self):
+        self.pending_transactions = []
+
+    def add(self, transaction):
+        if any(tx.transaction_id == transaction.transaction_id for tx in self.pending_transactions):
+            return False
+        self.pending_transactions.append(transaction)
+        return True
+
+    def select(self, max_count=100):
+        return sorted(self.pending_transactions, key=lambda tx: tx.timestamp)[:max_count]
+
+
+class TestMempool:
+    """Test ordering, reservation and eviction."""
+
+    @pytest.mark.unit
+    def test_select_by_priority_then_age(self):
+        pool = Mempool()
+        fees = [0, 5, 1, 5, 0, 3]
+        for i, fee in enumerate(fees):
+            assert pool.add(make_tx(i, sender=i, fee=fee))
+        assert not pool.add(make_tx(0, sender=0, fee=0))
+
+        selected = pool.select(4)
+        assert [tx.transaction_id for tx in selected] == [f"{i:064x}" for i in (1, 3, 5, 2)]
+        assert len(pool) == 6  # Selection leaves the pool unchanged
+        assert [tx.fee for tx in pool.select(100)] == [5, 5, 3, 1, 0, 0]
+        assert pool.metrics.duplicates == 1
+
+    @pytest.mark.unit
+    def test_funds_cannot_be_double_pending(self):
+        balances = {address(1): to_units(10)}
+        pool = Mempool(balance_of=lambda addr: balances.get(addr, 0))
+
+        assert pool.add(make_tx(0, amount=6))
+        assert not pool.add(make_tx(1, amount=6))
+        assert pool.available_balance(address(1)) == to_units(4)
+        assert pool.add(make_tx(2, amount=4))
+
+        assert pool.remove(f"{0:064x}") is not None
+        assert pool.reserved(address(1)) == to_units(4)
+        assert pool.add(make_tx(1, amount=6))
+        assert pool.metrics.insufficient_funds == 1
+
+        # Coinbase spends are never reserved
+        coinbase = Transaction(sender="COINBASE", recipient=address(1), amount=to_units(50), timestamp=1.0)
+        assert pool.add(coinbase)
+        assert pool.reserved("COINBASE") == 0
+
+    @pytest.mark.unit
+    def test_eviction_by_size_and_age(self):
+        pool = Mempool(max_size=3, max_age=60)
+        for i, fee in enumerate((2, 1, 3)):
+            pool.add(make_tx(i, sender=i, fee=fee), now=1000.0 + i)
+
+        assert not pool.add(make_tx(3, sender=3, fee=1), now=1003.0)  # Ties lose to older entries
+        assert pool.add(make_tx(4, sender=4, fee=5), now=1004.0)
+        assert f"{1:064x}" not in pool
+        assert pool.metrics.evicted_size == 1
+        assert pool.metrics.rejected_full == 1
+
+        assert pool.evict_expired(now=1062.5) == 2  # Added at t=1000 and t=1002
+        assert [tx.fee for tx in pool] == [5]
+
+    @pytest.mark.unit
+    def test_stale_heap_entries_stay_bounded(self):
+        pool = Mempool()
+        for round_ in range(20):
+            txs = [make_tx(round_ * 100 + i, sender=i) for i in range(100)]
+            for tx in txs:
+                pool.add(tx)
+            assert pool.remove_many(tx.transaction_id for tx in txs[:90]) == 90
+        assert len(pool) == 200
+        assert len(pool._best) <= 2 * len(pool) + 64
+        assert len(pool.select(1000)) == 200
+
+
+class TestBlockchainStateMempool:
+    """Test BlockchainState uses the mempool for its pending pool."""
+
+    @pytest.mark.unit
+    def test_pending_pool_round_trip(self, tmp_path):
+        state = BlockchainState()
+        state.update_balance(address(1), to_units(10))
+        with patch.object(BlockchainState, "validate_transaction", return_value=True):
+            assert state.add_transaction(make_tx(0, amount=6))
+            assert not state.add_transaction(make_tx(0, amount=6))
+            assert not state.add_transaction(make_tx(1, amount=6))
+            assert state.add_transaction(make_tx(2, amount=3, timestamp=1.0))
+
+        assert [tx.amount for tx in state.get_pending_transactions()] == [to_units(3), to_units(6)]
+        assert state.get_transaction_by_id(f"{2:064x}").amount == to_units(3)
+        assert state.get_network_stats()["pending_transactions"] == 2
+
+        path = str(tmp_path / "state.json")
+        assert state.save_state(path)
+        restored = BlockchainState()
+        assert restored.load_state(path)
+        assert [tx.transaction_id for tx in restored.pending_transactions] == \
+            [tx.transaction_id for tx in state.pending_transactions]
+        assert restored.mempool.reserved(address(1)) == to_units(9)
+
+        state.clear_pending_transactions(state.get_pending_transactions(1))
+        assert [tx.amount for tx in state.pending_transactions] == [to_units(6)]
+        assert state.mempool.reserved(address(1)) == to_units(6)
+
+
+class TestMempoolBenchmark:
+    """Benchmark insert and selection throughput."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_hundred_thousand_transactions(self):
+        print("\n🧺 Benchmarking a 100k-transaction mempool...")
+        rng = random.Random(42)
+        count = 100_000
+        txs = [make_tx(i, sender=i % 5_000, fee=rng.randint(0, 100), timestamp=1_700_000_000.0 + rng.random() * 1e4)
+               for i in range(count)]
+
+        pool = Mempool(max_size=count)
+        start = time.perf_counter()
+        for tx in txs:
+            assert pool.add(tx)
+        insert_rate = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            selected = pool.select(1_000)
+        select_ms = (time.perf_counter() - start) * 10
+        assert [tx.fee for tx in selected] == sorted((tx.fee for tx in txs), reverse=True)[:1_000]
+
+        # Previous list: O(n) duplicate check per insert (sampled) and a full sort per selection
+        legacy, sample = LegacyPool(), 10_000
+        start = time.perf_counter()
+        for tx in txs[:sample]:
+            legacy.add(tx)
+        legacy_insert_rate = sample / (time.perf_counter() - start)
+        legacy.pending_transactions = list(txs)
+        start = time.perf_counter()
+        for _ in range(10):
+            legacy.select(1_000)
+        legacy_select_ms = (time.perf_counter() - start) * 100
+
+        print(f"   insert: mempool {insert_rate:10,.0f} tx/sec, list {legacy_insert_rate:10,.0f} tx/sec "
+              f"(first {sample:,} only)")
+        print(f"   select 1,000 of {count:,}: mempool {select_ms:6.2f} ms, sorted list {legacy_select_ms:6.2f} ms")
+
+        print("✅ Mempool benchmark passed")
@@ -0,0 +1,166 @@
+"""
+Tests for the orphan block pool and parent-triggered batch connection
+Includes a simulation of blocks arriving in random order
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from orphan_pool import OrphanPool
+from tests import helpers
+from tests.helpers import make_block, make_chain
+
+
+def make_engine(**config):
+    config.setdefault("max_headers_per_second", 10 ** 9)  # Feed headers faster than gossip allows
+    return helpers.make_engine(**config)
+
+
+class TestOrphanPool:
+    """Test indexing, batch removal and eviction."""
+
+    @pytest.mark.unit
+    def test_descendants_taken_parent_first(self):
+        chain = make_chain(make_block(None), 4)
+        fork = make_block(chain[0], tag="fork")
+        pool = OrphanPool()
+        for block in reversed(chain[1:] + [fork]):
+            assert pool.add(block)
+        assert not pool.add(chain[2])
+
+        taken = [entry.block for entry in pool.take_descendants(chain[0].block_hash)]
+
+        assert len(taken) == 4
+        assert taken.index(chain[1]) < taken.index(chain[2]) < taken.index(chain[3])
+        assert len(pool) == 0
+        assert pool.metrics.duplicates == 1
+        assert pool.take_descendants(chain[0].block_hash) == []
+
+    @pytest.mark.unit
+    def test_eviction_by_size_and_age(self):
+        chain = make_chain(make_block(None), 6)
+        pool = OrphanPool(max_orphans=3, max_age=60)
+        for i, block in enumerate(chain[:4]):
+            pool.add(block, now=1000.0 + i)
+
+        assert len(pool) == 3
+        assert chain[0].block_hash not in pool
+        assert pool.metrics.evicted_size == 1
+
+        pool.add(chain[4], now=1062.0)  # chain[1] (t=1001) is now too old
+        assert chain[1].block_hash not in pool
+        assert pool.metrics.evicted_age == 1
+        assert pool.evict_expired(now=2000.0) == 3
+        assert not pool.has_children(chain[2].block_hash)
+
+    @pytest.mark.unit
+    def test_missing_parents_are_chain_roots(self):
+        chain = make_chain(make_block(None), 6)
+        pool = OrphanPool()
+        for block in (chain[2], chain[3], chain[5]):
+            pool.add(block)
+
+        assert pool.missing_parents() == [chain[1].block_hash, chain[4].block_hash]
+
+
+class TestEngineIntegration:
+    """Test orphan buffering in validate_header and the staged pipeline."""
+
+    @pytest.mark.unit
+    def test_parent_connects_waiting_descendants(self):
+        engine, genesis = make_engine()
+        chain = make_chain(genesis, 6)
+
+        for block in reversed(chain[1:]):
+            assert engine.validate_header(block) is False
+        assert engine.best_tip.block is genesis
+        assert len(engine.orphan_pool) == 5
+
+        assert engine.validate_header(chain[0]) is True
+
+        assert engine.best_tip.block.block_hash == chain[-1].block_hash
+        assert engine.best_tip.height == 6
+        metrics = engine.get_orphan_metrics()
+        assert metrics["pool_size"] == 0
+        assert metrics["resolved"] == 5
+        assert metrics["orphan_rate"] == pytest.approx(5 / 6)
+        assert metrics["avg_resolution_latency"] >= 0.0
+
+    @pytest.mark.unit
+    def test_invalid_orphan_dropped_with_descendants(self):
+        engine, genesis = make_engine()
+        chain = make_chain(genesis, 4)
+        chain[1].timestamp = chain[0].timestamp - 1  # Fails median-time-past once linked
+        chain[1].block_hash = chain[1].calculate_hash()
+        chain[2] = make_block(chain[1])
+        chain[3] = make_block(chain[2])
+
+        for block in chain[1:]:
+            engine.validate_header(block)
+        engine.validate_header(chain[0])
+
+        assert engine.best_tip.block.block_hash == chain[0].block_hash
+        assert engine.orphan_pool.metrics.dropped == 3
+        assert chain[3].block_hash not in engine.block_tree
+        assert len(engine.orphan_pool) == 0
+
+    @pytest.mark.unit
+    def test_invalid_orphan_rejected_before_buffering(self):
+        engine, genesis = make_engine()
+        orphan = make_chain(genesis, 2)[1]
+        orphan.problem = None
+
+        with pytest.raises(Exception, match="Orphan header validation failed"):
+            engine.validate_header(orphan)
+        assert len(engine.orphan_pool) == 0
+
+    @pytest.mark.unit
+    def test_pipeline_accepts_out_of_order_batch(self):
+        engine, genesis = make_engine()
+        chain = make_chain(genesis, 20)
+        shuffled = chain[10:] + chain[:10]
+
+        result = engine.validate_blocks(shuffled, workers=0)
+
+        assert result.rejected == []
+        assert result.orphaned == [block.block_hash for block in chain[10:]]
+        assert sorted(result.accepted) == sorted(block.block_hash for block in chain)
+        assert engine.best_tip.block.block_hash == chain[-1].block_hash
+        assert engine.last_pipeline_metrics["orphaned"] == 10
+
+
+class TestOutOfOrderSimulation:
+    """Simulate gossip delivering a forked chain in random order."""
+
+    @pytest.mark.simulation
+    def test_random_arrival_order_converges(self):
+        print("\n🔀 Simulating out-of-order block arrival...")
+        engine, genesis = make_engine(compaction_interval=0)
+        main = make_chain(genesis, 400)
+        fork = make_chain(main[199], 50, tag="fork")
+        blocks = main + fork
+
+        rng = random.Random(1337)
+        rng.shuffle(blocks)
+
+        start = time.perf_counter()
+        for block in blocks:
+            engine.validate_header(block)
+        elapsed = time.perf_counter() - start
+
+        metrics = engine.get_orphan_metrics()
+        print(f"   {len(blocks)} blocks in {elapsed * 1000:.1f} ms, orphan rate {metrics['orphan_rate']:.1%}, "
+              f"max pool wait {metrics['max_resolution_latency'] * 1000:.1f} ms")
+
+        assert engine.best_tip.block.block_hash == main[-1].block_hash
+        assert all(block.block_hash in engine.block_tree for block in blocks)
+        assert metrics["pool_size"] == 0
+        assert metrics["resolved"] == metrics["orphans_received"]
+
+        print("✅ Out-of-order simulation passed")
@@ -0,0 +1,182 @@
+"""
+Tests for pooled framed connections in P2PDiscoveryService
+Runs against local in-process peers on 127.0.0.1
+"""
+
+import pytest
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from p2p_discovery import (
+    P2PDiscoveryService, DiscoveryConfig, DiscoveryProtocol, ConnectionPool,
+    encode_frame, FRAME_HEADER
+)
+
+
+def make_peer_data(i):
+    return {
+        "peer_id": f"peer-{i:04d}",
+        "address": f"10.0.{i // 256}.{i % 256}",
+        "port": 12346,
+        "protocol": "bootstrap",
+        "last_seen": time.time(),
+        "reputation": 1.0,
+        "capabilities": ["headers", "blocks"]
+    }
+
+
+def make_service(bootstrap_nodes=None, serve=True, **overrides):
+    config = DiscoveryConfig(
+        bootstrap_nodes=bootstrap_nodes or [],
+        listen_port=0,
+        listen_host="127.0.0.1",
+        serve_peer_exchange=serve,
+        max_peers=1000,
+        request_timeout=3.0,
+        **overrides
+    )
+    service = P2PDiscoveryService(config)
+    if serve:
+        service.bound_port = service.connection_pool.serve(
+            config.listen_host, config.listen_port, service._handle_discovery_request
+        )
+    return service
+
+
+@pytest.fixture
+def services():
+    created = []
+
+    def factory(*args, **kwargs):
+        service = make_service(*args, **kwargs)
+        created.append(service)
+        return service
+
+    yield factory
+    for service in created:
+        service.connection_pool.close()
+
+
+class TestFraming:
+    """Test the length-prefixed frame format."""
+
+    @pytest.mark.unit
+    def test_frame_length_prefix(self):
+        frame = encode_frame({"type": "ping"})
+        (length,) = FRAME_HEADER.unpack(frame[:FRAME_HEADER.size])
+        assert length == len(frame) - FRAME_HEADER.size
+
+
+class TestPooledDiscovery:
+    """Test discovery over persistent framed connections."""
+
+    @pytest.mark.integration
+    def test_large_peer_list_not_truncated(self, services):
+        """Test: 300 peers (~50KB) arrive intact, well past the old recv(4096)."""
+        bootstrap = services()
+        for i in range(300):
+            bootstrap._add_discovered_peer(make_peer_data(i), DiscoveryProtocol.BOOTSTRAP)
+
+        client = services([f"127.0.0.1:{bootstrap.bound_port}"], serve=False)
+        client._discover_from_bootstrap_nodes()
+
+        assert len(client.discovered_peers) == 300
+
+    @pytest.mark.integration
+    def test_connection_reused_across_cycles(self, services):
+        bootstrap = services()
+        bootstrap._add_discovered_peer(make_peer_data(1), DiscoveryProtocol.BOOTSTRAP)
+        client = services([f"127.0.0.1:{bootstrap.bound_port}"], serve=False)
+
+        for _ in range(5):
+            client._discover_from_bootstrap_nodes()
+
+        stats = client.connection_pool.stats
+        assert stats["connects"] == 1
+        assert stats["requests"] == 5
+        assert stats["reused"] == 4
+
+    @pytest.mark.integration
+    def test_unreachable_bootstrap_does_not_block_others(self, services):
+        bootstrap = services()
+        bootstrap._add_discovered_peer(make_peer_data(7), DiscoveryProtocol.BOOTSTRAP)
+        client = services(
+            ["127.0.0.1:1", f"127.0.0.1:{bootstrap.bound_port}"], serve=False
+        )
+
+        client._discover_from_bootstrap_nodes()
+
+        assert "peer-0007" in client.discovered_peers
+        assert client.connection_pool.stats["failures"] == 1
+
+    @pytest.mark.integration
+    def test_concurrent_exchange_with_all_peers(self, services):
+        """Test: exchange hits every connected peer (not the first 3) concurrently."""
+        print("\n🌐 Testing concurrent peer exchange (8 peers)...")
+        delay = 0.3
+        peers = []
+        for i in range(8):
+            peer = services()
+            peer._add_discovered_peer(make_peer_data(100 + i), DiscoveryProtocol.BOOTSTRAP)
+            handler = peer._handle_discovery_request
+
+            def slow_handler(message, handler=handler):
+                time.sleep(delay)
+                return handler(message)
+
+            peer.connection_pool.close()
+            peer.connection_pool = ConnectionPool()
+            peer.bound_port = peer.connection_pool.serve("127.0.0.1", 0, slow_handler)
+            peers.append(peer)
+
+        client = services(serve=False)
+        for i, peer in enumerate(peers):
+            data = dict(make_peer_data(i), peer_id=f"node-{i}", address="127.0.0.1", port=peer.bound_port)
+            client._add_discovered_peer(data, DiscoveryProtocol.BOOTSTRAP)
+            assert client.connect_to_peer(f"node-{i}")
+
+        start = time.time()
+        client._exchange_peers_with_connected()
+        elapsed = time.time() - start
+
+        print(f"   Exchange with {len(peers)} peers took {elapsed:.3f}s (sequential ≈ {delay * len(peers):.1f}s)")
+        for i in range(8):
+            assert f"peer-{100 + i:04d}" in client.discovered_peers
+        assert elapsed < delay * len(peers) / 2
+        assert client.connection_pool.stats["connects"] == len(peers)
+
+    @pytest.mark.integration
+    def test_multiplexed_requests_share_one_connection(self, services):
+        server_pool = ConnectionPool()
+        port = server_pool.serve("127.0.0.1", 0, lambda m: (time.sleep(0.2), {"type": "pong"})[1])
+        client = services(serve=False)
+
+        try:
+            start = time.time()
+            replies = client.connection_pool.request_many([("127.0.0.1", port)] * 10, {"type": "ping"})
+            elapsed = time.time() - start
+        finally:
+            server_pool.close()
+
+        assert all(reply and reply["type"] == "pong" for reply in replies)
+        assert client.connection_pool.stats["connects"] == 1
+        assert elapsed < 1.0, "Requests should be in flight concurrently"
+
+    @pytest.mark.integration
+    def test_keepalive_evicts_dead_connection(self, services):
+        server = services()
+        client = services(serve=False, keepalive_interval=0.2)
+        client.connection_pool.request("127.0.0.1", server.bound_port, {"type": "ping"})
+        assert len(client.connection_pool.connections) == 1
+
+        server.connection_pool.close()
+        deadline = time.time() + 3.0
+        while client.connection_pool.connections and time.time() < deadline:
+            time.sleep(0.1)
+
+        assert not client.connection_pool.connections
+        assert client.connection_pool.stats["evicted"] >= 1
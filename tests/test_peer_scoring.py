@@ -0,0 +1,189 @@
+"""
+Tests for the latency- and reliability-scored peer table
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from peer_scoring import (
+    PeerScoreTable, PeerScore, RTT_EWMA_ALPHA,
+    PURPOSE_SYNC, PURPOSE_GOSSIP, PURPOSE_DISCOVERY
+)
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from network import NetworkProtocol, LocalTransport
+
+
+class TestPeerScore:
+    """Test per-peer metrics."""
+
+    @pytest.mark.unit
+    def test_rtt_ewma(self):
+        table = PeerScoreTable()
+        table.record_success("p1", rtt=0.1)
+        table.record_success("p1", rtt=0.5)
+
+        expected = RTT_EWMA_ALPHA * 0.5 + (1 - RTT_EWMA_ALPHA) * 0.1
+        assert table.get("p1").rtt_ewma == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_failures_lower_quality(self):
+        table = PeerScoreTable()
+        for _ in range(5):
+            table.record_success("good", rtt=0.05)
+            table.record_success("flaky", rtt=0.05)
+            table.record_failure("flaky")
+
+        assert table.get("good").quality > table.get("flaky").quality
+        assert PeerScore("new").success_rate == 0.5
+
+
+class TestTopK:
+    """Test per-purpose best-peer selection."""
+
+    @pytest.mark.unit
+    def test_gossip_prefers_fast_reliable(self):
+        table = PeerScoreTable()
+        table.record_success("slow", rtt=0.3)
+        table.record_success("fast", rtt=0.01)
+        table.record_failure("dead")
+
+        assert table.top_k(2, PURPOSE_GOSSIP) == ["fast", "slow"]
+        assert table.rank(["dead", "unknown", "slow", "fast"], PURPOSE_GOSSIP) == [
+            "fast", "slow", "dead", "unknown"
+        ]
+
+    @pytest.mark.unit
+    def test_sync_prefers_height_then_quality(self):
+        table = PeerScoreTable()
+        table.update_height("tall-slow", 100)
+        table.record_success("tall-slow", rtt=1.0)
+        table.update_height("tall-fast", 100)
+        table.record_success("tall-fast", rtt=0.01)
+        table.update_height("short", 50)
+        table.record_success("short", rtt=0.001)
+
+        assert table.top_k(3, PURPOSE_SYNC) == ["tall-fast", "tall-slow", "short"]
+        assert table.top_k(5, PURPOSE_SYNC, where=lambda p: p.last_height < 100) == ["short"]
+        assert table.best_height() == 100
+
+    @pytest.mark.unit
+    def test_updates_and_removal_invalidate_entries(self):
+        table = PeerScoreTable()
+        table.record_success("a", rtt=0.01)
+        table.record_success("b", rtt=0.5)
+        for _ in range(10):
+            table.record_failure("a")
+        table.remove("b")
+
+        assert table.top_k(5, PURPOSE_DISCOVERY) == ["a"]
+        assert len(table) == 1
+
+    @pytest.mark.unit
+    def test_removed_peer_readded_is_ranked_once(self):
+        table = PeerScoreTable()
+        table.add_peer("a")
+        table.add_peer("b")
+        table.record_success("a")
+        table.remove("a")
+        assert table.top_k(3) == ["b"]
+
+        table.add_peer("a")
+        table.record_failure("a")
+        for purpose in (PURPOSE_GOSSIP, PURPOSE_SYNC, PURPOSE_DISCOVERY):
+            ranked = table.top_k(3, purpose)
+            assert sorted(ranked) == ["a", "b"]
+        assert table.top_k(3, PURPOSE_GOSSIP) == ["b", "a"]
+        assert table.get("a").successes == 0
+
+    @pytest.mark.unit
+    def test_unknown_purpose_rejected(self):
+        with pytest.raises(ValueError):
+            PeerScoreTable().top_k(1, "mining")
+
+
+class TestPersistence:
+    """Test snapshots in the storage peer_index table."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path):
+        storage = StorageManager(StorageConfig(
+            data_dir=str(tmp_path / "peers"),
+            role=NodeRole.FULL,
+            pruning_mode=PruningMode.FULL
+        ))
+        table = PeerScoreTable()
+        table.record_success("p1", rtt=0.2, served_bytes=1000)
+        table.update_height("p1", 42)
+        table.record_failure("p2")
+
+        assert table.save(storage)
+        restored = PeerScoreTable()
+        assert restored.load(storage) == 2
+
+        assert restored.get("p1").rtt_ewma == pytest.approx(0.2)
+        assert restored.get("p1").served_bytes == 1000
+        assert restored.get("p2").failures == 1
+        assert restored.top_k(1, PURPOSE_SYNC) == ["p1"]
+
+
+class TestNetworkIntegration:
+    """Test that requests feed the table and gossip fan-out uses it."""
+
+    @pytest.mark.simulation
+    def test_requests_scored_and_fanout_limited(self, tmp_path):
+        registry = {}
+        nodes = []
+        for name in ("client", "a", "b", "c"):
+            storage = StorageManager(StorageConfig(
+                data_dir=str(tmp_path / name),
+                role=NodeRole.FULL,
+                pruning_mode=PruningMode.FULL
+            ))
+            transport = LocalTransport(name, registry)
+            net = NetworkProtocol(Mock(), storage, Mock(), peer_id=name, transport=transport)
+            transport.attach(net)
+            nodes.append(net)
+        client = nodes[0]
+
+        assert client.request_headers("a", 0, 10) == []
+        assert client.request_headers("missing", 0, 10) is None
+        client.peer_scores.record_failure("c")
+
+        assert client.peer_scores.get("a").successes == 1
+        assert client.peer_scores.get("missing").failures == 1
+
+        client.gossip_fanout = 2
+        peers = client._get_gossip_peers()
+        assert peers[0] == "a"
+        assert len(peers) == 2
+
+
+class TestSelectionPerformance:
+    """Test top-k stays cheap on large peer tables."""
+
+    @pytest.mark.stress
+    def test_top_k_large_table(self):
+        print("\n📊 Testing top-k selection over 20,000 peers...")
+        rng = random.Random(7)
+        table = PeerScoreTable()
+        for i in range(20_000):
+            table.record_success(f"peer-{i}", rtt=rng.uniform(0.01, 2.0), served_bytes=rng.randint(0, 10_000))
+            table.update_height(f"peer-{i}", rng.randint(0, 1000))
+
+        start = time.time()
+        for i in range(1000):
+            table.record_success(f"peer-{rng.randrange(20_000)}", rtt=rng.uniform(0.01, 2.0))
+            best = table.top_k(8, PURPOSE_GOSSIP)
+        elapsed = time.time() - start
+
+        expected = sorted(table.scores.values(), key=lambda p: p.quality, reverse=True)[:8]
+        print(f"   1000 update+top_k(8) rounds in {elapsed:.3f}s")
+        assert best == [p.peer_id for p in expected]
+        assert elapsed < 2.0
@@ -0,0 +1,260 @@
+"""
+Tests for common-ancestor reorgs and best-chain deltas
+Includes a benchmark of reorgs at depth 1-100 on a 100k-block chain
+"""
+
+import pytest
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import ProblemTier
+from consensus import ChainDelta, get_skip_height
+from tokenomics.dynamic_tokenomics import DynamicWorkScoreTokenomics
+from tokenomics.blockchain_state import BlockchainState
+from tests.helpers import make_block, make_engine, extend, NullStorage
+
+
+def hashes(blocks):
+    return [block.block_hash for block in blocks]
+
+
+class TestAncestorLookup:
+    """Test skip-pointer ancestor lookup and fork-point search."""
+
+    @pytest.mark.unit
+    def test_skip_heights_descend(self):
+        for height in range(1, 5000):
+            assert 0 <= get_skip_height(height) < height
+
+    @pytest.mark.unit
+    def test_get_ancestor_matches_parent_walk(self):
+        engine, genesis = make_engine(compaction_interval=0)
+        chain = [genesis] + extend(engine, genesis, 300)
+        tip = engine.best_tip
+
+        for height in (0, 1, 2, 63, 64, 65, 150, 299, 300):
+            assert engine.get_ancestor(tip, height).block_hash == chain[height].block_hash
+        assert engine.get_ancestor(tip, 301) is None
+
+    @pytest.mark.unit
+    def test_find_fork_point(self):
+        engine, genesis = make_engine(compaction_interval=0)
+        main = extend(engine, genesis, 50)
+        side = extend(engine, main[29], 5, tag="side")
+
+        old_tip = engine.block_tree[main[-1].block_hash]
+        new_tip = engine.block_tree[side[-1].block_hash]
+        assert engine.find_fork_point(old_tip, new_tip).block_hash == main[29].block_hash
+        assert engine.find_fork_point(old_tip, new_tip, max_depth=10) is None
+
+
+class TestReorgDeltas:
+    """Test that tip changes emit only the disconnect/connect deltas."""
+
+    @pytest.mark.unit
+    def test_extension_emits_single_connect(self):
+        engine, genesis = make_engine()
+        deltas = []
+        engine.add_chain_listener(deltas.append)
+
+        block = extend(engine, genesis, 1)[0]
+
+        assert deltas == [ChainDelta(genesis.block_hash, 0, [], [block])]
+        engine.storage.batch_write.assert_called_with([("work_index", (1, int(engine.best_tip.cumulative_work), block.block_hash))])
+
+    @pytest.mark.unit
+    def test_heavier_branch_reorgs_to_fork_point(self):
+        engine, genesis = make_engine()
+        main = extend(engine, genesis, 30)
+        deltas = []
+        engine.add_chain_listener(deltas.append)
+
+        side = extend(engine, main[24], 5, tag="side", numbers=40)
+
+        reorg = engine.last_reorg
+        assert engine.best_tip.block.block_hash == side[-1].block_hash
+        assert reorg.fork_hash == main[24].block_hash
+        assert reorg.depth == 5
+        assert hashes(reorg.disconnected) == hashes(reversed(main[25:]))
+        assert hashes(reorg.connected) == hashes(side[:len(reorg.connected)])
+        # Later side blocks arrive as plain extensions
+        assert sum(len(d.connected) for d in deltas) == 5
+        assert sum(len(d.disconnected) for d in deltas) == 5
+
+        work_index = [
+            op for c in engine.storage.batch_write.call_args_list for op in c.args[0]
+            if op[0] == "work_index"
+        ]
+        assert [op[1][2] for op in work_index[-5:]] == hashes(side)
+
+    @pytest.mark.unit
+    def test_manual_reorg_and_depth_limit(self):
+        engine, genesis = make_engine(max_reorg_depth=20, compaction_interval=0)
+        main = extend(engine, genesis, 40)
+        short = extend(engine, main[29], 3, tag="side")
+        deep = extend(engine, main[9], 3, tag="deep")
+
+        removed, added = engine.handle_reorg(short[-1].block_hash)
+        assert hashes(removed) == hashes(main[30:])
+        assert hashes(added) == hashes(short)
+        assert engine.best_tip.block.block_hash == short[-1].block_hash
+
+        assert engine.handle_reorg(deep[-1].block_hash) == ([], [])
+        assert engine.best_tip.block.block_hash == short[-1].block_hash
+
+    @pytest.mark.unit
+    def test_finality_requires_main_chain(self):
+        engine, genesis = make_engine(confirmation_depth=5, compaction_interval=0)
+        main = extend(engine, genesis, 30)
+        side = extend(engine, main[4], 3, tag="side")
+
+        assert engine.is_finalized(main[6].block_hash)
+        assert not engine.is_finalized(side[0].block_hash)
+
+    @pytest.mark.unit
+    def test_finalized_history_not_disconnected(self):
+        engine, genesis = make_engine(confirmation_depth=5, compaction_interval=5)
+        main = extend(engine, genesis, 40)
+        old = engine.block_tree[main[10].block_hash]
+        assert not hasattr(old, "block")  # Compacted to a stub
+
+        side = make_block(main[10], tag="side", numbers=40)
+        engine._add_block_to_tree(side, receipt_time=time.time())
+        assert engine.handle_reorg(side.block_hash) == ([], [])
+        assert engine.best_tip.block.block_hash == main[-1].block_hash
+
+
+class TestTokenomicsDelta:
+    """Test tokenomics follows chain deltas."""
+
+    @pytest.mark.unit
+    def test_disconnect_undoes_rewards(self):
+        state = BlockchainState()
+        tokenomics = DynamicWorkScoreTokenomics(blockchain_state=state)
+        genesis = make_block(None)
+        a = make_block(genesis)
+        b = make_block(a)
+
+        for block in (genesis, a):
+            tokenomics.connect_block(block, miner_address="miner")
+        work, issued = tokenomics.cumulative_work_score, tokenomics.total_coins_issued
+        balance = state.get_balance("miner")
+
+        tokenomics.connect_block(b, miner_address="miner")
+        assert tokenomics.disconnect_block(b)
+
+        assert tokenomics.cumulative_work_score == pytest.approx(work)
+        assert tokenomics.total_coins_issued == pytest.approx(issued)
+        assert state.get_balance("miner") == pytest.approx(balance)
+        assert len(state.transaction_history["miner"]) == 2
+        assert tokenomics.capacity_performance[ProblemTier.TIER_2_DESKTOP].blocks_mined == 2
+        assert not tokenomics.disconnect_block(b)
+
+    @pytest.mark.unit
+    def test_listener_tracks_reorg(self):
+        engine, genesis = make_engine()
+        tokenomics = DynamicWorkScoreTokenomics()
+        tokenomics.connect_block(genesis)
+        engine.add_chain_listener(tokenomics.apply_chain_delta)
+
+        main = extend(engine, genesis, 10)
+        extend(engine, main[6], 4, tag="side", numbers=40)
+
+        recorded = [r.block_hash for r in tokenomics.work_score_history]
+        chain = engine.get_chain_from_genesis()
+        assert recorded == hashes(chain)
+
+    def _reorg_with_balances(self, miner_resolver):
+        """Main chain credited to main-miner, then a heavier side branch from height 6."""
+        engine, genesis = make_engine()
+        state = BlockchainState()
+        tokenomics = DynamicWorkScoreTokenomics(blockchain_state=state, miner_resolver=miner_resolver)
+        main = extend(engine, genesis, 10)
+        for block in [genesis] + main:
+            tokenomics.connect_block(block, miner_address="main-miner")
+        engine.add_chain_listener(tokenomics.apply_chain_delta)
+        rewards = {r.block_hash: r.reward for r in tokenomics.work_score_history}
+
+        side = extend(engine, main[6], 4, tag="side", numbers=40)
+        assert engine.best_tip.block.block_hash == side[-1].block_hash
+        return state, tokenomics, genesis, main, side, rewards
+
+    @pytest.mark.unit
+    def test_reorg_moves_rewards_to_new_branch_miners(self):
+        resolver = lambda block: "side-miner" if block.timestamp % 1 else "main-miner"
+        state, tokenomics, genesis, main, side, rewards = self._reorg_with_balances(resolver)
+
+        kept = sum(rewards[b.block_hash] for b in [genesis] + main[:7])
+        side_rewards = sum(r.reward for r in tokenomics.work_score_history if r.miner_address == "side-miner")
+        assert state.get_balance("main-miner") == kept
+        assert side_rewards > 0 and state.get_balance("side-miner") == side_rewards
+        assert tokenomics.total_coins_issued == kept + side_rewards
+        assert len(state.transaction_history["main-miner"]) == 8
+        assert len(state.transaction_history["side-miner"]) == 4
+
+    @pytest.mark.unit
+    def test_reorg_without_resolver_leaves_balances(self):
+        state, tokenomics, genesis, main, side, rewards = self._reorg_with_balances(None)
+
+        assert state.get_balance("main-miner") == sum(rewards.values())
+        assert len(state.transaction_history["main-miner"]) == 11
+        assert [r.block_hash for r in tokenomics.work_score_history][-4:] == hashes(side)
+
+    @pytest.mark.unit
+    def test_disconnect_removes_own_coinbase(self):
+        """Test: rewards with equal timestamp and amount keep separate coinbases."""
+        genesis = make_block(None)
+        first, second = make_block(genesis, tag="a"), make_block(genesis, tag="b")
+        state = BlockchainState()
+        tokenomics = DynamicWorkScoreTokenomics(blockchain_state=state)
+        reward = 500_000_000
+        for block in (first, second):
+            tokenomics.record_block(block, block.complexity, reward, miner_address="miner")
+
+        assert tokenomics.disconnect_block(second)
+        remaining = state.get_transaction_history("miner", limit=None)
+        assert [tx.transaction_id for tx in remaining] == [tokenomics.work_score_history[-1].coinbase_id]
+        assert state.get_balance("miner") == reward
+
+
+class TestReorgBenchmark:
+    """Benchmark reorg cost against depth on a long chain."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_reorg_depths_on_100k_chain(self):
+        print("\n🔀 Benchmarking reorgs at depth 1-100 on a 100k-block chain...")
+        engine, genesis = make_engine(NullStorage(), confirmation_depth=128, compaction_interval=64)
+        tip = extend(engine, genesis, 100_000)[-1]
+
+        for depth in (1, 2, 5, 10, 20, 50, 100):
+            fork = engine.get_ancestor(engine.best_tip, engine.best_tip.height - depth)
+            fork_block = fork.block
+
+            # Equal-work side branch of the same length does not win the tie-break...
+            parent = fork_block
+            for _ in range(depth):
+                parent = make_block(parent, tag=f"side{depth}")
+                engine._add_block_to_tree(parent, receipt_time=time.time())
+            assert engine.best_tip.block.block_hash == tip.block_hash
+
+            # ...until one more block tips it over
+            parent = make_block(parent, tag=f"side{depth}")
+            start = time.perf_counter()
+            engine._add_block_to_tree(parent, receipt_time=time.time())
+            elapsed = time.perf_counter() - start
+
+            assert engine.best_tip.block.block_hash == parent.block_hash
+            assert engine.last_reorg.depth == depth
+            assert engine.last_reorg.fork_hash == fork_block.block_hash
+            print(f"   depth {depth:>3}: {elapsed * 1000:.3f} ms")
+            assert elapsed < 0.05 + depth * 0.001
+
+            # Extend the new branch so the next fork sits on it
+            tip = extend(engine, parent, 200)[-1]
+
+        print("✅ Reorg benchmark passed")
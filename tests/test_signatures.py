@@ -0,0 +1,167 @@
+"""
+Tests for the batched, cached Ed25519 signature verifier
+Includes verification benchmarks for 1k and 10k-transaction blocks
+"""
+
+import pytest
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics import signatures
+from tokenomics.signatures import SignatureVerifier
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tokenomics.wallet import Wallet
+from tokenomics.amount import to_units
+from tests.helpers import legacy_verify
+
+
+def make_wallets(count):
+    return [Wallet() for _ in range(count)]
+
+
+def signed_transactions(wallets, count, start=0):
+    """Signed transfers between wallets, each sender funded by the caller."""
+    transactions = []
+    for i in range(start, start + count):
+        sender, recipient = wallets[i % len(wallets)], wallets[(i + 1) % len(wallets)]
+        tx = Transaction(sender=sender.address, recipient=recipient.address, amount=to_units(1),
+                         timestamp=1_700_000_000.0 + i)
+        tx.sign(sender.get_private_key_bytes())
+        transactions.append(tx)
+    return transactions
+
+
+class TestSignatureVerifier:
+    """Test verification results, batching and the verified cache."""
+
+    @pytest.mark.unit
+    def test_verify_and_verify_many(self):
+        verifier = SignatureVerifier(workers=0)
+        wallet = Wallet()
+        message = b"block data"
+        public_key = wallet.get_public_key_bytes().hex()
+        signature = wallet.sign_transaction(message).hex()
+
+        assert verifier.backend == signatures.BACKEND != "none"
+        assert verifier.verify(public_key, message, signature)
+        assert not verifier.verify(public_key, b"other data", signature)
+        assert not verifier.verify(Wallet().get_public_key_bytes().hex(), message, signature)
+        assert not verifier.verify("zz", message, signature)
+        assert not verifier.verify(public_key, message, "")
+
+        items = [
+            (public_key, message, signature),
+            (public_key, b"tampered", signature),
+            ("not hex", message, signature),
+            (public_key, message, signature[:-2] + "00"),
+        ]
+        assert verifier.verify_many(items) == [True, False, False, False]
+        assert Wallet.verify_block_signature(public_key, {"a": 1}, wallet.sign_block({"a": 1}))
+
+    @pytest.mark.unit
+    def test_cache_is_bounded_and_positive_only(self):
+        verifier = SignatureVerifier(cache_size=3, workers=0)
+        wallet = Wallet()
+        public_key = wallet.get_public_key_bytes().hex()
+        signed = [(public_key, bytes([i]), wallet.sign_transaction(bytes([i])).hex()) for i in range(5)]
+
+        assert verifier.verify_many(signed) == [True] * 5
+        assert len(verifier) == 3
+        assert not verifier.verify(public_key, b"x", signed[0][2])
+        assert len(verifier) == 3
+
+        with patch.object(signatures, "_verify", wraps=signatures._verify) as backend:
+            assert verifier.verify_many(signed[2:]) == [True] * 3
+            assert backend.call_count == 0
+            assert verifier.verify(*signed[0])
+            assert backend.call_count == 1
+        assert verifier.metrics.cache_hits == 3
+
+    @pytest.mark.unit
+    def test_mempool_verified_transactions_skip_block_verification(self):
+        wallets = make_wallets(5)
+        transactions = signed_transactions(wallets, 20)
+        state = BlockchainState()
+        for wallet in wallets:
+            state.update_balance(wallet.address, to_units(100))
+
+        verifier = SignatureVerifier(workers=0)
+        with patch.object(signatures, "_signature_verifier", verifier):
+            for tx in transactions:
+                assert state.add_transaction(tx)
+            verified = verifier.metrics.verified
+            assert verified == 20
+
+            block = state.get_pending_transactions()
+            assert state.process_transactions(block, verify_signatures=True)
+            assert verifier.metrics.verified == verified
+            assert verifier.metrics.cache_hits == 20
+
+    @pytest.mark.unit
+    def test_block_with_bad_signature_is_rejected(self):
+        wallets = make_wallets(3)
+        transactions = signed_transactions(wallets, 6)
+        transactions[4].signature = transactions[3].signature
+        coinbase = Transaction(sender="COINBASE", recipient=wallets[0].address, amount=to_units(50), timestamp=1.0)
+        state = BlockchainState()
+        for wallet in wallets:
+            state.update_balance(wallet.address, to_units(10))
+        before = dict(state.balances)
+
+        with patch.object(signatures, "_signature_verifier", SignatureVerifier(workers=0)):
+            assert state.verify_transactions([coinbase] + transactions) == [True] * 5 + [False, True]
+            assert not state.process_transactions(transactions, verify_signatures=True)
+            assert dict(state.balances) == before
+            assert state.process_transactions(transactions[:4], verify_signatures=True)
+
+    @pytest.mark.integration
+    def test_worker_pool_matches_inline(self):
+        wallets = make_wallets(4)
+        transactions = signed_transactions(wallets, 40)
+        transactions[7].signature = transactions[8].signature
+
+        with SignatureVerifier(workers=2, chunk_size=8, cache_size=0) as pooled:
+            results = pooled.verify_transactions(transactions)
+            assert pooled.metrics.pooled_batches == 1
+        inline = SignatureVerifier(workers=0, cache_size=0).verify_transactions(transactions)
+        assert results == inline == [legacy_verify(tx) for tx in transactions]
+        assert results.count(False) == 1
+
+
+class TestSignatureBenchmark:
+    """Benchmark block signature checks against one-at-a-time verification."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_block_verification(self):
+        print("\n✍️  Benchmarking signature verification for 1k / 10k-transaction blocks...")
+        wallets = make_wallets(100)
+        transactions = signed_transactions(wallets, 10_000)
+
+        for size in (1_000, 10_000):
+            block = transactions[:size]
+
+            start = time.perf_counter()
+            assert all(legacy_verify(tx) for tx in block)
+            legacy_ms = (time.perf_counter() - start) * 1000
+
+            with SignatureVerifier(cache_size=20_000) as verifier:
+                start = time.perf_counter()
+                assert all(verifier.verify_transactions(block))
+                cold_ms = (time.perf_counter() - start) * 1000
+
+                # Second pass: the block connects after its transactions were admitted
+                start = time.perf_counter()
+                assert all(verifier.verify_transactions(block))
+                warm_ms = (time.perf_counter() - start) * 1000
+                workers = verifier.workers
+
+            print(f"   {size:>6,} txs: one-at-a-time {legacy_ms:7.1f} ms | verify_many {cold_ms:7.1f} ms "
+                  f"({workers} workers) | cached {warm_ms:6.1f} ms")
+
+        print("✅ Signature verification benchmark passed")
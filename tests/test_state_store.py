@@ -0,0 +1,178 @@
+"""
+Tests for SQLite-backed BlockchainState persistence
+Includes a crash check and startup / per-block apply benchmarks
+"""
+
+import pytest
+import sqlite3
+import subprocess
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tokenomics.amount import to_units
+from tests.helpers import address
+
+
+def block_transactions(height, per_block=10, addresses=200):
+    """A coinbase plus transfers between a fixed set of addresses."""
+    txs = [Transaction(sender="COINBASE", recipient=address(height % addresses), amount=to_units(50),
+                       timestamp=float(height * 100), transaction_id=f"cb-{height}")]
+    for i in range(1, per_block):
+        txs.append(Transaction(
+            sender=address((height + i) % addresses), recipient=address((height + 2 * i) % addresses),
+            amount=to_units(1), timestamp=float(height * 100 + i), transaction_id=f"tx-{height}-{i}"
+        ))
+    return txs
+
+
+def apply_blocks(state, start, count):
+    for height in range(start, start + count):
+        assert state.process_transactions(block_transactions(height))
+
+
+class TestSQLiteState:
+    """Test incremental persistence and atomic block application."""
+
+    @pytest.mark.unit
+    def test_state_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        state, reference = BlockchainState(db_path=path), BlockchainState()
+        for target in (state, reference):
+            apply_blocks(target, 0, 30)
+        pending = Transaction(sender="COINBASE", recipient=address(1), amount=to_units(5), timestamp=1e6)
+        assert state.add_transaction(pending)
+        assert state.save_state()
+        state.store.close()
+
+        reopened = BlockchainState(db_path=path)
+        assert dict(reopened.balances) == dict(reference.balances)
+        assert len(reopened.transactions) == 300
+        assert "tx-12-3" in reopened.processed_transactions
+        assert len(reopened.processed_transactions) == 300
+        assert [tx.transaction_id for tx in reopened.get_transaction_history(address(5), 20)] == \
+            [tx.transaction_id for tx in reference.get_transaction_history(address(5), 20)]
+        assert reopened.get_transaction_by_id("tx-3-1").amount == to_units(1)
+        assert [tx.transaction_id for tx in reopened.pending_transactions] == [pending.transaction_id]
+
+        # Removal keeps the address index consistent
+        assert reopened.remove_transaction("cb-5").recipient == address(5)
+        assert reopened.transaction_history[address(5)] == reopened.get_transaction_history(address(5), None)[::-1]
+        assert len(reopened.transactions) == 299
+
+    @pytest.mark.unit
+    def test_failed_block_rolls_back(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        state = BlockchainState(db_path=path)
+        apply_blocks(state, 0, 5)
+        before = dict(state.balances)
+
+        real_add = state.store.add_transaction
+        calls = []
+
+        def failing_add(tx):
+            calls.append(tx)
+            if len(calls) == 4:
+                raise sqlite3.OperationalError("disk I/O error")
+            return real_add(tx)
+
+        with patch.object(state.store, "add_transaction", side_effect=failing_add):
+            assert not state.process_transactions(block_transactions(5))
+
+        assert dict(state.balances) == before
+        assert "cb-5" not in state.processed_transactions
+        assert len(state.transactions) == 50
+        state.store.close()
+        assert dict(BlockchainState(db_path=path).balances) == before
+
+    @pytest.mark.unit
+    def test_json_state_imported_once(self, tmp_path):
+        legacy = BlockchainState()
+        apply_blocks(legacy, 0, 10)
+        json_path = str(tmp_path / "blockchain_state.json")
+        assert legacy.save_state(json_path)
+
+        state = BlockchainState(db_path=str(tmp_path / "state.db"))
+        assert state.load_state(json_path)
+        assert dict(state.balances) == dict(legacy.balances)
+        assert len(state.transactions) == 100
+
+        apply_blocks(state, 10, 1)
+        assert state.load_state(json_path)  # Database already populated: not re-imported
+        assert len(state.transactions) == 110
+
+    @pytest.mark.integration
+    def test_crash_mid_block_leaves_block_boundary(self, tmp_path):
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        path = str(tmp_path / "state.db")
+        script = (
+            "import os, sys\n"
+            f"sys.path.insert(0, {tests_dir!r})\n"
+            "import test_state_store as t\n"
+            f"state = t.BlockchainState(db_path={path!r})\n"
+            "t.apply_blocks(state, 0, 20)\n"
+            "add = state.processed_transactions.add\n"
+            "def crash(tx_id):\n"
+            "    if tx_id == 'tx-20-5':\n"
+            "        os._exit(1)\n"
+            "    add(tx_id)\n"
+            "state.processed_transactions.add = crash\n"
+            "state.process_transactions(t.block_transactions(20))\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", script], capture_output=True)
+        assert completed.returncode == 1
+
+        reference = BlockchainState()
+        apply_blocks(reference, 0, 20)
+        recovered = BlockchainState(db_path=path)
+        assert dict(recovered.balances) == dict(reference.balances)
+        assert len(recovered.transactions) == 200
+        assert "cb-20" not in recovered.processed_transactions
+
+
+class TestStateBenchmark:
+    """Benchmark startup and per-block cost as the chain ages."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_constant_per_block_cost(self, tmp_path):
+        print("\n🗄️  Benchmarking SQLite state vs whole-file JSON...")
+        path = str(tmp_path / "state.db")
+        state = BlockchainState(db_path=path)
+        json_state = BlockchainState()
+        json_path = str(tmp_path / "state.json")
+
+        applied = 0
+        for checkpoint in (1_000, 4_000, 8_000):
+            apply_blocks(state, applied, checkpoint - 100 - applied)
+            apply_blocks(json_state, applied, checkpoint - applied)
+
+            start = time.perf_counter()
+            apply_blocks(state, checkpoint - 100, 100)
+            per_block_ms = (time.perf_counter() - start) * 10
+            applied = checkpoint
+
+            start = time.perf_counter()
+            json_state.save_state(json_path)
+            json_save_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            reopened = BlockchainState(db_path=path)
+            startup_ms = (time.perf_counter() - start) * 1000
+            assert len(reopened.processed_transactions) == checkpoint * 10
+            reopened.store.close()
+
+            start = time.perf_counter()
+            BlockchainState().load_state(json_path)
+            json_load_ms = (time.perf_counter() - start) * 1000
+
+            print(f"   {checkpoint:>5,} blocks: apply {per_block_ms:5.2f} ms/block, startup {startup_ms:6.1f} ms | "
+                  f"JSON save {json_save_ms:7.1f} ms, load {json_load_ms:7.1f} ms")
+
+        assert dict(state.balances) == dict(json_state.balances)
+        print("✅ State persistence benchmark passed")
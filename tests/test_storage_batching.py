@@ -0,0 +1,185 @@
+"""
+Tests for batched storage commits when connecting many blocks
+Includes a crash-recovery check and a blocks/sec sync benchmark
+"""
+
+import pytest
+import sqlite3
+import subprocess
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from consensus import ConsensusEngine, ConsensusConfig
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+from pow import ProblemRegistry
+from tests import helpers
+
+
+def make_chain(count):
+    """Genesis followed by count valid blocks."""
+    return helpers.make_chain(None, count + 1, numbers=8)
+
+
+def make_engine(data_dir, **config):
+    storage = StorageManager(StorageConfig(data_dir=str(data_dir), role=NodeRole.FULL, pruning_mode=PruningMode.FULL))
+    with patch.object(ConsensusEngine, "_initialize_genesis"):
+        engine = ConsensusEngine(ConsensusConfig(confirmation_depth=6, **config), storage, ProblemRegistry())
+    return engine
+
+
+def table_counts(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("headers", "blocks", "work_index", "tips")
+        }
+
+
+class CountingStorage:
+    """Wrap a StorageManager and count transactions."""
+
+    def __init__(self, storage):
+        self._storage = storage
+        self.transactions = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._storage, name)
+        if name.startswith("store_") or name == "batch_write":
+            def counted(*args, **kwargs):
+                self.transactions += 1
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+class TestBatchedWrites:
+    """Test commit grouping and write-through fallback."""
+
+    @pytest.mark.unit
+    def test_one_commit_per_n_blocks(self, tmp_path):
+        engine = make_engine(tmp_path, compaction_interval=0)
+        chain = make_chain(250)
+        engine.storage = storage = CountingStorage(engine.storage)
+
+        with engine.batched_writes(max_blocks=100, max_ms=60_000, store_blocks=True) as batch:
+            for block in chain:
+                engine._add_block_to_tree(block, receipt_time=time.time())
+
+        assert batch.commits == 3
+        assert storage.transactions == 3
+        assert table_counts(engine.storage.db_path) == {"headers": 251, "blocks": 251, "work_index": 251, "tips": 251}
+        assert engine.storage.get_work_at_height(250) == int(engine.best_tip.cumulative_work)
+
+    @pytest.mark.unit
+    def test_commit_after_time_limit(self):
+        with patch.object(ConsensusEngine, "_initialize_genesis"):
+            engine = ConsensusEngine(ConsensusConfig(), Mock(), ProblemRegistry())
+        chain = make_chain(3)
+
+        with engine.batched_writes(max_blocks=1000, max_ms=0) as batch:
+            for block in chain:
+                engine._add_block_to_tree(block, receipt_time=time.time())
+            assert batch.commits == 4
+
+        engine.storage.store_tip.assert_not_called()
+
+    @pytest.mark.unit
+    def test_connect_blocks_matches_unbatched(self, tmp_path):
+        chain = make_chain(300)
+        batched = make_engine(tmp_path / "batched")
+        batched._add_block_to_tree(chain[0], receipt_time=chain[0].timestamp)
+        result = batched.connect_blocks(chain[1:], workers=0)
+
+        plain = make_engine(tmp_path / "plain")
+        plain._add_block_to_tree(chain[0], receipt_time=chain[0].timestamp)
+        for block in chain[1:]:
+            plain._add_block_to_tree(block, receipt_time=time.time())
+
+        assert len(result.accepted) == 300
+        assert batched.best_tip.block.block_hash == plain.best_tip.block.block_hash
+        # Compacted stubs load their blocks back from storage
+        assert [b.block_hash for b in batched.get_chain_from_genesis()] == [b.block_hash for b in chain]
+        for height in (1, 150, 300):
+            assert batched.storage.get_work_at_height(height) == plain.storage.get_work_at_height(height)
+
+    @pytest.mark.unit
+    def test_failed_commit_kept_for_retry(self):
+        with patch.object(ConsensusEngine, "_initialize_genesis"):
+            engine = ConsensusEngine(ConsensusConfig(), Mock(), ProblemRegistry())
+        engine.storage.batch_write.side_effect = [False, True]
+        chain = make_chain(1)
+
+        with engine.batched_writes(max_blocks=1, max_ms=60_000) as batch:
+            engine._add_block_to_tree(chain[0], receipt_time=time.time())
+            assert batch.failed_commits == 1
+            engine._add_block_to_tree(chain[1], receipt_time=time.time())
+
+        committed = engine.storage.batch_write.call_args_list[-1].args[0]
+        assert [op for op, _ in committed] == ["work_index", "tip", "work_index", "tip"]
+        assert batch.operations == []
+
+
+class TestCrashRecovery:
+    """Test that a crash mid-sync leaves a consistent prefix on disk."""
+
+    @pytest.mark.integration
+    def test_crash_leaves_committed_prefix(self, tmp_path):
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        script = (
+            "import os, sys\n"
+            f"sys.path.insert(0, {tests_dir!r})\n"
+            "import test_storage_batching as t\n"
+            f"engine = t.make_engine({str(tmp_path)!r}, compaction_interval=0)\n"
+            "chain = t.make_chain(400)\n"
+            "def crash(delta):\n"
+            "    if delta.connected[-1].index == 350:\n"
+            "        os._exit(1)\n"
+            "engine.add_chain_listener(crash)\n"
+            "with engine.batched_writes(max_blocks=100, max_ms=60_000, store_blocks=True):\n"
+            "    for block in chain:\n"
+            "        engine._add_block_to_tree(block, receipt_time=block.timestamp)\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", script], capture_output=True)
+        assert completed.returncode == 1
+
+        # Blocks 0-299 were committed in three batches; 300-350 were lost together
+        counts = table_counts(os.path.join(str(tmp_path), "blockchain.db"))
+        assert counts == {"headers": 300, "blocks": 300, "work_index": 300, "tips": 300}
+        with sqlite3.connect(os.path.join(str(tmp_path), "blockchain.db")) as conn:
+            assert conn.execute("SELECT MAX(height) FROM work_index").fetchone()[0] == 299
+            assert conn.execute("SELECT MAX(height) FROM headers").fetchone()[0] == 299
+
+
+class TestSyncBenchmark:
+    """Benchmark initial-sync throughput with and without batching."""
+
+    @pytest.mark.stress
+    def test_sync_blocks_per_second(self, tmp_path):
+        print("\n💾 Benchmarking batched storage commits during sync...")
+        chain = make_chain(2_000)
+        rates = {}
+
+        for name, batched in (("per-block", False), ("batched", True)):
+            engine = make_engine(tmp_path / name)
+            engine._add_block_to_tree(chain[0], receipt_time=chain[0].timestamp)
+
+            start = time.perf_counter()
+            if batched:
+                result = engine.connect_blocks(chain[1:], workers=0)
+            else:
+                result = engine.validate_blocks(chain[1:], workers=0)
+                for block in chain[1:]:
+                    engine.storage.store_header(block)
+                    engine.storage.store_block(block)
+            rates[name] = len(chain[1:]) / (time.perf_counter() - start)
+
+            assert len(result.accepted) == 2_000
+            print(f"   {name:>9}: {rates[name]:8,.0f} blocks/sec")
+
+        assert rates["batched"] > rates["per-block"] * 2
+        print("✅ Sync benchmark passed")
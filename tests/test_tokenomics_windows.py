@@ -0,0 +1,353 @@
+"""
+Tests for the rolling statistics and dynamics snapshot behind DynamicWorkScoreTokenomics
+Includes per-reward latency and profitability-query benchmarks
+"""
+
+import pytest
+import random
+import statistics
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier, ComputationalComplexity, EnergyMetrics, HardwareType
+from tokenomics.dynamic_tokenomics import (
+    DynamicWorkScoreTokenomics, RollingWindow, MarketDrivenMining, HardwareProfile
+)
+
+
+TIERS = list(ProblemTier)
+
+
+def make_complexity(size, solve_time, verify_time):
+    return ComputationalComplexity(
+        time_solve_O="O(2^n)", time_solve_Omega="Omega(2^(n/2))", time_solve_Theta=None,
+        time_verify_O="O(n)", time_verify_Omega="Omega(n)", time_verify_Theta="Theta(n)",
+        space_solve_O="O(n * target)", space_solve_Omega="Omega(n)", space_solve_Theta=None,
+        space_verify_O="O(n)", space_verify_Omega="Omega(n)", space_verify_Theta="Theta(n)",
+        problem_class="NP-Complete",
+        problem_size=size,
+        solution_size=4,
+        epsilon_approximation=None,
+        asymmetry_time=solve_time / verify_time,
+        asymmetry_space=10.0,
+        measured_solve_time=solve_time,
+        measured_verify_time=verify_time,
+        measured_solve_space=1024,
+        measured_verify_space=64,
+        energy_metrics=EnergyMetrics(
+            solve_energy_joules=1.0, verify_energy_joules=0.001,
+            solve_power_watts=100.0, verify_power_watts=1.0,
+            solve_time_seconds=solve_time, verify_time_seconds=verify_time,
+            cpu_utilization=50.0, memory_utilization=10.0, gpu_utilization=0.0
+        ),
+        problem={"type": "subset_sum", "numbers": [], "target": 0, "size": size},
+        solution_quality=1.0
+    )
+
+
+def make_blocks(count, seed=45):
+    """Blocks with varied tiers, sizes and timings."""
+    rng = random.Random(seed)
+    blocks = []
+    for index in range(count):
+        complexity = make_complexity(rng.randint(8, 32), rng.uniform(0.1, 10.0), rng.uniform(0.001, 0.01))
+        blocks.append(Block(
+            index=index, timestamp=1_700_000_000.0 + index * 14, previous_hash="",
+            transactions=[], merkle_root="", problem=complexity.problem, solution=[],
+            complexity=complexity, mining_capacity=rng.choice(TIERS[:rng.randint(1, len(TIERS))]),
+            cumulative_work_score=0.0, block_hash=f"{index:064x}"
+        ))
+    return blocks
+
+
+class LegacyTokenomics(DynamicWorkScoreTokenomics):
+    """The previous full-recompute statistics over an unbounded list, used as a reference."""
+
+    def __init__(self):
+        super().__init__()
+        self.legacy_history = []
+
+    def record_block(self, block, complexity, reward, miner_address=None):
+        super().record_block(block, complexity, reward, miner_address)
+        self.legacy_history.append(self.work_score_history[-1])
+
+    def _get_recent_average_work(self, window=100):
+        window = min(window, len(self.legacy_history))
+        if window == 0:
+            return 1.0
+        return statistics.mean(r.work_score for r in self.legacy_history[-window:])
+
+    def get_capacity_market_dynamics(self):
+        total_blocks = len(self.legacy_history)
+        if total_blocks == 0:
+            return {}
+        dynamics = {}
+        for capacity in self.capacity_performance:
+            recent = list(self.capacity_performance[capacity].recent_records)
+            avg_work = statistics.mean(r.work_score for r in recent)
+            avg_solve = statistics.mean(r.measured_solve_time for r in recent)
+            work_per_second = avg_work / max(0.001, avg_solve)
+            avg_work_per_second = statistics.mean(
+                r.work_score / max(0.001, r.measured_solve_time) for r in self.legacy_history[-100:]
+            )
+            relative_profitability = work_per_second / avg_work_per_second if avg_work_per_second > 0 else 1.0
+            market_share = self.capacity_performance[capacity].blocks_mined / total_blocks
+            dynamics[capacity] = {
+                'blocks_mined': self.capacity_performance[capacity].blocks_mined,
+                'market_share': market_share,
+                'avg_work_score': avg_work,
+                'avg_solve_time': avg_solve,
+                'work_per_second': work_per_second,
+                'relative_profitability': relative_profitability,
+                'status': self._get_capacity_status(market_share, relative_profitability)
+            }
+        return dynamics
+
+    def _calculate_diversity_bonus(self, capacity):
+        dynamics = self.get_capacity_market_dynamics()
+        if capacity not in dynamics:
+            return 1.0
+        return self._diversity_bonus_for_share(dynamics[capacity]['market_share'])
+
+    def get_dynamic_block_time(self):
+        times = [r.measured_verify_time for r in self.legacy_history[-100:]]
+        if len(times) < 10:
+            return 1.0
+        return max(1.0, statistics.median(times) * 50)
+
+    def get_difficulty_adjustment(self):
+        if len(self.legacy_history) < 100:
+            return 1.0
+        ratio = statistics.mean(r.work_score for r in self.legacy_history[-50:]) / \
+            statistics.mean(r.work_score for r in self.legacy_history[-100:])
+        return 1.1 if ratio > 1.3 else 0.9 if ratio < 0.7 else 1.0
+
+
+def make_hardware(capability):
+    return HardwareProfile(
+        hardware_type=HardwareType.DESKTOP_STANDARD, computational_capability=capability,
+        cpu_cores=8, memory_gb=16.0, storage_gb=512.0, gpu_available=False,
+        network_speed_mbps=100.0, battery_powered=False, energy_efficiency=0.6, accessibility_score=0.7
+    )
+
+
+def assert_same_statistics(tokenomics, reference):
+    assert tokenomics._get_recent_average_work() == pytest.approx(reference._get_recent_average_work())
+    assert tokenomics.get_dynamic_block_time() == pytest.approx(reference.get_dynamic_block_time())
+    assert tokenomics.get_difficulty_adjustment() == reference.get_difficulty_adjustment()
+    dynamics, expected = tokenomics.get_capacity_market_dynamics(), reference.get_capacity_market_dynamics()
+    assert dynamics.keys() == expected.keys()
+    for capacity in expected:
+        for key, value in expected[capacity].items():
+            assert dynamics[capacity][key] == (value if isinstance(value, str) else pytest.approx(value))
+
+
+class TestRollingWindow:
+    """Test running sums and medians against full recomputation."""
+
+    @pytest.mark.unit
+    def test_matches_statistics(self):
+        rng = random.Random(1)
+        window, values = RollingWindow(25, track_median=True), []
+        for step in range(2_000):
+            if values and rng.random() < 0.2:
+                assert window.pop() == values.pop()
+            else:
+                value = rng.uniform(-1e6, 1e6)
+                window.append(value)
+                values = (values + [value])[-25:]
+            if values:
+                assert window.mean() == pytest.approx(statistics.mean(values), abs=1e-6)
+                assert window.median() == statistics.median(values)
+            assert list(window) == values
+
+        window.clear()
+        window.appendleft(2.0)
+        window.appendleft(1.0)
+        assert list(window) == [1.0, 2.0] and window.median() == 1.5
+        with pytest.raises(statistics.StatisticsError):
+            RollingWindow(3, track_median=True).median()
+
+
+class TestTokenomicsWindows:
+    """Test reward-path statistics and bounded memory."""
+
+    @pytest.mark.unit
+    def test_statistics_match_full_recompute(self):
+        tokenomics, reference = DynamicWorkScoreTokenomics(), LegacyTokenomics()
+        for block in make_blocks(600):
+            reward = reference.calculate_block_reward(block, block.complexity)
+            assert tokenomics.calculate_block_reward(block, block.complexity) == reward
+            tokenomics.record_block(block, block.complexity, reward)
+            reference.record_block(block, block.complexity, reward)
+            if block.index % 97 == 0:
+                assert_same_statistics(tokenomics, reference)
+        assert_same_statistics(tokenomics, reference)
+
+        trend = tokenomics.get_network_state()['work_score_trend']
+        scores = [r.work_score for r in reference.legacy_history[-100:]]
+        assert trend['recent_mean'] == pytest.approx(statistics.mean(scores[50:]))
+        assert trend['historical_mean'] == pytest.approx(statistics.mean(scores[:50]))
+
+    @pytest.mark.unit
+    def test_disconnect_refills_network_windows(self):
+        tokenomics, reference = DynamicWorkScoreTokenomics(), LegacyTokenomics()
+        blocks = make_blocks(300)
+        for block in blocks:
+            tokenomics.connect_block(block)
+            reference.connect_block(block)
+
+        for block in reversed(blocks[-40:]):
+            assert tokenomics.disconnect_block(block)
+            reference.disconnect_block(block)
+            reference.legacy_history.pop()
+
+        assert tokenomics.blocks_recorded == 260
+        assert list(tokenomics.recent_work_scores) == [r.work_score for r in reference.legacy_history[-100:]]
+        assert tokenomics._get_recent_average_work() == pytest.approx(reference._get_recent_average_work())
+        assert tokenomics.get_difficulty_adjustment() == reference.get_difficulty_adjustment()
+
+    @pytest.mark.unit
+    def test_history_is_bounded(self):
+        tokenomics = DynamicWorkScoreTokenomics(history_retention=200)
+        blocks = make_blocks(1_000)
+        for block in blocks:
+            tokenomics.connect_block(block)
+
+        assert len(tokenomics.work_score_history) == 200
+        assert tokenomics.blocks_recorded == 1_000
+        assert tokenomics.get_network_state()['blocks_mined'] == 1_000
+        shares = [d['market_share'] for d in tokenomics.get_capacity_market_dynamics().values()]
+        assert sum(shares) == pytest.approx(1.0)
+
+        # Reorgs reach back as far as the retained history
+        for block in reversed(blocks[-200:]):
+            assert tokenomics.disconnect_block(block)
+        assert not tokenomics.disconnect_block(blocks[799])
+
+
+class TestDynamicsSnapshot:
+    """Test the memoized capacity dynamics snapshot."""
+
+    @pytest.mark.unit
+    def test_snapshot_rebuilt_only_when_blocks_change(self):
+        tokenomics = DynamicWorkScoreTokenomics()
+        market = MarketDrivenMining(tokenomics)
+        blocks = make_blocks(120)
+        for block in blocks[:100]:
+            tokenomics.connect_block(block)
+
+        with patch.object(tokenomics, "_compute_capacity_market_dynamics",
+                          wraps=tokenomics._compute_capacity_market_dynamics) as compute:
+            for block in blocks[100:110]:
+                tokenomics.calculate_block_reward(block, block.complexity)
+                for tier in TIERS:
+                    market.estimate_profitability(make_hardware(0.5), tier)
+            tokenomics.get_network_state()
+            assert compute.call_count == 1
+
+            tokenomics.connect_block(blocks[100])
+            tokenomics.calculate_block_reward(blocks[101], blocks[101].complexity)
+            assert compute.call_count == 2
+
+            assert tokenomics.disconnect_block(blocks[100])
+            tokenomics.get_capacity_market_dynamics()
+            assert compute.call_count == 3
+
+    @pytest.mark.unit
+    def test_cached_values_match_fresh_computation(self):
+        tokenomics, reference = DynamicWorkScoreTokenomics(), LegacyTokenomics()
+        for block in make_blocks(300):
+            assert tokenomics.calculate_block_reward(block, block.complexity) == \
+                reference.calculate_block_reward(block, block.complexity)
+            tokenomics.connect_block(block)
+            reference.connect_block(block)
+            for tier in TIERS:
+                assert tokenomics._calculate_diversity_bonus(tier) == reference._calculate_diversity_bonus(tier)
+
+        # Callers get copies; the snapshot itself is not exposed for mutation
+        dynamics = tokenomics.get_capacity_market_dynamics()
+        next(iter(dynamics.values()))['market_share'] = 99.0
+        assert all(d['market_share'] <= 1.0 for d in tokenomics.get_capacity_market_dynamics().values())
+
+        market = MarketDrivenMining(tokenomics)
+        desktop = make_hardware(0.5)
+        assert market.estimate_profitability(desktop, ProblemTier.TIER_1_MOBILE) > 0
+        assert market.estimate_profitability(desktop, ProblemTier.TIER_1_MOBILE) == \
+            market.estimate_profitability(desktop, ProblemTier.TIER_1_MOBILE)
+
+
+class TestTokenomicsBenchmark:
+    """Benchmark reward latency as the chain grows."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_reward_latency_over_million_blocks(self):
+        print("\n📈 Benchmarking block reward latency over 1,000,000 blocks...")
+        blocks = make_blocks(1_000)
+        tokenomics = DynamicWorkScoreTokenomics()
+
+        def reward_latency(target, samples=500):
+            start = time.perf_counter()
+            for i in range(samples):
+                block = blocks[i % len(blocks)]
+                target.calculate_block_reward(block, block.complexity)
+            return (time.perf_counter() - start) / samples
+
+        legacy = LegacyTokenomics()
+        for i in range(10_000):
+            block = blocks[i % len(blocks)]
+            legacy.record_block(block, block.complexity, 0)
+        legacy_latency = reward_latency(legacy, samples=50)
+
+        latencies = {}
+        start = time.perf_counter()
+        for i in range(1_000_000):
+            block = blocks[i % len(blocks)]
+            tokenomics.record_block(block, block.complexity, 0)
+            if i + 1 in (1_000, 10_000, 100_000, 1_000_000):
+                latencies[i + 1] = reward_latency(tokenomics)
+        record_rate = 1_000_000 / (time.perf_counter() - start)
+
+        for count, latency in latencies.items():
+            print(f"   {count:>9,} blocks: {latency * 1e6:7.1f} µs/reward")
+        print(f"   Full recompute at 10,000 blocks: {legacy_latency * 1e6:,.1f} µs/reward")
+        print(f"   record_block: {record_rate:,.0f} blocks/sec, history kept: {len(tokenomics.work_score_history):,}")
+
+        assert len(tokenomics.work_score_history) <= 1_000
+        print("✅ Tokenomics rolling statistics benchmark passed")
+
+    @pytest.mark.stress
+    def test_rewards_under_profitability_queries(self):
+        print("\n💹 Benchmarking rewards with 20 profitability queries per block...")
+        blocks = make_blocks(2_000)
+        hardware = [make_hardware(c) for c in (0.15, 0.5, 0.7, 0.85)]
+
+        def run(tokenomics):
+            market = MarketDrivenMining(tokenomics)
+            start = time.perf_counter()
+            for block in blocks:
+                for profile in hardware:
+                    for tier in TIERS:
+                        market.estimate_profitability(profile, tier)
+                tokenomics.connect_block(block)
+            return len(blocks) / (time.perf_counter() - start), tokenomics.total_coins_issued
+
+        memoized_rate, memoized_issued = run(DynamicWorkScoreTokenomics())
+
+        uncached = DynamicWorkScoreTokenomics()
+        compute = uncached._compute_capacity_market_dynamics
+        uncached._get_dynamics_snapshot = lambda: (uncached.version, compute(), {})
+        uncached_rate, uncached_issued = run(uncached)
+
+        print(f"   Memoized snapshot: {memoized_rate:,.0f} rewards/sec")
+        print(f"   Rebuilt per query: {uncached_rate:,.0f} rewards/sec")
+        print(f"   Speedup: {memoized_rate / uncached_rate:.1f}x")
+
+        assert memoized_issued == uncached_issued
+        print("✅ Dynamics snapshot benchmark passed")
@@ -0,0 +1,175 @@
+"""
+Tests for cached transaction signing bytes and ids
+Includes a profile-backed benchmark counting hashes per transaction from receive to apply
+"""
+
+import pytest
+import cProfile
+import hashlib
+import pstats
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Transaction as CoreTransaction
+from tokenomics import signatures
+from tokenomics.signatures import SignatureVerifier
+from tokenomics.blockchain_state import BlockchainState, Transaction
+from tokenomics.wallet import Wallet
+from tokenomics.amount import to_units, to_coins
+
+
+class LegacyTransaction(Transaction):
+    """The previous Transaction, rebuilding its bytes and hash on every use."""
+
+    def _signing_data(self) -> bytes:
+        return f"{self.sender}{self.recipient}{to_coins(self.amount)}{self.timestamp}".encode()
+
+    def calculate_transaction_id(self) -> str:
+        return hashlib.sha256(self._signing_data()).hexdigest()
+
+    @property
+    def signing_digest(self):
+        return None
+
+
+def signed_transactions(cls, wallets, count):
+    """Signed transfers between wallets, each sender funded by the caller."""
+    transactions = []
+    for i in range(count):
+        sender, recipient = wallets[i % len(wallets)], wallets[(i + 1) % len(wallets)]
+        tx = cls(sender=sender.address, recipient=recipient.address, amount=to_units(1),
+                 timestamp=1_700_000_000.0 + i)
+        tx.sign(sender.get_private_key_bytes())
+        transactions.append(tx)
+    return transactions
+
+
+def sha256_calls(profiler):
+    """Number of SHA-256 constructions recorded by a profiler."""
+    stats = pstats.Stats(profiler)
+    return sum(calls for (_, _, name), (_, calls, *_rest) in stats.stats.items() if "sha256" in name)
+
+
+def receive_mine_apply(transactions, wallets, block_size=100):
+    """Admit transactions to the mempool, select blocks and connect them."""
+    state = BlockchainState()
+    for wallet in wallets:
+        state.update_balance(wallet.address, to_units(1_000))
+    for tx in transactions:
+        assert state.add_transaction(tx)
+    while state.mempool:
+        block = state.get_pending_transactions(block_size)
+        assert state.process_transactions(block, verify_signatures=True)
+        state.clear_pending_transactions(block)
+    return state
+
+
+class TestTokenomicsTransactionCache:
+    """Test cached ids and frozen identity fields on tokenomics transactions."""
+
+    @pytest.mark.unit
+    def test_id_and_bytes_match_legacy(self):
+        tx = Transaction(sender="CJ" + "1" * 40, recipient="CJ" + "2" * 40, amount=to_units(2.5), timestamp=1.0)
+        legacy = f"{tx.sender}{tx.recipient}2.5{tx.timestamp}".encode()
+
+        assert tx.signing_bytes == tx._signing_data() == legacy
+        assert tx.signing_digest == hashlib.sha256(legacy).digest()
+        assert tx.transaction_id == tx.calculate_transaction_id() == hashlib.sha256(legacy).hexdigest()
+        assert Transaction.from_dict(tx.to_dict()).transaction_id == tx.transaction_id
+
+    @pytest.mark.unit
+    def test_identity_fields_are_immutable(self):
+        wallet = Wallet()
+        tx = Transaction(sender=wallet.address, recipient=Wallet().address, amount=to_units(1), timestamp=1.0)
+        for field, value in (("sender", "CJ" + "0" * 40), ("recipient", "CJ" + "0" * 40),
+                             ("amount", to_units(2)), ("timestamp", 2.0), ("transaction_id", "x")):
+            with pytest.raises(AttributeError):
+                setattr(tx, field, value)
+
+        tx.sign(wallet.get_private_key_bytes())
+        assert tx.signature and tx.public_key
+        assert tx.verify_signature()
+
+        # Signature fields stay writable, and a swapped signature fails
+        tx.signature = Transaction(sender=wallet.address, recipient=tx.recipient, amount=to_units(1),
+                                   timestamp=3.0).sign(wallet.get_private_key_bytes())
+        assert not tx.verify_signature()
+
+    @pytest.mark.unit
+    def test_verifier_reuses_cached_digest(self):
+        wallet = Wallet()
+        tx = signed_transactions(Transaction, [wallet, Wallet()], 1)[0]
+        verifier = SignatureVerifier(workers=0)
+
+        with patch.object(signatures.hashlib, "sha256", wraps=hashlib.sha256) as sha256:
+            assert verifier.verify_transaction(tx)
+            assert verifier.verify_transactions([tx]) == [True]
+            assert sha256.call_count == 0
+        assert verifier.metrics.cache_hits == 1
+
+
+class TestCoreTransactionCache:
+    """Test the same caching on core.blockchain.Transaction."""
+
+    @pytest.mark.unit
+    def test_sign_verify_and_round_trip(self):
+        wallet = Wallet()
+        tx = CoreTransaction(sender=wallet.address, recipient="CJ" + "2" * 40, amount=2.5, timestamp=1.0)
+        legacy = f"{tx.sender}{tx.recipient}{tx.amount}{tx.timestamp}".encode()
+        assert tx.signing_bytes == legacy
+        assert tx.transaction_id == tx.calculate_transaction_id() == hashlib.sha256(legacy).hexdigest()
+
+        tx.sign(wallet.get_private_key_bytes())
+        assert tx.verify_signature()
+
+        restored = CoreTransaction.from_dict(tx.to_dict())
+        assert restored.to_dict() == tx.to_dict()
+        assert restored.verify_signature()
+
+        # A stored id is kept as-is
+        assert CoreTransaction.from_dict(dict(tx.to_dict(), transaction_id="abc")).transaction_id == "abc"
+
+    @pytest.mark.unit
+    def test_identity_fields_are_immutable(self):
+        tx = CoreTransaction(sender="CJ" + "1" * 40, recipient="CJ" + "2" * 40, amount=1.0, timestamp=1.0)
+        for field in ("sender", "recipient", "amount", "timestamp", "transaction_id"):
+            with pytest.raises(AttributeError):
+                setattr(tx, field, getattr(tx, field))
+        tx.signature = "00"
+        assert not tx.verify_signature()
+
+
+class TestTransactionCacheBenchmark:
+    """Benchmark hashing per transaction through a full receive→mine→apply cycle."""
+
+    @pytest.mark.stress
+    def test_hashes_per_transaction(self):
+        print("\n#️⃣  Profiling SHA-256 calls per transaction from receive to apply (2,000 txs)...")
+        wallets = [Wallet() for _ in range(50)]
+        count = 2_000
+        results = {}
+
+        for label, cls in (("cached", Transaction), ("legacy", LegacyTransaction)):
+            verifier = SignatureVerifier(workers=0)
+            with patch.object(signatures, "_signature_verifier", verifier):
+                profiler = cProfile.Profile()
+                start = time.perf_counter()
+                profiler.enable()
+                transactions = signed_transactions(cls, wallets, count)
+                state = receive_mine_apply(transactions, wallets)
+                profiler.disable()
+                elapsed = time.perf_counter() - start
+
+            assert len(state.processed_transactions) == count
+            assert verifier.metrics.verified == count and verifier.metrics.cache_hits == count
+            results[label] = (sha256_calls(profiler) / count, elapsed)
+            print(f"   {label:>6}: {results[label][0]:.2f} sha256 calls/tx, {elapsed:.2f} s under profiler")
+
+        assert results["cached"][0] <= 1.0
+        assert results["legacy"][0] >= 3.0
+        print("✅ Transaction hashing benchmark passed")
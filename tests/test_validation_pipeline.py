@@ -0,0 +1,168 @@
+"""
+Tests for the staged header/reveal validation pipeline
+Includes a benchmark over a synthetic 10k-block chain
+"""
+
+import pytest
+import os
+import time
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pow import ProblemRegistry, derive_epoch_salt, create_commitment, compute_solution_hash
+from validation_pipeline import ValidationPipeline, ValidationJob, check_block_stateless
+from tests import helpers
+
+
+REGISTRY = ProblemRegistry()
+MINER_SALT = b"\x01" * 32
+
+
+def make_chain(length, numbers=64):
+    """Build a linked chain (genesis first) with valid proofs and reveals."""
+    jobs = []
+    for block in helpers.make_chain(None, length, numbers=numbers, solution_size=8):
+        epoch_salt = derive_epoch_salt(block.previous_hash.encode(), int(block.timestamp))
+        commitment = create_commitment(
+            REGISTRY.encode_params(block.problem), MINER_SALT, epoch_salt, compute_solution_hash(block.solution)
+        )
+        jobs.append(ValidationJob(block=block, commitment=commitment, miner_salt=MINER_SALT))
+    return jobs
+
+
+def make_engine(genesis):
+    return helpers.make_engine(genesis=genesis, registry=REGISTRY)[0]
+
+
+class TestStatelessChecks:
+    """Test the checks that run in worker processes."""
+
+    @pytest.mark.unit
+    def test_valid_block_passes(self):
+        job = make_chain(2)[1]
+        assert check_block_stateless(job.block, REGISTRY, job.commitment, job.miner_salt) is None
+
+    @pytest.mark.unit
+    def test_bad_commitment_and_solution_rejected(self):
+        job = make_chain(2)[1]
+        assert check_block_stateless(job.block, REGISTRY, b"\x00" * 32, MINER_SALT) == "Commitment verification failed"
+
+        job.block.solution = job.block.solution[:-1]
+        job.block.block_hash = job.block.calculate_hash()
+        assert check_block_stateless(job.block, REGISTRY) == "Solution verification failed"
+
+    @pytest.mark.unit
+    def test_hash_mismatch_rejected(self):
+        job = make_chain(2)[1]
+        job.block.merkle_root = "f" * 64
+        assert check_block_stateless(job.block, REGISTRY) == "Block hash mismatch"
+
+
+class TestPipelineOrdering:
+    """Test in-order stateful commit."""
+
+    @pytest.mark.unit
+    def test_chain_accepted_in_order(self):
+        jobs = make_chain(300)
+        engine = make_engine(jobs[0].block)
+
+        with ValidationPipeline(engine, workers=2, batch_size=16) as pipeline:
+            result = pipeline.validate_blocks(jobs[1:])
+            metrics = pipeline.get_metrics()
+
+        assert result.rejected == []
+        assert result.accepted == [job.block.block_hash for job in jobs[1:]]
+        assert engine.best_tip.block.block_hash == jobs[-1].block.block_hash
+        assert engine.storage.store_commitment.call_count == 299
+        assert metrics["accepted"] == 299
+        assert metrics["queue_depth_max"] > 0
+
+    @pytest.mark.unit
+    def test_out_of_order_commitments_indexed(self):
+        jobs = make_chain(40)
+        engine = make_engine(jobs[0].block)
+        # Children before their parents: 11-20 arrive first and wait as orphans
+        shuffled = jobs[11:21] + jobs[1:11] + jobs[21:]
+
+        with ValidationPipeline(engine, workers=0, batch_size=8) as pipeline:
+            result = pipeline.validate_blocks(shuffled)
+
+        assert result.rejected == []
+        assert len(result.orphaned) == 10
+        assert engine.best_tip.block.block_hash == jobs[-1].block.block_hash
+        indexed = {call.args[1]: call.args[0] for call in engine.storage.store_commitment.call_args_list}
+        assert indexed == {job.block.block_hash: job.commitment for job in jobs[1:]}
+
+    @pytest.mark.unit
+    def test_buffered_orphan_resubmitted(self):
+        jobs = make_chain(6)
+        engine = make_engine(jobs[0].block)
+
+        with ValidationPipeline(engine, workers=0, batch_size=8) as pipeline:
+            first = pipeline.validate_blocks(jobs[3:5])
+            again = pipeline.validate_blocks(jobs[3:4])
+            metrics = pipeline.get_metrics()
+
+        assert first.orphaned == [jobs[3].block.block_hash, jobs[4].block.block_hash]
+        assert again.orphaned == [jobs[3].block.block_hash]
+        assert metrics["duplicates"] == 1
+        assert len(engine.orphan_pool) == 2
+
+    @pytest.mark.unit
+    def test_descendants_of_invalid_block_rejected(self):
+        jobs = make_chain(50)
+        jobs[20].commitment = b"\x00" * 32
+        engine = make_engine(jobs[0].block)
+
+        result = engine.validate_blocks(jobs[1:], workers=2)
+
+        assert len(result.accepted) == 19
+        reasons = dict(result.rejected)
+        assert reasons[jobs[20].block.block_hash] == "Commitment verification failed"
+        assert reasons[jobs[21].block.block_hash] == "Parent linkage validation failed"
+        assert engine.best_tip.height == 19
+        assert engine.last_pipeline_metrics["rejected"] == 30
+
+    @pytest.mark.unit
+    def test_not_rate_limited_like_gossip(self):
+        """Test: catch-up commits are not subject to the per-second header limit."""
+        jobs = make_chain(250)
+        engine = make_engine(jobs[0].block)
+
+        result = engine.validate_blocks([job.block for job in jobs[1:]], workers=0)
+
+        assert len(result.accepted) == 249
+
+
+class TestPipelineBenchmark:
+    """Benchmark against inline sequential validation."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_synthetic_10k_chain(self):
+        print("\n⛓️  Benchmarking validation over a synthetic 10k-block chain...")
+        jobs = make_chain(10_001)
+
+        sequential = make_engine(jobs[0].block)
+        start = time.time()
+        for job in jobs[1:]:
+            assert check_block_stateless(job.block, REGISTRY, job.commitment, job.miner_salt) is None
+            assert sequential._validate_parent_linkage(job.block)
+            sequential._add_block_to_tree(job.block, receipt_time=time.time())
+        sequential_elapsed = time.time() - start
+
+        engine = make_engine(jobs[0].block)
+        with ValidationPipeline(engine) as pipeline:
+            result = pipeline.validate_blocks(jobs[1:])
+            metrics = pipeline.get_metrics()
+
+        print(f"   Sequential: {10_000 / sequential_elapsed:,.0f} blocks/s")
+        print(f"   Pipeline ({metrics['workers']} workers): {metrics['throughput']:,.0f} blocks/s, "
+              f"max queue {metrics['queue_depth_max']}, avg queue {metrics['avg_queue_depth']:.0f}")
+
+        assert len(result.accepted) == 10_000
+        assert engine.best_tip.block.block_hash == sequential.best_tip.block.block_hash
+
+        print("✅ Validation pipeline benchmark passed")
@@ -0,0 +1,148 @@
+"""
+Tests for the indexed, lazily loading WalletManager
+Includes a startup benchmark with 50,000 wallet files
+"""
+
+import pytest
+import json
+import os
+import time
+import tracemalloc
+import sys
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tokenomics.wallet import Wallet, WalletManager
+
+
+def write_wallets(directory, count, start=0):
+    """Wallet files as WalletManager writes them; returns their addresses."""
+    addresses = []
+    for i in range(start, start + count):
+        wallet = Wallet()
+        wallet.save_to_file(os.path.join(directory, f"wallet-{i:06d}.json"))
+        addresses.append(wallet.address)
+    return addresses
+
+
+def legacy_load(directory):
+    """The previous eager load of every wallet file, used as a reference."""
+    wallets = {}
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            wallet = Wallet.load_from_file(os.path.join(directory, name))
+            wallets[wallet.address] = wallet
+    return wallets
+
+
+class TestWalletIndex:
+    """Test the address index, lazy key loading and paging."""
+
+    @pytest.mark.unit
+    def test_reopen_loads_no_keys(self, tmp_path):
+        addresses = write_wallets(str(tmp_path), 20)
+        WalletManager(str(tmp_path)).close()
+
+        with patch.object(Wallet, "from_private_key_bytes", wraps=Wallet.from_private_key_bytes) as load:
+            manager = WalletManager(str(tmp_path), cache_size=4)
+            assert len(manager) == 20
+            assert load.call_count == 0
+
+            wallet = manager.get_wallet(addresses[3])
+            assert wallet.address == addresses[3]
+            assert manager.get_wallet(addresses[3]) is wallet
+            assert load.call_count == 1
+
+            for address in addresses[:10]:
+                assert manager.get_wallet(address).address == address
+            assert len(manager._wallets) == 4
+        assert manager.get_wallet("BEANS" + "0" * 40) is None
+
+    @pytest.mark.unit
+    def test_directory_changes_are_reconciled(self, tmp_path):
+        addresses = write_wallets(str(tmp_path), 5)
+        manager = WalletManager(str(tmp_path))
+        created = manager.create_wallet("faucet")
+        imported = manager.import_wallet("imported", Wallet().get_private_key_bytes().hex())
+        assert {w['address'] for w in manager.list_wallets()} == set(addresses) | {created.address, imported.address}
+
+        # Another process adds, replaces and deletes files
+        extra = write_wallets(str(tmp_path), 1, start=100)[0]
+        os.remove(tmp_path / "wallet-000000.json")
+        replacement = Wallet()
+        with open(tmp_path / "wallet-000001.json", "w") as f:
+            json.dump({"private_key": replacement.get_private_key_bytes().hex()}, f)  # No public key
+        (tmp_path / "broken.json").write_text("{not json")
+
+        assert manager.refresh() == {"updated": 2, "removed": 1}
+        listed = {w['address'] for w in manager.list_wallets()}
+        assert extra in listed and replacement.address in listed
+        assert addresses[0] not in listed and addresses[1] not in listed
+        assert manager.get_wallet(replacement.address).address == replacement.address
+        assert manager.get_wallet(addresses[0]) is None
+
+    @pytest.mark.unit
+    def test_paginated_listing(self, tmp_path):
+        write_wallets(str(tmp_path), 25)
+        manager = WalletManager(str(tmp_path))
+        everything = manager.list_wallets()
+        pages = [manager.list_wallets(offset=offset, limit=10) for offset in (0, 10, 20, 30)]
+
+        assert [len(page) for page in pages] == [10, 10, 5, 0]
+        assert [w for page in pages for w in page] == everything
+        assert set(everything[0]) == {'address', 'public_key'}
+
+
+class TestWalletManagerBenchmark:
+    """Benchmark startup against eager loading."""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_startup_with_50k_wallets(self, tmp_path):
+        print("\n👛 Benchmarking WalletManager startup with 50,000 wallets...")
+        directory = str(tmp_path)
+        addresses = write_wallets(directory, 50_000)
+
+        def timed(fn):
+            start = time.perf_counter()
+            result = fn()
+            return result, time.perf_counter() - start
+
+        def held_mib(fn):
+            tracemalloc.start()
+            result = fn()
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return result, current / 2**20
+
+        wallets, legacy_s = timed(lambda: legacy_load(directory))
+        assert len(wallets) == 50_000
+        del wallets
+        _, legacy_mb = held_mib(lambda: legacy_load(directory))
+
+        manager, build_s = timed(lambda: WalletManager(directory))
+        manager.close()
+        manager, startup_s = timed(lambda: WalletManager(directory))
+        assert len(manager) == 50_000
+        manager.close()
+        manager, startup_mb = held_mib(lambda: WalletManager(directory))
+
+        start = time.perf_counter()
+        for address in addresses[:1_000]:
+            assert manager.get_wallet(address).address == address
+        first_use_us = (time.perf_counter() - start) / 1_000 * 1e6
+        start = time.perf_counter()
+        page = manager.list_wallets(offset=40_000, limit=100)
+        page_ms = (time.perf_counter() - start) * 1000
+        assert len(page) == 100
+
+        print(f"   Eager load:        {legacy_s:6.2f} s, {legacy_mb:6.1f} MiB held")
+        print(f"   First index build: {build_s:6.2f} s")
+        print(f"   Indexed startup:   {startup_s:6.2f} s, {startup_mb:6.1f} MiB held")
+        print(f"   First use: {first_use_us:.0f} µs/wallet, page of 100 at offset 40k: {page_ms:.1f} ms")
+
+        assert startup_s * 5 < legacy_s
+        assert startup_mb * 10 < legacy_mb
+        print("✅ Wallet manager startup benchmark passed")